@@ -0,0 +1,19 @@
+"""pytest 공통 설정
+
+테스트 실행 중 LLM 응답 캐시 / 임베딩 디스크 캐시 / 평가 노드 판단 로그·모델이 저장소의 data/에 쓰이지 않도록
+임시 디렉토리로 돌립니다 (개별 테스트가 경로를 직접 지정하면 그 경로가 우선).
+"""
+
+import os
+import shutil
+import tempfile
+
+_runtime_dir = tempfile.mkdtemp(prefix="support-bot-test-")
+os.environ.setdefault("LLM_CACHE_PATH", os.path.join(_runtime_dir, "llm_cache.sqlite"))
+os.environ.setdefault("EMBEDDING_CACHE_PATH", os.path.join(_runtime_dir, "embedding_cache.sqlite"))
+os.environ.setdefault("DECISION_LOG_DIR", os.path.join(_runtime_dir, "decision_logs"))
+os.environ.setdefault("DECISION_MODEL_DIR", os.path.join(_runtime_dir, "decision_models"))
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(_runtime_dir, ignore_errors=True)
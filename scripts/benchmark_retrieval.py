@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""검색 지연시간 벤치마크 스크립트
+
+매 쿼리마다 임베딩 클라이언트/벡터 스토어를 새로 여는 방식(cold)과
+공유 검색 서비스를 재사용하는 방식(warm)의 쿼리당 지연시간을 비교합니다.
+"""
+
+import sys
+import os
+import time
+import statistics
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from dotenv import load_dotenv
+
+from src.services.retrieval import RetrievalService
+
+# 환경 변수 로드
+load_dotenv()
+
+
+TEST_QUERIES = [
+    "메신저에서 알림이 안떠요",
+    "비밀번호를 잊어버렸어요",
+    "파일 업로드가 안돼요",
+    "로그인이 안돼요",
+    "화면이 검게 나와요",
+]
+
+
+def measure_cold(queries: list, rounds: int) -> list:
+    """쿼리마다 서비스를 새로 생성 (기존 search_knowledge_node 방식)"""
+    latencies = []
+    for _ in range(rounds):
+        for query in queries:
+            started = time.perf_counter()
+            service = RetrievalService()
+            service.similarity_search_with_score(query, k=5)
+            latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def measure_warm(queries: list, rounds: int) -> list:
+    """예열된 공유 서비스 재사용"""
+    service = RetrievalService()
+    service.warmup()
+
+    latencies = []
+    for _ in range(rounds):
+        for query in queries:
+            started = time.perf_counter()
+            service.similarity_search_with_score(query, k=5)
+            latencies.append(time.perf_counter() - started)
+
+    stats = service.embedding_cache.stats()
+    print(f"  임베딩 캐시: hit {stats['hits']} / miss {stats['misses']} "
+          f"(적중률 {stats['hit_rate']:.0%})")
+    return latencies
+
+
+def print_summary(label: str, latencies: list):
+    """지연시간 요약 출력"""
+    ordered = sorted(latencies)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(f"  {label:<6} 평균 {statistics.mean(latencies) * 1000:8.1f}ms | "
+          f"p50 {statistics.median(latencies) * 1000:8.1f}ms | "
+          f"p95 {p95 * 1000:8.1f}ms | n={len(latencies)}")
+
+
+def main():
+    """메인 함수"""
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+
+    print("=" * 60)
+    print("  검색 지연시간 벤치마크 (cold vs warm)")
+    print(f"  - 벡터 스토어: {os.getenv('VECTORSTORE_PATH', 'data/vectorstore')}")
+    print(f"  - 쿼리 수: {len(TEST_QUERIES)} x {rounds}회")
+    print("=" * 60)
+
+    if not os.path.exists(os.getenv("VECTORSTORE_PATH", "data/vectorstore")):
+        print("❌ 벡터 스토어를 찾을 수 없습니다. 먼저 구축하세요:")
+        print("   python scripts/build_vectorstore.py")
+        sys.exit(1)
+
+    try:
+        cold = measure_cold(TEST_QUERIES, rounds)
+        warm = measure_warm(TEST_QUERIES, rounds)
+    except Exception as e:
+        print(f"❌ 벤치마크 실패: {e}")
+        print("\n💡 Ollama 서버가 실행 중인지 확인하세요:")
+        print("   ollama serve")
+        sys.exit(1)
+
+    print()
+    print_summary("cold", cold)
+    print_summary("warm", warm)
+    print(f"\n  → warm 경로가 평균 {statistics.mean(cold) / statistics.mean(warm):.1f}배 빠름")
+
+
+if __name__ == "__main__":
+    main()
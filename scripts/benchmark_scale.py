@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""규모별 구축/검색/메모리 벤치마크
+
+합성 FAQ 코퍼스(generate_faq_corpus.py)로 문서 수를 늘려가며
+색인 구축 시간, 쿼리 지연시간(p50/p95), 프로세스 메모리(RSS)를 측정하여 JSON으로 저장합니다.
+Ollama 없이 결정적 해싱 n-gram 임베딩을 사용하므로 CI / 노트북에서도 실행할 수 있습니다.
+
+측정 항목 (규모마다 별도 프로세스에서 실행 - RSS가 이전 규모의 영향을 받지 않도록):
+    - 구축: 문서 렌더링, 임베딩, NumPy 행렬, 단일 파일 인덱스 저장 / mmap 열기, IVF, int8 양자화, 어휘 색인, 메타데이터 색인
+    - 실제 구축 경로 (--chroma): build_vectorstore.py의 Chroma 구축(stream: JSONL 스트리밍, full: 전체 구축)
+      + 단일 파일 인덱스 페이지 내보내기 + 어휘 색인 / 문서 저장소 기록 - 해싱 임베딩 주입, 임베딩 캐시는 임시 디렉토리
+    - 검색: numpy(exact) / mmap / ivf / int8 / chroma 벡터 검색, 어휘 검색, 카테고리 필터 검색(티켓 카테고리 조회 경로)
+    - 메모리: 단계별 RSS, 최대 RSS
+
+사용법:
+    python scripts/benchmark_scale.py                               # 1천 / 1만 / 10만 건
+    python scripts/benchmark_scale.py --sizes 10000 100000 1000000 --output scale.json
+    python scripts/benchmark_scale.py --sizes 1000 10000 --chroma full     # 전체 구축 경로로 Chroma 구축
+    python scripts/benchmark_scale.py --chroma off                          # Chroma 구축 생략 (인덱스만 측정)
+"""
+
+import sys
+import os
+import json
+import time
+import tempfile
+import argparse
+import subprocess
+import contextlib
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from scripts.generate_faq_corpus import load_seed_faqs, generate_faq_records, write_jsonl
+from scripts.build_vectorstore import (
+    create_documents_from_faq,
+    build_vectorstore,
+    stream_build_vectorstore,
+    export_single_file_index,
+    export_record_indexes,
+)
+from src.services.hashed_embeddings import HashedNgramEmbeddings
+from src.services.vector_index import ChromaIndex, NumpyIndex
+from src.services.index_file import MmapIndex, write_index_file
+from src.services.ivf_index import IVFIndex
+from src.services.quantized_index import QuantizedIndex
+from src.services.lexical_index import LexicalIndex
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+CHROMA_MODES = ("stream", "full", "off")
+
+
+def current_rss_mb() -> float:
+    """현재 RSS (MB) - /proc가 없으면 최대 RSS"""
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return peak_rss_mb()
+
+
+def peak_rss_mb() -> float:
+    """최대 RSS (MB)"""
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def latency_summary(latencies: list) -> dict:
+    """지연시간 p50 / p95 (ms)"""
+    values = np.asarray(latencies) * 1000
+    return {"p50": round(float(np.percentile(values, 50)), 3), "p95": round(float(np.percentile(values, 95)), 3)}
+
+
+def build_chroma(mode: str, faq_data: list, documents: list, directory: str, embeddings, timed):
+    """
+    build_vectorstore.py의 실제 구축 경로 실행 (Chroma 구축 → 단일 파일 인덱스 내보내기 → 어휘 색인 / 문서 저장소)
+
+    Args:
+        mode: stream (JSONL 스트리밍 구축) | full (전체 구축)
+        faq_data: FAQ 레코드
+        documents: 렌더링된 문서 (full 모드)
+        directory: 작업 디렉토리 (벡터 스토어 / 임베딩 캐시)
+        embeddings: 주입할 임베딩
+        timed: 단계 측정 함수
+
+    Returns:
+        Chroma 벡터 스토어
+    """
+    persist_directory = os.path.join(directory, "vectorstore")
+    # 해싱 임베딩이 실제 모델 이름으로 디스크 임베딩 캐시에 섞이지 않도록 캐시 / 모델 이름 분리 (측정 후 복원)
+    overrides = {
+        "EMBEDDING_CACHE_PATH": os.path.join(directory, "embedding_cache.sqlite"),
+        "OLLAMA_EMBEDDING_MODEL": f"hashed-ngram-{embeddings.dim}",
+    }
+    previous = {name: os.environ.get(name) for name in overrides}
+    os.environ.update(overrides)
+
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            if mode == "stream":
+                faq_file = os.path.join(directory, "faq.jsonl")
+                timed("chroma_jsonl", lambda: write_jsonl(faq_data, faq_file))
+                vectorstore = timed("chroma_build", lambda: stream_build_vectorstore(
+                    faq_file, persist_directory, batch_size=256, max_workers=2, resume=False, embeddings=embeddings
+                ))
+            else:
+                vectorstore = timed("chroma_build", lambda: build_vectorstore(
+                    documents, persist_directory, batch_size=256, max_workers=2, embeddings=embeddings
+                ))
+            timed("chroma_export", lambda: export_single_file_index(vectorstore, persist_directory))
+            timed("record_indexes", lambda: export_record_indexes(iter(faq_data), persist_directory, solutions=False))
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+    return vectorstore
+
+
+def run_size(size: int, dim: int, queries: int, seed: int, seed_file: str, chroma: str = "stream") -> dict:
+    """
+    한 규모에 대한 구축/검색/메모리 측정
+
+    Args:
+        size: 문서 수
+        dim: 해싱 임베딩 차원
+        queries: 측정할 쿼리 수
+        seed: 코퍼스 생성 시드
+        seed_file: 분포를 가져올 샘플 FAQ
+        chroma: 실제 Chroma 구축 경로 (stream | full | off)
+
+    Returns:
+        build_seconds / latency_ms / rss_mb / sizes_bytes 보고서
+    """
+    build, latency, rss = {}, {}, {"start": round(current_rss_mb(), 1)}
+
+    def timed(name, fn):
+        started = time.perf_counter()
+        result = fn()
+        build[name] = round(time.perf_counter() - started, 3)
+        rss[name] = round(current_rss_mb(), 1)
+        return result
+
+    faq_data = timed("generate", lambda: list(generate_faq_records(load_seed_faqs(seed_file), size, seed=seed)))
+    with contextlib.redirect_stdout(sys.stderr):
+        documents = timed("render", lambda: create_documents_from_faq(faq_data))
+
+    embeddings = HashedNgramEmbeddings(dim=dim)
+
+    def embed_all():
+        # 파이썬 리스트로 모으지 않고 미리 할당한 행렬에 청크 단위로 기록
+        matrix = np.empty((len(documents), dim), dtype=np.float32)
+        for start in range(0, len(documents), 1000):
+            chunk = documents[start:start + 1000]
+            matrix[start:start + len(chunk)] = embeddings.embed_documents([doc.page_content for doc in chunk])
+        return matrix
+
+    vectors = timed("embed", embed_all)
+    numpy_index = timed("numpy_index", lambda: NumpyIndex(documents, vectors))
+    del vectors
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index_path = os.path.join(tmp, "faq_index.bin")
+        timed("write_index_file", lambda: write_index_file(index_path, documents, numpy_index.matrix))
+        mmap_index = timed("mmap_open", lambda: MmapIndex.open(index_path))
+        ivf_index = timed("ivf_build", lambda: IVFIndex.build(numpy_index))
+        int8_index = timed("int8_build", lambda: QuantizedIndex.build(numpy_index, mode="int8"))
+        lexical_index = timed("lexical_build", lambda: LexicalIndex.from_faq(faq_data))
+        timed("metadata_index", lambda: numpy_index.metadata_index)
+        chroma_index = None
+        if chroma != "off":
+            chroma_index = ChromaIndex(build_chroma(chroma, faq_data, documents, tmp, embeddings, timed))
+
+        rng = np.random.default_rng(seed)
+        sample = rng.choice(size, size=min(queries, size), replace=False)
+        query_texts = [faq_data[int(row)]["content"]["symptom"] for row in sample]
+        query_vectors = embeddings.embed_documents(query_texts)
+        categories = [faq_data[int(row)]["category"] for row in sample]
+
+        def measure(name, fn):
+            latencies = []
+            for i in range(len(query_texts)):
+                started = time.perf_counter()
+                fn(i)
+                latencies.append(time.perf_counter() - started)
+            latency[name] = latency_summary(latencies)
+
+        measure("numpy", lambda i: numpy_index.search_ids_by_vector(query_vectors[i], k=5))
+        measure("mmap", lambda i: mmap_index.search_ids_by_vector(query_vectors[i], k=5))
+        measure("ivf", lambda i: ivf_index.search_ids_by_vector(query_vectors[i], k=5))
+        measure("int8", lambda i: int8_index.search_ids_by_vector(query_vectors[i], k=5))
+        if chroma_index is not None:
+            measure("chroma", lambda i: chroma_index.search_ids_by_vector(query_vectors[i], k=5))
+        measure("lexical", lambda i: lexical_index.search(query_texts[i], k=5))
+        measure("category_filter", lambda i: numpy_index.search_ids_by_vector(
+            query_vectors[i], k=5, filter={"category": categories[i]}
+        ))
+
+        started = time.perf_counter()
+        numpy_index.search_ids_by_vectors(query_vectors, k=5)
+        latency["numpy_batch_per_query"] = round((time.perf_counter() - started) * 1000 / len(query_vectors), 3)
+
+        index_size = os.path.getsize(index_path)
+        mmap_index.close()
+
+    rss["peak"] = round(peak_rss_mb(), 1)
+    return {
+        "documents": size,
+        "dim": dim,
+        "queries": len(query_texts),
+        "chroma": chroma,
+        "build_seconds": build,
+        "latency_ms": latency,
+        "rss_mb": rss,
+        "sizes_bytes": {"index_file": index_size, "float32_matrix": size * dim * 4, "int8_codes": size * (dim + 4)},
+    }
+
+
+def print_report(runs: list):
+    """규모별 요약 표 출력"""
+    print(f"\n  {'docs':>9} {'embed(s)':>9} {'ivf(s)':>8} {'lex(s)':>8} {'chroma(s)':>9} | {'numpy p95':>10} "
+          f"{'ivf p95':>9} {'int8 p95':>9} {'lex p95':>9} | {'RSS peak(MB)':>12}")
+    for run in runs:
+        build, latency = run["build_seconds"], run["latency_ms"]
+        chroma = f"{build['chroma_build']:>9.1f}" if "chroma_build" in build else f"{'-':>9}"
+        print(f"  {run['documents']:>9,} {build['embed']:>9.1f} {build['ivf_build']:>8.1f} {build['lexical_build']:>8.1f} "
+              f"{chroma} | {latency['numpy']['p95']:>10.2f} {latency['ivf']['p95']:>9.2f} {latency['int8']['p95']:>9.2f} "
+              f"{latency['lexical']['p95']:>9.2f} | {run['rss_mb']['peak']:>12.1f}")
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="규모별 구축/검색/메모리 벤치마크 (합성 FAQ)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="측정할 문서 수들")
+    parser.add_argument("--dim", type=int, default=256, help="해싱 임베딩 차원")
+    parser.add_argument("--queries", type=int, default=200, help="규모별 측정 쿼리 수")
+    parser.add_argument("--seed", type=int, default=42, help="코퍼스 생성 시드")
+    parser.add_argument("--seed-file", default="data/faq_sample.json", help="분포를 가져올 샘플 FAQ 파일")
+    parser.add_argument("--chroma", default="stream", choices=CHROMA_MODES,
+                        help="실제 Chroma 구축 경로 측정 (stream: JSONL 스트리밍, full: 전체 구축, off: 생략)")
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    parser.add_argument("--single", type=int, default=None, help=argparse.SUPPRESS)  # 내부용: 한 규모만 측정 후 JSON 출력
+    args = parser.parse_args()
+
+    if args.single is not None:
+        print(json.dumps(run_size(args.single, args.dim, args.queries, args.seed, args.seed_file, args.chroma),
+                         ensure_ascii=False))
+        return
+
+    print("=" * 60)
+    print("  규모별 구축/검색/메모리 벤치마크")
+    print(f"  - 문서 수: {', '.join(f'{size:,}' for size in args.sizes)}")
+    print(f"  - 임베딩: 해싱 n-gram {args.dim}차원 / 쿼리 {args.queries}개")
+    print(f"  - Chroma 구축 경로: {args.chroma}")
+    print("=" * 60)
+
+    runs = []
+    for size in args.sizes:
+        print(f"\n⏱️  {size:,}건 측정 중...")
+        # 규모마다 새 프로세스 - 최대 RSS가 이전 규모의 영향을 받지 않도록
+        completed = subprocess.run(
+            [sys.executable, __file__, "--single", str(size), "--dim", str(args.dim),
+             "--queries", str(args.queries), "--seed", str(args.seed), "--seed-file", args.seed_file,
+             "--chroma", args.chroma],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, cwd=str(project_root)
+        )
+        if completed.returncode != 0:
+            print(f"❌ {size:,}건 측정 실패 (exit {completed.returncode}) - 메모리 부족 여부를 확인하세요")
+            continue
+        run = json.loads(completed.stdout.strip().splitlines()[-1])
+        runs.append(run)
+        print(f"✅ 완료 - 임베딩 {run['build_seconds']['embed']:.1f}초, 최대 RSS {run['rss_mb']['peak']:.0f}MB")
+
+    print_report(runs)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"runs": runs}, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
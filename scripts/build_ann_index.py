@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""ANN(IVF) 인덱스 구축 스크립트
+
+벡터 인덱스의 임베딩으로 IVF 클러스터를 학습하여 저장하고,
+exact(brute-force) 검색 대비 recall@k / 지연시간 보고서를 출력합니다.
+임베딩은 단일 파일 인덱스(faq_index.bin)가 있으면 그 파일에서, 없으면 Chroma에서 읽습니다.
+(재임베딩 없음 - Ollama 서버 불필요)
+
+사용법:
+    python scripts/build_ann_index.py                       # 구축 + 보고서
+    python scripts/build_ann_index.py --nlist 256 --nprobe 16
+    python scripts/build_ann_index.py --report-only         # 저장된 인덱스 평가만
+"""
+
+import sys
+import os
+import json
+import time
+import argparse
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+from langchain_chroma import Chroma
+from dotenv import load_dotenv
+
+from src.services.vector_index import NumpyIndex
+from src.services.index_file import MmapIndex, INDEX_FILE
+from src.services.ivf_index import IVFIndex, IVF_FILE, default_nlist, evaluate_recall
+
+# 환경 변수 로드
+load_dotenv()
+
+
+def load_base_index(persist_directory: str) -> NumpyIndex:
+    """임베딩/문서를 가진 base 인덱스 로드 (단일 파일 인덱스 우선)"""
+    index_file = os.getenv("VECTORSTORE_INDEX_FILE") or os.path.join(persist_directory, INDEX_FILE)
+    if os.path.exists(index_file):
+        print(f"📂 단일 파일 인덱스 로드: {index_file}")
+        return MmapIndex.open(index_file)
+
+    print(f"📂 Chroma 컬렉션 로드: {persist_directory}")
+    vectorstore = Chroma(persist_directory=persist_directory, collection_name="faq_collection")
+    return NumpyIndex.from_chroma(vectorstore)
+
+
+def sample_queries(base: NumpyIndex, count: int, noise: float, seed: int = 0) -> np.ndarray:
+    """평가용 쿼리 벡터 (문서 임베딩에 가우시안 잡음 추가 - 실제 질의와 문서 사이의 차이 흉내)"""
+    rng = np.random.default_rng(seed)
+    rows = rng.choice(base.count(), size=min(count, base.count()), replace=False)
+    queries = np.asarray(base.matrix[rows], dtype=np.float32)
+    queries = queries + rng.normal(0.0, noise, size=queries.shape).astype(np.float32)
+    return queries / np.linalg.norm(queries, axis=1, keepdims=True)
+
+
+def print_report(report: list, k: int):
+    """recall@k / 지연시간 표 출력"""
+    print(f"\n📊 recall@{k} vs exact 검색")
+    print(f"   {'nprobe':>8} | {'recall':>7} | {'p50':>9} | {'p95':>9} | {'탐색 비율':>8}")
+    print("   " + "-" * 54)
+    for row in report:
+        label = "exact" if row["nprobe"] == 0 else str(row["nprobe"])
+        print(f"   {label:>8} | {row['recall']:7.3f} | {row['latency_p50_ms']:7.2f}ms | "
+              f"{row['latency_p95_ms']:7.2f}ms | {row['scanned_ratio']:8.1%}")
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="IVF 근사 검색 인덱스 구축")
+    parser.add_argument("--persist-directory", default=os.getenv("VECTORSTORE_PATH", "data/vectorstore"),
+                        help="벡터 스토어 경로")
+    parser.add_argument("--output", default=None, help="IVF 인덱스 저장 경로 (기본: IVF_INDEX_FILE 또는 <벡터 스토어>/ivf_index.npz)")
+    parser.add_argument("--nlist", type=int, default=int(os.getenv("IVF_NLIST", "0")),
+                        help="클러스터 수 (0이면 4·√문서 수)")
+    parser.add_argument("--nprobe", type=int, default=int(os.getenv("IVF_NPROBE", "8")),
+                        help="검색 시 탐색할 클러스터 수 (보고서 기준값)")
+    parser.add_argument("--iterations", type=int, default=20, help="k-means 최대 반복 횟수")
+    parser.add_argument("--sample-size", type=int, default=0, help="k-means 학습 표본 수 (0이면 nlist x 64)")
+    parser.add_argument("--k", type=int, default=5, help="recall@k의 k")
+    parser.add_argument("--queries", type=int, default=200, help="평가 쿼리 수")
+    parser.add_argument("--noise", type=float, default=0.02, help="평가 쿼리에 더할 잡음 표준편차")
+    parser.add_argument("--report-only", action="store_true", help="구축하지 않고 저장된 인덱스만 평가")
+    parser.add_argument("--report-json", default=None, help="보고서를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    output = args.output or os.getenv("IVF_INDEX_FILE") or os.path.join(args.persist_directory, IVF_FILE)
+
+    print("=" * 60)
+    print("  IVF 근사 검색 인덱스 구축")
+    print("=" * 60)
+
+    base = load_base_index(args.persist_directory)
+    if base.count() == 0:
+        print("❌ 색인된 문서가 없습니다. 먼저 scripts/build_vectorstore.py를 실행하세요.")
+        sys.exit(1)
+    print(f"   - 문서 수: {base.count()}개, 차원: {base.matrix.shape[1]}, 거리: {base.metric}")
+
+    if args.report_only:
+        ivf = IVFIndex.load(output, base, nprobe=args.nprobe)
+        print(f"\n📂 IVF 인덱스 로드: {output} (nlist={ivf.nlist})")
+    else:
+        nlist = args.nlist or default_nlist(base.count())
+        print(f"\n🔧 k-means 학습 중... (nlist={nlist}, 반복 {args.iterations}회)")
+        started = time.perf_counter()
+        ivf = IVFIndex.build(
+            base,
+            nlist=nlist,
+            nprobe=args.nprobe,
+            iterations=args.iterations,
+            sample_size=args.sample_size or None
+        )
+        elapsed = time.perf_counter() - started
+
+        sizes = np.diff(ivf.list_offsets)
+        info = ivf.save(output)
+        print(f"✅ IVF 인덱스 구축 완료 ({elapsed:.2f}s)")
+        print(f"   - 클러스터 크기: 최소 {sizes.min()} / 평균 {sizes.mean():.1f} / 최대 {sizes.max()}")
+        print(f"   - 저장 경로: {output} ({info['size_bytes'] / 1024:.1f}KB)")
+
+    queries = sample_queries(base, args.queries, args.noise)
+    nprobes = sorted({n for n in (1, 2, 4, 8, 16, 32, args.nprobe) if n <= ivf.nlist})
+    report = evaluate_recall(ivf, queries, k=args.k, nprobes=nprobes)
+    print_report(report, args.k)
+
+    if args.report_json:
+        with open(args.report_json, "w", encoding="utf-8") as f:
+            json.dump({"nlist": ivf.nlist, "count": ivf.count(), "k": args.k, "results": report}, f, indent=2)
+        print(f"\n💾 보고서 저장: {args.report_json}")
+
+    print("\n사용하려면 .env에 다음을 설정하세요:")
+    print("  VECTORSTORE_BACKEND=ivf")
+    print(f"  IVF_NPROBE={args.nprobe}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""양자화 인덱스 구축 스크립트
+
+벡터 인덱스의 float32 임베딩을 int8(벡터별 스케일) / float16으로 압축하여 저장하고,
+문서당 메모리와 float32 대비 recall@k 차이를 보고합니다.
+(재임베딩 없음 - Ollama 서버 불필요)
+
+사용법:
+    python scripts/build_quantized_index.py                  # int8 + float16 모두 구축
+    python scripts/build_quantized_index.py --mode int8 --rescore 32
+"""
+
+import sys
+import os
+import json
+import argparse
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from dotenv import load_dotenv
+
+from scripts.build_ann_index import load_base_index, sample_queries
+from src.services.quantized_index import (
+    QuantizedIndex,
+    QUANTIZATION_MODES,
+    quantized_file_name,
+    compare_quantization,
+)
+
+# 환경 변수 로드
+load_dotenv()
+
+
+def print_report(report: list, k: int, rescore: int):
+    """메모리 / recall@k 표 출력"""
+    baseline = report[0]
+    print(f"\n📊 float32 대비 비교 (recall@{k}, 재점수 후보 {rescore}개)")
+    print(f"   {'방식':>8} | {'문서당':>9} | {'상주':>9} | {'recall':>7} | {'Δrecall':>8} | {'재점수 없음':>10} | {'p50':>8}")
+    print("   " + "-" * 80)
+    for row in report:
+        delta = row["recall"] - baseline["recall"]
+        print(f"   {row['mode']:>8} | {row['bytes_per_doc']:7.0f}B | {row['resident_bytes_per_doc']:7.0f}B | {row['recall']:7.3f} | "
+              f"{delta:+8.3f} | {row['recall_no_rescore']:10.3f} | {row['latency_p50_ms']:6.2f}ms")
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="양자화(int8 / float16) 인덱스 구축")
+    parser.add_argument("--persist-directory", default=os.getenv("VECTORSTORE_PATH", "data/vectorstore"),
+                        help="벡터 스토어 경로")
+    parser.add_argument("--mode", choices=QUANTIZATION_MODES, action="append",
+                        help="구축할 양자화 방식 (여러 번 지정 가능, 기본: 전체)")
+    parser.add_argument("--rescore", type=int, default=int(os.getenv("QUANTIZED_RESCORE", "20")),
+                        help="원본 float32로 재점수할 후보 수")
+    parser.add_argument("--k", type=int, default=5, help="recall@k의 k")
+    parser.add_argument("--queries", type=int, default=200, help="평가 쿼리 수")
+    parser.add_argument("--noise", type=float, default=0.02, help="평가 쿼리에 더할 잡음 표준편차")
+    parser.add_argument("--report-json", default=None, help="보고서를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    modes = args.mode or list(QUANTIZATION_MODES)
+
+    print("=" * 60)
+    print("  양자화 인덱스 구축")
+    print("=" * 60)
+
+    base = load_base_index(args.persist_directory)
+    if base.count() == 0:
+        print("❌ 색인된 문서가 없습니다. 먼저 scripts/build_vectorstore.py를 실행하세요.")
+        sys.exit(1)
+    print(f"   - 문서 수: {base.count()}개, 차원: {base.matrix.shape[1]}")
+
+    for mode in modes:
+        path = os.path.join(args.persist_directory, quantized_file_name(mode))
+        info = QuantizedIndex.build(base, mode=mode, rescore=args.rescore).save(path)
+        print(f"✅ {mode} 저장 완료: {path} ({info['size_bytes'] / 1024:.1f}KB)")
+
+    queries = sample_queries(base, args.queries, args.noise)
+    report = compare_quantization(base, queries, k=args.k, modes=modes, rescore=args.rescore)
+    print_report(report, args.k, args.rescore)
+
+    if args.report_json:
+        with open(args.report_json, "w", encoding="utf-8") as f:
+            json.dump({"count": base.count(), "k": args.k, "rescore": args.rescore, "results": report}, f, indent=2)
+        print(f"\n💾 보고서 저장: {args.report_json}")
+
+    print("\n사용하려면 .env에 다음을 설정하세요:")
+    print("  VECTORSTORE_BACKEND=mmap")
+    print(f"  VECTORSTORE_QUANTIZATION={modes[0]}")
+    print(f"  QUANTIZED_RESCORE={args.rescore}")
+
+
+if __name__ == "__main__":
+    main()
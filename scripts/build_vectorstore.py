@@ -3,25 +3,77 @@
 
 FAQ JSON 파일을 읽어서 Chroma 벡터 스토어를 구축합니다.
 문서 전체 청킹 전략을 사용하여 해결 방법이 잘리지 않도록 합니다.
+JSONL 파일(한 줄에 FAQ 하나)은 스트리밍으로 구축하며, 중단되면 마지막 체크포인트부터 재개합니다.
+
+사용법:
+    python scripts/build_vectorstore.py                # 전체 재구축
+    python scripts/build_vectorstore.py --incremental  # 변경된 FAQ만 반영
+    python scripts/build_vectorstore.py --faq-file data/synthetic/faq_1000000.jsonl  # 스트리밍 구축
+    python scripts/build_vectorstore.py --publish      # 새 버전 디렉토리에 구축 후 게시 (실행 중인 앱이 무중단 교체)
+    python scripts/build_vectorstore.py --tenant messenger --categories 메신저 메일  # 테넌트 샤드 구축
+    python scripts/build_vectorstore.py --tickets --incremental  # 답변 완료 티켓 컬렉션 구축 (신규 답변만 반영)
 """
 
 import json
 import sys
 import os
+import argparse
+import shutil
 from pathlib import Path
+from typing import Iterable, List, Optional
 
 # 프로젝트 루트를 Python 경로에 추가
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+import numpy as np
 from langchain_ollama import OllamaEmbeddings
 from langchain_chroma import Chroma
 from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
 from dotenv import load_dotenv
 
+from src.services.lexical_index import LexicalIndex, LexicalIndexBuilder
+from src.services.vector_index import NumpyIndex
+from src.services.index_file import INDEX_FILE, IndexFileWriter, MmapIndex
+from src.services.ivf_index import IVFIndex, IVF_FILE
+from src.services.quantized_index import QuantizedIndex, QUANTIZATION_MODES, quantized_file_name
+from src.services.document_store import DOC_STORE_FILE, DocumentStoreWriter
+from src.services.solution_index import SOLUTION_INDEX_FILE, render_solution, create_solution_documents
+from src.services.embedding_cache import DiskEmbeddingCache
+from src.services.embedding_pipeline import EmbeddingPipeline
+from src.services.faq_stream import (
+    CHECKPOINT_FILE,
+    CommitWatermark,
+    iter_faq_jsonl,
+    iter_faq_records,
+    source_fingerprint,
+    load_checkpoint,
+    save_checkpoint,
+    clear_checkpoint,
+)
+from src.services.index_reload import (
+    VERSIONS_DIR,
+    read_index_pointer,
+    new_version_directory,
+    publish_index_version,
+    prune_index_versions,
+)
+from src.services.tenant_shards import tenant_directory
+from src.services.ticket_index import TICKET_INDEX_DIR, load_answered_tickets
+from src.services.index_manifest import (
+    content_hash,
+    text_hash,
+    new_manifest,
+    load_manifest,
+    save_manifest,
+)
+
 # 환경 변수 로드
 load_dotenv()
 
+EXPORT_PAGE_SIZE = 4096  # 단일 파일 인덱스 내보내기 시 Chroma에서 한 번에 읽는 문서 수
+
 
 def load_faq_data(file_path: str) -> list:
     """FAQ JSON 파일 로드"""
@@ -34,19 +86,10 @@ def load_faq_data(file_path: str) -> list:
     return data
 
 
-def create_documents_from_faq(faq_data: list) -> list:
-    """FAQ 데이터를 Document 객체로 변환 (전체 문서 청킹)
-
-    청킹 전략: 각 FAQ 문서를 통째로 하나의 청크로 처리
-    - 장점: 해결 방법이 절대 잘리지 않음
-    - 적합성: FAQ 크기가 1000-2000자로 적당함
-    """
-    print("\n📄 Document 객체 생성 중...")
-    documents = []
-
-    for faq in faq_data:
-        # 전체 FAQ 내용을 하나의 문자열로 구성
-        content = f"""제목: {faq['title']}
+def render_document(faq: dict) -> Document:
+    """FAQ 하나를 Document로 변환 (전체 문서 청킹)"""
+    # 전체 FAQ 내용을 하나의 문자열로 구성
+    content = f"""제목: {faq['title']}
 카테고리: {faq['category']}
 
 증상:
@@ -57,27 +100,34 @@ def create_documents_from_faq(faq_data: list) -> list:
 
 해결 방법:
 """
-        # 모든 해결 방법을 완전하게 포함
-        for solution in faq['content']['solutions']:
-            content += f"\n[방법 {solution['method']}] {solution['title']}\n"
-            for i, step in enumerate(solution['steps'], 1):
-                content += f"  {i}. {step}\n"
-            content += f"  ▶ 기대 결과: {solution['expected_result']}\n"
-
-        # Document 생성 (메타데이터 포함)
-        doc = Document(
-            page_content=content,
-            metadata={
-                "id": faq["id"],
-                "category": faq["category"],
-                "title": faq["title"],
-                "tags": ", ".join(faq["tags"]) if isinstance(faq["tags"], list) else faq["tags"],
-                "source": faq["source"],
-                "helpful_count": faq["helpful_count"],
-                "created_at": faq["created_at"]
-            }
-        )
-        documents.append(doc)
+    # 모든 해결 방법을 완전하게 포함
+    for solution in faq['content']['solutions']:
+        content += "\n" + render_solution(solution)
+
+    # Document 생성 (메타데이터 포함)
+    return Document(
+        page_content=content,
+        metadata={
+            "id": faq["id"],
+            "category": faq["category"],
+            "title": faq["title"],
+            "tags": ", ".join(faq["tags"]) if isinstance(faq["tags"], list) else faq["tags"],
+            "source": faq["source"],
+            "helpful_count": faq["helpful_count"],
+            "created_at": faq["created_at"]
+        }
+    )
+
+
+def create_documents_from_faq(faq_data: list) -> list:
+    """FAQ 데이터를 Document 객체로 변환 (전체 문서 청킹)
+
+    청킹 전략: 각 FAQ 문서를 통째로 하나의 청크로 처리
+    - 장점: 해결 방법이 절대 잘리지 않음
+    - 적합성: FAQ 크기가 1000-2000자로 적당함
+    """
+    print("\n📄 Document 객체 생성 중...")
+    documents = [render_document(faq) for faq in faq_data]
 
     print(f"✅ {len(documents)}개 Document 생성 완료")
     print(f"   - 평균 길이: {sum(len(d.page_content) for d in documents) // len(documents)}자")
@@ -87,46 +137,426 @@ def create_documents_from_faq(faq_data: list) -> list:
     return documents
 
 
-def build_vectorstore(documents: list, persist_directory: str = "data/vectorstore") -> Chroma:
-    """Chroma 벡터 스토어 구축"""
-
-    # Ollama 임베딩 모델 로드
-    print("\n🔄 Ollama 임베딩 모델 로드 중...")
+def make_cached_embed_fn(
+    embeddings: OllamaEmbeddings,
+    embedding_model: str,
+    disk_cache: DiskEmbeddingCache
+):
+    """디스크 캐시를 확인하여 캐시에 없는 문서만 임베딩하는 배치 함수 생성"""
+
+    def embed_batch(documents: list) -> list:
+        keys = [text_hash(doc.page_content) for doc in documents]
+        cached = disk_cache.get_many(embedding_model, keys)
+
+        missing = [i for i, key in enumerate(keys) if key not in cached]
+        if missing:
+            vectors = embeddings.embed_documents([documents[i].page_content for i in missing])
+            new_vectors = {keys[i]: vector for i, vector in zip(missing, vectors)}
+            disk_cache.put_many(embedding_model, new_vectors)
+            cached.update(new_vectors)
+
+        return [cached[key] for key in keys]
+
+    return embed_batch
+
+
+def build_vectorstore(
+    documents: list,
+    persist_directory: str = "data/vectorstore",
+    incremental: bool = False,
+    batch_size: int = 32,
+    max_workers: int = 4,
+    max_retries: int = 3,
+    embeddings: Embeddings = None
+) -> Chroma:
+    """Chroma 벡터 스토어 구축
+
+    - 전체 모드: 컬렉션을 비우고 모든 FAQ를 다시 색인
+    - 증분 모드: 매니페스트의 콘텐츠 해시와 비교하여 신규/변경 FAQ만 upsert, 삭제된 FAQ는 제거
+    - 두 모드 모두 디스크 임베딩 캐시에 같은 내용의 임베딩이 있으면 재임베딩하지 않음
+    - 임베딩은 배치 단위로 워커 풀에서 병렬 처리하고, 완료된 배치부터 컬렉션에 기록
+    - embeddings를 주면 Ollama 대신 사용 (벤치마크 / 테스트용)
+    """
     embedding_model = os.getenv("OLLAMA_EMBEDDING_MODEL", "bge-m3-korean")
-    print(f"   - 모델: {embedding_model}")
+    if embeddings is None:
+        # Ollama 임베딩 모델 로드
+        print("\n🔄 Ollama 임베딩 모델 로드 중...")
+        print(f"   - 모델: {embedding_model}")
+
+        try:
+            embeddings = OllamaEmbeddings(model=embedding_model)
+            print("✅ BGE-M3-Korean 임베딩 모델 로드 완료")
+        except Exception as e:
+            print(f"❌ 임베딩 모델 로드 실패: {e}")
+            print("\n💡 Ollama 서버가 실행 중인지 확인하세요:")
+            print("   ollama serve")
+            print(f"\n💡 모델이 다운로드되었는지 확인하세요:")
+            print(f"   ollama pull {embedding_model}")
+            sys.exit(1)
+
+    # Chroma 벡터 스토어 구축
+    print(f"\n🗄️  Chroma 벡터 스토어 구축 중... ({'증분' if incremental else '전체'} 모드)")
+    print(f"   - 저장 경로: {persist_directory}")
+    print(f"   - 문서 수: {len(documents)}개")
+
+    collection_name = "faq_collection"
+    vectorstore = Chroma(
+        persist_directory=persist_directory,
+        embedding_function=embeddings,
+        collection_name=collection_name
+    )
+
+    manifest = load_manifest(persist_directory) if incremental else None
+    if manifest is not None and manifest.get("streamed"):
+        print("   ⚠️  스트리밍 구축본에는 FAQ별 해시가 없어 전체 재구축합니다")
+        manifest = None
+    elif manifest is not None and manifest.get("embedding_model") != embedding_model:
+        print(f"   ⚠️  임베딩 모델이 변경되어 전체 재구축합니다 ({manifest.get('embedding_model')} → {embedding_model})")
+        manifest = None
+
+    if manifest is None:
+        # 전체 재구축 (이전 빌드의 임의 ID 문서가 남지 않도록 컬렉션 초기화)
+        if incremental:
+            print("   - 매니페스트가 없어 전체 재구축합니다")
+        vectorstore.reset_collection()
+        manifest = new_manifest(collection_name, embedding_model)
+
+    # 변경 감지 (FAQ ID → 콘텐츠 해시)
+    current = {doc.metadata["id"]: (doc, content_hash(doc)) for doc in documents}
+    previous = manifest["documents"]
+
+    changed = [doc for faq_id, (doc, digest) in current.items() if previous.get(faq_id) != digest]
+    removed = [faq_id for faq_id in previous if faq_id not in current]
+
+    print(f"   - 변경 없음: {len(current) - len(changed)}개, 신규/변경: {len(changed)}개, 삭제: {len(removed)}개")
+
+    # 완료된 배치만 매니페스트에 반영 (실패한 문서는 다음 증분 실행에서 재시도)
+    committed = {faq_id: digest for faq_id, digest in previous.items() if faq_id in current}
+
+    def write_batch(batch: list, vectors: list):
+        vectorstore._collection.upsert(
+            ids=[doc.metadata["id"] for doc in batch],
+            embeddings=vectors,
+            documents=[doc.page_content for doc in batch],
+            metadatas=[doc.metadata for doc in batch]
+        )
+        for doc in batch:
+            committed[doc.metadata["id"]] = current[doc.metadata["id"]][1]
 
     try:
-        embeddings = OllamaEmbeddings(model=embedding_model)
-        print("✅ BGE-M3-Korean 임베딩 모델 로드 완료")
+        if changed:
+            print(f"   - 임베딩 진행 중... (배치 {batch_size}개, 워커 {max_workers}개)")
+            pipeline = EmbeddingPipeline(
+                make_cached_embed_fn(embeddings, embedding_model, DiskEmbeddingCache()),
+                batch_size=batch_size,
+                max_workers=max_workers,
+                max_retries=max_retries
+            )
+            stats = pipeline.run(changed, on_batch=write_batch, total=len(changed))
+
+            print(f"   - 처리량: {stats['docs_per_sec']:.1f} docs/s ({stats['documents']}개, {stats['elapsed']:.1f}s)")
+            print(f"   - 배치 지연시간: p50 {stats['batch_latency_p50']:.2f}s | "
+                  f"p95 {stats['batch_latency_p95']:.2f}s | max {stats['batch_latency_max']:.2f}s | "
+                  f"재시도 {stats['retries']}회")
+
+        if removed:
+            vectorstore._collection.delete(ids=removed)
+
+        manifest["documents"] = committed
+        save_manifest(persist_directory, manifest)
     except Exception as e:
-        print(f"❌ 임베딩 모델 로드 실패: {e}")
-        print("\n💡 Ollama 서버가 실행 중인지 확인하세요:")
-        print("   ollama serve")
-        print(f"\n💡 모델이 다운로드되었는지 확인하세요:")
-        print(f"   ollama pull {embedding_model}")
+        print(f"❌ 벡터 스토어 구축 실패: {e}")
         sys.exit(1)
 
-    # Chroma 벡터 스토어 구축
-    print(f"\n🗄️  Chroma 벡터 스토어 구축 중...")
+    if changed and stats["failed_batches"]:
+        print(f"❌ {stats['failed_batches']}개 배치({len(stats['failed_documents'])}개 문서) 임베딩 실패")
+        print("   다시 실행하면 실패한 문서만 재시도합니다:")
+        print("   python scripts/build_vectorstore.py --incremental")
+        sys.exit(1)
+
+    print("✅ 벡터 스토어 구축 완료")
+    return vectorstore
+
+
+def stream_build_vectorstore(
+    faq_file: str,
+    persist_directory: str = "data/vectorstore",
+    batch_size: int = 32,
+    max_workers: int = 4,
+    max_retries: int = 3,
+    resume: bool = True,
+    embeddings: Embeddings = None,
+    categories: Optional[List[str]] = None
+) -> Chroma:
+    """JSONL FAQ 스트리밍 구축 (대용량 코퍼스용)
+
+    파일을 한 줄씩 읽어 파싱 → Document 렌더링 → 임베딩 → 컬렉션 기록까지
+    제너레이터로 이어서 처리하므로 메모리는 처리 중인 배치 수만큼만 사용합니다.
+    - 앞의 레코드가 모두 기록된 위치(바이트 오프셋)를 체크포인트로 저장
+    - 중단 후 다시 실행하면 같은 파일/모델인 경우 체크포인트 다음 레코드부터 재개
+    - 파일이나 임베딩 모델이 바뀌었으면 컬렉션을 비우고 처음부터 구축
+    - categories가 주어지면 해당 카테고리 FAQ만 구축 (카테고리 그룹 샤드)
+    """
+    embedding_model = os.getenv("OLLAMA_EMBEDDING_MODEL", "bge-m3-korean")
+    if embeddings is None:
+        print("\n🔄 Ollama 임베딩 모델 로드 중...")
+        print(f"   - 모델: {embedding_model}")
+        embeddings = OllamaEmbeddings(model=embedding_model)
+
+    print("\n🗄️  Chroma 벡터 스토어 스트리밍 구축 중...")
+    print(f"   - 입력: {faq_file}")
     print(f"   - 저장 경로: {persist_directory}")
-    print(f"   - 문서 수: {len(documents)}개")
-    print(f"   - 임베딩 진행 중... (수 분 소요될 수 있습니다)")
 
-    try:
-        vectorstore = Chroma.from_documents(
-            documents=documents,
-            embedding=embeddings,
-            persist_directory=persist_directory,
-            collection_name="faq_collection"
+    collection_name = "faq_collection"
+    vectorstore = Chroma(
+        persist_directory=persist_directory,
+        embedding_function=embeddings,
+        collection_name=collection_name
+    )
+
+    fingerprint = source_fingerprint(faq_file)
+    fingerprint["categories"] = sorted(categories) if categories else None
+    checkpoint = load_checkpoint(persist_directory) if resume else None
+    if checkpoint is not None and all(checkpoint.get(key) == value for key, value in fingerprint.items()) \
+            and checkpoint.get("embedding_model") == embedding_model:
+        watermark = CommitWatermark(checkpoint["offset"], checkpoint["records"])
+        print(f"   - 체크포인트에서 재개: {watermark.records:,}개 기록됨 (offset {watermark.offset:,})")
+    else:
+        if checkpoint is not None:
+            print("   ⚠️  입력 파일 또는 임베딩 모델이 변경되어 처음부터 구축합니다")
+        vectorstore.reset_collection()
+        clear_checkpoint(persist_directory)
+        watermark = CommitWatermark()
+
+    # 실패한 배치 뒤로 커밋 대기 문서가 계속 쌓이지 않도록 상한을 넘으면 읽기 중단
+    stall_limit = batch_size * max_workers * 8
+
+    def documents():
+        for end_offset, record in iter_faq_jsonl(faq_file, start_offset=watermark.offset):
+            if categories and record["category"] not in categories:
+                continue
+            if watermark.pending > stall_limit:
+                print(f"   ⚠️  기록되지 않은 앞 배치가 있어 읽기를 중단합니다 (대기 {watermark.pending}개)")
+                return
+            doc = render_document(record)
+            watermark.track(doc, end_offset)
+            yield doc
+
+    def write_batch(batch: list, vectors: list):
+        vectorstore._collection.upsert(
+            ids=[doc.metadata["id"] for doc in batch],
+            embeddings=vectors,
+            documents=[doc.page_content for doc in batch],
+            metadatas=[doc.metadata for doc in batch]
         )
-        print("✅ 벡터 스토어 구축 완료")
+        if watermark.commit(batch):
+            save_checkpoint(persist_directory, fingerprint, embedding_model, watermark)
+
+    print(f"   - 임베딩 진행 중... (배치 {batch_size}개, 워커 {max_workers}개)")
+    pipeline = EmbeddingPipeline(
+        make_cached_embed_fn(embeddings, embedding_model, DiskEmbeddingCache()),
+        batch_size=batch_size,
+        max_workers=max_workers,
+        max_retries=max_retries
+    )
+    try:
+        stats = pipeline.run(documents(), on_batch=write_batch)
     except Exception as e:
         print(f"❌ 벡터 스토어 구축 실패: {e}")
+        print("   다시 실행하면 마지막 체크포인트부터 재개합니다")
+        sys.exit(1)
+
+    print(f"   - 처리량: {stats['docs_per_sec']:.1f} docs/s ({stats['documents']}개, {stats['elapsed']:.1f}s)")
+    print(f"   - 배치 지연시간: p50 {stats['batch_latency_p50']:.2f}s | "
+          f"p95 {stats['batch_latency_p95']:.2f}s | max {stats['batch_latency_max']:.2f}s | "
+          f"재시도 {stats['retries']}회")
+
+    if stats["failed_batches"] or watermark.pending:
+        print(f"❌ {stats['failed_batches']}개 배치({len(stats['failed_documents'])}개 문서) 임베딩 실패")
+        print(f"   {watermark.records:,}개까지 기록되었습니다. 다시 실행하면 체크포인트부터 재개합니다:")
+        print(f"   python scripts/build_vectorstore.py --faq-file {faq_file}")
         sys.exit(1)
 
+    # 스트리밍 구축은 FAQ별 콘텐츠 해시를 보관하지 않음 → 다음 --incremental은 전체 재구축
+    manifest = new_manifest(collection_name, embedding_model)
+    manifest["streamed"] = True
+    save_manifest(persist_directory, manifest)
+    clear_checkpoint(persist_directory)
+
+    print(f"✅ 벡터 스토어 구축 완료 ({watermark.records:,}개 문서)")
     return vectorstore
 
 
+def export_single_file_index(vectorstore: Chroma, persist_directory: str = "data/vectorstore") -> str:
+    """단일 파일 인덱스 내보내기 (mmap 백엔드 / 스냅샷용)
+
+    Chroma 컬렉션의 임베딩을 재임베딩 없이 EXPORT_PAGE_SIZE개씩 읽어 하나의 바이너리 파일로 이어 씁니다
+    (컬렉션 전체를 메모리에 올리지 않음).
+    VECTORSTORE_BACKEND=mmap으로 실행하면 이 파일을 바로 mmap으로 엽니다.
+    """
+    print("\n📦 단일 파일 인덱스 내보내기 중...")
+    index_path = os.path.join(persist_directory, INDEX_FILE)
+    collection = vectorstore._collection
+    with IndexFileWriter(index_path, NumpyIndex.chroma_metric(vectorstore)) as writer:
+        for offset in range(0, collection.count(), EXPORT_PAGE_SIZE):
+            page = collection.get(limit=EXPORT_PAGE_SIZE, offset=offset, include=["embeddings", "documents", "metadatas"])
+            writer.add(
+                [
+                    Document(id=doc_id, page_content=content, metadata=metadata or {})
+                    for doc_id, content, metadata in zip(page["ids"], page["documents"], page["metadatas"])
+                ],
+                page["embeddings"]
+            )
+    info = writer.info
+
+    print(f"✅ 인덱스 파일 저장 완료 ({info['count']}개 문서, {info['dim']}차원, "
+          f"{info['size_bytes'] / 1024:.1f}KB)")
+    print(f"   - 저장 경로: {index_path}")
+    return index_path
+
+
+def refresh_derived_indexes(persist_directory: str = "data/vectorstore") -> None:
+    """IVF 클러스터 / 양자화 파일 갱신 (단일 파일 인덱스를 다시 내보낸 뒤 호출)
+
+    두 파일 모두 단일 파일 인덱스의 행 순서에 묶여 있으므로 base 인덱스가 바뀌면 그대로 쓸 수 없습니다.
+    이전 파일(또는 --publish --incremental로 복사된 파일)이 있으면 같은 설정(nlist / 양자화 방식)으로
+    mmap 인덱스에서 다시 구축하고, 다시 구축할 수 없으면 삭제합니다 (검색 서비스는 파일이 없으면 exact 검색).
+    """
+    ivf_path = os.path.join(persist_directory, IVF_FILE)
+    quantized_paths = {
+        mode: os.path.join(persist_directory, quantized_file_name(mode)) for mode in QUANTIZATION_MODES
+    }
+    stale = [path for path in [ivf_path, *quantized_paths.values()] if os.path.exists(path)]
+    if not stale:
+        return
+
+    print("\n🧭 IVF 클러스터 / 양자화 파일 갱신 중...")
+    base = MmapIndex.open(os.path.join(persist_directory, INDEX_FILE))
+    try:
+        if ivf_path in stale:
+            try:
+                with np.load(ivf_path) as data:
+                    nlist = int(data["centroids"].shape[0])
+            except (OSError, KeyError, ValueError):
+                nlist = None
+            rebuild_derived_file(ivf_path, lambda: IVFIndex.build(base, nlist=nlist).save(ivf_path))
+
+        for mode, path in quantized_paths.items():
+            if path in stale:
+                rebuild_derived_file(path, lambda: QuantizedIndex.build(base, mode=mode).save(path))
+    finally:
+        base.close()
+
+
+def rebuild_derived_file(path: str, build) -> None:
+    """파생 파일 하나 다시 구축 (실패하면 오래된 파일 삭제)"""
+    try:
+        build()
+    except ValueError as e:
+        os.remove(path)
+        print(f"⚠️  다시 구축할 수 없어 삭제했습니다: {path} ({e})")
+        return
+    print(f"✅ 갱신 완료: {path}")
+
+
+def export_record_indexes(
+    records: Iterable[dict],
+    persist_directory: str = "data/vectorstore",
+    solutions: bool = True,
+    embeddings: Embeddings = None,
+    batch_size: int = 32,
+    max_workers: int = 4,
+    max_retries: int = 3
+) -> None:
+    """FAQ 레코드를 한 번만 순회하며 어휘 색인 / 문서 저장소 / 해결 방법 하위 문서 색인 기록
+
+    - 어휘 색인(lexical_index.json): 문자 2/3-gram 역색인 (하이브리드 검색에서 벡터 결과와 RRF 결합)
+    - 문서 저장소(doc_store.bin): 검색 결과 본문 지연 조회용 (대화 상태에는 ID/점수만)
+    - 해결 방법 색인(solution_index.bin): [방법 N] 단위 하위 문서 (plan_response 프롬프트 축소용)
+
+    레코드마다 어휘 색인 빌더와 문서 저장소 파일에 바로 추가하고, 해결 방법 하위 문서는 같은 순회에서
+    임베딩 파이프라인으로 흘려 완료된 배치부터 인덱스 파일에 씁니다.
+    records가 JSONL 제너레이터여도 메모리에는 어휘 색인(결과물)과 처리 중인 배치만 남습니다.
+    solutions=False(대용량 스트리밍 구축)이면 해결 방법 색인을 만들지 않고 이전 색인을 삭제합니다
+    (solution_index.bin이 없으면 검색 서비스는 FAQ 전체 해결 방법을 사용).
+    """
+    print("\n🔤 어휘 색인 / 📚 문서 저장소" + (" / 🧩 해결 방법 색인" if solutions else "") + " 구축 중...")
+    lexical = LexicalIndexBuilder()
+    store_path = os.path.join(persist_directory, DOC_STORE_FILE)
+    solution_path = os.path.join(persist_directory, SOLUTION_INDEX_FILE)
+    counts = {"faq": 0}
+
+    def solution_documents():
+        for record in records:
+            lexical.add(record)
+            doc_store.add(render_document(record))
+            counts["faq"] += 1
+            if solutions:
+                yield from create_solution_documents([record])
+
+    with DocumentStoreWriter(store_path) as doc_store:
+        if solutions:
+            solution_info = write_solution_index(
+                solution_documents(), solution_path, embeddings, batch_size, max_workers, max_retries
+            )
+        else:
+            for _ in solution_documents():
+                pass
+
+    lexical_index = lexical.build()
+    lexical_path = os.path.join(persist_directory, LexicalIndex.FILE_NAME)
+    lexical_index.save(lexical_path)
+
+    print(f"✅ 어휘 색인 구축 완료 ({len(lexical_index.postings)}개 n-gram) - {lexical_path}")
+    print(f"✅ 문서 저장소 저장 완료 ({doc_store.info['count']}개 문서, "
+          f"{doc_store.info['size_bytes'] / 1024:.1f}KB) - {store_path}")
+    if not solutions:
+        print("🧩 스트리밍 구축에서는 해결 방법 하위 문서 색인을 생략합니다")
+        if os.path.exists(solution_path):
+            os.remove(solution_path)
+            print(f"   - 이전 색인 삭제: {solution_path}")
+    elif solution_info is not None:
+        print(f"✅ 하위 문서 색인 저장 완료 ({solution_info['count']}개, FAQ {counts['faq']}개, "
+              f"{solution_info['size_bytes'] / 1024:.1f}KB) - {solution_path}")
+
+
+def write_solution_index(
+    documents: Iterable[Document],
+    index_path: str,
+    embeddings: Embeddings = None,
+    batch_size: int = 32,
+    max_workers: int = 4,
+    max_retries: int = 3
+) -> Optional[dict]:
+    """해결 방법 하위 문서 임베딩 → 완료된 배치부터 단일 파일 인덱스에 기록
+
+    디스크 임베딩 캐시를 사용하므로 변경되지 않은 방법은 다시 임베딩하지 않습니다.
+    실패한 배치가 있으면 기록을 중단하고 이전 색인을 그대로 둡니다 (파일 정보 대신 None).
+    """
+    embedding_model = os.getenv("OLLAMA_EMBEDDING_MODEL", "bge-m3-korean")
+    if embeddings is None:
+        embeddings = OllamaEmbeddings(model=embedding_model)
+
+    pipeline = EmbeddingPipeline(
+        make_cached_embed_fn(embeddings, embedding_model, DiskEmbeddingCache()),
+        batch_size=batch_size,
+        max_workers=max_workers,
+        max_retries=max_retries,
+        verbose=False
+    )
+    writer = IndexFileWriter(index_path)
+    try:
+        stats = pipeline.run(documents, on_batch=writer.add)
+    except BaseException:
+        writer.abort()
+        raise
+    if stats["failed_batches"]:
+        writer.abort()
+        print(f"❌ {len(stats['failed_documents'])}개 하위 문서 임베딩 실패 - 하위 문서 색인을 갱신하지 않습니다")
+        return None
+    return writer.close()
+
+
 def test_search(vectorstore: Chroma):
     """벡터 검색 테스트"""
     print("\n🔍 테스트 검색 수행 중...")
@@ -150,8 +580,137 @@ def test_search(vectorstore: Chroma):
             print(f"       내용: {preview}...")
 
 
+def in_categories(categories: Optional[List[str]]):
+    """카테고리 그룹 필터 (categories가 없으면 모든 FAQ)"""
+    return lambda faq: not categories or faq["category"] in categories
+
+
+def build_from_json(args) -> Chroma:
+    """JSON FAQ 파일(또는 답변 완료 티켓) 구축 - 벡터 스토어, 어휘 색인, 단일 파일 인덱스, 문서 저장소, 해결 방법 색인"""
+    if args.tickets:
+        faq_data = load_answered_tickets(args.tickets)
+        print(f"\n🎫 답변 완료 티켓 로드: {len(faq_data)}개 ({args.tickets})")
+        if not faq_data:
+            print("❌ 답변 완료(status: answered) 티켓이 없습니다")
+            sys.exit(1)
+    else:
+        faq_data = load_faq_data(args.faq_file)
+    if args.categories:
+        faq_data = [faq for faq in faq_data if in_categories(args.categories)(faq)]
+        print(f"   - 카테고리 그룹 ({', '.join(args.categories)}): {len(faq_data)}개 FAQ")
+        if not faq_data:
+            print("❌ 해당 카테고리의 FAQ가 없습니다")
+            sys.exit(1)
+
+    # Document 객체 생성
+    documents = create_documents_from_faq(faq_data)
+
+    # 벡터 스토어 구축
+    vectorstore = build_vectorstore(
+        documents,
+        args.persist_directory,
+        incremental=args.incremental,
+        batch_size=args.batch_size,
+        max_workers=args.workers,
+        max_retries=args.max_retries
+    )
+
+    # 단일 파일 인덱스 내보내기 (mmap 백엔드용) + 이 인덱스에 묶인 IVF / 양자화 파일 갱신
+    export_single_file_index(vectorstore, args.persist_directory)
+    refresh_derived_indexes(args.persist_directory)
+
+    # 어휘 색인 (하이브리드 검색용) + 문서 저장소 (본문 지연 조회용) + 해결 방법 하위 문서 색인 - 한 번의 순회
+    export_record_indexes(
+        faq_data,
+        args.persist_directory,
+        batch_size=args.batch_size,
+        max_workers=args.workers,
+        max_retries=args.max_retries
+    )
+
+    return vectorstore
+
+
+def build_streaming(args) -> Chroma:
+    """JSONL 스트리밍 구축 - 벡터 스토어 이후 색인들도 파일을 다시 읽어 스트리밍으로 생성"""
+    if args.incremental:
+        print("⚠️  스트리밍 구축은 --incremental을 지원하지 않습니다 (체크포인트 재개만 지원)")
+
+    vectorstore = stream_build_vectorstore(
+        args.faq_file,
+        args.persist_directory,
+        batch_size=args.batch_size,
+        max_workers=args.workers,
+        max_retries=args.max_retries,
+        resume=not args.no_resume,
+        categories=args.categories
+    )
+
+    export_single_file_index(vectorstore, args.persist_directory)
+    refresh_derived_indexes(args.persist_directory)
+
+    # 해결 방법 색인은 FAQ당 여러 하위 문서를 임베딩하므로 대용량 스트리밍 구축에서는 생략
+    keep = in_categories(args.categories)
+    export_record_indexes(filter(keep, iter_faq_records(args.faq_file)), args.persist_directory, solutions=False)
+    return vectorstore
+
+
+def prepare_version_directory(root: str, incremental: bool, resume: bool) -> tuple:
+    """게시용 새 버전 디렉토리 준비 → (버전, 디렉토리)
+
+    - 중단된 스트리밍 구축(체크포인트가 남은 미게시 버전)이 있으면 그 디렉토리에서 재개
+    - 증분 모드면 현재 게시된 버전을 복사한 뒤 변경분만 반영
+    - 실행 중인 앱은 게시 전까지 기존 버전을 그대로 사용
+    """
+    pointer = read_index_pointer(root)
+    current = pointer["version"] if pointer else None
+
+    versions_dir = os.path.join(root, VERSIONS_DIR)
+    if resume and os.path.isdir(versions_dir):
+        for name in sorted(os.listdir(versions_dir), reverse=True):
+            directory = os.path.join(versions_dir, name)
+            if name != current and os.path.exists(os.path.join(directory, CHECKPOINT_FILE)):
+                print(f"   - 중단된 구축 버전에서 재개: {name}")
+                return name, directory
+
+    version, directory = new_version_directory(root)
+    if incremental and pointer is not None:
+        shutil.copytree(pointer["directory"], directory)
+        print(f"   - 현재 버전({current})을 복사하여 증분 구축")
+    else:
+        os.makedirs(directory, exist_ok=True)
+    return version, directory
+
+
 def main():
     """메인 함수"""
+    parser = argparse.ArgumentParser(description="FAQ 벡터 스토어 구축")
+    parser.add_argument("--faq-file", default="data/faq_sample.json", help="FAQ JSON 파일 경로")
+    parser.add_argument("--persist-directory", default=os.getenv("VECTORSTORE_PATH", "data/vectorstore"),
+                        help="벡터 스토어 저장 경로")
+    parser.add_argument("--incremental", action="store_true",
+                        help="매니페스트 기준으로 신규/변경/삭제된 FAQ만 반영")
+    parser.add_argument("--batch-size", type=int, default=int(os.getenv("EMBED_BATCH_SIZE", "32")),
+                        help="임베딩 배치 크기")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("EMBED_WORKERS", "4")),
+                        help="동시 임베딩 요청 수")
+    parser.add_argument("--max-retries", type=int, default=3, help="배치별 최대 재시도 횟수")
+    parser.add_argument("--stream", action="store_true",
+                        help="JSONL 스트리밍 구축 (.jsonl 파일은 자동 적용)")
+    parser.add_argument("--no-resume", action="store_true",
+                        help="스트리밍 구축 체크포인트를 무시하고 처음부터 구축")
+    parser.add_argument("--publish", action="store_true",
+                        help="새 버전 디렉토리에 구축한 뒤 현재 버전 포인터를 교체 (앱 무중단 반영)")
+    parser.add_argument("--keep-versions", type=int, default=int(os.getenv("INDEX_KEEP_VERSIONS", "2")),
+                        help="--publish 후 남겨 둘 최근 버전 수")
+    parser.add_argument("--tenant", default=None,
+                        help="테넌트 샤드로 구축 (<persist-directory>/tenants/<테넌트>)")
+    parser.add_argument("--categories", nargs="+", default=None,
+                        help="이 카테고리 FAQ만 구축 (카테고리 그룹 샤드)")
+    parser.add_argument("--tickets", nargs="?", const=os.getenv("TICKETS_PATH", "data/tickets"), default=None,
+                        help="FAQ 대신 답변 완료 티켓 디렉토리로 티켓 컬렉션 구축 (<persist-directory>/tickets)")
+    args = parser.parse_args()
+
     print("="*60)
     print("  FAQ 벡터 스토어 구축 스크립트")
     print("  - 전략: 문서 전체 청킹 (해결 방법 완전 보존)")
@@ -160,26 +719,55 @@ def main():
     print("="*60)
 
     # FAQ 데이터 로드
-    faq_file = "data/faq_sample.json"
-    if not os.path.exists(faq_file):
+    faq_file = args.faq_file
+    if args.tickets:
+        if not os.path.isdir(args.tickets):
+            print(f"❌ 티켓 디렉토리를 찾을 수 없습니다: {args.tickets}")
+            sys.exit(1)
+    elif not os.path.exists(faq_file):
         print(f"❌ FAQ 파일을 찾을 수 없습니다: {faq_file}")
         sys.exit(1)
 
-    faq_data = load_faq_data(faq_file)
-
-    # Document 객체 생성
-    documents = create_documents_from_faq(faq_data)
-
-    # 벡터 스토어 구축
-    vectorstore = build_vectorstore(documents)
+    if args.tenant:
+        try:
+            args.persist_directory = tenant_directory(args.persist_directory, args.tenant)
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        print(f"\n🏢 테넌트 샤드: {args.tenant} ({args.persist_directory})")
+
+    if args.tickets:
+        args.persist_directory = os.path.join(args.persist_directory, TICKET_INDEX_DIR)
+        print(f"\n🎫 티켓 컬렉션: {args.persist_directory}")
+
+    root = args.persist_directory
+    if args.publish:
+        print(f"\n🏷️  새 인덱스 버전 준비 중... ({root})")
+        version, args.persist_directory = prepare_version_directory(root, args.incremental, not args.no_resume)
+        print(f"   - 버전: {version}")
+    elif read_index_pointer(root) is not None:
+        print(f"⚠️  {root}에는 게시된 버전 포인터가 있어 앱은 이 구축 결과를 사용하지 않습니다 (--publish 사용)")
+
+    if not args.tickets and (args.stream or faq_file.endswith(".jsonl")):
+        vectorstore = build_streaming(args)
+    else:
+        vectorstore = build_from_json(args)
 
     # 테스트 검색
     test_search(vectorstore)
 
+    if args.publish:
+        # 포인터 교체 = 게시 (실행 중인 앱은 INDEX_RELOAD_INTERVAL 안에 새 버전으로 교체)
+        publish_index_version(root, version)
+        removed = prune_index_versions(root, keep=args.keep_versions)
+        print(f"\n🚀 인덱스 버전 게시 완료: {version}")
+        if removed:
+            print(f"   - 이전 버전 정리: {', '.join(removed)}")
+
     print("\n" + "="*60)
     print("✅ 벡터 스토어 구축 완료!")
     print("="*60)
-    print(f"\n저장 위치: {os.path.abspath('data/vectorstore')}")
+    print(f"\n저장 위치: {os.path.abspath(args.persist_directory)}")
     print("\n이제 챗봇을 실행할 수 있습니다:")
     print("  streamlit run src/ui/app.py")
 
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""오프라인 검색 품질/지연시간 벤치마크
+
+라벨링된 질의 → 정답 FAQ ID 파일로 검색 백엔드를 평가하여
+recall@1/3/5, MRR, p50/p95/p99 지연시간을 JSON으로 저장합니다.
+결과 JSON을 이전 실행과 비교(--baseline)하면 회귀 여부를 바로 확인할 수 있습니다.
+
+--offline이면 Ollama 없이 결정적 문자 n-gram 해싱 임베딩으로
+임시 디렉토리에 벡터 스토어/색인을 구축한 뒤 평가합니다 (CI용).
+
+질의 파일 형식 (JSONL, 한 줄에 하나):
+    {"query": "메신저에서 알림이 안떠요", "expected": ["FAQ-001"]}
+
+사용법:
+    python scripts/evaluate_retrieval.py --offline --output benchmark.json
+    python scripts/evaluate_retrieval.py --offline --backends chroma numpy mmap ivf
+    python scripts/evaluate_retrieval.py --backends mmap --baseline benchmark.json   # 구축된 벡터 스토어 + Ollama
+"""
+
+import sys
+import os
+import json
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+from langchain_chroma import Chroma
+from langchain_core.embeddings import Embeddings
+from dotenv import load_dotenv
+
+from scripts.build_vectorstore import load_faq_data, create_documents_from_faq
+from src.services.retrieval import RetrievalService
+from src.services.lexical_index import LexicalIndex
+from src.services.vector_index import NumpyIndex
+from src.services.index_file import INDEX_FILE, export_index_file, write_index_file
+from src.services.ivf_index import IVFIndex, IVF_FILE
+from src.services.document_store import DOC_STORE_FILE, write_document_store
+from src.services.solution_index import SOLUTION_INDEX_FILE, create_solution_documents
+from src.services.hashed_embeddings import HashedNgramEmbeddings
+
+# 환경 변수 로드
+load_dotenv()
+
+DEFAULT_QUERIES = "data/benchmark/labeled_queries.jsonl"
+RECALL_KS = (1, 3, 5)
+PERCENTILES = (50, 95, 99)
+
+
+def load_labeled_queries(path: str) -> list:
+    """라벨링된 질의 로드 - expected는 FAQ ID 하나(str) 또는 여러 개(list)"""
+    queries = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            expected = record.get("expected")
+            if isinstance(expected, str):
+                expected = [expected]
+            if not record.get("query") or not expected:
+                raise ValueError(f"{path}:{line_no} - query와 expected가 필요합니다")
+            queries.append({"query": record["query"], "expected": list(expected)})
+    return queries
+
+
+def build_offline_store(faq_file: str, persist_directory: str, embeddings: Embeddings) -> None:
+    """
+    주어진 임베딩으로 벡터 스토어와 모든 색인 파일 구축 (build_vectorstore.py와 같은 파일 구성)
+
+    Chroma 컬렉션, 어휘 색인, 단일 파일 인덱스, IVF 클러스터, 문서 저장소, 해결 방법 하위 문서 색인
+    """
+    faq_data = load_faq_data(faq_file)
+    documents = create_documents_from_faq(faq_data)
+
+    vectorstore = Chroma.from_documents(
+        documents,
+        embeddings,
+        ids=[doc.metadata["id"] for doc in documents],
+        persist_directory=persist_directory,
+        collection_name="faq_collection"
+    )
+    base = NumpyIndex.from_chroma(vectorstore)
+
+    LexicalIndex.from_faq(faq_data).save(os.path.join(persist_directory, LexicalIndex.FILE_NAME))
+    export_index_file(os.path.join(persist_directory, INDEX_FILE), base)
+    IVFIndex.build(base).save(os.path.join(persist_directory, IVF_FILE))
+    write_document_store(os.path.join(persist_directory, DOC_STORE_FILE), documents)
+
+    solution_docs = create_solution_documents(faq_data)
+    write_index_file(
+        os.path.join(persist_directory, SOLUTION_INDEX_FILE),
+        solution_docs,
+        embeddings.embed_documents([doc.page_content for doc in solution_docs])
+    )
+
+
+def percentile(values: list, q: float) -> float:
+    """백분위수 (선형 보간)"""
+    return float(np.percentile(values, q)) if values else 0.0
+
+
+def run_benchmark(service: RetrievalService, queries: list, mode: str = "hybrid", k: int = 5) -> dict:
+    """
+    라벨링된 질의로 검색 평가
+
+    Args:
+        service: 평가할 검색 서비스
+        queries: load_labeled_queries() 결과
+        mode: "hybrid" (search_knowledge_node와 같은 경로) | "vector" (벡터 검색만)
+        k: 검색 결과 수 (MRR도 상위 k 안에서 계산)
+
+    Returns:
+        config / metrics / latency_ms / search_paths / failures 보고서
+    """
+    def hybrid_search(query: str, k: int):
+        # search_knowledge_node와 같이 어휘 점수만으로 확실한 질의는 임베딩 없이 어휘 결과 순위 사용
+        return service.decisive_lexical_ids(query, k=k) or service.hybrid_search_ids(query, k=k)
+
+    search = hybrid_search if mode == "hybrid" else service.similarity_search_ids
+
+    # 인덱스/어휘 색인 로드와 임베딩 클라이언트 연결은 측정에서 제외
+    service.warmup(query=None)
+    search(queries[0]["query"], k=k)
+    service.path_counts.clear()
+
+    hits = {n: 0 for n in RECALL_KS}
+    reciprocal_ranks = []
+    latencies = []
+    failures = []
+    for item in queries:
+        started = time.perf_counter()
+        results = search(item["query"], k=k)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+        ranked = [faq_id for faq_id, _ in results]
+        rank = next((i for i, faq_id in enumerate(ranked, 1) if faq_id in item["expected"]), None)
+        for n in RECALL_KS:
+            if rank is not None and rank <= n:
+                hits[n] += 1
+        reciprocal_ranks.append(1.0 / rank if rank else 0.0)
+        if rank != 1:
+            failures.append({"query": item["query"], "expected": item["expected"], "retrieved": ranked, "rank": rank})
+
+    total = len(queries)
+    return {
+        "config": {
+            "backend": service.backend,
+            "quantization": (service.quantization if service.backend == "mmap" else None) or "none",
+            "mode": mode,
+            "hybrid_enabled": service.hybrid_enabled,
+            "k": k,
+            "queries": total,
+        },
+        "metrics": {
+            **{f"recall@{n}": round(hits[n] / total, 4) for n in RECALL_KS},
+            "mrr": round(sum(reciprocal_ranks) / total, 4),
+        },
+        "latency_ms": {
+            **{f"p{q}": round(percentile(latencies, q), 3) for q in PERCENTILES},
+            "mean": round(float(np.mean(latencies)), 3),
+        },
+        "search_paths": dict(service.path_counts),
+        "failures": failures,
+    }
+
+
+def compare_reports(baseline: dict, current: dict) -> list:
+    """기준 보고서 대비 지표 변화 [(백엔드, 지표, 기준값, 현재값)] - 같은 backend/mode 끼리 비교"""
+    def key(run):
+        return (run["config"]["backend"], run["config"]["quantization"], run["config"]["mode"])
+
+    baseline_runs = {key(run): run for run in baseline.get("runs", [])}
+    changes = []
+    for run in current["runs"]:
+        previous = baseline_runs.get(key(run))
+        if previous is None:
+            continue
+        for section in ("metrics", "latency_ms"):
+            for name, value in run[section].items():
+                if name in previous[section]:
+                    changes.append(("/".join(key(run)), name, previous[section][name], value))
+    return changes
+
+
+def print_report(report: dict):
+    """백엔드별 품질/지연시간 표 출력"""
+    print(f"\n  {'backend':<18} {'R@1':>6} {'R@3':>6} {'R@5':>6} {'MRR':>6} "
+          f"{'p50(ms)':>9} {'p95(ms)':>9} {'p99(ms)':>9}")
+    for run in report["runs"]:
+        config, metrics, latency = run["config"], run["metrics"], run["latency_ms"]
+        label = config["backend"] if config["quantization"] == "none" else f"{config['backend']}+{config['quantization']}"
+        print(f"  {label:<18} {metrics['recall@1']:>6.3f} {metrics['recall@3']:>6.3f} {metrics['recall@5']:>6.3f} "
+              f"{metrics['mrr']:>6.3f} {latency['p50']:>9.2f} {latency['p95']:>9.2f} {latency['p99']:>9.2f}")
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="오프라인 검색 벤치마크 (recall@k / MRR / 지연시간)")
+    parser.add_argument("--queries", default=DEFAULT_QUERIES, help="라벨링된 질의 파일 (JSONL)")
+    parser.add_argument("--backends", nargs="+", default=[os.getenv("VECTORSTORE_BACKEND", "chroma")],
+                        choices=RetrievalService.BACKENDS, help="평가할 벡터 인덱스 백엔드 (기본: VECTORSTORE_BACKEND)")
+    parser.add_argument("--mode", default="hybrid", choices=("hybrid", "vector"),
+                        help="hybrid: search_knowledge_node와 같은 경로, vector: 벡터 검색만")
+    parser.add_argument("--k", type=int, default=5, help="검색 결과 수")
+    parser.add_argument("--offline", action="store_true",
+                        help="Ollama 없이 해싱 임베딩으로 임시 벡터 스토어를 구축하여 평가")
+    parser.add_argument("--faq-file", default="data/faq_sample.json", help="--offline 구축에 사용할 FAQ 파일")
+    parser.add_argument("--persist-directory", default=os.getenv("VECTORSTORE_PATH", "data/vectorstore"),
+                        help="평가할 벡터 스토어 경로 (--offline이면 무시)")
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", default=None, help="비교할 이전 결과 JSON")
+    args = parser.parse_args()
+
+    queries = load_labeled_queries(args.queries)
+
+    print("=" * 60)
+    print("  검색 벤치마크")
+    print(f"  - 질의: {args.queries} ({len(queries)}개)")
+    print(f"  - 백엔드: {', '.join(args.backends)} / 모드: {args.mode}")
+    print(f"  - 임베딩: {'해싱 n-gram (오프라인)' if args.offline else os.getenv('OLLAMA_EMBEDDING_MODEL', 'bge-m3-korean')}")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        embeddings = None
+        persist_directory = args.persist_directory
+        if args.offline:
+            embeddings = HashedNgramEmbeddings()
+            persist_directory = tmp
+            print("\n🔨 해싱 임베딩으로 임시 벡터 스토어 구축 중...")
+            build_offline_store(args.faq_file, persist_directory, embeddings)
+        elif not os.path.exists(persist_directory):
+            print("❌ 벡터 스토어를 찾을 수 없습니다. 먼저 구축하거나 --offline을 사용하세요:")
+            print("   python scripts/build_vectorstore.py")
+            sys.exit(1)
+
+        runs = []
+        for backend in args.backends:
+            service = RetrievalService(persist_directory=persist_directory, backend=backend, embeddings=embeddings)
+            try:
+                runs.append(run_benchmark(service, queries, mode=args.mode, k=args.k))
+            except Exception as e:
+                print(f"❌ {backend} 평가 실패: {e}")
+                if not args.offline:
+                    print("\n💡 Ollama 서버가 실행 중인지 확인하세요 (또는 --offline):")
+                    print("   ollama serve")
+                sys.exit(1)
+
+    report = {
+        "embeddings": "hashed-ngram" if args.offline else os.getenv("OLLAMA_EMBEDDING_MODEL", "bge-m3-korean"),
+        "queries_file": args.queries,
+        "runs": runs,
+    }
+    print_report(report)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"\n📊 기준 결과 대비 ({args.baseline})")
+        for label, name, before, after in compare_reports(baseline, report):
+            marker = "" if before == after else ("  ▲" if after > before else "  ▼")
+            print(f"  {label:<24} {name:<10} {before:>9} → {after:<9}{marker}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""합성 FAQ 코퍼스 생성 스크립트
+
+샘플 FAQ(data/faq_sample.json)의 카테고리 / 해결 방법 수 / 단계 수 / 태그 분포를 바탕으로
+FAQDocument 스키마를 만족하는 한국어 FAQ를 원하는 개수만큼 JSONL로 생성합니다.
+(10만~100만 건 규모의 구축/검색/메모리 테스트용 - 레코드를 하나씩 스트리밍하여 메모리 일정)
+
+- 제목/증상: 샘플 FAQ 문장에 플랫폼 / 발생 상황 / 오류 코드 등을 조합
+- 원인 / 해결 방법: 같은 카테고리 FAQ들의 원인과 해결 방법을 섞어 구성 (방법 번호는 다시 매김)
+- 같은 seed면 항상 같은 코퍼스 생성
+
+사용법:
+    python scripts/generate_faq_corpus.py --count 10000 --output data/synthetic/faq_10000.jsonl
+    python scripts/generate_faq_corpus.py --count 1000000 --seed 7 --output data/synthetic/faq_1m.jsonl
+"""
+
+import sys
+import os
+import json
+import math
+import time
+import random
+import argparse
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.models.faq import FAQDocument, validate_faq_document
+
+PLATFORMS = ["Windows", "macOS", "Android", "iOS", "웹 브라우저"]
+PLATFORM_TAGS = {"Windows": "윈도우", "macOS": "맥", "Android": "안드로이드", "iOS": "아이폰", "웹 브라우저": "웹"}
+CONTEXTS = [
+    "업데이트 후", "재설치 후", "회사 네트워크에서", "외부에서 접속할 때", "다중 모니터 환경에서",
+    "절전 모드 해제 후", "로그인 직후", "대용량 파일 사용 시", "여러 기기에서 동시에 사용할 때",
+    "장시간 실행 후", "비밀번호 변경 후", "새 PC로 교체한 뒤",
+]
+EXTRA_SYMPTOMS = [
+    "재부팅해도 같은 증상이 반복됩니다.",
+    "다른 기기에서는 정상적으로 동작합니다.",
+    "오류 코드 {code}가 함께 표시됩니다.",
+    "며칠 전까지는 문제가 없었습니다.",
+    "동료들도 같은 증상을 겪고 있습니다.",
+    "간헐적으로 발생하며 재현이 어렵습니다.",
+]
+EXTRA_STEPS = [
+    "앱을 완전히 종료한 뒤 다시 실행합니다",
+    "기기를 재부팅합니다",
+    "앱을 최신 버전으로 업데이트합니다",
+    "문제가 계속되면 오류 화면을 캡처해 고객센터에 문의합니다",
+]
+
+
+def load_seed_faqs(file_path: str) -> List[Dict]:
+    """생성 기준이 되는 샘플 FAQ 로드"""
+    with open(file_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _random_date(rng: random.Random, start: date, days: int) -> date:
+    return start + timedelta(days=rng.randrange(days))
+
+
+def generate_faq_records(
+    seed_faqs: List[Dict],
+    count: int,
+    seed: int = 42,
+    qa_board_ratio: float = 0.2
+) -> Iterator[FAQDocument]:
+    """
+    합성 FAQ 레코드 생성 (제너레이터)
+
+    Args:
+        seed_faqs: 분포를 가져올 샘플 FAQ
+        count: 생성할 FAQ 수
+        seed: 난수 시드 (같으면 같은 결과)
+        qa_board_ratio: 출처가 Q&A 게시판(qa_board)인 비율
+
+    Yields:
+        FAQDocument 레코드 (ID: FAQ-0000001 형식)
+    """
+    rng = random.Random(seed)
+
+    by_category: Dict[str, List[Dict]] = {}
+    for faq in seed_faqs:
+        by_category.setdefault(faq["category"], []).append(faq)
+    # 카테고리 분포 = 샘플 FAQ의 카테고리 비율
+    categories = [faq["category"] for faq in seed_faqs]
+    solution_counts = [len(faq["content"]["solutions"]) for faq in seed_faqs]
+    solutions_by_category = {
+        category: [solution for faq in faqs for solution in faq["content"]["solutions"]]
+        for category, faqs in by_category.items()
+    }
+    width = max(7, len(str(count)))
+
+    for n in range(1, count + 1):
+        category = rng.choice(categories)
+        base = rng.choice(by_category[category])
+        platform = rng.choice(PLATFORMS)
+        context = rng.choice(CONTEXTS)
+
+        pattern = rng.random()
+        if pattern < 0.15:
+            title = base["title"]
+        elif pattern < 0.5:
+            title = f"{context} {base['title']}"
+        elif pattern < 0.8:
+            title = f"[{platform}] {base['title']}"
+        else:
+            title = f"{platform}에서 {context} {base['title']}"
+
+        symptom = base["content"]["symptom"]
+        if rng.random() < 0.6:
+            symptom = f"{platform}에서 {context} " + symptom
+        if rng.random() < 0.5:
+            symptom += " " + rng.choice(EXTRA_SYMPTOMS).format(code=f"E{rng.randint(100, 999)}")
+
+        # 해결 방법 수 = 샘플 분포 (+ 가끔 1개 또는 4개)
+        solution_count = rng.choice(solution_counts + [1, 4])
+        pool = solutions_by_category[category]
+        picked = rng.sample(pool, min(solution_count, len(pool)))
+        solutions = []
+        for method, solution in enumerate(picked, 1):
+            steps = list(solution["steps"])
+            if rng.random() < 0.3:
+                steps.append(rng.choice(EXTRA_STEPS))
+            solutions.append({
+                "method": method,
+                "title": solution["title"],
+                "steps": steps,
+                "expected_result": solution["expected_result"],
+            })
+
+        tags = list(base["tags"])
+        if rng.random() < 0.5:
+            tags.append(PLATFORM_TAGS[platform])
+        if rng.random() < 0.2:
+            tags = tags[:2]
+
+        created = _random_date(rng, date(2022, 1, 1), 3 * 365)
+        updated = created + timedelta(days=rng.randrange(0, 181))
+        # 조회수는 롱테일 분포, 도움됨은 조회수의 일부
+        view_count = max(1, int(math.exp(rng.gauss(6.5, 1.2))))
+        helpful_count = int(view_count * rng.betavariate(6, 3))
+
+        yield {
+            "id": f"FAQ-{n:0{width}d}",
+            "category": category,
+            "title": title,
+            "content": {
+                "symptom": symptom,
+                "cause": rng.choice(by_category[category])["content"]["cause"],
+                "solutions": solutions,
+            },
+            "tags": tags,
+            "created_at": created.isoformat(),
+            "updated_at": updated.isoformat(),
+            "view_count": view_count,
+            "helpful_count": helpful_count,
+            "source": "qa_board" if rng.random() < qa_board_ratio else "faq",
+        }
+
+
+def write_jsonl(records: Iterable[Dict], file_path: str, validate: bool = True) -> int:
+    """레코드를 JSONL로 스트리밍 저장 (임시 파일에 쓴 뒤 교체) - 저장한 레코드 수 반환"""
+    directory = os.path.dirname(file_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    written = 0
+    tmp_path = file_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for record in records:
+            if validate:
+                errors = validate_faq_document(record)
+                if errors:
+                    raise ValueError(f"{record.get('id')}: 스키마 오류 - {', '.join(errors)}")
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            written += 1
+    os.replace(tmp_path, file_path)
+    return written
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="합성 FAQ 코퍼스 생성 (JSONL)")
+    parser.add_argument("--count", type=int, default=10000, help="생성할 FAQ 수")
+    parser.add_argument("--output", default=None, help="저장 경로 (기본: data/synthetic/faq_<count>.jsonl)")
+    parser.add_argument("--seed", type=int, default=42, help="난수 시드")
+    parser.add_argument("--seed-file", default="data/faq_sample.json", help="분포를 가져올 샘플 FAQ 파일")
+    parser.add_argument("--qa-board-ratio", type=float, default=0.2, help="출처가 qa_board인 비율")
+    args = parser.parse_args()
+
+    output = args.output or f"data/synthetic/faq_{args.count}.jsonl"
+
+    print("=" * 60)
+    print("  합성 FAQ 코퍼스 생성")
+    print(f"  - 개수: {args.count:,}개 / seed: {args.seed}")
+    print(f"  - 기준 샘플: {args.seed_file}")
+    print("=" * 60)
+
+    started = time.perf_counter()
+    seed_faqs = load_seed_faqs(args.seed_file)
+    records = generate_faq_records(seed_faqs, args.count, seed=args.seed, qa_board_ratio=args.qa_board_ratio)
+    written = write_jsonl(records, output)
+    elapsed = time.perf_counter() - started
+
+    print(f"\n✅ {written:,}개 FAQ 저장 완료 ({elapsed:.1f}초, {os.path.getsize(output) / 1024 / 1024:.1f}MB)")
+    print(f"   - 저장 경로: {output}")
+
+
+if __name__ == "__main__":
+    main()
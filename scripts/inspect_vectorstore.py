@@ -9,10 +9,10 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from langchain_ollama import OllamaEmbeddings
-from langchain_chroma import Chroma
 from dotenv import load_dotenv
 
+from src.services.retrieval import RetrievalService
+
 load_dotenv()
 
 
@@ -31,20 +31,14 @@ def inspect_vectorstore(persist_directory: str = "data/vectorstore"):
 
     print(f"\n📂 벡터 스토어 경로: {os.path.abspath(persist_directory)}")
 
-    # Ollama 임베딩 모델 로드
-    embedding_model = os.getenv("OLLAMA_EMBEDDING_MODEL", "bge-m3-korean")
-    embeddings = OllamaEmbeddings(model=embedding_model)
-
-    # 벡터 스토어 로드
+    # 벡터 스토어 로드 (검색 서비스)
     print(f"\n🔄 벡터 스토어 로드 중...")
-    vectorstore = Chroma(
-        persist_directory=persist_directory,
-        embedding_function=embeddings,
-        collection_name="faq_collection"
-    )
+    retrieval_service = RetrievalService(persist_directory=persist_directory)
+    load_time = retrieval_service.warmup(query=None)
+    print(f"   - 로드 시간: {load_time * 1000:.1f}ms")
 
     # 컬렉션 정보 가져오기
-    collection = vectorstore._collection
+    collection = retrieval_service.collection
 
     print("\n" + "="*60)
     print("📊 벡터 스토어 통계")
@@ -104,7 +98,7 @@ def inspect_vectorstore(persist_directory: str = "data/vectorstore"):
 
     for query in test_queries:
         print(f"\n📌 쿼리: '{query}'")
-        results = vectorstore.similarity_search_with_score(query, k=3)
+        results = retrieval_service.similarity_search_with_score(query, k=3)
 
         for i, (doc, score) in enumerate(results, 1):
             print(f"  [{i}] 유사도: {score:.4f}")
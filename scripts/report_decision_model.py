@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""판단 모델 오프라인 리포트
+
+게시된(또는 지정한) 판단 모델을 판단 로그의 LLM 판단과 비교하여
+전체 일치율, 혼동 행렬, 임계값별 모델 응답 비율 / 일치율을 출력합니다.
+학습 이후에 쌓인 로그(--since-training)만 평가하면 배포 후 성능 변화를 확인할 수 있습니다.
+
+사용법:
+    python scripts/report_decision_model.py --node evaluate_status
+    python scripts/report_decision_model.py --node all --since-training --output decision_report.json
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from dotenv import load_dotenv
+
+from scripts.train_decision_model import print_evaluation
+from src.services.decision_model import (
+    DECISION_LABELS,
+    evaluate_against_llm,
+    load_decision_log,
+    load_decision_model,
+)
+
+# 환경 변수 로드
+load_dotenv()
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="판단 모델 vs LLM 오프라인 리포트")
+    parser.add_argument("--node", default="all", choices=list(DECISION_LABELS) + ["all"], help="평가할 노드")
+    parser.add_argument("--version", default=None, help="모델 버전 (기본: 게시된 현재 버전)")
+    parser.add_argument("--log-dir", default=None, help="판단 로그 디렉토리 (기본: DECISION_LOG_DIR)")
+    parser.add_argument("--model-dir", default=None, help="모델 디렉토리 (기본: DECISION_MODEL_DIR)")
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.5, 0.7, 0.8, 0.9, 0.95],
+                        help="평가할 임계값들")
+    parser.add_argument("--since-training", action="store_true", help="모델 학습 이후 기록된 로그만 평가")
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    nodes = list(DECISION_LABELS) if args.node == "all" else [args.node]
+    results = {}
+    for node in nodes:
+        model = load_decision_model(node, args.version, args.model_dir)
+        if model is None:
+            print(f"\n⚠️  {node}: 게시된 모델이 없습니다 (python scripts/train_decision_model.py --publish)")
+            continue
+
+        records = load_decision_log(node, args.log_dir)
+        trained_at = model.meta.get("trained_at", "")
+        if args.since_training and trained_at:
+            records = [record for record in records if record.get("logged_at", "") > trained_at]
+
+        print(f"\n{'=' * 60}\n  {node} (모델 {model.version}, 임계값 {model.threshold})\n{'=' * 60}")
+        report = evaluate_against_llm(model, records, thresholds=args.thresholds)
+        print_evaluation("LLM 판단 대비", report)
+
+        if report["samples"]:
+            print("\n  혼동 행렬 (행: LLM, 열: 모델)")
+            print("  " + " " * 10 + "".join(f"{label:>10}" for label in model.labels))
+            for label, row in report["confusion"].items():
+                print(f"  {label:<10}" + "".join(f"{row[other]:>10}" for other in model.labels))
+
+        results[node] = dict(report, version=model.version, threshold=model.threshold)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
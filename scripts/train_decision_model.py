@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""평가 노드 판단 모델 학습
+
+evaluate_status / evaluate_ticket_confirmation 노드가 남긴 (사용자 메시지, 단계 문맥, LLM 판단) 로그로
+문자 n-gram 로지스틱 회귀 모델을 학습하여 버전 아티팩트로 저장합니다.
+검증 분할(--holdout)에서 LLM 판단 대비 정확도를 출력하고, --publish이면 임계값 구간 정확도가
+--min-accuracy 이상일 때만 현재 모델로 게시합니다 (앱은 다음 판단부터 새 모델 사용).
+
+사용법:
+    python scripts/train_decision_model.py --node evaluate_status
+    python scripts/train_decision_model.py --node all --threshold 0.9 --publish
+"""
+
+import sys
+import os
+import argparse
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+from dotenv import load_dotenv
+
+from src.services.decision_model import (
+    DECISION_LABELS,
+    DecisionModel,
+    evaluate_against_llm,
+    load_decision_log,
+    publish_decision_model,
+)
+
+# 환경 변수 로드
+load_dotenv()
+
+
+def split_records(records: list, holdout: float, seed: int) -> tuple:
+    """학습 / 검증 분할 (시드 고정 셔플)"""
+    order = np.random.default_rng(seed).permutation(len(records))
+    n_holdout = int(len(records) * holdout)
+    return [records[i] for i in order[n_holdout:]], [records[i] for i in order[:n_holdout]]
+
+
+def print_evaluation(title: str, report: dict) -> None:
+    """LLM 판단 대비 정확도 / 임계값별 응답 비율 출력"""
+    print(f"\n📊 {title}: {report['samples']}건, LLM 일치율 {report['accuracy']:.1%}")
+    print(f"  {'임계값':>6} {'모델 응답':>9} {'일치율':>7}")
+    for row in report["thresholds"]:
+        accuracy = f"{row['accuracy']:.1%}" if row["accuracy"] is not None else "-"
+        print(f"  {row['threshold']:>6.2f} {row['coverage']:>9.1%} {accuracy:>7}")
+
+
+def train_node(node: str, args) -> bool:
+    """노드 하나 학습 / 저장 (게시 여부 반환)"""
+    records = load_decision_log(node, args.log_dir)
+    print(f"\n{'=' * 60}\n  {node}\n  - 로그: {len(records)}건 (중복 제거 후)\n{'=' * 60}")
+    if len(records) < args.min_samples:
+        print(f"⚠️  로그가 {args.min_samples}건 미만이라 학습을 건너뜁니다")
+        return False
+
+    counts = {label: sum(record["decision"] == label for record in records) for label in DECISION_LABELS[node]}
+    print(f"  - 라벨 분포: {counts}")
+
+    train, holdout = split_records(records, args.holdout, args.seed)
+    model = DecisionModel(node, threshold=args.threshold).fit(
+        [record["text"] for record in train],
+        [record["decision"] for record in train],
+        contexts=[record.get("context", "") for record in train],
+        epochs=args.epochs
+    )
+    print(f"  - 문맥에 따라 판단이 갈린 메시지: {len(model.conflicting)}개 (모델이 답하지 않음)")
+    thresholds = sorted({0.5, 0.7, 0.8, 0.9, 0.95, args.threshold})
+    report = evaluate_against_llm(model, holdout, thresholds=thresholds)
+    print_evaluation("검증 분할", report)
+    answered = next(row for row in report["thresholds"] if row["threshold"] == args.threshold)
+
+    model.meta = {
+        "trained_at": records[-1].get("logged_at", ""),
+        "train_samples": len(train),
+        "holdout": {"samples": report["samples"], "accuracy": report["accuracy"], "at_threshold": answered},
+    }
+    version = model.save(args.model_dir)
+    model_dir = args.model_dir or os.getenv("DECISION_MODEL_DIR", "data/decision_models")
+    print(f"\n💾 저장: {os.path.join(model_dir, node, version)}.npz")
+
+    if not args.publish:
+        return False
+    if answered["accuracy"] is None or answered["accuracy"] < args.min_accuracy:
+        print(f"⚠️  임계값 {args.threshold} 구간 일치율이 {args.min_accuracy:.0%} 미만이라 게시하지 않습니다")
+        return False
+    publish_decision_model(node, version, args.model_dir)
+    print(f"✅ 게시: {node} → {version}")
+    return True
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="평가 노드 판단 모델 학습 (LLM 판단 로그 증류)")
+    parser.add_argument("--node", default="all", choices=list(DECISION_LABELS) + ["all"], help="학습할 노드")
+    parser.add_argument("--log-dir", default=None, help="판단 로그 디렉토리 (기본: DECISION_LOG_DIR)")
+    parser.add_argument("--model-dir", default=None, help="모델 디렉토리 (기본: DECISION_MODEL_DIR)")
+    parser.add_argument("--threshold", type=float, default=0.9, help="모델이 답하는 최소 확률")
+    parser.add_argument("--holdout", type=float, default=0.2, help="검증 분할 비율")
+    parser.add_argument("--epochs", type=int, default=400, help="경사 하강 반복 수")
+    parser.add_argument("--min-samples", type=int, default=50, help="학습에 필요한 최소 로그 수")
+    parser.add_argument("--seed", type=int, default=42, help="분할 시드")
+    parser.add_argument("--publish", action="store_true", help="검증 통과 시 현재 모델로 게시")
+    parser.add_argument("--min-accuracy", type=float, default=0.95,
+                        help="게시 조건 - 임계값 이상 구간의 LLM 일치율")
+    args = parser.parse_args()
+
+    nodes = list(DECISION_LABELS) if args.node == "all" else [args.node]
+    published = [node for node in nodes if train_node(node, args)]
+    print(f"\n🎉 완료 (게시: {', '.join(published) if published else '없음'})")
+
+
+if __name__ == "__main__":
+    main()
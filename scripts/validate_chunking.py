@@ -11,10 +11,9 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from langchain_ollama import OllamaEmbeddings
-from langchain_chroma import Chroma
 from dotenv import load_dotenv
-import os
+
+from src.services.retrieval import get_retrieval_service
 
 # 환경 변수 로드
 load_dotenv()
@@ -30,15 +29,10 @@ def validate_chunking_completeness():
 
     # 벡터 스토어 로드
     print("\n📂 벡터 스토어 로드 중...")
-    embedding_model = os.getenv("OLLAMA_EMBEDDING_MODEL", "bge-m3-korean")
 
     try:
-        embeddings = OllamaEmbeddings(model=embedding_model)
-        vectorstore = Chroma(
-            persist_directory="data/vectorstore",
-            embedding_function=embeddings,
-            collection_name="faq_collection"
-        )
+        retrieval_service = get_retrieval_service()
+        retrieval_service.warmup(query=None)
         print("✅ 벡터 스토어 로드 완료")
     except Exception as e:
         print(f"❌ 벡터 스토어 로드 실패: {e}")
@@ -62,7 +56,7 @@ def validate_chunking_completeness():
 
     for query in test_cases:
         print(f"쿼리: {query}")
-        results = vectorstore.similarity_search(query, k=1)
+        results = retrieval_service.similarity_search(query, k=1)
 
         if not results:
             print(f"  ⚠️  검색 결과 없음")
@@ -3,7 +3,7 @@
 FAQ, State, Ticket 데이터 모델을 정의하는 모듈입니다.
 """
 
-from .faq import FAQDocument, FAQContent, FAQSolution
+from .faq import FAQDocument, FAQContent, FAQSolution, validate_faq_document
 from .state import SupportState, SolutionStep
 from .ticket import Ticket
 
@@ -11,6 +11,7 @@ __all__ = [
     "FAQDocument",
     "FAQContent",
     "FAQSolution",
+    "validate_faq_document",
     "SupportState",
     "SolutionStep",
     "Ticket",
@@ -34,3 +34,45 @@ class FAQDocument(TypedDict):
     view_count: int                          # 조회수
     helpful_count: int                       # 도움됨 수
     source: Literal["faq", "qa_board"]       # 출처
+
+
+def validate_faq_document(record: dict) -> List[str]:
+    """
+    FAQDocument 구조 검증 (외부/생성 데이터 적재 전 확인용)
+
+    Args:
+        record: FAQ 레코드 (JSON에서 읽은 dict)
+
+    Returns:
+        오류 메시지 리스트 (비어 있으면 유효)
+    """
+    errors = []
+    for field, expected in (
+        ("id", str), ("category", str), ("title", str), ("content", dict), ("tags", list),
+        ("created_at", str), ("updated_at", str), ("view_count", int), ("helpful_count", int), ("source", str),
+    ):
+        if not isinstance(record.get(field), expected):
+            errors.append(f"{field}: {expected.__name__} 필요")
+    if record.get("source") not in ("faq", "qa_board"):
+        errors.append("source: 'faq' 또는 'qa_board' 필요")
+
+    content = record.get("content")
+    if isinstance(content, dict):
+        for field in ("symptom", "cause"):
+            if not isinstance(content.get(field), str):
+                errors.append(f"content.{field}: str 필요")
+        solutions = content.get("solutions")
+        if not isinstance(solutions, list) or not solutions:
+            errors.append("content.solutions: 1개 이상 필요")
+        else:
+            for i, solution in enumerate(solutions):
+                if not (
+                    isinstance(solution, dict)
+                    and isinstance(solution.get("method"), int)
+                    and isinstance(solution.get("title"), str)
+                    and isinstance(solution.get("steps"), list)
+                    and all(isinstance(step, str) for step in solution["steps"])
+                    and isinstance(solution.get("expected_result"), str)
+                ):
+                    errors.append(f"content.solutions[{i}]: method/title/steps/expected_result 필요")
+    return errors
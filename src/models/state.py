@@ -25,7 +25,9 @@ class SupportState(TypedDict):
 
     # RAG 검색 결과
     retrieved_docs: List[Dict]               # 검색된 FAQ 문서들
-    relevance_score: float                   # 관련성 점수
+    retrieved_solutions: List[Dict]          # 질의와 가장 가까운 해결 방법 하위 문서들 (parent_id로 FAQ 연결)
+    relevance_score: Optional[float]         # 관련성 점수 (최소 벡터 거리, 어휘 결과 경로는 None)
+    search_filter: Optional[Dict]            # 메타데이터 사전 필터 (예: {"category": ["메신저"]})
 
     # 단계별 답변 계획
     solution_steps: List[SolutionStep]       # 해결 단계 목록
@@ -63,6 +65,7 @@ class SupportState(TypedDict):
 
     # 메타데이터
     user_id: str                             # 사용자 ID
+    tenant_id: Optional[str]                 # 테넌트(사업부) 키 - 검색 샤드 선택 (None이면 기본 인덱스)
     session_id: str                          # 세션 ID
     started_at: str                          # 시작 시간
 
@@ -13,6 +13,7 @@ from typing import Dict, Any
 from langchain_core.messages import AIMessage
 
 from src.models.state import SupportState
+from src.services.retrieval import get_retrieval_service
 
 
 def ask_symptoms_node(state: SupportState) -> Dict[str, Any]:
@@ -35,6 +36,14 @@ def ask_symptoms_node(state: SupportState) -> Dict[str, Any]:
             last_user_message = msg.content
             break
 
+    # 모호한 표현에 카테고리가 언급되어 있으면 다음 검색을 해당 카테고리로 좁힘
+    # ("메신저가 이상해" → 증상 답변 검색 시 category=메신저 사전 필터)
+    try:
+        state["search_filter"] = get_retrieval_service(state.get("tenant_id")).infer_category_filter(last_user_message)
+    except Exception as e:
+        print(f"[WARNING] 카테고리 필터 추론 실패: {e}")
+        state["search_filter"] = None
+
     # 구체적인 증상을 물어보는 메시지 생성
     clarification_message = (
         f"네, '{last_user_message}'라고 하셨네요.\n\n"
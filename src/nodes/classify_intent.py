@@ -1,6 +1,8 @@
 """Classify Intent Node - 사용자 의도 분류
 
 사용자 입력을 LLM으로 분석하여 의도를 분류합니다.
+인사 / 명확한 기술 문의처럼 확실한 입력은 규칙 기반 빠른 경로(src.services.intent_rules)로,
+그다음 라벨된 예시 문장과의 임베딩 k-NN 투표(src.services.intent_knn)로 LLM 없이 분류합니다.
 - small_talk: 인사, 잡담
 - technical_support: 기술 지원 요청
 - continue_conversation: 기존 대화 계속
@@ -13,18 +15,63 @@ sys.path.insert(0, str(project_root))
 
 import os
 import json
+import time
 from typing import Dict, Any
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_ollama import ChatOllama
 
 from src.models.state import SupportState
+from src.services.llm_provider import get_llm
+from src.services.intent_rules import match_intent
+from src.services.intent_knn import get_intent_classifier
+from src.services.retrieval import get_retrieval_service
+
+# 프롬프트 / 응답 후처리를 바꾸면 올림 (이 노드의 LLM 응답 캐시 무효화)
+PROMPT_VERSION = "1"
+
+
+def apply_intent(state: SupportState, intent: str, confidence: float, reason: str, path: str) -> SupportState:
+    """
+    분류 결과를 상태에 반영
+
+    Args:
+        state: 현재 상태
+        intent: small_talk / technical_support / vague_problem
+        confidence: 분류 신뢰도
+        reason: 분류 이유 (규칙 경로는 일치한 규칙 이름)
+        path: 분류 경로 (rule / embedding / llm)
+    """
+    state["intent"] = intent
+    state["intent_confidence"] = confidence
+
+    if intent == "small_talk":
+        state["status"] = "small_talking"
+    elif intent == "vague_problem":
+        state["status"] = "clarifying"  # 증상 명확화 필요
+        state["needs_clarification"] = True
+    else:  # technical_support
+        state["status"] = "searching"
+
+    # 디버그 정보 저장
+    if state.get("debug_info") is None:
+        state["debug_info"] = {}
+    state["debug_info"]["intent_classification"] = {
+        "intent": intent,
+        "confidence": confidence,
+        "reason": reason,
+        "path": path,
+    }
+    return state
 
 
 def classify_intent_node(state: SupportState) -> Dict[str, Any]:
     """
     사용자 의도 분류 노드
-    - LLM을 사용하여 정확한 의도 파악
+    - 규칙 기반 빠른 경로: 확실한 입력은 LLM 호출 없이 분류
+    - 임베딩 k-NN 경로: 예시 문장 투표의 마진이 충분하면 LLM 호출 없이 분류
+      (질의 임베딩은 쿼리 캐시에 남아 search_knowledge에서 재사용)
+    - 그래도 애매한 입력은 LLM을 사용하여 정확한 의도 파악
     - 문맥을 고려한 분류
+    - 어느 경로로 분류했는지 로그와 debug_info["intent_classification"]["path"]에 기록
 
     Args:
         state: 현재 상태
@@ -43,20 +90,43 @@ def classify_intent_node(state: SupportState) -> Dict[str, Any]:
         state["status"] = "evaluating"
         return state
 
-    # 새 입력인 경우 LLM으로 분류
+    # 새 입력 - 마지막 사용자 메시지 분류
     last_user_message = ""
     for msg in reversed(state["messages"]):
         if msg.type == "human":
             last_user_message = msg.content
             break
 
+    # 규칙 기반 빠른 경로 (인사 / 감사 / 기능 + 실패 표현이 분명한 문의)
+    started = time.perf_counter()
+    rule_match = match_intent(last_user_message) if os.getenv("INTENT_RULES", "true").lower() == "true" else None
+    if rule_match is not None:
+        elapsed_us = (time.perf_counter() - started) * 1_000_000
+        print(f"[ClassifyIntent] path=rule intent={rule_match['intent']} rule={rule_match['rule']} ({elapsed_us:.0f}µs)")
+        return apply_intent(state, rule_match["intent"], rule_match["confidence"], rule_match["rule"], "rule")
+
+    # 임베딩 k-NN 경로 (검색과 같은 임베딩 - search_knowledge가 같은 질의를 다시 임베딩하지 않음)
+    if last_user_message.strip() and os.getenv("INTENT_KNN", "true").lower() == "true":
+        try:
+            embeddings = get_retrieval_service(state.get("tenant_id")).embeddings
+            vote = get_intent_classifier(embeddings).vote(embeddings.embed_query(last_user_message))
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if vote["accepted"]:
+                print(
+                    f"[ClassifyIntent] path=embedding intent={vote['intent']} "
+                    f"margin={vote['margin']:.2f} ({elapsed_ms:.0f}ms)"
+                )
+                reason = f"knn:margin={vote['margin']:.2f},similarity={vote['similarity']:.2f}"
+                return apply_intent(state, vote["intent"], vote["confidence"], reason, "embedding")
+            print(
+                f"[ClassifyIntent] 임베딩 분류 보류 ({vote['intent']} margin={vote['margin']:.2f} "
+                f"similarity={vote['similarity']:.2f}) → LLM"
+            )
+        except Exception as e:
+            print(f"[ClassifyIntent] Warning: 임베딩 분류 실패, LLM으로 분류: {e}")
+
     # LLM 초기화
-    llm_model = os.getenv("OLLAMA_LLM_MODEL", "gemma2:27b")
-    llm = ChatOllama(
-        model=llm_model,
-        base_url=os.getenv("OLLAMA_BASE_URL", "http://localhost:11434"),
-        temperature=0
-    )
+    llm = get_llm("classify_intent", temperature=0, cache=True, prompt_version=PROMPT_VERSION)
 
     # 의도 분류 프롬프트
     prompt = ChatPromptTemplate.from_messages([
@@ -111,30 +181,13 @@ JSON 형식으로 응답하세요:
         intent = classification.get("intent", "technical_support")  # 기본값: 기술 지원
         confidence = classification.get("confidence", 0.0)
 
-        # 상태 업데이트
-        state["intent"] = intent
-        state["intent_confidence"] = confidence
-
-        if intent == "small_talk":
-            state["status"] = "small_talking"
-        elif intent == "vague_problem":
-            state["status"] = "clarifying"  # 증상 명확화 필요
-            state["needs_clarification"] = True
-        else:  # technical_support
-            state["status"] = "searching"
-
-        # 디버그 정보 저장
-        if state.get("debug_info") is None:
-            state["debug_info"] = {}
-        state["debug_info"]["intent_classification"] = {
-            "intent": intent,
-            "confidence": confidence,
-            "reason": classification.get("reason", "")
-        }
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        print(f"[ClassifyIntent] path=llm intent={intent} ({elapsed_ms:.0f}ms)")
+        apply_intent(state, intent, confidence, classification.get("reason", ""), "llm")
 
     except (json.JSONDecodeError, Exception) as e:
         # 에러 발생 시 안전하게 기술 지원으로 분류
-        print(f"[ClassifyIntent] Warning: 분류 실패, 기술 지원으로 처리: {e}")
+        print(f"[ClassifyIntent] path=fallback Warning: 분류 실패, 기술 지원으로 처리: {e}")
         state["intent"] = "technical_support"
         state["status"] = "searching"
 
@@ -8,14 +8,13 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-import os
 import json
 from typing import Dict, Any
 from langchain_core.messages import AIMessage
-from langchain_ollama import ChatOllama
 from langchain_core.prompts import ChatPromptTemplate
 
 from src.models.state import SupportState
+from src.services.llm_provider import get_llm
 
 
 def confirm_ticket_node(state: SupportState) -> Dict[str, Any]:
@@ -32,12 +31,7 @@ def confirm_ticket_node(state: SupportState) -> Dict[str, Any]:
     """
 
     # LLM 초기화
-    llm_model = os.getenv("OLLAMA_LLM_MODEL", "gemma2:27b")
-    llm = ChatOllama(
-        model=llm_model,
-        base_url=os.getenv("OLLAMA_BASE_URL", "http://localhost:11434"),
-        temperature=0
-    )
+    llm = get_llm("confirm_ticket", temperature=0)
 
     # 대화 내용 포맷팅
     conversation_history = []
@@ -14,12 +14,12 @@ from datetime import datetime
 import uuid
 from typing import Dict, Any
 
-from langchain_ollama import ChatOllama
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import AIMessage
 from dotenv import load_dotenv
 
 from src.models.state import SupportState
+from src.services.llm_provider import get_llm
 from src.utils.state_reset import reset_conversation_state
 
 # 환경 변수 로드
@@ -40,12 +40,7 @@ def create_ticket_node(state: SupportState) -> Dict[str, Any]:
     """
 
     # LLM 초기화
-    llm_model = os.getenv("OLLAMA_LLM_MODEL", "gemma2:27b")
-    llm = ChatOllama(
-        model=llm_model,
-        base_url=os.getenv("OLLAMA_BASE_URL", "http://localhost:11434"),
-        temperature=0
-    )
+    llm = get_llm("create_ticket", temperature=0)
 
     # 대화 내용 포맷팅
     conversation = "\n".join([
@@ -1,6 +1,7 @@
 """Evaluate Status Node - 상태 평가
 
 사용자 응답을 분석하여 문제 해결 여부를 판단합니다.
+LLM 판단은 로그로 남고, 이를 학습한 판단 모델(src.services.decision_model)이 확실한 입력은 LLM 없이 판단합니다.
 """
 
 import sys
@@ -8,21 +9,24 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-import os
 import json
 from typing import Dict, Any
 
-from langchain_ollama import ChatOllama
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import AIMessage
 from dotenv import load_dotenv
 
 from src.models.state import SupportState
+from src.services.llm_provider import get_llm
+from src.services.decision_model import get_decision_router
 from src.utils.state_reset import reset_conversation_state
 
 # 환경 변수 로드
 load_dotenv()
 
+# 프롬프트 / 응답 후처리를 바꾸면 올림 (이 노드의 LLM 응답 캐시 무효화)
+PROMPT_VERSION = "1"
+
 
 def evaluate_status_node(state: SupportState) -> Dict[str, Any]:
     """
@@ -40,12 +44,7 @@ def evaluate_status_node(state: SupportState) -> Dict[str, Any]:
     # print(f"[Evaluate] 시작 - current_step={state.get('current_step')}, total_steps={len(state.get('solution_steps', []))}")  # 디버그
 
     # LLM 초기화
-    llm_model = os.getenv("OLLAMA_LLM_MODEL", "gemma2:27b")
-    llm = ChatOllama(
-        model=llm_model,
-        base_url=os.getenv("OLLAMA_BASE_URL", "http://localhost:11434"),
-        temperature=0
-    )
+    llm = get_llm("evaluate_status", temperature=0, cache=True, prompt_version=PROMPT_VERSION)
 
     # 마지막 사용자 응답 가져오기
     last_user_message = ""
@@ -155,10 +154,12 @@ JSON 형식으로만 응답:
 위 응답을 분석하여 JSON으로 판단 결과를 출력하세요.""")
     ])
 
-    try:
+    step_context = str(current_step) if current_step else "N/A"
+
+    def ask_llm() -> Dict[str, Any]:
         response = llm.invoke(
             prompt.format_messages(
-                current_step=str(current_step) if current_step else "N/A",
+                current_step=step_context,
                 user_response=last_user_message
             )
         )
@@ -170,7 +171,11 @@ JSON 형식으로만 응답:
             if content.startswith("json"):
                 content = content[4:].strip()
 
-        evaluation = json.loads(content)
+        return json.loads(content)
+
+    try:
+        # 판단 모델이 확실하면 모델, 아니면 LLM (LLM 판단은 학습용 로그로 기록)
+        evaluation = get_decision_router().decide("evaluate_status", last_user_message, step_context, ask_llm)
         decision = evaluation.get("decision", "continue")
 
         if decision == "resolved":
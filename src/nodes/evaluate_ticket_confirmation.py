@@ -1,6 +1,7 @@
 """Evaluate Ticket Confirmation - 티켓 확인 평가
 
 사용자의 티켓 등록 의사를 평가합니다.
+LLM 판단은 로그로 남고, 이를 학습한 판단 모델(src.services.decision_model)이 짧고 확실한 응답은 LLM 없이 판단합니다.
 """
 
 import sys
@@ -8,14 +9,45 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-import os
 import json
 from typing import Dict, Any
 from langchain_core.messages import AIMessage
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_ollama import ChatOllama
 
 from src.models.state import SupportState
+from src.services.llm_provider import get_llm
+from src.services.decision_model import get_decision_router
+
+# 프롬프트 / 응답 후처리를 바꾸면 올림 (이 노드의 LLM 응답 캐시 무효화)
+PROMPT_VERSION = "2"
+
+# 판단 모델은 이 길이 이하의 응답만 판단 (긴 응답은 추가 정보 추출이 필요하므로 LLM)
+SHORT_REPLY_CHARS = 15
+
+# 확인 요청 메시지(confirm_ticket)에서 등록될 문의 요약으로 읽는 줄
+TICKET_SUMMARY_FIELDS = ("**제목**", "**문의 내용**", "**핵심 문제**")
+
+
+def pending_ticket_summary(state: SupportState) -> str:
+    """
+    확인 요청 중인 문의 요약 (판단 문맥 - 프롬프트와 판단 모델 특징에 사용)
+
+    마지막 상담원 메시지(confirm_ticket의 확인 요청)에서 제목 / 문의 내용 줄을 읽음
+
+    Returns:
+        "제목: ... / 핵심 문제: ..." (확인 요청이 없으면 "N/A")
+    """
+    for msg in reversed(state["messages"]):
+        if msg.type == "ai":
+            lines = [
+                line.strip().replace("**", "")
+                for line in msg.content.splitlines()
+                if line.strip().startswith(TICKET_SUMMARY_FIELDS)
+            ]
+            if lines:
+                return " / ".join(lines)
+            break
+    return "N/A"
 
 
 def evaluate_ticket_confirmation_node(state: SupportState) -> Dict[str, Any]:
@@ -31,12 +63,7 @@ def evaluate_ticket_confirmation_node(state: SupportState) -> Dict[str, Any]:
     """
 
     # LLM 초기화
-    llm_model = os.getenv("OLLAMA_LLM_MODEL", "gemma2:27b")
-    llm = ChatOllama(
-        model=llm_model,
-        base_url=os.getenv("OLLAMA_BASE_URL", "http://localhost:11434"),
-        temperature=0
-    )
+    llm = get_llm("evaluate_ticket_confirmation", temperature=0, cache=True, prompt_version=PROMPT_VERSION)
 
     # 마지막 사용자 응답 가져오기
     last_user_message = ""
@@ -45,6 +72,8 @@ def evaluate_ticket_confirmation_node(state: SupportState) -> Dict[str, Any]:
             last_user_message = msg.content
             break
 
+    ticket_context = pending_ticket_summary(state)
+
     # LLM 프롬프트
     prompt = ChatPromptTemplate.from_messages([
         ("system", """당신은 사용자의 의사를 정확히 파악하는 전문가입니다.
@@ -65,13 +94,13 @@ JSON 형식으로 응답하세요:
   "reason": "판단 이유",
   "additional_info": "사용자가 덧붙인 추가 정보 (없으면 null)"
 }}"""),
-        ("user", f"사용자 응답: {last_user_message}")
+        ("user", "등록될 문의: {ticket_context}\n사용자 응답: {user_response}")
     ])
 
-    try:
+    def ask_llm() -> Dict[str, Any]:
         # LLM 호출
         chain = prompt | llm
-        response = chain.invoke({})
+        response = chain.invoke({"ticket_context": ticket_context, "user_response": last_user_message})
         content = response.content.strip()
 
         # JSON 파싱 (코드 블록 제거)
@@ -80,7 +109,17 @@ JSON 형식으로 응답하세요:
             if content.startswith("json"):
                 content = content[4:].strip()
 
-        evaluation = json.loads(content)
+        return json.loads(content)
+
+    try:
+        # 짧은 응답은 판단 모델이 확실하면 모델, 아니면 LLM (LLM 판단은 학습용 로그로 기록)
+        evaluation = get_decision_router().decide(
+            "evaluate_ticket_confirmation",
+            last_user_message,
+            ticket_context,
+            ask_llm,
+            allow_model=len(last_user_message.strip()) <= SHORT_REPLY_CHARS
+        )
         decision = evaluation.get("decision", "unclear")
 
         if decision == "yes":
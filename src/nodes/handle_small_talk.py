@@ -9,12 +9,11 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from typing import Dict, Any
-import os
 from langchain_core.messages import AIMessage
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_ollama import ChatOllama
 
 from src.models.state import SupportState
+from src.services.llm_provider import get_llm
 
 
 def handle_small_talk_node(state: SupportState) -> Dict[str, Any]:
@@ -31,12 +30,7 @@ def handle_small_talk_node(state: SupportState) -> Dict[str, Any]:
     """
 
     # LLM 초기화
-    llm_model = os.getenv("OLLAMA_LLM_MODEL", "gemma2:27b")
-    llm = ChatOllama(
-        model=llm_model,
-        base_url=os.getenv("OLLAMA_BASE_URL", "http://localhost:11434"),
-        temperature=0.7  # 약간의 창의성 허용
-    )
+    llm = get_llm("handle_small_talk", temperature=0.7)  # 약간의 창의성 허용
 
     # 마지막 사용자 메시지 가져오기
     last_user_message = ""
@@ -13,6 +13,7 @@ import uuid
 from typing import Dict, Any
 
 from src.models.state import SupportState
+from src.services.tenant_shards import resolve_tenant
 
 
 def initialize_node(state: SupportState) -> Dict[str, Any]:
@@ -47,6 +48,10 @@ def initialize_node(state: SupportState) -> Dict[str, Any]:
         if "user_id" not in state or not state.get("user_id"):
             state["user_id"] = "anonymous"
 
+    # 테넌트 키 검증 - 잘못된 키(URL 입력 등)는 경고 후 기본 인덱스 (검색 노드가 실패하지 않도록)
+    if state.get("tenant_id"):
+        state["tenant_id"] = resolve_tenant(state["tenant_id"])
+
     # 현재 쿼리 추출 (마지막 사용자 메시지)
     current_query = ""
     if state.get("messages"):
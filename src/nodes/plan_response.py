@@ -8,19 +8,73 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-import os
 import json
-from typing import Dict, Any
+from typing import Dict, Any, List
 
-from langchain_ollama import ChatOllama
 from langchain_core.prompts import ChatPromptTemplate
 from dotenv import load_dotenv
 
 from src.models.state import SupportState
+from src.services.llm_provider import get_llm
+from src.services.retrieval import get_retrieval_service
 
 # 환경 변수 로드
 load_dotenv()
 
+# 프롬프트 / 응답 후처리를 바꾸면 올림 (이 노드의 LLM 응답 캐시 무효화)
+PROMPT_VERSION = "1"
+
+
+def relevance_label(doc: Dict) -> str:
+    """프롬프트 문서 헤더의 점수 표시 (어휘 결과 경로 문서는 거리 대신 어휘 점수)"""
+    if doc.get("score") is not None:
+        return f"관련도: {doc['score']:.3f}"
+    return f"어휘 일치도: {doc.get('lexical_score', 0.0):.3f}"
+
+
+def format_docs_context(retrieved_docs: List[Dict], retrieved_solutions: List[Dict]) -> str:
+    """
+    프롬프트용 문서 컨텍스트 생성
+
+    - 해결 방법 하위 문서가 있으면 FAQ별로 선택된 방법만 잘리지 않게 포함
+      (선택된 방법이 없는 FAQ는 제외)
+    - 없으면 기존처럼 FAQ 본문 앞 500자 사용
+
+    Args:
+        retrieved_docs: 검색된 FAQ 문서들 (검색 순위 순)
+        retrieved_solutions: 선택된 해결 방법들 (parent_id로 FAQ 연결)
+
+    Returns:
+        프롬프트에 넣을 문서 컨텍스트
+    """
+    solutions_by_parent: Dict[str, List[Dict]] = {}
+    for solution in retrieved_solutions:
+        solutions_by_parent.setdefault(solution["parent_id"], []).append(solution)
+
+    sections = []
+    for doc in retrieved_docs:
+        solutions = solutions_by_parent.get(doc["id"])
+        if not solutions:
+            continue
+        # FAQ 안에서는 원래 방법 순서 유지 (간단한 방법이 앞에 오도록 작성되어 있음)
+        methods = "\n".join(s["content"] for s in sorted(solutions, key=lambda s: s["method"]))
+        sections.append(
+            f"[문서 {len(sections)+1}] ({relevance_label(doc)})\n"
+            f"제목: {doc['title']}\n"
+            f"카테고리: {doc['category']}\n"
+            f"해결 방법:\n{methods}"
+        )
+    if sections:
+        return "\n\n".join(sections)
+
+    return "\n\n".join([
+        f"[문서 {i+1}] ({relevance_label(doc)})\n"
+        f"제목: {doc['title']}\n"
+        f"카테고리: {doc['category']}\n"
+        f"내용:\n{doc['content'][:500]}..."  # 처음 500자만
+        for i, doc in enumerate(retrieved_docs)
+    ])
+
 
 def plan_response_node(state: SupportState) -> Dict[str, Any]:
     """
@@ -36,12 +90,7 @@ def plan_response_node(state: SupportState) -> Dict[str, Any]:
     """
 
     # LLM 초기화
-    llm_model = os.getenv("OLLAMA_LLM_MODEL", "gemma2:27b")
-    llm = ChatOllama(
-        model=llm_model,
-        base_url=os.getenv("OLLAMA_BASE_URL", "http://localhost:11434"),
-        temperature=0
-    )
+    llm = get_llm("plan_response", temperature=0, cache=True, prompt_version=PROMPT_VERSION)
 
     # 검색된 문서가 없는 경우 - 바로 티켓 생성 플로우로
     if not state["retrieved_docs"]:
@@ -55,14 +104,13 @@ def plan_response_node(state: SupportState) -> Dict[str, Any]:
 
         return state
 
-    # 검색된 문서들 포맷팅
-    docs_context = "\n\n".join([
-        f"[문서 {i+1}] (관련도: {doc['score']:.3f})\n"
-        f"제목: {doc['title']}\n"
-        f"카테고리: {doc['category']}\n"
-        f"내용:\n{doc['content'][:500]}..."  # 처음 500자만
-        for i, doc in enumerate(state["retrieved_docs"])
-    ])
+    # 상태에는 참조만 있으므로 프롬프트에 필요한 본문을 문서 저장소에서 조회
+    retrieval_service = get_retrieval_service(state.get("tenant_id"))
+    retrieved_docs = retrieval_service.hydrate(state["retrieved_docs"])
+    retrieved_solutions = retrieval_service.hydrate_solutions(state.get("retrieved_solutions") or [])
+
+    # 검색된 문서들 포맷팅 (질의와 가장 가까운 해결 방법만 전체 단계 포함)
+    docs_context = format_docs_context(retrieved_docs, retrieved_solutions)
 
     # 프롬프트 생성
     prompt = ChatPromptTemplate.from_messages([
@@ -124,7 +172,7 @@ def plan_response_node(state: SupportState) -> Dict[str, Any]:
         # 파싱 실패시 검색된 문서의 첫 번째 항목을 기본 단계로 사용
         print(f"Warning: LLM 응답 파싱 실패: {e}")
 
-        first_doc = state["retrieved_docs"][0]
+        first_doc = retrieved_docs[0] if retrieved_docs else dict(state["retrieved_docs"][0], content="")
         state["solution_steps"] = [{
             "step": 1,
             "action": first_doc["title"],
@@ -9,12 +9,11 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from typing import Dict, Any
-import os
 from langchain_core.messages import AIMessage
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_ollama import ChatOllama
 
 from src.models.state import SupportState
+from src.services.llm_provider import get_llm
 
 
 def respond_step_node(state: SupportState) -> Dict[str, Any]:
@@ -62,12 +61,7 @@ def respond_step_node(state: SupportState) -> Dict[str, Any]:
             search_info += f"가장 관련성 높은 문서: **{docs[0]['title']}** (카테고리: {docs[0]['category']})\n\n"
 
         # LLM 초기화
-        llm_model = os.getenv("OLLAMA_LLM_MODEL", "gemma2:27b")
-        llm = ChatOllama(
-            model=llm_model,
-            base_url=os.getenv("OLLAMA_BASE_URL", "http://localhost:11434"),
-            temperature=0.3  # 명확한 지시를 위해 낮은 온도
-        )
+        llm = get_llm("respond_step", temperature=0.3)  # 명확한 지시를 위해 낮은 온도
 
         # 단계별 응답 프롬프트
         prompt = ChatPromptTemplate.from_messages([
@@ -1,6 +1,8 @@
 """Search Knowledge Node - RAG 검색
 
 Chroma 벡터 스토어에서 관련 FAQ를 검색합니다.
+답변 완료 티켓 컬렉션이 구축되어 있으면 FAQ와 동시에 검색하여 함께 병합합니다.
+벡터 스토어는 프로세스 공유 검색 서비스(src.services.retrieval)를 통해 재사용합니다.
 """
 
 import sys
@@ -9,79 +11,221 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 import os
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 
-from langchain_chroma import Chroma
-from langchain_ollama import OllamaEmbeddings
 from dotenv import load_dotenv
 
 from src.models.state import SupportState
+from src.services.retrieval import get_retrieval_service
+from src.services.solution_index import solution_ref
+from src.services.document_store import metadata_ref
 
 # 환경 변수 로드
 load_dotenv()
 
+SEARCH_K = 5            # 검색 후보 수 (임계값 필터링 전)
+MAX_RETRIEVED_DOCS = 3  # retrieved_docs 최대 개수
+DISTANCE_THRESHOLD = 0.9  # 임계값 (0.82~0.86 정도의 점수가 나와서 0.9로 상향 조정)
+
+
+def select_documents(
+    retrieval_service,
+    docs_with_scores: List[Tuple[str, float]],
+    lexical: bool = False
+) -> List[Dict]:
+    """
+    검색 결과 → retrieved_docs 참조 리스트 (FAQ / 티켓 문서 모두)
+
+    - 벡터 / 하이브리드 결과 (문서 ID, 거리): 거리 임계값(DISTANCE_THRESHOLD) 이하만
+    - 어휘 결과 (문서 ID, 어휘 점수, lexical=True): 벡터 거리가 없으므로 어휘 점수가
+      검색 서비스의 lexical_min_score 이상인 것만, 참조의 score는 None이고 어휘 점수는 lexical_score에 저장
+    최대 MAX_RETRIEVED_DOCS개, 상태에는 참조(ID, 점수)와 표시용 제목/카테고리만 저장
+    (참조는 메타데이터만 읽어 만들고, 본문은 문서 저장소에서 필요할 때 조회)
+    """
+    if lexical:
+        passed = [(doc_id, score) for doc_id, score in docs_with_scores if score >= retrieval_service.lexical_min_score]
+    else:
+        passed = [(doc_id, score) for doc_id, score in docs_with_scores if score <= DISTANCE_THRESHOLD]
+    passed = passed[:MAX_RETRIEVED_DOCS]
+
+    metadatas = retrieval_service.get_metadatas([doc_id for doc_id, _ in passed])
+    if lexical:
+        return [metadata_ref(metadatas[doc_id], lexical_score=score) for doc_id, score in passed if doc_id in metadatas]
+    return [metadata_ref(metadatas[doc_id], score) for doc_id, score in passed if doc_id in metadatas]
+
+
+def best_distance(docs_with_scores: List[Tuple[str, float]], lexical: bool = False) -> Optional[float]:
+    """
+    최고 점수 (낮을수록 좋음 - 하이브리드 검색은 RRF 순서이므로 첫 문서가 아닌 최소 거리)
+    어휘 결과는 벡터 거리가 없으므로 None
+    """
+    if lexical:
+        return None
+    return min(score for _, score in docs_with_scores) if docs_with_scores else 1.0
+
+
+def select_solutions(retrieval_service, query: str, retrieved_docs: List[Dict], lexical: bool = False) -> List[Dict]:
+    """검색된 문서의 해결 방법 하위 문서 선택 → 상태에 담을 참조 리스트 (실패 시 빈 리스트)"""
+    try:
+        solutions = retrieval_service.best_solutions(query, retrieved_docs, lexical=lexical)
+    except Exception as e:
+        print(f"[WARNING] 해결 방법 선택 실패: {e}")
+        solutions = []
+    return [solution_ref(solution) for solution in solutions]
+
+
+def search_knowledge_batch(
+    queries: List[str],
+    filter: Optional[Dict] = None,
+    batch_size: Optional[int] = None,
+    tenant: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    여러 질의 일괄 검색 (캐시 예열 / 검색 평가 / 티켓 중복 탐지 등 오프라인 작업용)
+
+    search_knowledge_node와 같은 검색/임계값/필터 대체 규칙을 적용하되
+    질의 임베딩은 배치로, 벡터 점수는 다중 쿼리 검색 한 번으로 계산합니다.
+    답변 완료 티켓 컬렉션이 있으면 함께 검색하여 노드와 같은 출처 가중치로 병합합니다.
+    (결과 캐시, 해결 방법 선택, 컬렉션 마감 시간은 적용하지 않음)
+
+    Args:
+        queries: 질의 리스트
+        filter: 메타데이터 사전 필터 (임계값을 통과한 문서가 없는 질의는 전체 범위로 다시 검색)
+        batch_size: 임베딩 배치 크기 (None이면 EMBED_BATCH_SIZE)
+        tenant: 테넌트 키 (해당 테넌트 샤드에서 검색)
+
+    Returns:
+        질의 순서대로 {"query", "retrieved_docs", "relevance_score"}
+        - retrieved_docs 항목은 search_knowledge_node와 같은 필드 (id, title, category, score, source,
+          어휘 결과는 lexical_score)
+    """
+    retrieval_service = get_retrieval_service(tenant)
+    results, lexical = retrieval_service.batch_search_collections(
+        queries, k=SEARCH_K, filter=filter, batch_size=batch_size
+    )
+    selected = [select_documents(retrieval_service, docs, lexical=i in lexical) for i, docs in enumerate(results)]
+
+    def research(indices: List[int], search_filter: Optional[Dict]) -> None:
+        """노드와 같이 어휘 결과 경로 없이 하이브리드 검색으로 다시 검색"""
+        retried, _ = retrieval_service.batch_search_collections(
+            [queries[i] for i in indices], k=SEARCH_K, filter=search_filter, batch_size=batch_size, decisive=False
+        )
+        for i, docs in zip(indices, retried):
+            results[i] = docs
+            lexical.discard(i)
+            selected[i] = select_documents(retrieval_service, docs)
+
+    # 어휘 점수를 통과한 문서가 없는 어휘 결과 → 같은 필터로 하이브리드 검색
+    fallback = sorted(i for i in lexical if not selected[i])
+    if fallback:
+        research(fallback, filter)
+
+    if filter:
+        # 임계값을 통과한 문서가 없으면 전체 범위로 다시 검색
+        retry = [i for i, docs in enumerate(selected) if not docs]
+        if retry:
+            research(retry, None)
+
+    return [
+        {
+            "query": query,
+            "retrieved_docs": selected[i],
+            "relevance_score": best_distance(results[i], lexical=i in lexical),
+        }
+        for i, query in enumerate(queries)
+    ]
+
 
 def search_knowledge_node(state: SupportState) -> Dict[str, Any]:
     """
     RAG 검색 노드
-    - 벡터 스토어에서 관련 FAQ 검색
+    - 어휘 점수만으로 확실한 질의는 임베딩 없이 결과 사용 (결과 캐시도 건너뜀)
+    - 시맨틱 결과 캐시 적중 시 인덱스 검색 생략
+    - 어휘(n-gram) + 벡터 하이브리드 검색으로 관련 FAQ 검색
+      (답변 완료 티켓 컬렉션이 있으면 동시 검색 후 출처 가중치로 병합, 전체 마감 시간 SEARCH_DEADLINE_MS)
     - 유사도 점수 계산
+    - 검색된 FAQ의 해결 방법 중 질의와 가장 가까운 것만 선택 (plan_response 프롬프트용)
 
     Args:
         state: 현재 상태
 
     Returns:
-        업데이트된 상태 (retrieved_docs, relevance_score 포함)
+        업데이트된 상태 (retrieved_docs, retrieved_solutions 참조, relevance_score 포함)
     """
 
-    # 벡터 스토어 로드
-    embedding_model = os.getenv("OLLAMA_EMBEDDING_MODEL", "bge-m3-korean")
-    embeddings = OllamaEmbeddings(
-        model=embedding_model,
-        base_url=os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
-    )
+    # 공유 검색 서비스 (프로세스당 한 번만 로드, 테넌트가 지정되면 해당 샤드)
+    retrieval_service = get_retrieval_service(state.get("tenant_id"))
 
-    vectorstore = Chroma(
-        persist_directory=os.getenv("VECTORSTORE_PATH", "data/vectorstore"),
-        embedding_function=embeddings,
-        collection_name="faq_collection"
-    )
+    query = state["current_query"]
+    search_filter = state.get("search_filter")
+    # 사전 필터는 한 번의 검색에만 적용
+    state["search_filter"] = None
+
+    # 어휘 점수만으로 확실한 질의("계정잠금", "VPN" 등) - 임베딩 없이 바로 결과 사용
+    # (시맨틱 결과 캐시 조회/저장도 질의 임베딩이 필요하므로 이 경로에서는 건너뜀)
+    # 벡터 거리가 없으므로 어휘 점수로만 거르고 relevance_score는 None
+    lexical_scores = retrieval_service.decisive_lexical_ids(query, k=SEARCH_K, filter=search_filter)
+    retrieved_docs = select_documents(retrieval_service, lexical_scores, lexical=True) if lexical_scores else []
+    if retrieved_docs:
+        state["retrieved_docs"] = retrieved_docs
+        state["retrieved_solutions"] = select_solutions(retrieval_service, query, retrieved_docs, lexical=True)
+        state["relevance_score"] = best_distance(lexical_scores, lexical=True)
+        state["status"] = "planning"
+        return state
+
+    # 시맨틱 결과 캐시 - 임베딩이 가까운 이전 질의의 검색 결과를 인덱스 검색 없이 재사용
+    # (결과가 없던 질의도 캐시되어 plan_response에서 바로 티켓 확인으로 진행)
+    try:
+        cached = retrieval_service.cached_results(query, filter=search_filter)
+    except Exception as e:
+        print(f"[WARNING] 검색 결과 캐시 조회 실패: {e}")
+        cached = None
+
+    if cached is not None:
+        state["retrieved_docs"] = cached["retrieved_docs"]
+        state["retrieved_solutions"] = cached.get("retrieved_solutions", [])
+        state["relevance_score"] = cached["relevance_score"]
+        state["status"] = "planning"
+        return state
 
     # 유사 문서 검색 (상위 5개 - 필터링 전)
-    query = state["current_query"]
-    docs_with_scores = vectorstore.similarity_search_with_score(
+    # 어휘(n-gram) + 벡터 결과를 RRF로 결합, 어휘 점수가 확실하면 임베딩 생략
+    # FAQ / 티켓 컬렉션을 동시에 검색하고 정규화 점수 × 출처 가중치로 병합
+    # 본문 없이 (문서 ID, 거리)만 반환 - 본문은 plan_response에서 문서 저장소로 조회
+    docs_with_scores = retrieval_service.search_collections(
         query,
-        k=5
+        k=SEARCH_K,
+        filter=search_filter
     )
 
     # 유사도 임계값 필터링 (코사인 거리 기준)
     # 0.0 = 완전 동일, 0.3 = 매우 유사, 0.5 = 관련성 있음
     relevance_threshold = float(os.getenv("RELEVANCE_THRESHOLD", "0.5"))
 
-    # 검색 결과 저장 (임계값 이하만)
-    retrieved_docs = []
-    threshold = 0.9  # 임계값 (0.82~0.86 정도의 점수가 나와서 0.9로 상향 조정)
-
-    for doc, score in docs_with_scores:
-        if score <= threshold:
-            retrieved_docs.append({
-                "id": doc.metadata.get("id", ""),
-                "category": doc.metadata.get("category", ""),
-                "title": doc.metadata.get("title", ""),
-                "content": doc.page_content,
-                "tags": doc.metadata.get("tags", []),
-                "score": float(score),
-                "source": doc.metadata.get("source", "faq"),
-                "helpful_count": doc.metadata.get("helpful_count", 0)
-            })
-
-    # 최대 3개까지만 사용
-    retrieved_docs = retrieved_docs[:3]
+    # 필터 범위에서 임계값을 통과한 문서가 없으면 전체 범위로 다시 검색
+    if search_filter and not any(score <= DISTANCE_THRESHOLD for _, score in docs_with_scores):
+        docs_with_scores = retrieval_service.search_collections(query, k=SEARCH_K)
 
+    # 검색 결과 저장 (임계값 이하만, 최대 3개)
+    retrieved_docs = select_documents(retrieval_service, docs_with_scores)
     state["retrieved_docs"] = retrieved_docs
 
+    # 해결 방법 하위 문서 선택 (참조만 저장)
+    state["retrieved_solutions"] = select_solutions(retrieval_service, query, retrieved_docs)
+
     # 최고 점수 저장 (낮을수록 좋음 - 코사인 거리)
-    state["relevance_score"] = docs_with_scores[0][1] if docs_with_scores else 1.0
+    state["relevance_score"] = best_distance(docs_with_scores)
     state["status"] = "planning"
 
+    try:
+        retrieval_service.cache_results(
+            query,
+            retrieved_docs,
+            state["relevance_score"],
+            filter=search_filter,
+            retrieved_solutions=state["retrieved_solutions"]
+        )
+    except Exception as e:
+        print(f"[WARNING] 검색 결과 캐시 저장 실패: {e}")
+
     return state
@@ -0,0 +1,92 @@
+"""서비스 레이어
+
+노드들이 공유하는 검색 등 프로세스 단위 서비스를 정의하는 모듈입니다.
+"""
+
+from .embedding_cache import EmbeddingCache, CachedEmbeddings, DiskEmbeddingCache, normalize_query
+from .metadata_index import MetadataIndex, matches_filter
+from .embedding_pipeline import EmbeddingPipeline, iter_batches
+from .faq_stream import CommitWatermark, iter_faq_jsonl, iter_faq_records
+from .vector_index import VectorIndex, ChromaIndex, NumpyIndex
+from .index_file import MmapIndex, IndexFileWriter, write_index_file, export_index_file
+from .ivf_index import IVFIndex, evaluate_recall
+from .quantized_index import QuantizedIndex, quantize, compare_quantization
+from .result_cache import SemanticResultCache
+from .document_store import DocumentStore, DocumentStoreFile, DocumentStoreWriter, write_document_store, document_to_dict, document_ref, metadata_ref
+from .solution_index import create_solution_documents, split_solutions, render_solution
+from .hashed_embeddings import HashedNgramEmbeddings
+from .index_reload import IndexReloader, publish_index_version, prune_index_versions, read_index_pointer
+from .tenant_shards import ShardRegistry, normalize_tenant, resolve_tenant, tenant_directory, list_tenants
+from .ticket_index import load_answered_tickets, ticket_to_record, is_ticket_id
+from .retrieval import RetrievalService, get_retrieval_service, reset_retrieval_service
+from .llm_cache import LLMResponseCache
+from .llm_provider import LLMProvider, get_llm_provider, get_llm, reset_llm_provider
+from .intent_rules import match_intent
+from .intent_knn import IntentKNNClassifier, get_intent_classifier, reset_intent_classifier
+from .decision_model import DecisionModel, DecisionRouter, get_decision_router, reset_decision_router
+
+__all__ = [
+    "EmbeddingCache",
+    "CachedEmbeddings",
+    "DiskEmbeddingCache",
+    "normalize_query",
+    "MetadataIndex",
+    "matches_filter",
+    "EmbeddingPipeline",
+    "iter_batches",
+    "CommitWatermark",
+    "iter_faq_jsonl",
+    "iter_faq_records",
+    "VectorIndex",
+    "ChromaIndex",
+    "NumpyIndex",
+    "MmapIndex",
+    "IndexFileWriter",
+    "write_index_file",
+    "export_index_file",
+    "IVFIndex",
+    "evaluate_recall",
+    "QuantizedIndex",
+    "quantize",
+    "compare_quantization",
+    "SemanticResultCache",
+    "DocumentStore",
+    "DocumentStoreFile",
+    "DocumentStoreWriter",
+    "write_document_store",
+    "document_to_dict",
+    "document_ref",
+    "metadata_ref",
+    "create_solution_documents",
+    "split_solutions",
+    "render_solution",
+    "HashedNgramEmbeddings",
+    "IndexReloader",
+    "publish_index_version",
+    "prune_index_versions",
+    "read_index_pointer",
+    "ShardRegistry",
+    "normalize_tenant",
+    "resolve_tenant",
+    "tenant_directory",
+    "list_tenants",
+    "load_answered_tickets",
+    "ticket_to_record",
+    "is_ticket_id",
+    "RetrievalService",
+    "get_retrieval_service",
+    "reset_retrieval_service",
+    "LLMResponseCache",
+    "LLMProvider",
+    "get_llm_provider",
+    "get_llm",
+    "reset_llm_provider",
+    "match_intent",
+    "IntentKNNClassifier",
+    "get_intent_classifier",
+    "reset_intent_classifier",
+    "DecisionModel",
+    "DecisionRouter",
+    "get_decision_router",
+    "reset_decision_router",
+]
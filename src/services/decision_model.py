@@ -0,0 +1,493 @@
+"""Decision Model - 평가 노드용 경량 판단 모델 (LLM 판단 증류)
+
+evaluate_status(resolved / continue / escalate)와 evaluate_ticket_confirmation(yes / no / unclear)의
+LLM 판단을 (사용자 메시지, 단계 문맥, LLM 판단) 로그로 남기고, 이를 학습한 작은 로컬 분류기로
+확실한 입력은 LLM 호출 없이 판단합니다.
+- 로그: DECISION_LOG_DIR/<노드>.jsonl (LLM이 판단한 경우만 - 학습 라벨)
+- 모델: 메시지 / 단계 문맥의 문자 n-gram 해싱 특징(HashedNgramEmbeddings, 블록별) + NumPy 다항 로지스틱 회귀
+- 같은 메시지("네" 등)를 문맥에 따라 LLM이 다르게 판단한 기록이 있으면 그 메시지는 모델이 답하지 않음
+- 저장: DECISION_MODEL_DIR/<노드>/<버전>.npz + current.json 포인터 (학습: scripts/train_decision_model.py)
+- 실행: 최고 확률이 모델 임계값 이상이면 모델이 답하고, 아니면 LLM에 위임
+- 모니터: 모델이 답할 수 있는 요청 중 DECISION_SHADOW_RATE 비율은 LLM도 호출하여 일치율 집계
+"""
+
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import os
+import json
+import time
+import random
+import threading
+from collections import deque
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+
+from src.services.hashed_embeddings import HashedNgramEmbeddings
+from src.services.embedding_cache import normalize_query
+
+# 환경 변수 로드
+load_dotenv()
+
+DECISION_LABELS = {
+    "evaluate_status": ("resolved", "continue", "escalate"),
+    "evaluate_ticket_confirmation": ("yes", "no", "unclear"),
+}
+MODEL_POINTER_FILE = "current.json"
+AGREEMENT_WINDOW = 200  # 일치율 계산에 쓰는 최근 섀도 비교 수
+
+
+def _log_dir(log_dir: Optional[str] = None) -> str:
+    return log_dir or os.getenv("DECISION_LOG_DIR", "data/decision_logs")
+
+
+def _model_dir(model_dir: Optional[str] = None) -> str:
+    return model_dir or os.getenv("DECISION_MODEL_DIR", "data/decision_models")
+
+
+def load_decision_log(node: str, log_dir: Optional[str] = None) -> List[Dict]:
+    """
+    노드의 판단 로그 로드 (학습 / 리포트용)
+
+    - 라벨이 노드의 판단 집합에 없는 줄은 무시
+    - 같은 (정규화 메시지, 문맥)은 마지막 판단만 사용 (응답 캐시 적중으로 반복 기록된 항목 제거)
+
+    Returns:
+        [{"text", "context", "decision", "logged_at"}, ...] (기록 순서)
+    """
+    path = os.path.join(_log_dir(log_dir), f"{node}.jsonl")
+    if not os.path.exists(path):
+        return []
+
+    labels = set(DECISION_LABELS[node])
+    records: Dict[Tuple[str, str], Dict] = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("decision") not in labels:
+                continue
+            key = (normalize_query(record.get("text", "")), record.get("context", ""))
+            records.pop(key, None)
+            records[key] = record
+    return list(records.values())
+
+
+class DecisionModel:
+    """문자 n-gram 로지스틱 회귀 판단 모델
+
+    Args:
+        node: 노드 이름
+        labels: 판단 라벨 (None이면 DECISION_LABELS[node])
+        dim: 메시지 해싱 특징 차원
+        ngram_sizes: 문자 n-gram 길이들
+        threshold: 모델이 답하는 최소 확률 (미만이면 LLM에 위임)
+        context_dim: 단계 문맥 해싱 특징 차원 (메시지 특징 뒤에 이어 붙임)
+    """
+
+    def __init__(
+        self,
+        node: str,
+        labels: Optional[Sequence[str]] = None,
+        dim: int = 2048,
+        ngram_sizes: Sequence[int] = (1, 2, 3),
+        threshold: float = 0.9,
+        context_dim: int = 512
+    ):
+        self.node = node
+        self.labels = list(labels or DECISION_LABELS[node])
+        self.dim = dim
+        self.ngram_sizes = tuple(ngram_sizes)
+        self.threshold = threshold
+        self.context_dim = context_dim
+        self.version = ""
+        self.meta: Dict = {}
+        self.conflicting: set = set()  # 문맥에 따라 LLM 판단이 갈린 정규화 메시지 (모델이 답하지 않음)
+        self.weights = np.zeros((dim + context_dim, len(self.labels)), dtype=np.float32)
+        self.bias = np.zeros(len(self.labels), dtype=np.float32)
+        self._featurizer = HashedNgramEmbeddings(dim=dim, ngram_sizes=self.ngram_sizes)
+        self._context_featurizer = (
+            HashedNgramEmbeddings(dim=context_dim, ngram_sizes=self.ngram_sizes) if context_dim else None
+        )
+
+    def featurize(self, texts: Sequence[str], contexts: Optional[Sequence[str]] = None) -> np.ndarray:
+        """
+        (메시지, 문맥) → 해싱 특징 행렬 (n, dim + context_dim)
+
+        메시지 / 문맥 블록을 각각 L2 정규화하여 이어 붙임 (문맥이 없으면 문맥 블록은 0)
+        """
+        features = np.asarray(self._featurizer.embed_documents(list(texts)), dtype=np.float32).reshape(-1, self.dim)
+        if self._context_featurizer is None:
+            return features
+        contexts = list(contexts) if contexts is not None else [""] * len(features)
+        context_features = np.zeros((len(contexts), self.context_dim), dtype=np.float32)
+        for i, context in enumerate(contexts):
+            if context:
+                context_features[i] = self._context_featurizer.embed_query(context)
+        return np.hstack([features, context_features])
+
+    def fit(
+        self,
+        texts: Sequence[str],
+        decisions: Sequence[str],
+        contexts: Optional[Sequence[str]] = None,
+        epochs: int = 400,
+        learning_rate: float = 4.0,
+        l2: float = 1e-4
+    ) -> "DecisionModel":
+        """
+        전체 배치 경사 하강법으로 학습 (클래스 빈도 역수 가중치 - 드문 판단도 학습되도록)
+
+        Args:
+            texts: 사용자 메시지
+            decisions: LLM 판단 (labels 중 하나)
+            contexts: 판단 당시 단계 문맥 (None이면 문맥 없음)
+        """
+        labels_by_text: Dict[str, set] = {}
+        for text, decision in zip(texts, decisions):
+            labels_by_text.setdefault(normalize_query(text), set()).add(decision)
+        self.conflicting = {key for key, labels in labels_by_text.items() if len(labels) > 1}
+
+        features = self.featurize(texts, contexts)
+        index = {label: i for i, label in enumerate(self.labels)}
+        targets = np.array([index[decision] for decision in decisions])
+        onehot = np.eye(len(self.labels), dtype=np.float32)[targets]
+
+        counts = np.bincount(targets, minlength=len(self.labels)).astype(np.float32)
+        class_weights = len(targets) / (len(self.labels) * np.maximum(counts, 1.0))
+        sample_weights = (class_weights[targets] / len(targets))[:, None]
+
+        for _ in range(epochs):
+            gradient = (self._softmax(features @ self.weights + self.bias) - onehot) * sample_weights
+            self.weights -= learning_rate * (features.T @ gradient + l2 * self.weights)
+            self.bias -= learning_rate * gradient.sum(axis=0)
+        return self
+
+    @staticmethod
+    def _softmax(logits: np.ndarray) -> np.ndarray:
+        logits = logits - logits.max(axis=1, keepdims=True)
+        exp = np.exp(logits)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    def predict_proba(self, texts: Sequence[str], contexts: Optional[Sequence[str]] = None) -> np.ndarray:
+        """메시지별 라벨 확률 (n, 라벨 수)"""
+        return self._softmax(self.featurize(texts, contexts) @ self.weights + self.bias)
+
+    def is_confident(self, text: str, confidence: float) -> bool:
+        """임계값 이상이고, 문맥에 따라 LLM 판단이 갈린 메시지가 아닌지"""
+        return confidence >= self.threshold and normalize_query(text) not in self.conflicting
+
+    def predict(self, text: str, context: str = "") -> Dict:
+        """{"decision", "confidence", "confident"(모델이 답해도 되는지)}"""
+        probabilities = self.predict_proba([text], [context])[0]
+        best = int(np.argmax(probabilities))
+        confidence = float(probabilities[best])
+        return {
+            "decision": self.labels[best],
+            "confidence": round(confidence, 4),
+            "confident": self.is_confident(text, confidence),
+        }
+
+    def save(self, model_dir: Optional[str] = None, version: Optional[str] = None) -> str:
+        """
+        버전 아티팩트로 저장 (<모델 디렉토리>/<노드>/<버전>.npz, 게시는 publish_decision_model)
+
+        Returns:
+            저장한 버전
+        """
+        directory = os.path.join(_model_dir(model_dir), self.node)
+        os.makedirs(directory, exist_ok=True)
+        if version is None:
+            base = time.strftime("%Y%m%dT%H%M%S")
+            version, n = base, 1
+            while os.path.exists(os.path.join(directory, f"{version}.npz")):
+                n += 1
+                version = f"{base}-{n}"
+
+        self.version = version
+        meta = dict(self.meta, node=self.node, version=version, dim=self.dim,
+                    ngram_sizes=list(self.ngram_sizes), threshold=self.threshold,
+                    context_dim=self.context_dim, conflicting=sorted(self.conflicting))
+        np.savez(
+            os.path.join(directory, f"{version}.npz"),
+            weights=self.weights,
+            bias=self.bias,
+            labels=np.array(self.labels),
+            meta=np.array(json.dumps(meta, ensure_ascii=False))
+        )
+        return version
+
+    @classmethod
+    def load(cls, path: str) -> "DecisionModel":
+        """아티팩트(.npz) 로드"""
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            model = cls(
+                meta["node"],
+                labels=[str(label) for label in data["labels"]],
+                dim=meta["dim"],
+                ngram_sizes=meta["ngram_sizes"],
+                threshold=meta["threshold"],
+                context_dim=meta.get("context_dim", 0)
+            )
+            model.weights = data["weights"].astype(np.float32)
+            model.bias = data["bias"].astype(np.float32)
+        model.version = meta["version"]
+        model.conflicting = set(meta.get("conflicting", []))
+        model.meta = meta
+        return model
+
+
+def publish_decision_model(node: str, version: str, model_dir: Optional[str] = None) -> None:
+    """노드의 현재 모델 포인터를 version으로 교체 (임시 파일에 쓴 뒤 교체)"""
+    directory = os.path.join(_model_dir(model_dir), node)
+    if not os.path.exists(os.path.join(directory, f"{version}.npz")):
+        raise FileNotFoundError(f"게시할 모델이 없습니다: {directory}/{version}.npz")
+
+    path = os.path.join(directory, MODEL_POINTER_FILE)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": version, "published_at": time.strftime("%Y-%m-%dT%H:%M:%S")}, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def load_decision_model(
+    node: str,
+    version: Optional[str] = None,
+    model_dir: Optional[str] = None
+) -> Optional[DecisionModel]:
+    """노드 모델 로드 (version이 None이면 게시된 현재 버전, 없으면 None)"""
+    directory = os.path.join(_model_dir(model_dir), node)
+    if version is None:
+        try:
+            with open(os.path.join(directory, MODEL_POINTER_FILE), "r", encoding="utf-8") as f:
+                version = json.load(f)["version"]
+        except (OSError, ValueError, KeyError):
+            return None
+    return DecisionModel.load(os.path.join(directory, f"{version}.npz"))
+
+
+def evaluate_against_llm(
+    model: DecisionModel,
+    records: Sequence[Dict],
+    thresholds: Sequence[float] = (0.5, 0.7, 0.8, 0.9, 0.95)
+) -> Dict:
+    """
+    로그된 LLM 판단 대비 모델 정확도 (오프라인 리포트)
+
+    Returns:
+        {"samples", "accuracy"(전체 일치율), "confusion"(LLM 판단 → 모델 판단 → 개수),
+         "thresholds": [{"threshold", "coverage"(모델이 답하는 비율), "accuracy"(그중 일치율)}]}
+    """
+    if not records:
+        return {"samples": 0, "accuracy": 0.0, "confusion": {}, "thresholds": []}
+
+    probabilities = model.predict_proba(
+        [record["text"] for record in records],
+        [record.get("context", "") for record in records]
+    )
+    predicted = [model.labels[i] for i in probabilities.argmax(axis=1)]
+    confidence = probabilities.max(axis=1)
+    # 문맥에 따라 판단이 갈린 메시지는 임계값과 무관하게 모델이 답하지 않음
+    eligible = np.array([normalize_query(record["text"]) not in model.conflicting for record in records])
+    expected = [record["decision"] for record in records]
+    correct = np.array([p == e for p, e in zip(predicted, expected)])
+
+    confusion = {label: {other: 0 for other in model.labels} for label in model.labels}
+    for p, e in zip(predicted, expected):
+        confusion[e][p] += 1
+
+    table = []
+    for threshold in thresholds:
+        answered = (confidence >= threshold) & eligible
+        table.append({
+            "threshold": threshold,
+            "coverage": round(float(answered.mean()), 4),
+            "accuracy": round(float(correct[answered].mean()), 4) if answered.any() else None,
+        })
+    return {
+        "samples": len(records),
+        "accuracy": round(float(correct.mean()), 4),
+        "confusion": confusion,
+        "thresholds": table,
+    }
+
+
+class DecisionRouter:
+    """평가 노드의 판단 경로 선택 (모델 / LLM) + 판단 로그 + 일치율 모니터
+
+    Args:
+        model_dir: 모델 디렉토리 (None이면 DECISION_MODEL_DIR)
+        log_dir: 판단 로그 디렉토리 (None이면 DECISION_LOG_DIR)
+        log_decisions: LLM 판단 로그 기록 여부 (None이면 DECISION_LOG)
+        shadow_rate: 모델이 답할 수 있는 요청 중 LLM도 호출하여 비교하는 비율 (None이면 DECISION_SHADOW_RATE)
+    """
+
+    def __init__(
+        self,
+        model_dir: Optional[str] = None,
+        log_dir: Optional[str] = None,
+        log_decisions: Optional[bool] = None,
+        shadow_rate: Optional[float] = None
+    ):
+        self.model_dir = _model_dir(model_dir)
+        self.log_dir = _log_dir(log_dir)
+        self.log_decisions = (
+            log_decisions if log_decisions is not None
+            else os.getenv("DECISION_LOG", "true").lower() == "true"
+        )
+        self.enabled = os.getenv("DECISION_MODEL", "true").lower() == "true"
+        self.shadow_rate = shadow_rate if shadow_rate is not None else float(os.getenv("DECISION_SHADOW_RATE", "0.05"))
+        self.alert_threshold = float(os.getenv("DECISION_AGREEMENT_ALERT", "0.9"))
+
+        self._models: Dict[str, Tuple[float, Optional[DecisionModel]]] = {}  # 노드 → (포인터 mtime, 모델)
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._agreement: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+        self._log_lock = threading.Lock()
+
+    def model(self, node: str) -> Optional[DecisionModel]:
+        """노드의 현재 모델 (포인터가 바뀌면 다시 로드 - 재학습 후 재시작 불필요)"""
+        pointer = os.path.join(self.model_dir, node, MODEL_POINTER_FILE)
+        try:
+            mtime = os.stat(pointer).st_mtime
+        except OSError:
+            return None
+
+        cached = self._models.get(node)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        try:
+            model = load_decision_model(node, model_dir=self.model_dir)
+        except Exception as e:
+            print(f"[WARNING] {node} 판단 모델 로드 실패: {e}")
+            model = None
+        with self._lock:
+            self._models[node] = (mtime, model)
+        return model
+
+    def decide(
+        self,
+        node: str,
+        text: str,
+        context: str,
+        ask_llm: Callable[[], Dict],
+        allow_model: bool = True
+    ) -> Dict:
+        """
+        판단 - 모델이 확실하면 모델, 아니면 LLM
+
+        Args:
+            node: 노드 이름
+            text: 사용자 메시지
+            context: 판단 문맥 (현재 단계 등 - 모델 특징으로 사용, 로그에 함께 기록)
+            ask_llm: LLM 판단 함수 ({"decision", "reason", ...} 반환, 실패 시 예외)
+            allow_model: False면 항상 LLM (노드가 LLM 전용 정보가 필요한 입력)
+
+        Returns:
+            LLM 응답 dict 또는 {"decision", "reason"} + "path"(model / llm)
+        """
+        model = self.model(node) if self.enabled and allow_model else None
+        prediction = model.predict(text, context) if model is not None else None
+
+        if prediction is not None and prediction["confident"] and random.random() >= self.shadow_rate:
+            self._count(node, "model")
+            return {
+                "decision": prediction["decision"],
+                "reason": f"판단 모델 {model.version} (p={prediction['confidence']:.2f})",
+                "path": "model",
+            }
+
+        evaluation = ask_llm()
+        self._count(node, "llm")
+        decision = evaluation.get("decision")
+        if decision in DECISION_LABELS.get(node, ()):
+            if self.log_decisions:
+                self._log(node, text, context, decision, evaluation.get("reason", ""))
+            if prediction is not None and prediction["confident"]:
+                self._record_agreement(node, prediction["decision"], decision)
+        return dict(evaluation, path="llm")
+
+    def _log(self, node: str, text: str, context: str, decision: str, reason: str) -> None:
+        record = {
+            "text": text,
+            "context": context,
+            "decision": decision,
+            "reason": reason,
+            "logged_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        try:
+            with self._log_lock:
+                os.makedirs(self.log_dir, exist_ok=True)
+                with open(os.path.join(self.log_dir, f"{node}.jsonl"), "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except OSError as e:
+            print(f"[WARNING] 판단 로그 기록 실패: {e}")
+
+    def _count(self, node: str, path: str) -> None:
+        with self._lock:
+            counts = self._counts.setdefault(node, {"model": 0, "llm": 0})
+            counts[path] += 1
+
+    def _record_agreement(self, node: str, model_decision: str, llm_decision: str) -> None:
+        with self._lock:
+            window = self._agreement.setdefault(node, deque(maxlen=AGREEMENT_WINDOW))
+            window.append(model_decision == llm_decision)
+            checks, rate = len(window), sum(window) / len(window)
+        if model_decision != llm_decision and checks >= 20 and rate < self.alert_threshold:
+            print(
+                f"[WARNING] {node} 판단 모델 일치율 {rate:.1%} (최근 {checks}건) - "
+                f"임계값 {self.alert_threshold:.0%} 미만, 재학습이 필요합니다"
+            )
+
+    def metrics(self) -> Dict:
+        """노드별 경로 수 / 모델 응답 비율 / 섀도 비교 일치율"""
+        with self._lock:
+            counts = {node: dict(node_counts) for node, node_counts in self._counts.items()}
+            agreement = {node: list(window) for node, window in self._agreement.items()}
+            versions = {node: model.version for node, (_, model) in self._models.items() if model is not None}
+
+        result = {}
+        for node in sorted(set(counts) | set(agreement)):
+            node_counts = counts.get(node, {"model": 0, "llm": 0})
+            total = node_counts["model"] + node_counts["llm"]
+            checks = agreement.get(node, [])
+            result[node] = {
+                "version": versions.get(node),
+                "model": node_counts["model"],
+                "llm": node_counts["llm"],
+                "model_rate": node_counts["model"] / total if total else 0.0,
+                "shadow_checks": len(checks),
+                "agreement_rate": sum(checks) / len(checks) if checks else None,
+            }
+        return result
+
+
+_router: Optional[DecisionRouter] = None
+_router_lock = threading.Lock()
+
+
+def get_decision_router() -> DecisionRouter:
+    """프로세스 공유 판단 라우터 반환"""
+    global _router
+    if _router is None:
+        with _router_lock:
+            if _router is None:
+                _router = DecisionRouter()
+    return _router
+
+
+def reset_decision_router() -> None:
+    """공유 판단 라우터 초기화 (설정 변경 후 / 테스트용)"""
+    global _router
+    with _router_lock:
+        _router = None
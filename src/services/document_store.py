@@ -0,0 +1,370 @@
+"""Document Store - ID 기반 문서 저장소
+
+벡터 인덱스(검색)와 문서 본문(내용)을 분리합니다.
+검색은 (FAQ ID, 거리)만 반환하고, 대화 상태에는 ID/점수 같은 참조만 담습니다.
+본문은 프롬프트를 만드는 시점에 이 저장소에서 가져오며(hydration) LRU로 캐시합니다.
+
+문서 저장소 파일 구조 (리틀 엔디언, mmap으로 열어 필요한 문서만 디코딩):
+    [헤더 32B]  magic, 포맷 버전, 문서 수, 테이블/blob 오프셋
+    [테이블]    count x (blob 오프셋, ID/본문/메타데이터 길이) - ID 오름차순 (이진 탐색)
+    [blob]      UTF-8 ID + 본문 + 메타데이터 JSON
+"""
+
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import os
+import mmap
+import json
+import struct
+import shutil
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+from langchain_core.documents import Document
+
+DOC_STORE_FILE = "doc_store.bin"
+DOC_STORE_VERSION = 1
+
+_MAGIC = b"FAQDOC\x00\x00"
+_HEADER = struct.Struct("<8sIIQQ")  # 32 bytes
+_TABLE_DTYPE = np.dtype([
+    ("offset", "<u8"),
+    ("id_len", "<u4"),
+    ("content_len", "<u4"),
+    ("meta_len", "<u4"),
+    ("reserved", "<u4"),
+])
+
+
+def document_to_dict(doc: Document, score: Optional[float] = None, lexical_score: Optional[float] = None) -> Dict:
+    """Document → 노드에서 사용하는 검색 결과 dict (본문 포함, 어휘 경로 결과는 lexical_score 추가)"""
+    result = {
+        "id": doc.metadata.get("id", ""),
+        "category": doc.metadata.get("category", ""),
+        "title": doc.metadata.get("title", ""),
+        "content": doc.page_content,
+        "tags": doc.metadata.get("tags", []),
+        "score": float(score) if score is not None else None,
+        "source": doc.metadata.get("source", "faq"),
+        "helpful_count": doc.metadata.get("helpful_count", 0)
+    }
+    if lexical_score is not None:
+        result["lexical_score"] = float(lexical_score)
+    return result
+
+
+def document_ref(doc: Document, score: Optional[float] = None, lexical_score: Optional[float] = None) -> Dict:
+    """Document → 대화 상태에 담는 참조 (ID/점수 + 표시용 제목/카테고리, 본문 제외)"""
+    return metadata_ref(doc.metadata, score, lexical_score)
+
+
+def metadata_ref(metadata: Dict, score: Optional[float] = None, lexical_score: Optional[float] = None) -> Dict:
+    """
+    메타데이터 → 대화 상태에 담는 참조 (get_metadatas 결과로 본문을 읽지 않고 생성)
+
+    score는 벡터 거리, 어휘 경로 결과는 거리 없이(score None) 어휘 점수를 lexical_score에 담습니다.
+    """
+    ref = {
+        "id": metadata.get("id", ""),
+        "title": metadata.get("title", ""),
+        "category": metadata.get("category", ""),
+        "score": float(score) if score is not None else None,
+        "source": metadata.get("source", "faq"),
+    }
+    if lexical_score is not None:
+        ref["lexical_score"] = float(lexical_score)
+    return ref
+
+
+class DocumentStoreWriter:
+    """문서 저장소 파일 스트리밍 기록 (문서를 하나씩 추가, close()에서 테이블 정렬 후 교체)
+
+    blob은 임시 파일에 바로 기록하므로 메모리에는 ID와 테이블 항목만 남습니다 (blob 순서는 입력 순서).
+    다른 색인과 같은 레코드 순회에서 문서를 추가할 수 있습니다.
+
+    Args:
+        path: 저장 경로
+    """
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.info: Optional[Dict] = None
+        self._ids: List[bytes] = []
+        self._rows: List[tuple] = []
+        self._blob_size = 0
+        self._blob_path = path + ".blobs.tmp"
+        self._blobs = open(self._blob_path, "wb")
+
+    def add(self, doc: Document) -> None:
+        """문서 하나 추가 (metadata["id"] = FAQ ID)"""
+        id_bytes = str(doc.metadata.get("id", doc.id or "")).encode("utf-8")
+        content_bytes = doc.page_content.encode("utf-8")
+        meta_bytes = json.dumps(doc.metadata, ensure_ascii=False).encode("utf-8")
+        self._blobs.write(id_bytes + content_bytes + meta_bytes)
+        self._ids.append(id_bytes)
+        self._rows.append((self._blob_size, len(id_bytes), len(content_bytes), len(meta_bytes), 0))
+        self._blob_size += len(id_bytes) + len(content_bytes) + len(meta_bytes)
+
+    def close(self) -> Dict:
+        """ID 순 테이블 + blob을 합쳐 최종 파일로 교체 → 파일 정보 (count, size_bytes)"""
+        self._blobs.close()
+        tmp_path = self.path + ".tmp"
+        try:
+            # 이진 탐색용으로 테이블만 ID 순 정렬
+            order = sorted(range(len(self._ids)), key=self._ids.__getitem__)
+            table = np.array([self._rows[i] for i in order], dtype=_TABLE_DTYPE)
+
+            table_offset = _HEADER.size
+            blob_offset = table_offset + table.nbytes
+            header = _HEADER.pack(_MAGIC, DOC_STORE_VERSION, len(self._ids), table_offset, blob_offset)
+
+            with open(tmp_path, "wb") as f, open(self._blob_path, "rb") as blobs:
+                f.write(header)
+                f.write(table.tobytes())
+                shutil.copyfileobj(blobs, f, 1 << 20)
+            os.replace(tmp_path, self.path)
+        finally:
+            if os.path.exists(self._blob_path):
+                os.remove(self._blob_path)
+
+        self.info = {"count": len(self._ids), "size_bytes": os.path.getsize(self.path)}
+        return self.info
+
+    def abort(self) -> None:
+        """기록 중단 - 임시 파일 삭제 (기존 파일은 그대로)"""
+        self._blobs.close()
+        if os.path.exists(self._blob_path):
+            os.remove(self._blob_path)
+
+    def __enter__(self) -> "DocumentStoreWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def write_document_store(path: str, documents: Iterable[Document]) -> Dict:
+    """
+    문서 저장소 파일 저장 (ID 오름차순 테이블, 임시 파일에 쓴 뒤 교체)
+
+    문서는 한 번만 순회하며 blob을 임시 파일에 바로 기록하므로
+    제너레이터를 넘기면 메모리에는 ID와 테이블 항목만 남습니다 (blob 순서는 입력 순서).
+
+    Args:
+        path: 저장 경로
+        documents: 문서 리스트 또는 제너레이터 (metadata["id"] = FAQ ID)
+
+    Returns:
+        파일 정보 (count, size_bytes)
+    """
+    with DocumentStoreWriter(path) as writer:
+        for doc in documents:
+            writer.add(doc)
+    return writer.info
+
+
+class DocumentStoreFile:
+    """mmap 문서 저장소 파일
+
+    - ID 조회는 정렬된 테이블을 이진 탐색 (ID → 행 dict를 만들지 않음)
+    - 조회된 문서만 디코딩
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"문서 저장소 파일이 비어 있습니다: {path}")
+
+        magic, version, count, table_offset, blob_offset = _HEADER.unpack_from(self._mmap, 0)
+        if magic != _MAGIC:
+            self.close()
+            raise ValueError(f"문서 저장소 파일 형식이 아닙니다: {path}")
+        if version != DOC_STORE_VERSION:
+            self.close()
+            raise ValueError(f"지원하지 않는 문서 저장소 버전: {version} (지원: {DOC_STORE_VERSION})")
+
+        self._count = count
+        self._table = np.frombuffer(self._mmap, dtype=_TABLE_DTYPE, count=count, offset=table_offset)
+        self._blob_offset = blob_offset
+
+    def count(self) -> int:
+        return self._count
+
+    def _id_bytes(self, row: int) -> bytes:
+        entry = self._table[row]
+        start = self._blob_offset + int(entry["offset"])
+        return self._mmap[start:start + int(entry["id_len"])]
+
+    def _find(self, doc_id: str) -> int:
+        """ID의 행 번호 (없으면 -1)"""
+        target = doc_id.encode("utf-8")
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._id_bytes(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo if lo < self._count and self._id_bytes(lo) == target else -1
+
+    def _document(self, row: int) -> Document:
+        entry = self._table[row]
+        start = self._blob_offset + int(entry["offset"])
+        id_len, content_len, meta_len = int(entry["id_len"]), int(entry["content_len"]), int(entry["meta_len"])
+
+        doc_id = self._mmap[start:start + id_len].decode("utf-8")
+        start += id_len
+        content = self._mmap[start:start + content_len].decode("utf-8")
+        start += content_len
+        metadata = json.loads(self._mmap[start:start + meta_len].decode("utf-8"))
+        return Document(id=doc_id, page_content=content, metadata=metadata)
+
+    def _metadata(self, row: int) -> Dict:
+        """행의 메타데이터 JSON만 디코딩 (본문은 건너뜀)"""
+        entry = self._table[row]
+        start = self._blob_offset + int(entry["offset"]) + int(entry["id_len"]) + int(entry["content_len"])
+        return json.loads(self._mmap[start:start + int(entry["meta_len"])].decode("utf-8"))
+
+    def get_documents(self, doc_ids: Sequence[str]) -> Dict[str, Document]:
+        found = {}
+        for doc_id in doc_ids:
+            row = self._find(doc_id)
+            if row >= 0:
+                found[doc_id] = self._document(row)
+        return found
+
+    def get_metadatas(self, doc_ids: Sequence[str]) -> Dict[str, Dict]:
+        found = {}
+        for doc_id in doc_ids:
+            row = self._find(doc_id)
+            if row >= 0:
+                found[doc_id] = self._metadata(row)
+        return found
+
+    def close(self) -> None:
+        """mmap 및 파일 닫기"""
+        self._table = None
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass
+        self._file.close()
+
+
+class DocumentStore:
+    """LRU 캐시를 앞에 둔 문서 저장소
+
+    Args:
+        source: get_documents(ids) → {ID: Document}, get_metadatas(ids) → {ID: 메타데이터}를 제공하는 객체
+                (DocumentStoreFile 또는 벡터 인덱스)
+        max_size: LRU 최대 문서 수 (0이면 캐시하지 않음)
+    """
+
+    def __init__(self, source, max_size: int = 256):
+        self.source = source
+        self.max_size = max_size
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Document]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_documents(self, doc_ids: Sequence[str]) -> Dict[str, Document]:
+        """ID로 문서 조회 (캐시에 없는 것만 저장소에서 읽음)"""
+        found: Dict[str, Document] = {}
+        missing: List[str] = []
+        with self._lock:
+            for doc_id in dict.fromkeys(doc_ids):
+                doc = self._entries.get(doc_id)
+                if doc is None:
+                    missing.append(doc_id)
+                    continue
+                self._entries.move_to_end(doc_id)
+                found[doc_id] = doc
+            self.hits += len(found)
+            self.misses += len(missing)
+
+        if missing:
+            loaded = self.source.get_documents(missing)
+            found.update(loaded)
+            if self.max_size > 0:
+                with self._lock:
+                    for doc_id, doc in loaded.items():
+                        self._entries[doc_id] = doc
+                        self._entries.move_to_end(doc_id)
+                    while len(self._entries) > self.max_size:
+                        self._entries.popitem(last=False)
+                        self.evictions += 1
+        return found
+
+    def get_metadatas(self, doc_ids: Sequence[str]) -> Dict[str, Dict]:
+        """
+        ID로 메타데이터만 조회 (검색 결과 참조용 - 본문을 읽지 않음)
+
+        LRU에 있는 문서는 그 메타데이터를 쓰고, 나머지는 저장소에서 메타데이터만 읽습니다
+        (본문이 없으므로 LRU에 넣지 않으며 적중률 통계에도 포함하지 않음).
+        """
+        found: Dict[str, Dict] = {}
+        missing: List[str] = []
+        with self._lock:
+            for doc_id in dict.fromkeys(doc_ids):
+                doc = self._entries.get(doc_id)
+                if doc is None:
+                    missing.append(doc_id)
+                else:
+                    found[doc_id] = doc.metadata
+        if missing:
+            found.update(self.source.get_metadatas(missing))
+        return found
+
+    def hydrate(self, refs: Sequence[Dict]) -> List[Dict]:
+        """
+        참조(id, score) 리스트 → 본문이 포함된 검색 결과 dict 리스트
+
+        Args:
+            refs: {"id": ..., "score": ...} 참조들 (검색 순위 순)
+
+        Returns:
+            document_to_dict 형식 리스트 - 저장소에 없는 ID는 제외, 순서 유지
+        """
+        documents = self.get_documents([ref["id"] for ref in refs])
+        return [
+            document_to_dict(documents[ref["id"]], ref.get("score"), ref.get("lexical_score"))
+            for ref in refs
+            if ref["id"] in documents
+        ]
+
+    def clear(self) -> None:
+        """캐시 비우기 (통계는 유지)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """LRU 통계"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
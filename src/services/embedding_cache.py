@@ -0,0 +1,258 @@
+"""Embedding Cache - 임베딩 캐시
+
+반복되는 사용자 질의("비밀번호를 잊어버렸어요", "알림이 안 떠요" 등)의
+임베딩을 메모리에 보관하여 Ollama 임베딩 호출을 생략합니다.
+- 키: 정규화된 쿼리 (공백/문장부호/이모지 제거)
+- 제거 정책: 최대 개수(LRU) + 유효 시간(TTL)
+
+벡터 스토어 재구축용으로 문서 임베딩을 디스크(SQLite)에 보관하는
+DiskEmbeddingCache도 제공합니다.
+"""
+
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import os
+import time
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+# 이모지 표현 선택자 (카테고리 Mn이라 별도 제거)
+_VARIATION_SELECTORS = {"\ufe0e", "\ufe0f"}
+
+
+def normalize_query(text: str) -> str:
+    """
+    캐시 키용 쿼리 정규화
+    - 유니코드 NFKC 정규화 + 소문자 변환
+    - 문장부호(P*), 기호/이모지(S*), 제어/서식 문자(C*) 제거
+    - 공백 제거 (한국어 띄어쓰기 차이 "안 떠요" / "안떠요"를 같은 키로 처리)
+
+    Args:
+        text: 원본 쿼리
+
+    Returns:
+        정규화된 키
+    """
+    text = unicodedata.normalize("NFKC", text).lower()
+    return "".join(
+        ch for ch in text
+        if not ch.isspace()
+        and ch not in _VARIATION_SELECTORS
+        and unicodedata.category(ch)[0] not in ("P", "S", "C")
+    )
+
+
+class EmbeddingCache:
+    """스레드 안전한 LRU + TTL 임베딩 캐시"""
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 3600.0):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key → (저장 시각, 벡터)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[List[float]]:
+        """캐시 조회 (만료된 항목은 제거 후 None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            stored_at, vector = entry
+            if self.ttl_seconds > 0 and time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return vector
+
+    def put(self, key: str, vector: List[float]) -> None:
+        """캐시 저장 (최대 개수 초과 시 가장 오래 사용되지 않은 항목 제거)"""
+        if self.max_size <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic(), vector)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """전체 항목 삭제 (통계는 유지)"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, float]:
+        """캐시 통계 (hit/miss 카운터, 적중률)"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+class CachedEmbeddings(Embeddings):
+    """쿼리 임베딩 캐시를 적용한 Embeddings 래퍼
+
+    - embed_query: 정규화 키로 캐시 조회, 미스일 때만 원본 모델 호출
+      (같은 키의 동시 미스는 한 번만 호출 - FAQ / 티켓 컬렉션 동시 검색 시 임베딩 중복 방지)
+    - embed_queries: 여러 쿼리를 캐시 조회 후 미스만 모아 원본 모델 배치 호출 한 번
+    - embed_documents: 색인용이므로 그대로 원본 모델에 위임
+    """
+
+    def __init__(self, base: Embeddings, cache: EmbeddingCache):
+        self.base = base
+        self.cache = cache
+        self._inflight: Dict[str, threading.Event] = {}
+        self._inflight_lock = threading.Lock()
+
+    def embed_query(self, text: str) -> List[float]:
+        key = normalize_query(text)
+        if not key:
+            return self.base.embed_query(text)
+
+        vector = self.cache.get(key)
+        if vector is not None:
+            return vector
+
+        with self._inflight_lock:
+            event = self._inflight.get(key)
+            leader = event is None
+            if leader:
+                event = self._inflight[key] = threading.Event()
+
+        if not leader:
+            # 같은 키를 임베딩 중인 요청이 끝나면 캐시에서 읽음 (그 요청이 실패했으면 직접 호출)
+            event.wait()
+            vector = self.cache.get(key)
+            return vector if vector is not None else self.base.embed_query(text)
+
+        try:
+            vector = self.base.embed_query(text)
+            self.cache.put(key, vector)
+            return vector
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+            event.set()
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        vectors: List[Optional[List[float]]] = [None] * len(texts)
+        # 같은 정규화 키의 쿼리는 한 번만 임베딩 (키가 빈 쿼리는 각각 임베딩, 캐시하지 않음)
+        pending: Dict[object, List[int]] = {}
+        for i, text in enumerate(texts):
+            key = normalize_query(text)
+            if key:
+                vector = self.cache.get(key)
+                if vector is not None:
+                    vectors[i] = vector
+                    continue
+            pending.setdefault(key or i, []).append(i)
+
+        if pending:
+            embedded = self.base.embed_documents([texts[rows[0]] for rows in pending.values()])
+            for (key, rows), vector in zip(pending.items(), embedded):
+                if isinstance(key, str):
+                    self.cache.put(key, vector)
+                for i in rows:
+                    vectors[i] = vector
+        return vectors
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.base.embed_documents(texts)
+
+
+class DiskEmbeddingCache:
+    """디스크 문서 임베딩 캐시 (SQLite)
+
+    - 키: (임베딩 모델, 텍스트 해시) - 같은 내용은 다시 임베딩하지 않음
+    - 값: float32 바이트
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or os.getenv("EMBEDDING_CACHE_PATH", "data/embedding_cache.sqlite")
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                " model TEXT NOT NULL,"
+                " text_hash TEXT NOT NULL,"
+                " vector BLOB NOT NULL,"
+                " PRIMARY KEY (model, text_hash))"
+            )
+            self._conn.commit()
+
+    def get_many(self, model: str, hashes: Sequence[str]) -> Dict[str, List[float]]:
+        """여러 해시를 한 번에 조회 (있는 것만 반환)"""
+        found: Dict[str, List[float]] = {}
+        hashes = list(dict.fromkeys(hashes))
+        with self._lock:
+            # SQLite 변수 개수 제한을 피하기 위해 나누어 조회
+            for start in range(0, len(hashes), 500):
+                chunk = hashes[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND text_hash IN ({placeholders})",
+                    [model, *chunk]
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32).tolist()
+        return found
+
+    def put_many(self, model: str, vectors: Dict[str, Sequence[float]]) -> None:
+        """여러 임베딩을 한 번에 저장"""
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, vector) VALUES (?, ?, ?)",
+                [
+                    (model, key, np.asarray(vector, dtype=np.float32).tobytes())
+                    for key, vector in vectors.items()
+                ]
+            )
+            self._conn.commit()
+
+    def count(self, model: str = None) -> int:
+        """저장된 임베딩 수"""
+        with self._lock:
+            if model is None:
+                return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM embeddings WHERE model = ?", [model]
+            ).fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,170 @@
+"""Embedding Pipeline - 배치 병렬 임베딩 파이프라인
+
+벡터 스토어 구축 시 문서를 배치 단위로 나누어 제한된 워커 풀로 임베딩합니다.
+- 문서를 스트리밍으로 읽어 배치 생성 (전체 목록을 메모리에 올릴 필요 없음)
+- 동시 처리 배치 수 제한 (워커 수 x 2)
+- 실패한 배치는 지수 백오프로 재시도
+- 완료된 배치는 즉시 on_batch 콜백으로 전달 (컬렉션 쓰기)
+- 처리량(docs/sec)과 배치별 지연시간 보고
+"""
+
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import time
+import statistics
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from langchain_core.documents import Document
+
+
+def iter_batches(items: Iterable, batch_size: int) -> Iterator[List]:
+    """이터러블을 batch_size 크기의 리스트로 나누어 반환"""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class EmbeddingPipeline:
+    """배치 병렬 임베딩 파이프라인
+
+    Args:
+        embed_fn: 문서 배치 → 임베딩 리스트 함수 (워커 스레드에서 호출됨)
+        batch_size: 배치당 문서 수
+        max_workers: 동시에 임베딩 서버로 보내는 최대 배치 수
+        max_retries: 배치별 최대 재시도 횟수
+        retry_backoff: 재시도 대기 시간 기준값 (초, 시도마다 2배)
+    """
+
+    def __init__(
+        self,
+        embed_fn: Callable[[List[Document]], List[List[float]]],
+        batch_size: int = 32,
+        max_workers: int = 4,
+        max_retries: int = 3,
+        retry_backoff: float = 1.0,
+        verbose: bool = True
+    ):
+        self.embed_fn = embed_fn
+        self.batch_size = max(1, batch_size)
+        self.max_workers = max(1, max_workers)
+        self.max_retries = max(0, max_retries)
+        self.retry_backoff = retry_backoff
+        self.verbose = verbose
+
+    def _embed_with_retry(self, batch: List[Document]) -> Dict:
+        """배치 임베딩 (실패 시 재시도)"""
+        started = time.perf_counter()
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            try:
+                vectors = self.embed_fn(batch)
+                if len(vectors) != len(batch):
+                    raise ValueError(f"임베딩 수 불일치: {len(vectors)} vs {len(batch)}")
+                return {
+                    "vectors": vectors,
+                    "attempts": attempt + 1,
+                    "latency": time.perf_counter() - started,
+                    "error": None,
+                }
+            except Exception as e:
+                last_error = e
+                if attempt < self.max_retries:
+                    time.sleep(self.retry_backoff * (2 ** attempt))
+
+        return {
+            "vectors": None,
+            "attempts": self.max_retries + 1,
+            "latency": time.perf_counter() - started,
+            "error": last_error,
+        }
+
+    def run(
+        self,
+        documents: Iterable[Document],
+        on_batch: Callable[[List[Document], List[List[float]]], None],
+        total: Optional[int] = None
+    ) -> Dict:
+        """
+        파이프라인 실행
+
+        Args:
+            documents: 임베딩할 문서 (리스트 또는 제너레이터)
+            on_batch: 완료된 배치 콜백 (메인 스레드에서 순차 호출 - 컬렉션 쓰기용)
+            total: 전체 문서 수 (진행률 표시용, 모르면 None)
+
+        Returns:
+            실행 통계 (documents, batches, failed_batches, failed_documents,
+                      elapsed, docs_per_sec, batch_latency_p50/p95/max, retries)
+        """
+        batches = iter_batches(documents, self.batch_size)
+        max_in_flight = self.max_workers * 2
+
+        latencies: List[float] = []
+        failed: List[List[Document]] = []
+        done_docs = 0
+        done_batches = 0
+        retries = 0
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            in_flight = {}
+            exhausted = False
+
+            while in_flight or not exhausted:
+                # 동시 처리 배치 수를 제한하며 다음 배치 제출
+                while not exhausted and len(in_flight) < max_in_flight:
+                    batch = next(batches, None)
+                    if batch is None:
+                        exhausted = True
+                        break
+                    in_flight[executor.submit(self._embed_with_retry, batch)] = batch
+
+                if not in_flight:
+                    break
+
+                completed, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in completed:
+                    batch = in_flight.pop(future)
+                    result = future.result()
+                    retries += result["attempts"] - 1
+                    done_batches += 1
+
+                    if result["error"] is not None:
+                        failed.append(batch)
+                        if self.verbose:
+                            print(f"   ❌ 배치 실패 ({len(batch)}개 문서, {result['attempts']}회 시도): {result['error']}")
+                        continue
+
+                    on_batch(batch, result["vectors"])
+                    latencies.append(result["latency"])
+                    done_docs += len(batch)
+
+                    if self.verbose:
+                        elapsed = time.perf_counter() - started
+                        progress = f"{done_docs}/{total}" if total else f"{done_docs}"
+                        print(f"   [배치 {done_batches}] {len(batch)}개 {result['latency']:.2f}s | "
+                              f"누적 {progress}개, {done_docs / elapsed:.1f} docs/s")
+
+        elapsed = time.perf_counter() - started
+        ordered = sorted(latencies)
+        return {
+            "documents": done_docs,
+            "batches": done_batches,
+            "failed_batches": len(failed),
+            "failed_documents": [doc for batch in failed for doc in batch],
+            "retries": retries,
+            "elapsed": elapsed,
+            "docs_per_sec": done_docs / elapsed if elapsed > 0 else 0.0,
+            "batch_latency_p50": statistics.median(ordered) if ordered else 0.0,
+            "batch_latency_p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] if ordered else 0.0,
+            "batch_latency_max": ordered[-1] if ordered else 0.0,
+        }
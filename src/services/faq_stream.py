@@ -0,0 +1,141 @@
+"""FAQ Stream - JSONL 스트리밍 적재
+
+대용량 FAQ 코퍼스를 json.load로 한 번에 읽지 않고 한 줄(레코드)씩 처리합니다.
+- iter_faq_jsonl: 레코드와 그 줄이 끝나는 바이트 오프셋을 함께 반환 (재개 지점)
+- CommitWatermark: 배치가 입력 순서와 다르게 완료되어도 "앞의 레코드가 모두 기록된" 위치만 전진
+- 체크포인트(ingest_checkpoint.json): 구축이 중단되면 마지막으로 커밋된 레코드 다음부터 재개
+"""
+
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import os
+import json
+from collections import deque
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from src.models.faq import validate_faq_document
+
+CHECKPOINT_FILE = "ingest_checkpoint.json"
+CHECKPOINT_VERSION = 1
+
+
+def iter_faq_jsonl(path: str, start_offset: int = 0, validate: bool = True) -> Iterator[Tuple[int, Dict]]:
+    """
+    JSONL FAQ 파일을 한 레코드씩 읽기
+
+    Args:
+        path: JSONL 파일 경로 (한 줄에 FAQDocument 하나)
+        start_offset: 읽기 시작할 바이트 오프셋 (체크포인트 재개 지점)
+        validate: FAQDocument 구조 검증 여부 (잘못된 줄은 경고 후 건너뜀)
+
+    Yields:
+        (이 줄이 끝나는 바이트 오프셋, FAQ 레코드)
+    """
+    with open(path, "rb") as f:
+        f.seek(start_offset)
+        while True:
+            line = f.readline()
+            if not line:
+                break
+            end_offset = f.tell()
+            if not line.strip():
+                continue
+
+            try:
+                record = json.loads(line.decode("utf-8"))
+            except (UnicodeDecodeError, json.JSONDecodeError) as e:
+                print(f"[WARNING] JSONL 파싱 실패 (offset {end_offset - len(line)}): {e}")
+                continue
+            if validate:
+                errors = validate_faq_document(record) if isinstance(record, dict) else ["객체가 아님"]
+                if errors:
+                    print(f"[WARNING] FAQ 레코드 건너뜀 ({record.get('id') if isinstance(record, dict) else '?'}): "
+                          f"{', '.join(errors)}")
+                    continue
+            yield end_offset, record
+
+
+def iter_faq_records(path: str) -> Iterator[Dict]:
+    """JSONL 파일의 FAQ 레코드만 순서대로 반환"""
+    for _, record in iter_faq_jsonl(path):
+        yield record
+
+
+class CommitWatermark:
+    """입력 순서 기준 연속 커밋 지점
+
+    track()으로 입력 순서대로 항목과 끝 오프셋을 등록하고, 기록이 끝난 항목을 commit()하면
+    그 앞의 항목이 모두 커밋된 경우에만 offset이 전진합니다.
+    (병렬 임베딩으로 배치 완료 순서가 바뀌어도 재개 지점 이전은 항상 기록 완료 상태)
+    보류 목록은 처리 중인 배치 수만큼만 유지됩니다 (실패한 배치가 있으면 그 뒤로 쌓임).
+    """
+
+    def __init__(self, offset: int = 0, records: int = 0):
+        self.offset = offset
+        self.records = records
+        self._pending: deque = deque()
+        self._done = set()
+
+    @property
+    def pending(self) -> int:
+        """아직 커밋 지점에 포함되지 않은 항목 수"""
+        return len(self._pending)
+
+    def track(self, item, end_offset: int) -> None:
+        self._pending.append((id(item), item, end_offset))
+
+    def commit(self, items: Iterable) -> bool:
+        """기록이 끝난 항목 반영 - offset이 전진했으면 True"""
+        self._done.update(id(item) for item in items)
+        advanced = False
+        while self._pending and self._pending[0][0] in self._done:
+            key, _, end_offset = self._pending.popleft()
+            self._done.discard(key)
+            self.offset = end_offset
+            self.records += 1
+            advanced = True
+        return advanced
+
+
+def source_fingerprint(path: str) -> Dict:
+    """입력 파일 식별 정보 (경로 / 크기 / 수정 시각) - 바뀌면 체크포인트 무효"""
+    stat = os.stat(path)
+    return {"source": os.path.abspath(path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def load_checkpoint(persist_directory: str) -> Optional[Dict]:
+    """적재 체크포인트 로드 (없거나 버전이 다르면 None)"""
+    path = os.path.join(persist_directory, CHECKPOINT_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        checkpoint = json.load(f)
+    if checkpoint.get("version") != CHECKPOINT_VERSION:
+        return None
+    return checkpoint
+
+
+def save_checkpoint(persist_directory: str, fingerprint: Dict, embedding_model: str, watermark: CommitWatermark) -> None:
+    """적재 체크포인트 저장 (임시 파일에 쓴 뒤 교체)"""
+    os.makedirs(persist_directory, exist_ok=True)
+    path = os.path.join(persist_directory, CHECKPOINT_FILE)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "version": CHECKPOINT_VERSION,
+            **fingerprint,
+            "embedding_model": embedding_model,
+            "offset": watermark.offset,
+            "records": watermark.records,
+        }, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def clear_checkpoint(persist_directory: str) -> None:
+    """적재 완료 후 체크포인트 삭제"""
+    path = os.path.join(persist_directory, CHECKPOINT_FILE)
+    if os.path.exists(path):
+        os.remove(path)
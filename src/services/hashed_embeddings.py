@@ -0,0 +1,66 @@
+"""Hashed Embeddings - 결정적 로컬 임베딩
+
+Ollama 서버 없이 검색 파이프라인을 돌려보기 위한 임베딩입니다 (CI / 오프라인 벤치마크용).
+문자 n-gram을 고정 차원으로 해싱(feature hashing)한 뒤 L2 정규화합니다.
+- 같은 텍스트는 프로세스/머신과 무관하게 항상 같은 벡터 (blake2b 해시 사용, PYTHONHASHSEED 영향 없음)
+- 의미 유사도가 아닌 표면 문자 겹침을 반영하므로 품질 수치는 BGE-M3와 직접 비교하지 말고
+  같은 임베딩끼리의 회귀 비교에만 사용
+"""
+
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import hashlib
+from typing import Dict, List, Sequence
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from src.services.embedding_cache import normalize_query
+
+
+class HashedNgramEmbeddings(Embeddings):
+    """문자 n-gram feature hashing 임베딩
+
+    Args:
+        dim: 벡터 차원
+        ngram_sizes: 사용할 n-gram 길이들 (캐시 키와 같은 정규화 - 띄어쓰기 차이 무시)
+    """
+
+    MAX_CACHED_NGRAMS = 1 << 20  # n-gram → 버킷 해시 캐시 상한 (대량 문서 임베딩 시 해시 재계산 방지)
+
+    def __init__(self, dim: int = 256, ngram_sizes: Sequence[int] = (2, 3)):
+        self.dim = dim
+        self.ngram_sizes = tuple(ngram_sizes)
+        self._buckets: Dict[str, tuple] = {}
+
+    def _bucket(self, gram: str) -> tuple:
+        """n-gram → (차원 번호, 부호) - 부호 해싱으로 충돌 편향 상쇄"""
+        digest = hashlib.blake2b(gram.encode("utf-8"), digest_size=8).digest()
+        value = int.from_bytes(digest, "little")
+        return value % self.dim, 1.0 if (value >> 63) & 1 else -1.0
+
+    def embed_query(self, text: str) -> List[float]:
+        padded = f" {normalize_query(text)} "
+        buckets, signs = [], []
+        for n in self.ngram_sizes:
+            for i in range(len(padded) - n + 1):
+                gram = padded[i:i + n]
+                entry = self._buckets.get(gram)
+                if entry is None:
+                    entry = self._bucket(gram)
+                    if len(self._buckets) < self.MAX_CACHED_NGRAMS:
+                        self._buckets[gram] = entry
+                buckets.append(entry[0])
+                signs.append(entry[1])
+
+        vector = np.bincount(buckets, weights=signs, minlength=self.dim).astype(np.float32)
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector.tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
@@ -0,0 +1,269 @@
+"""Index File - 단일 파일 인덱스 포맷
+
+임베딩 행렬, ID 테이블, 문서/메타데이터를 버전이 있는 바이너리 파일 하나에 저장합니다.
+런타임은 mmap + numpy 배열 뷰로 파일을 열어 시작 시간이 거의 없고,
+여러 워커 프로세스가 같은 물리 페이지를 공유합니다.
+파일 하나만 복사하면 다른 호스트에서도 같은 인덱스를 사용할 수 있습니다 (스냅샷).
+
+파일 구조 (리틀 엔디언):
+    [헤더 64B]  magic, 포맷 버전, 문서 수, 차원, 거리 함수, 섹션 오프셋
+    [벡터]      count x dim float32 (L2 정규화됨, 64B 정렬)
+    [테이블]    count x (blob 오프셋, ID/본문/메타데이터 길이)
+    [blob]      UTF-8 ID + 본문 + 메타데이터 JSON
+"""
+
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import os
+import mmap
+import json
+import struct
+import shutil
+from typing import Dict, List, Optional
+
+import numpy as np
+from langchain_core.documents import Document
+
+from src.services.vector_index import NumpyIndex
+
+INDEX_FILE = "faq_index.bin"
+FORMAT_VERSION = 1
+
+_MAGIC = b"FAQIDX\x00\x00"
+_HEADER = struct.Struct("<8sIIQIIQQQQ")  # 64 bytes
+_ALIGN = 64
+_METRIC_CODES = {"l2": 0, "cosine": 1}
+_TABLE_DTYPE = np.dtype([
+    ("offset", "<u8"),
+    ("id_len", "<u4"),
+    ("content_len", "<u4"),
+    ("meta_len", "<u4"),
+    ("reserved", "<u4"),
+])
+
+
+def _aligned(offset: int) -> int:
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+class IndexFileWriter:
+    """단일 파일 인덱스 스트리밍 기록
+
+    배치 단위로 문서/임베딩을 추가하며, 벡터 / 테이블 / blob을 각각 임시 파일에 이어 씁니다.
+    close()에서 헤더 + 세 임시 파일을 합쳐 최종 파일로 교체하므로
+    문서 수와 관계없이 메모리에는 추가 중인 배치만 남습니다 (읽는 쪽은 항상 완전한 파일만 봄).
+
+    Args:
+        path: 저장 경로
+        metric: 거리 함수 (l2 | cosine)
+    """
+
+    def __init__(self, path: str, metric: str = "l2"):
+        if metric not in _METRIC_CODES:
+            raise ValueError(f"지원하지 않는 거리 함수: {metric}")
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.metric = metric
+        self.count = 0
+        self.dim: Optional[int] = None
+        self.blob_size = 0
+        self.info: Optional[Dict] = None
+        self._parts = {name: path + f".{name}.tmp" for name in ("vectors", "table", "blobs")}
+        self._files = {name: open(part, "wb") for name, part in self._parts.items()}
+
+    def add(self, documents: List[Document], embeddings) -> None:
+        """문서 배치 추가 (임베딩은 L2 정규화하여 기록)"""
+        if not documents:
+            return
+        matrix = np.asarray(embeddings, dtype=np.float32).reshape(len(documents), -1)
+        if self.dim is None:
+            self.dim = matrix.shape[1]
+        elif matrix.shape[1] != self.dim:
+            raise ValueError(f"임베딩 차원이 다릅니다: {matrix.shape[1]} vs {self.dim}")
+
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        self._files["vectors"].write(np.ascontiguousarray(matrix / norms, dtype="<f4").tobytes())
+
+        table = np.zeros(len(documents), dtype=_TABLE_DTYPE)
+        for row, doc in enumerate(documents):
+            id_bytes = str(doc.metadata.get("id", doc.id or "")).encode("utf-8")
+            content_bytes = doc.page_content.encode("utf-8")
+            meta_bytes = json.dumps(doc.metadata, ensure_ascii=False).encode("utf-8")
+            table[row] = (self.blob_size, len(id_bytes), len(content_bytes), len(meta_bytes), 0)
+            self._files["blobs"].write(id_bytes + content_bytes + meta_bytes)
+            self.blob_size += len(id_bytes) + len(content_bytes) + len(meta_bytes)
+        self._files["table"].write(table.tobytes())
+        self.count += len(documents)
+
+    def close(self) -> Dict:
+        """임시 파일을 합쳐 최종 파일로 교체 → 파일 정보 (count, dim, size_bytes)"""
+        for f in self._files.values():
+            f.close()
+
+        dim = self.dim or 0
+        vectors_bytes = self.count * dim * 4
+        vectors_offset = _aligned(_HEADER.size)
+        table_offset = _aligned(vectors_offset + vectors_bytes)
+        blob_offset = table_offset + self.count * _TABLE_DTYPE.itemsize
+        header = _HEADER.pack(
+            _MAGIC, FORMAT_VERSION, 0, self.count, dim, _METRIC_CODES[self.metric],
+            vectors_offset, table_offset, blob_offset, self.blob_size
+        )
+
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(header)
+                f.write(b"\x00" * (vectors_offset - _HEADER.size))
+                self._copy("vectors", f)
+                f.write(b"\x00" * (table_offset - vectors_offset - vectors_bytes))
+                self._copy("table", f)
+                self._copy("blobs", f)
+            os.replace(tmp_path, self.path)
+        finally:
+            self._remove_parts()
+
+        self.info = {"count": self.count, "dim": dim, "size_bytes": os.path.getsize(self.path)}
+        return self.info
+
+    def abort(self) -> None:
+        """기록 중단 - 임시 파일 삭제 (기존 파일은 그대로)"""
+        for f in self._files.values():
+            f.close()
+        self._remove_parts()
+
+    def _copy(self, name: str, target) -> None:
+        with open(self._parts[name], "rb") as part:
+            shutil.copyfileobj(part, target, 1 << 20)
+
+    def _remove_parts(self) -> None:
+        for part in self._parts.values():
+            if os.path.exists(part):
+                os.remove(part)
+
+    def __enter__(self) -> "IndexFileWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def write_index_file(path: str, documents: List[Document], embeddings, metric: str = "l2") -> Dict:
+    """
+    단일 파일 인덱스 저장
+    - 임시 파일에 쓴 뒤 교체하므로 읽는 쪽은 항상 완전한 파일만 봄
+
+    Args:
+        path: 저장 경로
+        documents: 문서 리스트 (metadata["id"] = FAQ ID)
+        embeddings: 문서 임베딩 (count x dim)
+        metric: 거리 함수 (l2 | cosine)
+
+    Returns:
+        파일 정보 (count, dim, size_bytes)
+    """
+    with IndexFileWriter(path, metric) as writer:
+        writer.add(documents, embeddings)
+    return writer.info
+
+
+class MmapIndex(NumpyIndex):
+    """mmap으로 여는 단일 파일 인덱스 백엔드
+
+    - 임베딩 행렬은 파일 페이지를 그대로 가리키는 읽기 전용 배열 (복사 없음)
+    - 문서 본문/메타데이터는 검색 결과에 포함된 행만 필요할 때 디코딩
+    - 검색 로직은 NumpyIndex와 동일 (같은 거리 계약)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # 빈 파일은 mmap 불가
+            self._file.close()
+            raise ValueError(f"인덱스 파일이 비어 있습니다: {path}")
+
+        (magic, version, _flags, count, dim, metric_code,
+         vectors_offset, table_offset, blob_offset, blob_size) = _HEADER.unpack_from(self._mmap, 0)
+
+        if magic != _MAGIC:
+            self.close()
+            raise ValueError(f"인덱스 파일 형식이 아닙니다: {path}")
+        if version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"지원하지 않는 인덱스 파일 버전: {version} (지원: {FORMAT_VERSION})")
+
+        self.version = version
+        self.metric = {code: name for name, code in _METRIC_CODES.items()}[metric_code]
+        self.matrix = np.frombuffer(self._mmap, dtype="<f4", count=count * dim, offset=vectors_offset).reshape(count, dim)
+        self._table = np.frombuffer(self._mmap, dtype=_TABLE_DTYPE, count=count, offset=table_offset)
+        self._blob_offset = blob_offset
+        self._row_ids: Optional[Dict[str, int]] = None
+
+    @classmethod
+    def open(cls, path: str) -> "MmapIndex":
+        return cls(path)
+
+    def _read(self, start: int, length: int) -> str:
+        return self._mmap[start:start + length].decode("utf-8")
+
+    def _doc_id(self, row: int) -> str:
+        entry = self._table[row]
+        return self._read(self._blob_offset + int(entry["offset"]), int(entry["id_len"]))
+
+    def _document(self, row: int) -> Document:
+        entry = self._table[row]
+        start = self._blob_offset + int(entry["offset"])
+        id_len, content_len, meta_len = int(entry["id_len"]), int(entry["content_len"]), int(entry["meta_len"])
+
+        doc_id = self._read(start, id_len)
+        content = self._read(start + id_len, content_len)
+        metadata = json.loads(self._read(start + id_len + content_len, meta_len))
+        return Document(id=doc_id, page_content=content, metadata=metadata)
+
+    def _metadata(self, row: int) -> Dict:
+        """행 번호 → 메타데이터 (본문은 디코딩하지 않음)"""
+        entry = self._table[row]
+        start = self._blob_offset + int(entry["offset"]) + int(entry["id_len"]) + int(entry["content_len"])
+        return json.loads(self._read(start, int(entry["meta_len"])))
+
+    @property
+    def _rows_by_id(self) -> Dict[str, int]:
+        """FAQ ID → 행 번호 (첫 ID 조회 시 생성)"""
+        if self._row_ids is None:
+            self._row_ids = {self._doc_id(row): row for row in range(self.count())}
+        return self._row_ids
+
+    @property
+    def documents(self) -> List[Document]:
+        """전체 문서 (내보내기/점검용 - 검색 경로에서는 사용하지 않음)"""
+        return [self._document(row) for row in range(self.count())]
+
+    def close(self) -> None:
+        """mmap 및 파일 닫기"""
+        self.matrix = None
+        self._table = None
+        try:
+            self._mmap.close()
+        except BufferError:
+            # 외부에서 아직 배열 뷰를 참조 중이면 GC 시점에 해제됨
+            pass
+        self._file.close()
+
+
+def export_index_file(path: str, index: NumpyIndex) -> Dict:
+    """메모리 인덱스(NumpyIndex)를 단일 파일로 내보내기"""
+    return write_index_file(path, index.documents, index.matrix, metric=index.metric)
@@ -0,0 +1,70 @@
+"""Index Manifest - 벡터 스토어 매니페스트
+
+증분 재구축을 위해 컬렉션 옆에 FAQ ID별 콘텐츠 해시를 기록합니다.
+- content_hash: 렌더링된 page_content + 메타데이터 해시 (변경 감지용)
+- text_hash: page_content만의 해시 (임베딩 캐시 키)
+"""
+
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import os
+import json
+import hashlib
+from typing import Dict, Optional
+
+from langchain_core.documents import Document
+
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 1
+
+
+def text_hash(text: str) -> str:
+    """텍스트 SHA-256 해시 (임베딩 캐시 키)"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def content_hash(doc: Document) -> str:
+    """렌더링된 내용 + 메타데이터 해시 (변경 감지용)"""
+    payload = json.dumps(
+        {"content": doc.page_content, "metadata": doc.metadata},
+        ensure_ascii=False,
+        sort_keys=True
+    )
+    return text_hash(payload)
+
+
+def new_manifest(collection_name: str, embedding_model: str) -> Dict:
+    """빈 매니페스트 생성"""
+    return {
+        "version": MANIFEST_VERSION,
+        "collection_name": collection_name,
+        "embedding_model": embedding_model,
+        "documents": {},  # FAQ ID → content_hash
+    }
+
+
+def load_manifest(persist_directory: str) -> Optional[Dict]:
+    """매니페스트 로드 (없거나 버전이 다르면 None)"""
+    path = os.path.join(persist_directory, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return None
+
+    with open(path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    if manifest.get("version") != MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def save_manifest(persist_directory: str, manifest: Dict) -> None:
+    """매니페스트 저장 (임시 파일에 쓴 뒤 교체하여 중간 상태가 남지 않도록)"""
+    os.makedirs(persist_directory, exist_ok=True)
+    path = os.path.join(persist_directory, MANIFEST_FILE)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
@@ -0,0 +1,210 @@
+"""Index Reload - 인덱스 버전 게시 / 무중단 교체
+
+벡터 스토어 루트 디렉토리에 버전별 하위 디렉토리(versions/<버전>)를 만들고
+현재 버전 포인터(current.json)를 원자적으로 바꿔 새 인덱스를 게시합니다.
+- 앱은 포인터를 주기적으로 확인하고, 바뀌면 새 버전을 백그라운드에서 로드/예열한 뒤 교체
+- 교체 전에 시작된 검색은 이전 버전 객체로 끝까지 수행 (객체 참조가 남아 있는 동안 유지)
+- 이전 버전은 더 이상 참조되지 않으면 파일 매핑 / Chroma 클라이언트를 닫아 해제
+"""
+
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import os
+import json
+import time
+import shutil
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+INDEX_POINTER_FILE = "current.json"
+VERSIONS_DIR = "versions"
+
+
+def read_index_pointer(root: str) -> Optional[Dict]:
+    """
+    현재 버전 포인터 읽기
+
+    Returns:
+        {"version": 버전, "directory": 버전 디렉토리 절대 경로} 또는 None (포인터 없음 - 단일 디렉토리 구성)
+    """
+    path = os.path.join(root, INDEX_POINTER_FILE)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            pointer = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not pointer.get("version") or not pointer.get("directory"):
+        return None
+    return {
+        "version": pointer["version"],
+        "directory": os.path.join(os.path.abspath(root), pointer["directory"]),
+    }
+
+
+def resolve_index_directory(root: str) -> Tuple[str, str]:
+    """루트 디렉토리 → (실제 인덱스 디렉토리, 버전) - 포인터가 없으면 (root, "")"""
+    pointer = read_index_pointer(root)
+    if pointer is None:
+        return root, ""
+    return pointer["directory"], pointer["version"]
+
+
+def new_version_directory(root: str) -> Tuple[str, str]:
+    """새 버전 이름과 디렉토리 경로 (디렉토리는 만들지 않음)"""
+    base = time.strftime("%Y%m%dT%H%M%S")
+    version, n = base, 1
+    while os.path.exists(os.path.join(root, VERSIONS_DIR, version)):
+        n += 1
+        version = f"{base}-{n}"
+    return version, os.path.join(root, VERSIONS_DIR, version)
+
+
+def publish_index_version(root: str, version: str) -> None:
+    """포인터를 새 버전으로 교체 (임시 파일에 쓴 뒤 교체 - 앱은 항상 완전한 포인터만 읽음)"""
+    directory = os.path.join(root, VERSIONS_DIR, version)
+    if not os.path.isdir(directory):
+        raise FileNotFoundError(f"게시할 버전 디렉토리가 없습니다: {directory}")
+
+    path = os.path.join(root, INDEX_POINTER_FILE)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "version": version,
+            "directory": os.path.join(VERSIONS_DIR, version),
+            "published_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def prune_index_versions(root: str, keep: int = 2) -> list:
+    """
+    오래된 버전 디렉토리 삭제 (현재 버전 포함 최근 keep개 유지)
+
+    직전 버전은 교체 직후 진행 중인 검색이 아직 사용할 수 있으므로 keep은 2 이상을 권장합니다.
+
+    Returns:
+        삭제한 버전 이름 리스트
+    """
+    versions_dir = os.path.join(root, VERSIONS_DIR)
+    if not os.path.isdir(versions_dir):
+        return []
+
+    pointer = read_index_pointer(root)
+    current = pointer["version"] if pointer else None
+    versions = sorted(
+        (name for name in os.listdir(versions_dir) if os.path.isdir(os.path.join(versions_dir, name))),
+        reverse=True
+    )
+    kept = [current] if current else []
+    kept += [name for name in versions if name != current][:max(0, keep - len(kept))]
+
+    removed = []
+    for name in versions:
+        if name not in kept:
+            shutil.rmtree(os.path.join(versions_dir, name), ignore_errors=True)
+            removed.append(name)
+    return removed
+
+
+class IndexReloader:
+    """현재 버전 포인터 감시 + 백그라운드 로드 + 원자적 교체
+
+    Args:
+        root: 벡터 스토어 루트 디렉토리 (current.json 위치)
+        version: 현재 로드된 버전
+        load: (버전 디렉토리, 버전) → 로드/예열이 끝난 새 객체 (감시 스레드에서 호출)
+        on_swap: 새 객체로 교체하는 콜백 - 교체 후 새 요청은 새 객체 사용
+        interval: 포인터 확인 주기 (초)
+    """
+
+    def __init__(
+        self,
+        root: str,
+        version: str,
+        load: Callable[[str, str], object],
+        on_swap: Callable[[object], None],
+        interval: float = 5.0
+    ):
+        self.root = root
+        self.version = version
+        self.load = load
+        self.on_swap = on_swap
+        self.interval = interval
+
+        self.swaps = 0
+        self.failures = 0
+        self._failed_version: Optional[str] = None
+        self._pointer_stat: Optional[Tuple[int, int]] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _pointer_changed(self) -> bool:
+        """포인터 파일의 수정 시각/크기가 바뀌었는지 (stat 한 번으로 확인)"""
+        try:
+            stat = os.stat(os.path.join(self.root, INDEX_POINTER_FILE))
+        except OSError:
+            return False
+        key = (stat.st_mtime_ns, stat.st_size)
+        if key == self._pointer_stat:
+            return False
+        self._pointer_stat = key
+        return True
+
+    def check(self) -> bool:
+        """
+        포인터를 확인하고 새 버전이면 로드 후 교체
+
+        Returns:
+            교체했으면 True
+        """
+        with self._lock:
+            if not self._pointer_changed():
+                return False
+            pointer = read_index_pointer(self.root)
+            if pointer is None or pointer["version"] in (self.version, self._failed_version):
+                return False
+
+            started = time.perf_counter()
+            try:
+                loaded = self.load(pointer["directory"], pointer["version"])
+            except Exception as e:
+                # 로드 실패 시 이전 버전으로 계속 서비스 (같은 버전은 다시 시도하지 않음)
+                self.failures += 1
+                self._failed_version = pointer["version"]
+                print(f"[WARNING] 인덱스 버전 {pointer['version']} 로드 실패 - 이전 버전 유지: {e}")
+                return False
+
+            self.on_swap(loaded)
+            previous, self.version = self.version, pointer["version"]
+            self.swaps += 1
+            print(f"[IndexReloader] 인덱스 교체: {previous or '(초기)'} → {self.version} "
+                  f"({time.perf_counter() - started:.2f}s)")
+            return True
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                print(f"[WARNING] 인덱스 포인터 확인 실패: {e}")
+
+    def start(self) -> "IndexReloader":
+        """감시 스레드 시작 (데몬 스레드 - 프로세스 종료를 막지 않음)"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="index-reloader", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """감시 스레드 종료"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
+
+    def stats(self) -> Dict:
+        return {"version": self.version, "swaps": self.swaps, "failures": self.failures}
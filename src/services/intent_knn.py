@@ -0,0 +1,166 @@
+"""Intent k-NN - 임베딩 최근접 이웃 의도 분류
+
+검색에 쓰는 임베딩 모델로 라벨된 예시 문장(data/intent_exemplars.json)을 한 번만 임베딩해 두고,
+사용자 메시지와 가장 가까운 k개 예시의 유사도 가중 투표로 의도를 분류합니다.
+- 예시 행렬 × 질의 벡터 한 번(벡터화)으로 전체 유사도 계산 → 상위 k개 투표
+- 1위와 2위 득표율 차이(마진)가 INTENT_KNN_MARGIN 미만이거나
+  가장 가까운 예시의 유사도가 INTENT_KNN_MIN_SIMILARITY 미만이면 확정하지 않음 → LLM 분류
+- 질의 임베딩은 검색 서비스의 임베딩(쿼리 캐시 적용)으로 계산하므로
+  기술 문의는 search_knowledge에서 같은 임베딩을 캐시로 재사용 (임베딩 한 번, LLM 호출 없음)
+"""
+
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import os
+import json
+import time
+import threading
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from dotenv import load_dotenv
+
+from src.services.retrieval import get_retrieval_service
+
+# 환경 변수 로드
+load_dotenv()
+
+DEFAULT_EXEMPLARS_PATH = str(project_root / "data" / "intent_exemplars.json")
+
+
+def load_exemplars(path: Optional[str] = None) -> Dict[str, List[str]]:
+    """라벨별 예시 문장 로드 ({의도: [문장, ...]})"""
+    path = path or os.getenv("INTENT_EXEMPLARS_PATH", DEFAULT_EXEMPLARS_PATH)
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+class IntentKNNClassifier:
+    """임베딩 k-NN 의도 분류기
+
+    Args:
+        embeddings: 임베딩 모델 (검색 서비스와 같은 모델이어야 질의 임베딩을 재사용 가능)
+        exemplars: {의도: [예시 문장]} (None이면 INTENT_EXEMPLARS_PATH에서 로드)
+        k: 투표에 참여하는 이웃 수 (None이면 INTENT_KNN_K)
+        margin: 1위 - 2위 득표율 최소 차이 (None이면 INTENT_KNN_MARGIN)
+        min_similarity: 최근접 예시의 최소 코사인 유사도 (None이면 INTENT_KNN_MIN_SIMILARITY)
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        exemplars: Optional[Dict[str, Sequence[str]]] = None,
+        k: Optional[int] = None,
+        margin: Optional[float] = None,
+        min_similarity: Optional[float] = None
+    ):
+        self.embeddings = embeddings
+        self.exemplars = exemplars if exemplars is not None else load_exemplars()
+        self.k = k if k is not None else int(os.getenv("INTENT_KNN_K", "5"))
+        self.margin = margin if margin is not None else float(os.getenv("INTENT_KNN_MARGIN", "0.4"))
+        self.min_similarity = (
+            min_similarity if min_similarity is not None
+            else float(os.getenv("INTENT_KNN_MIN_SIMILARITY", "0.55"))
+        )
+
+        self.intents: List[str] = sorted(self.exemplars)
+        self.texts: List[str] = []
+        labels = []
+        for label, intent in enumerate(self.intents):
+            self.texts.extend(self.exemplars[intent])
+            labels.extend([label] * len(self.exemplars[intent]))
+        self.labels = np.asarray(labels, dtype=np.int64)
+
+        self._matrix: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """예시 임베딩 행렬 (n, dim), L2 정규화 - 처음 사용할 때 배치 임베딩 한 번"""
+        if self._matrix is None:
+            with self._lock:
+                if self._matrix is None:
+                    vectors = np.asarray(self.embeddings.embed_documents(self.texts), dtype=np.float32)
+                    self._matrix = _normalize_rows(vectors)
+        return self._matrix
+
+    def warmup(self) -> float:
+        """예시 임베딩 미리 계산 (앱 시작 시) - 걸린 시간(초) 반환"""
+        started = time.perf_counter()
+        self.matrix
+        return time.perf_counter() - started
+
+    def vote(self, vector: Sequence[float]) -> Dict:
+        """
+        질의 벡터의 k-NN 투표
+
+        Args:
+            vector: 질의 임베딩
+
+        Returns:
+            {"intent", "confidence"(1위 득표율), "margin"(1위 - 2위 득표율),
+             "similarity"(최근접 예시 유사도), "accepted"(확정 여부)}
+        """
+        query = _normalize_rows(np.asarray(vector, dtype=np.float32))
+        similarities = self.matrix @ query
+
+        k = min(self.k, len(similarities))
+        top = np.argpartition(-similarities, k - 1)[:k]
+        weights = np.clip(similarities[top], 0.0, None)
+        votes = np.bincount(self.labels[top], weights=weights, minlength=len(self.intents))
+        total = float(votes.sum())
+        shares = votes / total if total > 0 else votes
+
+        ranked = np.argsort(-shares)
+        confidence = float(shares[ranked[0]])
+        margin = confidence - (float(shares[ranked[1]]) if len(ranked) > 1 else 0.0)
+        similarity = float(similarities[top].max())
+        return {
+            "intent": self.intents[int(ranked[0])],
+            "confidence": round(confidence, 3),
+            "margin": round(margin, 3),
+            "similarity": round(similarity, 3),
+            "accepted": margin >= self.margin and similarity >= self.min_similarity,
+        }
+
+    def classify(self, text: str) -> Optional[Dict]:
+        """텍스트 분류 - 확정된 경우만 투표 결과, 아니면 None (LLM 분류로 넘김)"""
+        result = self.vote(self.embeddings.embed_query(text))
+        return result if result["accepted"] else None
+
+
+_classifier: Optional[IntentKNNClassifier] = None
+_classifier_lock = threading.Lock()
+
+
+def get_intent_classifier(embeddings: Optional[Embeddings] = None) -> IntentKNNClassifier:
+    """
+    프로세스 공유 k-NN 의도 분류기 반환 (예시 임베딩은 프로세스당 한 번)
+
+    Args:
+        embeddings: 처음 생성할 때 사용할 임베딩 (None이면 공유 검색 서비스의 임베딩)
+    """
+    global _classifier
+    if _classifier is None:
+        with _classifier_lock:
+            if _classifier is None:
+                if embeddings is None:
+                    embeddings = get_retrieval_service().embeddings
+                _classifier = IntentKNNClassifier(embeddings)
+    return _classifier
+
+
+def reset_intent_classifier() -> None:
+    """공유 분류기 초기화 (예시 / 임베딩 모델 변경 후, 테스트용)"""
+    global _classifier
+    with _classifier_lock:
+        _classifier = None
@@ -0,0 +1,105 @@
+"""Intent Rules - 의도 분류 규칙 기반 빠른 경로
+
+인사 / 감사 / 챗봇 질문과 "기능 + 실패 표현"이 분명한 기술 문의는
+LLM 없이 미리 컴파일한 패턴으로 분류합니다 (마이크로초 단위).
+- 입력은 쿼리 캐시와 같은 정규화(normalize_query - 공백/문장부호/이모지 제거, 소문자) 후 매칭
+- 확실한 경우에만 (의도, 신뢰도, 규칙 이름)을 반환하고, 애매하면 None → LLM 분류
+- 규칙 우선순위: 기술 문의(기능 + 실패/요청 표현) > 모호한 문제(문장 전체가 모호한 표현) > 잡담(문장 전체가 인사/감사)
+- 감사 / 챗봇 언급이 섞인 문장("설정 방법 알려줘서 고마워요", "이 챗봇 어떻게 사용해요?")은 기술 문의 규칙을 적용하지 않음
+- "설정" / "기능" / "사용" 같은 일반 단어와 "어떻게" / "방법" 같은 사용법 표현은 확실한 신호가 아니므로 규칙에서 제외
+"""
+
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import re
+from typing import Dict, Optional
+
+from src.services.embedding_cache import normalize_query
+
+# 인사 / 감사 접두어 (잡담 규칙 전체 매칭, 모호한 문제 규칙의 선택적 접두어)
+_GREETING = (
+    r"(?:안녕(?:하세요|하십니까|하셨어요)?|안뇽|하이|헬로|hello|hi|hey|"
+    r"좋은(?:아침|오후|저녁|하루)|반갑습니다|반가워요?|처음뵙겠습니다)"
+)
+_THANKS = r"(?:감사합니다|감사해요|감사드립니다|고마워요?|고맙습니다|잘부탁드립니다|잘부탁해요?|thanks|thankyou)"
+_ABOUT_BOT = (
+    r"(?:(?:넌|너는|당신은|챗봇은)?(?:누구(?:야|니|세요|예요|신가요)|뭐야|뭐하는(?:애|봇)?(?:야|니|예요|인가요))|"
+    r"(?:무엇을|뭘|뭐)도와(?:주나요|줄수있어요?|주실수있나요|줄수있나요))"
+)
+_CHITCHAT = r"(?:날씨(?:가)?좋네요|요즘어때요?|잘지내(?:요|셨어요)?|수고하세요|수고하셨습니다)"
+# "ㅎㅎ" / "ㅋㅋ"는 NFKC 정규화 후 첫소리 자모(U+1112 / U+110F)가 됨
+# "^^" / ":)" 같은 이모티콘은 기호/문장부호라 normalize_query에서 이미 제거되므로 패턴에 넣지 않음
+_ENDING = r"(?:이에요|이네요|입니다|이요|요|다)?(?:[ㅎㅋ\u1112\u110f]+)?"
+
+_SMALL_TALK = re.compile(
+    rf"^(?:{_GREETING}|{_THANKS}|{_ABOUT_BOT}|{_CHITCHAT})+{_ENDING}$"
+)
+
+# 기술 문의: 구체적인 기능/대상 + 실패/요청 표현이 함께 있는 경우
+_FEATURE = re.compile(
+    r"(로그인|로그아웃|비밀번호|비번|패스워드|계정|아이디|인증|otp|파일|업로드|다운로드|첨부|메시지|메세지|"
+    r"메신저|채팅|알림|푸시|설치|업데이트|동기화|vpn|프린터|인쇄|메일|이메일|화상회의|화면공유|카메라|마이크|"
+    r"네트워크|와이파이|wifi|인터넷|접속|연결|권한|드라이브|폴더|캘린더|일정|"
+    r"login|password|account|upload|download|file|install|update|sync|printer|email|message)"
+)
+_PROBLEM = re.compile(
+    r"(안돼|안되|안됩|안보|안떠|안와|안열|안들려|안나와|안켜|못하|못해|못받|못보|오류|에러|실패|먹통|"
+    r"잊어버|잊었|분실|잠겼|잠김|끊겨|끊김|끊어|멈춰|멈춤|튕겨|느려|느림|깨져|사라졌|"
+    r"삭제하고싶|변경하고싶|바꾸고싶|초기화|재설정|"
+    r"cant|cannot|couldnt|doesnt|notworking|error|fail|forgot)"
+)
+# 감사 / 챗봇 언급 - 문장 어디에 있든 기술 문의 규칙 보류 (LLM이 판단)
+_THANKS_OR_BOT = re.compile(rf"{_THANKS}|챗봇|chatbot|bot")
+
+# 모호한 문제: 문장 전체가 모호한 표현
+# - "○○가 이상해" / "문제가 생겼어요"처럼 무엇이 실패하는지 없는 표현은 대상이 있어도 모호
+# - "안 돼요" 계열은 대상 없이(뭔가 / 이게 같은 지시어만) 쓴 경우만 모호
+#   ("검색 기능이 안 돼요" / "결재가 안 돼요"는 구체적인 실패 보고 → 규칙 없이 LLM / 검색으로)
+_VAGUE = re.compile(
+    rf"^{_GREETING}?(?:"
+    r"(?:뭔가|좀|그냥)?(?:\w{1,6}(?:이|가|은|는)?)?(?:좀|뭔가|자꾸)?"
+    r"(?:이상해요?|이상해서요|이상한데요?|이상하네요|그래요?|그렇네요|"
+    r"문제가(?:생겼어요?|있어요?|생겼는데요?)|답답해요?|짜증나(?:네요|요)?|속상해요?)"
+    r"|(?:뭔가|그냥|이거|그거|이게|그게|다|전부)?(?:좀|자꾸|계속|갑자기)?(?:잘안돼요?|안돼요?|안되네요)"
+    rf"){_ENDING}$"
+)
+
+RULE_CONFIDENCE = {
+    "technical_support": 0.9,
+    "vague_problem": 0.85,
+    "small_talk": 0.95,
+}
+
+
+def match_intent(text: str) -> Optional[Dict]:
+    """
+    규칙 기반 의도 분류
+
+    Args:
+        text: 사용자 메시지
+
+    Returns:
+        {"intent", "confidence", "rule"} - 확실한 경우만, 애매하면 None (LLM 분류로 넘김)
+    """
+    key = normalize_query(text or "")
+    if not key:
+        return None
+
+    feature = _FEATURE.search(key)
+    problem = _PROBLEM.search(key)
+    if feature and problem and not _THANKS_OR_BOT.search(key):
+        return {
+            "intent": "technical_support",
+            "confidence": RULE_CONFIDENCE["technical_support"],
+            "rule": f"feature:{feature.group(1)}+problem:{problem.group(1)}",
+        }
+
+    if _VAGUE.match(key):
+        return {"intent": "vague_problem", "confidence": RULE_CONFIDENCE["vague_problem"], "rule": "vague"}
+
+    if _SMALL_TALK.match(key):
+        return {"intent": "small_talk", "confidence": RULE_CONFIDENCE["small_talk"], "rule": "small_talk"}
+    return None
@@ -0,0 +1,336 @@
+"""IVF Index - 근사 최근접 이웃(ANN) 인덱스
+
+FAQ + Q&A 게시판 답변처럼 수십만 건 규모에서 brute-force 대신 사용하는
+IVF(Inverted File) 인덱스입니다.
+- 구축: 정규화된 임베딩을 구면 k-means로 nlist개 클러스터에 배정 (coarse quantization)
+- 검색: 쿼리와 가까운 nprobe개 클러스터의 문서만 정확한 점수 계산
+- nprobe를 늘리면 재현율↑ / 지연시간↑ (nprobe = nlist면 exact 검색과 동일)
+
+문서/임베딩은 기존 NumpyIndex 또는 MmapIndex를 그대로 사용하고,
+클러스터 정보만 별도 파일(ivf_index.npz)에 저장합니다.
+클러스터 파일에는 base 인덱스 지문(index_fingerprint)을 함께 저장하여
+base 인덱스가 다시 구축된 뒤의 오래된 클러스터 파일은 로드하지 않습니다.
+"""
+
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import os
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+
+from src.services.vector_index import (
+    VectorIndex,
+    NumpyIndex,
+    similarity_to_distance,
+    index_fingerprint,
+    matches_fingerprint,
+)
+
+IVF_FILE = "ivf_index.npz"
+IVF_FORMAT_VERSION = 2  # 2: base 인덱스 지문 저장
+
+# 클러스터 배정 시 한 번에 곱하는 행 수 (100k x 1024 행렬도 메모리 급증 없이 처리)
+_ASSIGN_CHUNK = 8192
+
+
+def default_nlist(count: int) -> int:
+    """문서 수에 맞는 기본 클러스터 수 (≈ 4·√n, 최소 1)"""
+    return max(1, min(count, int(round(4 * np.sqrt(count)))))
+
+
+def _assign(matrix: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """각 행을 가장 가까운(내적이 가장 큰) 중심에 배정"""
+    assignments = np.empty(matrix.shape[0], dtype=np.int32)
+    for start in range(0, matrix.shape[0], _ASSIGN_CHUNK):
+        chunk = matrix[start:start + _ASSIGN_CHUNK]
+        assignments[start:start + len(chunk)] = np.argmax(chunk @ centroids.T, axis=1)
+    return assignments
+
+
+def spherical_kmeans(
+    matrix: np.ndarray,
+    nlist: int,
+    iterations: int = 20,
+    sample_size: Optional[int] = None,
+    seed: int = 42
+) -> np.ndarray:
+    """
+    구면 k-means (단위 벡터 + 내적 기준)
+
+    Args:
+        matrix: L2 정규화된 임베딩 행렬 (count x dim)
+        nlist: 클러스터 수
+        iterations: 최대 반복 횟수
+        sample_size: 학습에 사용할 표본 수 (None이면 nlist x 64, 전체보다 크면 전체)
+        seed: 난수 시드 (같은 입력이면 같은 인덱스)
+
+    Returns:
+        정규화된 중심 행렬 (nlist x dim, float32)
+    """
+    rng = np.random.default_rng(seed)
+    count = matrix.shape[0]
+    nlist = max(1, min(nlist, count))
+
+    sample_size = min(count, sample_size or nlist * 64)
+    sample_rows = np.sort(rng.choice(count, size=sample_size, replace=False))
+    sample = np.asarray(matrix[sample_rows], dtype=np.float32)
+
+    centroids = sample[rng.choice(sample_size, size=nlist, replace=False)].copy()
+    previous = None
+    for _ in range(iterations):
+        assignments = _assign(sample, centroids)
+        if previous is not None and np.array_equal(assignments, previous):
+            break
+        previous = assignments
+
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, sample)
+        sizes = np.bincount(assignments, minlength=nlist)
+
+        # 빈 클러스터는 임의의 표본으로 다시 시작
+        empty = np.flatnonzero(sizes == 0)
+        if empty.size:
+            sums[empty] = sample[rng.choice(sample_size, size=empty.size, replace=False)]
+
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        centroids = (sums / norms).astype(np.float32)
+
+    return centroids
+
+
+class IVFIndex(VectorIndex):
+    """IVF 근사 검색 백엔드
+
+    - base 인덱스(NumpyIndex / MmapIndex)의 행렬과 문서를 그대로 사용
+    - 클러스터별 행 번호를 연속 배열 하나(list_rows)와 오프셋(list_offsets)으로 보관
+    - 거리 계약은 base 인덱스와 동일 (같은 문서면 같은 거리)
+
+    Args:
+        base: 문서/임베딩을 가진 NumpyIndex (또는 MmapIndex)
+        centroids: 클러스터 중심 (nlist x dim)
+        assignments: 행별 클러스터 번호 (count)
+        nprobe: 검색 시 탐색할 클러스터 수
+    """
+
+    def __init__(self, base: NumpyIndex, centroids: np.ndarray, assignments: np.ndarray, nprobe: int = 8):
+        assignments = np.asarray(assignments, dtype=np.int32)
+        if assignments.shape[0] != base.count():
+            raise ValueError(f"클러스터 배정 수가 문서 수와 맞지 않습니다: {assignments.shape[0]} vs {base.count()}")
+
+        self.base = base
+        self.metric = base.metric
+        self.centroids = np.ascontiguousarray(centroids, dtype=np.float32)
+        self.nlist = self.centroids.shape[0]
+        self.nprobe = max(1, min(nprobe, self.nlist))
+
+        order = np.argsort(assignments, kind="stable").astype(np.int32)
+        sizes = np.bincount(assignments, minlength=self.nlist)
+        self.list_rows = order
+        self.list_offsets = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+        self.assignments = assignments
+
+    @classmethod
+    def build(
+        cls,
+        base: NumpyIndex,
+        nlist: Optional[int] = None,
+        nprobe: int = 8,
+        iterations: int = 20,
+        sample_size: Optional[int] = None,
+        seed: int = 42
+    ) -> "IVFIndex":
+        """base 인덱스의 임베딩으로 k-means 학습 후 전체 문서 배정"""
+        count = base.count()
+        if count == 0:
+            raise ValueError("빈 인덱스로는 IVF를 구축할 수 없습니다")
+
+        nlist = nlist or default_nlist(count)
+        centroids = spherical_kmeans(base.matrix, nlist, iterations=iterations, sample_size=sample_size, seed=seed)
+        return cls(base, centroids, _assign(base.matrix, centroids), nprobe=nprobe)
+
+    def save(self, path: str) -> Dict:
+        """클러스터 정보 저장 (문서/임베딩은 base 인덱스 파일에 있음)"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = path + ".tmp.npz"
+        np.savez(
+            tmp_path,
+            version=np.int32(IVF_FORMAT_VERSION),
+            count=np.int64(self.count()),
+            dim=np.int64(self.centroids.shape[1]),
+            **index_fingerprint(self.base),
+            centroids=self.centroids,
+            assignments=self.assignments,
+        )
+        os.replace(tmp_path, path)
+        return {"nlist": self.nlist, "count": self.count(), "size_bytes": os.path.getsize(path)}
+
+    @classmethod
+    def load(cls, path: str, base: NumpyIndex, nprobe: int = 8) -> "IVFIndex":
+        """저장된 클러스터 정보 로드 (base 인덱스와 문서 수/차원/지문이 다르면 ValueError)"""
+        with np.load(path) as data:
+            version = int(data["version"])
+            if version != IVF_FORMAT_VERSION:
+                raise ValueError(f"지원하지 않는 IVF 인덱스 버전: {version} (지원: {IVF_FORMAT_VERSION})")
+            if int(data["count"]) != base.count() or int(data["dim"]) != base.matrix.shape[1]:
+                raise ValueError(
+                    f"IVF 인덱스가 현재 벡터 인덱스와 맞지 않습니다 "
+                    f"({int(data['count'])}x{int(data['dim'])} vs {base.count()}x{base.matrix.shape[1]}) - 다시 구축하세요"
+                )
+            if not matches_fingerprint(base, data):
+                raise ValueError("IVF 인덱스가 다른 벡터 인덱스로 구축되었습니다 (base 인덱스 재구축 이후) - 다시 구축하세요")
+            return cls(base, data["centroids"], data["assignments"], nprobe=nprobe)
+
+    def _probe_rows(self, query: np.ndarray, nprobe: int) -> np.ndarray:
+        """쿼리와 가까운 nprobe개 클러스터의 행 번호"""
+        lists = NumpyIndex._top_k(self.centroids @ query, nprobe)
+        return np.concatenate([
+            self.list_rows[self.list_offsets[i]:self.list_offsets[i + 1]] for i in lists
+        ])
+
+    def search_by_vector(
+        self,
+        query_vector: Sequence[float],
+        k: int = 5,
+        filter: Optional[Dict] = None,
+        nprobe: Optional[int] = None
+    ) -> List[Tuple[Document, float]]:
+        """
+        근사 검색
+
+        Args:
+            query_vector: 쿼리 임베딩
+            k: 반환할 문서 수
+            filter: 메타데이터 필터 표현식
+            nprobe: 이번 검색에서 탐색할 클러스터 수 (None이면 인덱스 설정값)
+
+        Returns:
+            (Document, 거리) 리스트 - 거리 오름차순
+        """
+        rows, distances = self._search_rows(query_vector, k, filter, nprobe)
+        return [(self.base._document(int(row)), float(d)) for row, d in zip(rows, distances)]
+
+    def search_ids_by_vector(
+        self,
+        query_vector: Sequence[float],
+        k: int = 5,
+        filter: Optional[Dict] = None,
+        nprobe: Optional[int] = None
+    ) -> List[Tuple[str, float]]:
+        rows, distances = self._search_rows(query_vector, k, filter, nprobe)
+        return [(self.base._doc_id(int(row)), float(d)) for row, d in zip(rows, distances)]
+
+    def _search_rows(
+        self,
+        query_vector: Sequence[float],
+        k: int,
+        filter: Optional[Dict],
+        nprobe: Optional[int]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """(행 번호, 거리) 배열 - 거리 오름차순"""
+        empty = (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32))
+        if self.count() == 0 or k <= 0:
+            return empty
+
+        query = self.base._normalize_query(query_vector)
+        nprobe = max(1, min(nprobe or self.nprobe, self.nlist))
+        rows = self._probe_rows(query, nprobe)
+
+        filter_rows = self.metadata_index.rows(filter) if filter else None
+        if filter_rows is not None:
+            # 필터 후보가 탐색 범위보다 적으면 후보 전체를 정확히 검색 (선택도 높은 필터에서 누락 방지)
+            rows = filter_rows if filter_rows.size <= rows.size else np.intersect1d(rows, filter_rows)
+
+        if rows.size == 0:
+            return empty
+
+        similarities = self.base.matrix[rows] @ query
+        local_top = NumpyIndex._top_k(similarities, k)
+        return rows[local_top], similarity_to_distance(similarities[local_top], self.metric)
+
+    def count(self) -> int:
+        return self.base.count()
+
+    def get_documents(self, faq_ids: Sequence[str]) -> Dict[str, Document]:
+        return self.base.get_documents(faq_ids)
+
+    def get_metadatas(self, faq_ids: Sequence[str]) -> Dict[str, Dict]:
+        return self.base.get_metadatas(faq_ids)
+
+    def _metadatas(self) -> Tuple[List[Dict], List[str]]:
+        return self.base._metadatas()
+
+    @property
+    def metadata_index(self):
+        return self.base.metadata_index
+
+
+def evaluate_recall(
+    ivf: IVFIndex,
+    queries: np.ndarray,
+    k: int = 5,
+    nprobes: Sequence[int] = (1, 2, 4, 8, 16)
+) -> List[Dict]:
+    """
+    exact 검색 대비 recall@k / 지연시간 측정
+
+    Args:
+        ivf: 평가할 IVF 인덱스
+        queries: 쿼리 벡터들 (n x dim)
+        k: recall@k의 k
+        nprobes: 비교할 nprobe 값들
+
+    Returns:
+        nprobe별 결과 리스트 (nprobe, recall, latency_p50_ms, latency_p95_ms, scanned_ratio)
+        nprobe=0 항목은 exact(brute-force) 기준
+    """
+    def measure(search) -> Tuple[List[set], List[float]]:
+        found, latencies = [], []
+        for query in queries:
+            started = time.perf_counter()
+            results = search(query)
+            latencies.append(time.perf_counter() - started)
+            found.append({doc.metadata.get("id", "") for doc, _ in results})
+        return found, latencies
+
+    def percentile(values: List[float], q: float) -> float:
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q))] * 1000 if ordered else 0.0
+
+    exact, exact_latencies = measure(lambda q: ivf.base.search_by_vector(q, k=k))
+    report = [{
+        "nprobe": 0,
+        "recall": 1.0,
+        "latency_p50_ms": percentile(exact_latencies, 0.5),
+        "latency_p95_ms": percentile(exact_latencies, 0.95),
+        "scanned_ratio": 1.0,
+    }]
+
+    sizes = np.diff(ivf.list_offsets)
+    for nprobe in nprobes:
+        nprobe = min(nprobe, ivf.nlist)
+        found, latencies = measure(lambda q: ivf.search_by_vector(q, k=k, nprobe=nprobe))
+        hits = sum(len(a & e) for a, e in zip(found, exact))
+        total = sum(len(e) for e in exact)
+
+        scanned = [
+            sizes[NumpyIndex._top_k(ivf.centroids @ ivf.base._normalize_query(q), nprobe)].sum()
+            for q in queries
+        ]
+        report.append({
+            "nprobe": nprobe,
+            "recall": hits / total if total else 1.0,
+            "latency_p50_ms": percentile(latencies, 0.5),
+            "latency_p95_ms": percentile(latencies, 0.95),
+            "scanned_ratio": float(np.mean(scanned)) / ivf.count(),
+        })
+    return report
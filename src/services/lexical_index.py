@@ -0,0 +1,217 @@
+"""Lexical Index - 한국어 문자 n-gram 역색인
+
+FAQ의 제목(title), 태그(tags), 증상(symptom) 텍스트를 문자 bi/tri-gram으로 색인합니다.
+짧은 한국어 질의에 포함된 정확한 제품 용어("VPN", "계정잠금" 등)를
+임베딩 없이 빠르게 찾고, 벡터 검색 결과와 RRF(Reciprocal Rank Fusion)로 결합합니다.
+"""
+
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import re
+import json
+import math
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+# 필드별 가중치 (제목/태그 일치를 증상 일치보다 중요하게)
+DEFAULT_FIELD_WEIGHTS = {"title": 1.0, "tags": 1.0, "symptom": 0.5}
+DEFAULT_NGRAM_SIZES = (2, 3)
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def char_ngrams(text: str, sizes: Sequence[int] = DEFAULT_NGRAM_SIZES) -> set:
+    """
+    문자 n-gram 집합 생성
+    - NFKC 정규화 + 소문자 변환 후 단어 단위로 n-gram 추출 (단어 경계를 넘지 않음)
+    - n보다 짧은 단어는 해당 크기의 n-gram을 만들지 않음
+
+    Args:
+        text: 원본 텍스트
+        sizes: n-gram 크기들
+
+    Returns:
+        n-gram 집합
+    """
+    text = unicodedata.normalize("NFKC", text).lower()
+    grams = set()
+    for token in _TOKEN_PATTERN.findall(text):
+        for n in sizes:
+            for i in range(len(token) - n + 1):
+                grams.add(token[i:i + n])
+    return grams
+
+
+def reciprocal_rank_fusion(rankings: Iterable[Sequence[str]], k: int = 60) -> List[Tuple[str, float]]:
+    """
+    RRF(Reciprocal Rank Fusion) 결합
+    - score(d) = Σ 1 / (k + rank)
+
+    Args:
+        rankings: 문서 ID 순위 리스트들 (좋은 순서대로)
+        k: RRF 상수 (기본 60)
+
+    Returns:
+        (문서 ID, RRF 점수) 리스트 - 점수 내림차순
+    """
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, 1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+class LexicalIndex:
+    """FAQ 문자 n-gram 역색인
+
+    점수는 0~1로 정규화된 가중 커버리지입니다.
+    - 쿼리 n-gram의 IDF 합 중 문서가 가진 n-gram의 IDF 비율
+    - 문서 쪽 가중치는 해당 n-gram이 나타난 필드 중 가장 높은 필드 가중치
+    """
+
+    VERSION = 1
+    FILE_NAME = "lexical_index.json"
+
+    def __init__(
+        self,
+        doc_ids: List[str],
+        postings: Dict[str, Dict[int, float]],
+        ngram_sizes: Sequence[int] = DEFAULT_NGRAM_SIZES,
+        field_weights: Dict[str, float] = None
+    ):
+        self.doc_ids = doc_ids
+        self.postings = postings
+        self.ngram_sizes = tuple(ngram_sizes)
+        self.field_weights = dict(field_weights or DEFAULT_FIELD_WEIGHTS)
+
+        n = len(doc_ids)
+        self.idf = {
+            gram: math.log(1.0 + (n - len(rows) + 0.5) / (len(rows) + 0.5))
+            for gram, rows in postings.items()
+        }
+        # 색인에 없는 n-gram은 df=1 수준의 IDF로 취급 (커버리지를 보수적으로 계산)
+        self.unseen_idf = math.log(1.0 + (n - 0.5) / 1.5) if n else 0.0
+
+    @classmethod
+    def from_faq(
+        cls,
+        faq_data: Iterable[Dict],
+        ngram_sizes: Sequence[int] = DEFAULT_NGRAM_SIZES,
+        field_weights: Dict[str, float] = None
+    ) -> "LexicalIndex":
+        """FAQ 원본 데이터(리스트 또는 제너레이터)로 역색인 구축"""
+        builder = LexicalIndexBuilder(ngram_sizes, field_weights)
+        for faq in faq_data:
+            builder.add(faq)
+        return builder.build()
+
+    def search(self, query: str, k: int = 5, allowed_ids: Optional[Set[str]] = None) -> List[Tuple[str, float]]:
+        """
+        쿼리 검색
+
+        Args:
+            query: 사용자 질의
+            k: 반환할 문서 수
+            allowed_ids: 후보 FAQ ID 집합 (메타데이터 사전 필터 결과, None이면 전체)
+
+        Returns:
+            (FAQ ID, 정규화 점수 0~1) 리스트 - 점수 내림차순
+        """
+        grams = char_ngrams(query, self.ngram_sizes)
+        if not grams:
+            return []
+
+        total = 0.0
+        scores: Dict[int, float] = {}
+        for gram in grams:
+            rows = self.postings.get(gram)
+            if rows is None:
+                total += self.unseen_idf
+                continue
+            idf = self.idf[gram]
+            total += idf
+            for row, weight in rows.items():
+                scores[row] = scores.get(row, 0.0) + idf * weight
+
+        if total <= 0:
+            return []
+
+        if allowed_ids is not None:
+            scores = {row: score for row, score in scores.items() if self.doc_ids[row] in allowed_ids}
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+        return [(self.doc_ids[row], score / total) for row, score in ranked]
+
+    @staticmethod
+    def is_decisive(results: List[Tuple[str, float]], min_score: float, min_margin: float) -> bool:
+        """
+        어휘 검색 결과만으로 충분히 확실한지 판단
+        - 1위 점수가 min_score 이상이고 2위와의 차이가 min_margin 이상
+        """
+        if not results or results[0][1] < min_score:
+            return False
+        runner_up = results[1][1] if len(results) > 1 else 0.0
+        return results[0][1] - runner_up >= min_margin
+
+    def save(self, path: str) -> None:
+        """JSON 파일로 저장 (n-gram별로 이어 써서 postings 사본을 만들지 않음)"""
+        header = {
+            "version": self.VERSION,
+            "ngram_sizes": list(self.ngram_sizes),
+            "field_weights": self.field_weights,
+            "doc_ids": self.doc_ids,
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(header, ensure_ascii=False)[:-1] + ', "postings": {')
+            for i, (gram, rows) in enumerate(self.postings.items()):
+                entry = json.dumps([[row, weight] for row, weight in rows.items()])
+                f.write(f'{", " if i else ""}{json.dumps(gram, ensure_ascii=False)}: {entry}')
+            f.write("}}")
+
+    @classmethod
+    def load(cls, path: str) -> "LexicalIndex":
+        """JSON 파일에서 로드"""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        if data.get("version") != cls.VERSION:
+            raise ValueError(f"지원하지 않는 어휘 색인 버전: {data.get('version')}")
+
+        postings = {
+            gram: {int(row): float(weight) for row, weight in rows}
+            for gram, rows in data["postings"].items()
+        }
+        return cls(data["doc_ids"], postings, data["ngram_sizes"], data["field_weights"])
+
+
+class LexicalIndexBuilder:
+    """FAQ를 하나씩 추가하며 역색인 구축 (스트리밍 구축용 - 원본 FAQ 목록을 보관하지 않음)"""
+
+    def __init__(self, ngram_sizes: Sequence[int] = DEFAULT_NGRAM_SIZES, field_weights: Dict[str, float] = None):
+        self.ngram_sizes = tuple(ngram_sizes)
+        self.field_weights = dict(field_weights or DEFAULT_FIELD_WEIGHTS)
+        self._max_weight = max(self.field_weights.values())
+        self.doc_ids: List[str] = []
+        self.postings: Dict[str, Dict[int, float]] = {}
+
+    def add(self, faq: Dict) -> None:
+        """FAQ 하나 색인 (제목 / 태그 / 증상)"""
+        row = len(self.doc_ids)
+        self.doc_ids.append(faq["id"])
+        tags = faq["tags"] if isinstance(faq["tags"], list) else str(faq["tags"]).split(",")
+        fields = {
+            "title": faq["title"],
+            "tags": " ".join(tag.strip() for tag in tags),
+            "symptom": faq["content"]["symptom"],
+        }
+        for field, text in fields.items():
+            weight = self.field_weights.get(field, 0.0) / self._max_weight
+            for gram in char_ngrams(text, self.ngram_sizes):
+                rows = self.postings.setdefault(gram, {})
+                rows[row] = max(rows.get(row, 0.0), weight)
+
+    def build(self) -> LexicalIndex:
+        return LexicalIndex(self.doc_ids, self.postings, self.ngram_sizes, self.field_weights)
@@ -0,0 +1,241 @@
+"""LLM Response Cache - 결정적(temperature=0) LLM 응답 캐시
+
+의도 분류 / 상태 평가 / 티켓 확인 평가 / 해결 계획처럼 temperature 0으로 호출되는 노드는
+같은 프롬프트에 같은 응답을 내므로 ("네", "아니요", "로그인이 안돼요" 등 반복 입력)
+응답 텍스트를 2단계로 캐시하여 LLM 호출을 생략합니다.
+- 키: (모델 + 옵션, 렌더링된 프롬프트 메시지)의 SHA-256
+- 1단계: 프로세스 메모리 LRU (LLM_CACHE_SIZE)
+- 2단계: SQLite (LLM_CACHE_PATH, 최대 LLM_CACHE_DISK_ROWS행 - 재시작 / 다른 프로세스와 공유)
+- 두 단계 모두 유효 시간(LLM_CACHE_TTL) 적용
+- 노드의 프롬프트 버전이 바뀌면 해당 노드 항목만 무효화 (ensure_prompt_version)
+"""
+
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import Counter, OrderedDict
+from typing import Dict, Optional, Sequence
+
+from langchain_core.messages import BaseMessage
+
+PRUNE_EVERY = 100  # 이 횟수만큼 저장할 때마다 만료/초과 행 정리
+
+
+def response_key(client_key: Sequence, messages: Sequence[BaseMessage]) -> str:
+    """
+    캐시 키 - (모델, temperature, 옵션) + 렌더링된 프롬프트 메시지의 해시
+
+    Args:
+        client_key: LLMProvider.client_key() 결과
+        messages: 모델에 전달되는 메시지 리스트
+    """
+    payload = json.dumps(
+        [list(map(str, client_key)), [[message.type, message.content] for message in messages]],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """2단계(메모리 LRU → SQLite) LLM 응답 캐시
+
+    Args:
+        path: SQLite 파일 경로 (None이면 LLM_CACHE_PATH)
+        memory_size: 메모리 LRU 항목 수 (0이면 메모리 단계 생략)
+        max_rows: SQLite 최대 행 수 (초과 시 오래된 항목부터 삭제, 0이면 디스크 단계 생략)
+        ttl_seconds: 유효 시간 (0이면 만료 없음)
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        memory_size: Optional[int] = None,
+        max_rows: Optional[int] = None,
+        ttl_seconds: Optional[float] = None
+    ):
+        self.path = path or os.getenv("LLM_CACHE_PATH", "data/llm_cache.sqlite")
+        self.memory_size = int(os.getenv("LLM_CACHE_SIZE", "1024")) if memory_size is None else memory_size
+        self.max_rows = int(os.getenv("LLM_CACHE_DISK_ROWS", "100000")) if max_rows is None else max_rows
+        self.ttl_seconds = float(os.getenv("LLM_CACHE_TTL", "604800")) if ttl_seconds is None else ttl_seconds
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key → (저장 시각, 노드, 응답)
+        self._counts: Counter = Counter()  # (노드, memory_hits | disk_hits | misses)
+        self._puts = 0
+
+        self._conn = None
+        if self.max_rows > 0:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            with self._lock:
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS responses ("
+                    " key TEXT PRIMARY KEY,"
+                    " node TEXT NOT NULL,"
+                    " response TEXT NOT NULL,"
+                    " created_at REAL NOT NULL)"
+                )
+                self._conn.execute("CREATE INDEX IF NOT EXISTS responses_node ON responses (node)")
+                self._conn.execute("CREATE INDEX IF NOT EXISTS responses_created ON responses (created_at)")
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS prompt_versions (node TEXT PRIMARY KEY, version TEXT NOT NULL)"
+                )
+                self._conn.commit()
+
+    @property
+    def enabled(self) -> bool:
+        return self.memory_size > 0 or self._conn is not None
+
+    def _expired(self, stored_at: float) -> bool:
+        return self.ttl_seconds > 0 and time.time() - stored_at > self.ttl_seconds
+
+    def get(self, node: str, key: str) -> Optional[str]:
+        """응답 조회 (메모리 → SQLite, SQLite 적중은 메모리에 올림)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if not self._expired(entry[0]):
+                    self._entries.move_to_end(key)
+                    self._counts[(node, "memory_hits")] += 1
+                    return entry[2]
+                del self._entries[key]
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT response, created_at FROM responses WHERE key = ?", [key]
+                ).fetchone()
+                if row is not None and not self._expired(row[1]):
+                    self._remember(key, row[1], node, row[0])
+                    self._counts[(node, "disk_hits")] += 1
+                    return row[0]
+
+            self._counts[(node, "misses")] += 1
+            return None
+
+    def put(self, node: str, key: str, response: str) -> None:
+        """응답 저장 (메모리 + SQLite)"""
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, node, response)
+            if self._conn is None:
+                return
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, node, response, created_at) VALUES (?, ?, ?, ?)",
+                [key, node, response, now]
+            )
+            self._conn.commit()
+            self._puts += 1
+            if self._puts % PRUNE_EVERY == 0:
+                self._prune()
+
+    def _remember(self, key: str, stored_at: float, node: str, response: str) -> None:
+        if self.memory_size <= 0:
+            return
+        self._entries[key] = (stored_at, node, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.memory_size:
+            self._entries.popitem(last=False)
+
+    def _prune(self) -> int:
+        """만료된 행과 최대 행 수를 넘는 오래된 행 삭제 (잠금 안에서 호출)"""
+        removed = 0
+        if self.ttl_seconds > 0:
+            removed += self._conn.execute(
+                "DELETE FROM responses WHERE created_at < ?", [time.time() - self.ttl_seconds]
+            ).rowcount
+        removed += self._conn.execute(
+            "DELETE FROM responses WHERE key IN ("
+            " SELECT key FROM responses ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+            [self.max_rows]
+        ).rowcount
+        self._conn.commit()
+        return removed
+
+    def prune(self) -> int:
+        """만료/초과 행 정리 → 삭제한 행 수"""
+        if self._conn is None:
+            return 0
+        with self._lock:
+            return self._prune()
+
+    def invalidate(self, node: Optional[str] = None) -> int:
+        """
+        캐시 무효화 (프롬프트 / 후처리 변경 시)
+
+        Args:
+            node: 이 노드의 항목만 삭제 (None이면 전체)
+
+        Returns:
+            삭제한 SQLite 행 수
+        """
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if node is None or entry[1] == node]:
+                del self._entries[key]
+            if self._conn is None:
+                return 0
+            if node is None:
+                removed = self._conn.execute("DELETE FROM responses").rowcount
+            else:
+                removed = self._conn.execute("DELETE FROM responses WHERE node = ?", [node]).rowcount
+            self._conn.commit()
+            return removed
+
+    def ensure_prompt_version(self, node: str, version: str) -> bool:
+        """
+        노드 프롬프트 버전 확인 - 저장된 버전과 다르면 해당 노드 항목을 무효화하고 새 버전 기록
+
+        Returns:
+            무효화했으면 True
+        """
+        if self._conn is None or not version:
+            return False
+        with self._lock:
+            row = self._conn.execute("SELECT version FROM prompt_versions WHERE node = ?", [node]).fetchone()
+            if row is not None and row[0] == version:
+                return False
+            self._conn.execute(
+                "INSERT OR REPLACE INTO prompt_versions (node, version) VALUES (?, ?)", [node, version]
+            )
+            self._conn.commit()
+        if row is None:
+            return False
+        removed = self.invalidate(node)
+        print(f"[LLMCache] {node} 프롬프트 버전 변경 ({row[0]} → {version}) - 캐시 {removed}개 무효화")
+        return True
+
+    def stats(self) -> Dict:
+        """노드별 적중률 (메모리 / 디스크 적중 구분)"""
+        with self._lock:
+            counts = dict(self._counts)
+            memory_size = len(self._entries)
+            disk_rows = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0] if self._conn else 0
+
+        nodes = {}
+        for node in sorted({node for node, _ in counts}):
+            memory_hits = counts.get((node, "memory_hits"), 0)
+            disk_hits = counts.get((node, "disk_hits"), 0)
+            misses = counts.get((node, "misses"), 0)
+            total = memory_hits + disk_hits + misses
+            nodes[node] = {
+                "memory_hits": memory_hits,
+                "disk_hits": disk_hits,
+                "misses": misses,
+                "hit_rate": (memory_hits + disk_hits) / total if total else 0.0,
+            }
+        return {"memory_size": memory_size, "disk_rows": disk_rows, "nodes": nodes}
+
+    def close(self) -> None:
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+                self._conn = None
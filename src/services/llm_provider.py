@@ -0,0 +1,313 @@
+"""LLM Provider - 공유 LLM 클라이언트
+
+노드마다 호출할 때마다 ChatOllama를 새로 만들던 것을 프로세스 공유 클라이언트로 대체합니다.
+- (모델, temperature, 옵션)별로 ChatOllama 인스턴스를 한 번만 생성하여 재사용
+- 모든 인스턴스가 Ollama 엔드포인트로의 keep-alive 연결 풀(httpx 전송 계층) 하나를 공유
+- 노드별 호출 수 / 오류 수 / 지연시간(콜백으로 측정)
+- temperature 0 노드는 cache=True로 응답 캐시(LLMResponseCache) 사용 가능 (적중 시 LLM 호출 없음)
+"""
+
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import os
+import time
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+
+import httpx
+import numpy as np
+from ollama import Client
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.runnables import Runnable, RunnableConfig
+from langchain_ollama import ChatOllama
+from dotenv import load_dotenv
+
+from src.services.llm_cache import LLMResponseCache, response_key
+
+# 환경 변수 로드
+load_dotenv()
+
+LATENCY_WINDOW = 512  # 노드별 지연시간 백분위 계산에 쓰는 최근 호출 수
+
+# langchain-ollama 0.3 미만(requirements.txt의 0.2.0 포함)에는 sync_client_kwargs가 없음
+# (모르는 인자는 조용히 무시되므로 필드 존재 여부로 분기)
+_HAS_SYNC_CLIENT_KWARGS = "sync_client_kwargs" in ChatOllama.model_fields
+
+
+class LLMCallStats(BaseCallbackHandler):
+    """노드별 LLM 호출 수 / 오류 수 / 지연시간 (LangChain 콜백)
+
+    같은 핸들러가 여러 스레드의 호출을 동시에 받으므로 실행 ID별 시작 시각을 잠금으로 보호합니다.
+    """
+
+    def __init__(self, node: str):
+        self.node = node
+        self.calls = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.latencies: deque = deque(maxlen=LATENCY_WINDOW)
+        self._started: Dict[UUID, float] = {}
+        self._lock = threading.Lock()
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            self._started[run_id] = time.perf_counter()
+
+    def on_llm_start(self, serialized, prompts, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            self._started[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id, error=False)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id, error=True)
+
+    def _finish(self, run_id: UUID, error: bool) -> None:
+        with self._lock:
+            started = self._started.pop(run_id, None)
+            if started is None:
+                return
+            elapsed = time.perf_counter() - started
+            self.calls += 1
+            self.errors += int(error)
+            self.total_seconds += elapsed
+            self.latencies.append(elapsed)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            latencies = list(self.latencies)
+            calls, errors, total = self.calls, self.errors, self.total_seconds
+        return {
+            "calls": calls,
+            "errors": errors,
+            "avg_ms": round(total / calls * 1000, 1) if calls else 0.0,
+            "p50_ms": round(float(np.percentile(latencies, 50)) * 1000, 1) if latencies else 0.0,
+            "p95_ms": round(float(np.percentile(latencies, 95)) * 1000, 1) if latencies else 0.0,
+        }
+
+
+class CachedChatModel(Runnable):
+    """응답 캐시를 거치는 노드용 LLM (temperature 0 전용)
+
+    렌더링된 프롬프트 메시지로 캐시를 조회하고, 미스일 때만 LLM을 호출하여 응답 텍스트를 저장합니다.
+    적중 시에는 response_metadata["cache"] = "hit"인 AIMessage를 반환합니다.
+    """
+
+    def __init__(self, llm: BaseChatModel, bound: Runnable, node: str, client_key: Tuple, cache: LLMResponseCache):
+        self.llm = llm
+        self.bound = bound
+        self.node = node
+        self.client_key = client_key
+        self.cache = cache
+
+    def _messages(self, input: Any) -> List[BaseMessage]:
+        """invoke 입력(문자열 / 메시지 리스트 / PromptValue) → 메시지 리스트"""
+        return self.llm._convert_input(input).to_messages()
+
+    def invoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> BaseMessage:
+        key = response_key(self.client_key, self._messages(input))
+        cached = self.cache.get(self.node, key)
+        if cached is not None:
+            return AIMessage(content=cached, response_metadata={"cache": "hit"})
+
+        response = self.bound.invoke(input, config, **kwargs)
+        if isinstance(response.content, str) and response.content:
+            self.cache.put(self.node, key, response.content)
+        return response
+
+
+class LLMProvider:
+    """공유 LLM 클라이언트 제공자
+
+    Args:
+        base_url: Ollama 엔드포인트 (None이면 OLLAMA_BASE_URL)
+        model: 기본 모델 (None이면 OLLAMA_LLM_MODEL)
+        factory: (모델, temperature, 옵션) → 채팅 모델 (None이면 공유 연결 풀을 쓰는 ChatOllama, 테스트용)
+        response_cache: 응답 캐시 (None이면 LLM_CACHE_* 설정으로 처음 사용될 때 생성)
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        model: Optional[str] = None,
+        factory: Optional[Callable[..., BaseChatModel]] = None,
+        response_cache: Optional[LLMResponseCache] = None
+    ):
+        self.base_url = base_url or os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+        self.model = model or os.getenv("OLLAMA_LLM_MODEL", "gemma2:27b")
+        self.keep_alive = os.getenv("OLLAMA_KEEP_ALIVE") or None
+        self.timeout = float(os.getenv("LLM_TIMEOUT", "120"))
+        self.factory = factory
+
+        # 모든 ChatOllama 인스턴스가 공유하는 연결 풀 (노드마다 TCP 연결을 새로 맺지 않음)
+        self._transport = httpx.HTTPTransport(
+            limits=httpx.Limits(
+                max_connections=int(os.getenv("LLM_MAX_CONNECTIONS", "16")),
+                max_keepalive_connections=int(os.getenv("LLM_MAX_KEEPALIVE", "8")),
+                keepalive_expiry=float(os.getenv("LLM_KEEPALIVE_EXPIRY", "300"))
+            )
+        )
+        self._clients: Dict[Tuple, BaseChatModel] = {}
+        self._bound: Dict[Tuple, Runnable] = {}
+        self._stats: Dict[str, LLMCallStats] = {}
+        self._lock = threading.Lock()
+
+        self.cache_enabled = os.getenv("LLM_CACHE", "true").lower() == "true"
+        self._response_cache = response_cache
+
+    @property
+    def response_cache(self) -> Optional[LLMResponseCache]:
+        """응답 캐시 (지연 생성, LLM_CACHE=false면 None)"""
+        if self._response_cache is None and self.cache_enabled:
+            with self._lock:
+                if self._response_cache is None:
+                    self._response_cache = LLMResponseCache()
+        return self._response_cache
+
+    @staticmethod
+    def client_key(model: str, temperature: float, options: Dict) -> Tuple:
+        """클라이언트 캐시 키 (모델, temperature, 정렬된 옵션)"""
+        return (model, float(temperature), tuple(sorted(options.items())))
+
+    def _create(self, model: str, temperature: float, options: Dict) -> BaseChatModel:
+        if self.factory is not None:
+            return self.factory(model=model, temperature=temperature, **options)
+        if self.keep_alive is not None:
+            options.setdefault("keep_alive", self.keep_alive)
+        if _HAS_SYNC_CLIENT_KWARGS:
+            return ChatOllama(
+                model=model,
+                base_url=self.base_url,
+                temperature=temperature,
+                client_kwargs={"timeout": self.timeout},
+                sync_client_kwargs={"transport": self._transport},
+                **options
+            )
+
+        # 구버전: client_kwargs는 동기/비동기 클라이언트에 함께 전달되므로 (비동기 클라이언트에 동기 전송 계층 불가)
+        # 타임아웃만 넘기고, 생성 후 동기 클라이언트를 공유 연결 풀을 쓰는 클라이언트로 교체
+        llm = ChatOllama(
+            model=model,
+            base_url=self.base_url,
+            temperature=temperature,
+            client_kwargs={"timeout": self.timeout},
+            **options
+        )
+        llm._client = Client(host=self.base_url, timeout=self.timeout, transport=self._transport)
+        return llm
+
+    def client(self, model: Optional[str] = None, temperature: float = 0, **options: Any) -> BaseChatModel:
+        """(모델, temperature, 옵션)별 공유 채팅 모델 (처음 요청 시 생성)"""
+        model = model or self.model
+        key = self.client_key(model, temperature, options)
+        llm = self._clients.get(key)
+        if llm is None:
+            with self._lock:
+                llm = self._clients.get(key)
+                if llm is None:
+                    llm = self._clients[key] = self._create(model, temperature, dict(options))
+        return llm
+
+    def get(
+        self,
+        node: str,
+        temperature: float = 0,
+        model: Optional[str] = None,
+        cache: bool = False,
+        prompt_version: str = "",
+        **options: Any
+    ) -> Runnable:
+        """
+        노드용 LLM (공유 클라이언트 + 노드별 호출 통계 콜백)
+
+        Args:
+            node: 호출하는 노드 이름 (통계 키)
+            temperature: 샘플링 온도
+            model: 모델 (None이면 OLLAMA_LLM_MODEL)
+            cache: 응답 캐시 사용 (temperature 0일 때만 적용)
+            prompt_version: 노드 프롬프트 버전 - 이전 실행과 다르면 해당 노드의 캐시 항목 무효화
+            **options: ChatOllama 옵션 (num_ctx, num_predict 등 - 옵션이 다르면 별도 클라이언트)
+
+        Returns:
+            invoke() 또는 `prompt | llm`으로 사용할 수 있는 Runnable
+        """
+        model = model or self.model
+        client_key = self.client_key(model, temperature, options)
+        cached = cache and float(temperature) == 0.0 and self.response_cache is not None
+        key = (node, cached) + client_key
+        bound = self._bound.get(key)
+        if bound is None:
+            llm = self.client(model, temperature, **options)
+            if cached:
+                self.response_cache.ensure_prompt_version(node, prompt_version)
+            with self._lock:
+                bound = self._bound.get(key)
+                if bound is None:
+                    stats = self._stats.setdefault(node, LLMCallStats(node))
+                    bound = llm.with_config(callbacks=[stats], run_name=node)
+                    if cached:
+                        bound = CachedChatModel(llm, bound, node, client_key, self._response_cache)
+                    self._bound[key] = bound
+        return bound
+
+    def metrics(self) -> Dict:
+        """공유 클라이언트 수와 노드별 호출 통계"""
+        with self._lock:
+            stats = dict(self._stats)
+            clients = len(self._clients)
+        return {
+            "clients": clients,
+            "nodes": {node: node_stats.stats() for node, node_stats in sorted(stats.items())},
+            "response_cache": self._response_cache.stats() if self._response_cache is not None else None,
+        }
+
+    def close(self) -> None:
+        """공유 연결 풀 / 응답 캐시 닫기"""
+        self._transport.close()
+        if self._response_cache is not None:
+            self._response_cache.close()
+
+
+_provider: Optional[LLMProvider] = None
+_provider_lock = threading.Lock()
+
+
+def get_llm_provider() -> LLMProvider:
+    """프로세스 공유 LLM 제공자 반환"""
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                _provider = LLMProvider()
+    return _provider
+
+
+def get_llm(
+    node: str,
+    temperature: float = 0,
+    model: Optional[str] = None,
+    cache: bool = False,
+    prompt_version: str = "",
+    **options: Any
+) -> Runnable:
+    """노드용 공유 LLM (get_llm_provider().get()의 단축 함수)"""
+    return get_llm_provider().get(
+        node, temperature=temperature, model=model, cache=cache, prompt_version=prompt_version, **options
+    )
+
+
+def reset_llm_provider() -> None:
+    """공유 LLM 제공자 초기화 (설정 변경 후 / 테스트용)"""
+    global _provider
+    with _provider_lock:
+        provider, _provider = _provider, None
+    if provider is not None:
+        provider.close()
@@ -0,0 +1,131 @@
+"""Metadata Index - 메타데이터 사전 필터 색인
+
+FAQ 문서의 category / source / tags 메타데이터(해결 방법 하위 문서는 parent_id 포함)에 대한
+posting list 색인입니다.
+필터 표현식으로 후보 행을 먼저 좁힌 뒤 벡터 백엔드가 후보 행만 점수 계산합니다.
+
+필터 표현식:
+    {"category": "메신저"}                         # 단일 값
+    {"category": ["메신저", "알림"]}               # 필드 내 OR
+    {"category": "메신저", "tags": "알림"}         # 필드 간 AND
+    {"id": ["FAQ-001", "FAQ-007"]}                 # 문서 ID 목록 (posting list 없이 ID → 행 번호로 조회)
+"""
+
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from typing import Dict, List, Optional, Sequence, Set
+
+import numpy as np
+
+FILTER_FIELDS = ("category", "source", "tags", "parent_id")
+ID_FIELD = "id"
+
+
+def split_tags(value) -> List[str]:
+    """태그 메타데이터 정규화 (Chroma에는 "a, b, c" 문자열로 저장됨)"""
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return [str(tag).strip() for tag in value if str(tag).strip()]
+    return [tag.strip() for tag in str(value).split(",") if tag.strip()]
+
+
+def _field_values(metadata: Dict, field: str) -> List[str]:
+    if field == "tags":
+        return split_tags(metadata.get("tags"))
+    value = metadata.get(field)
+    return [] if value is None else [str(value)]
+
+
+def _wanted_values(value) -> List[str]:
+    if isinstance(value, (list, tuple, set)):
+        return [str(v) for v in value]
+    return [str(value)]
+
+
+def validate_filter(filter: Optional[Dict]) -> None:
+    """지원하지 않는 필드가 있으면 ValueError"""
+    for field in (filter or {}):
+        if field not in FILTER_FIELDS and field != ID_FIELD:
+            raise ValueError(f"지원하지 않는 필터 필드: {field} (지원: {', '.join(FILTER_FIELDS + (ID_FIELD,))})")
+
+
+def matches_filter(metadata: Dict, filter: Optional[Dict]) -> bool:
+    """단일 문서 메타데이터가 필터 조건을 만족하는지 확인"""
+    for field, value in (filter or {}).items():
+        if not set(_field_values(metadata, field)) & set(_wanted_values(value)):
+            return False
+    return True
+
+
+class MetadataIndex:
+    """category / source / tags / parent_id posting list 색인
+
+    - 필드 값마다 정렬된 행 번호 배열(int32)을 보관
+    - 필드 내 값들은 합집합, 필드 간에는 교집합
+    - id 필드는 posting list 대신 ID → 행 번호 사전으로 조회 (첫 ID 필터 시 생성)
+    """
+
+    def __init__(self, metadatas: Sequence[Dict], doc_ids: Sequence[str] = None):
+        self.size = len(metadatas)
+        self.doc_ids = list(doc_ids) if doc_ids is not None else [m.get("id", "") for m in metadatas]
+
+        postings: Dict[str, Dict[str, List[int]]] = {field: {} for field in FILTER_FIELDS}
+        for row, metadata in enumerate(metadatas):
+            for field in FILTER_FIELDS:
+                for value in _field_values(metadata or {}, field):
+                    postings[field].setdefault(value, []).append(row)
+
+        self.postings: Dict[str, Dict[str, np.ndarray]] = {
+            field: {value: np.asarray(rows, dtype=np.int32) for value, rows in values.items()}
+            for field, values in postings.items()
+        }
+        self._rows_by_id: Optional[Dict[str, int]] = None
+
+    def values(self, field: str) -> List[str]:
+        """필드에 존재하는 값 목록"""
+        return sorted(self.postings.get(field, {}).keys())
+
+    def rows(self, filter: Optional[Dict]) -> Optional[np.ndarray]:
+        """
+        필터 조건을 만족하는 행 번호
+
+        Args:
+            filter: 필터 표현식 (None/빈 dict면 필터 없음)
+
+        Returns:
+            정렬된 행 번호 배열, 필터가 없으면 None (= 전체)
+        """
+        if not filter:
+            return None
+        validate_filter(filter)
+
+        result: Optional[np.ndarray] = None
+        for field, value in filter.items():
+            if field == ID_FIELD:
+                field_rows = self._id_rows(_wanted_values(value))
+            else:
+                field_postings = self.postings.get(field, {})
+                lists = [field_postings[v] for v in _wanted_values(value) if v in field_postings]
+                field_rows = np.unique(np.concatenate(lists)) if lists else np.zeros(0, dtype=np.int32)
+            result = field_rows if result is None else np.intersect1d(result, field_rows, assume_unique=True)
+            if result.size == 0:
+                break
+        return result
+
+    def _id_rows(self, doc_ids: List[str]) -> np.ndarray:
+        """문서 ID 목록 → 정렬된 행 번호 (색인에 없는 ID는 제외)"""
+        if self._rows_by_id is None:
+            self._rows_by_id = {doc_id: row for row, doc_id in enumerate(self.doc_ids)}
+        rows = [self._rows_by_id[doc_id] for doc_id in doc_ids if doc_id in self._rows_by_id]
+        return np.unique(np.asarray(rows, dtype=np.int32))
+
+    def ids(self, filter: Optional[Dict]) -> Optional[Set[str]]:
+        """필터 조건을 만족하는 FAQ ID 집합 (필터가 없으면 None)"""
+        rows = self.rows(filter)
+        if rows is None:
+            return None
+        return {self.doc_ids[row] for row in rows}
@@ -0,0 +1,295 @@
+"""Quantized Index - 양자화 임베딩 저장소
+
+1024차원 float32 임베딩(문서당 4KB)을 압축된 형태로 메모리에 두고 후보를 점수 계산한 뒤,
+상위 후보만 원본 float32 벡터로 다시 점수를 매깁니다 (exact re-scoring).
+- int8: 벡터별 스케일(max|x| / 127) 스칼라 양자화 - 문서당 dim + 4 바이트
+- float16: 반정밀도 - 문서당 dim x 2 바이트
+
+원본 벡터는 base 인덱스(MmapIndex)에서 재점수 대상 행만 읽으므로
+mmap 백엔드와 함께 쓰면 프로세스 메모리에는 압축 행렬만 상주합니다.
+(인메모리 NumpyIndex 위에서는 float32 행렬이 그대로 남아 메모리가 늘어나므로 검색 서비스는 mmap에서만 사용)
+압축 행렬 파일에는 base 인덱스 지문(index_fingerprint)을 함께 저장하여
+base 인덱스가 다시 구축된 뒤의 오래된 파일은 로드하지 않습니다.
+"""
+
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import os
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+
+from src.services.vector_index import (
+    VectorIndex,
+    NumpyIndex,
+    similarity_to_distance,
+    index_fingerprint,
+    matches_fingerprint,
+)
+from src.services.index_file import MmapIndex
+
+QUANTIZATION_MODES = ("int8", "float16")
+QUANTIZED_FORMAT_VERSION = 2  # 2: base 인덱스 지문 저장
+
+# 근사 점수 계산 시 한 번에 처리하는 행 수
+# (float32 변환 임시 배열이 CPU 캐시에 머무는 크기 - 1024차원 기준 1MB)
+_SCORE_CHUNK = 256
+
+# 양자화 시 한 번에 변환하는 행 수
+_QUANTIZE_CHUNK = 8192
+
+
+def quantized_file_name(mode: str) -> str:
+    """모드별 압축 행렬 파일명"""
+    return f"quantized_{mode}.npz"
+
+
+def quantize(matrix: np.ndarray, mode: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    임베딩 행렬 양자화
+
+    Args:
+        matrix: 임베딩 행렬 (count x dim)
+        mode: int8 | float16
+
+    Returns:
+        (압축 행렬, 벡터별 스케일 - int8만, float16은 None)
+    """
+    if mode not in QUANTIZATION_MODES:
+        raise ValueError(f"지원하지 않는 양자화 방식: {mode} (지원: {', '.join(QUANTIZATION_MODES)})")
+
+    if mode == "float16":
+        return np.asarray(matrix, dtype=np.float16), None
+
+    # 행 청크 단위로 변환 - mmap 행렬도 float32 임시 배열을 전체 크기로 만들지 않음
+    codes = np.empty(matrix.shape, dtype=np.int8)
+    scales = np.zeros(matrix.shape[0], dtype=np.float32)
+    for start in range(0, matrix.shape[0], _QUANTIZE_CHUNK):
+        chunk = np.asarray(matrix[start:start + _QUANTIZE_CHUNK], dtype=np.float32)
+        if not chunk.size:
+            continue
+        chunk_scales = (np.abs(chunk).max(axis=1) / 127.0).astype(np.float32)
+        safe = np.where(chunk_scales > 0, chunk_scales, 1.0)[:, None]
+        codes[start:start + len(chunk)] = np.clip(np.rint(chunk / safe), -127, 127)
+        scales[start:start + len(chunk)] = chunk_scales
+    return codes, scales
+
+
+class QuantizedIndex(VectorIndex):
+    """양자화 검색 백엔드
+
+    - 압축 행렬로 전체(또는 필터 후보) 근사 점수 계산
+    - 상위 rescore개 후보만 base 인덱스의 float32 벡터로 정확한 점수 재계산
+    - 거리 계약은 base 인덱스와 동일 (재점수된 결과는 exact 거리)
+
+    Args:
+        base: 문서/원본 벡터를 가진 NumpyIndex (또는 MmapIndex)
+        codes: 압축 행렬 (int8 또는 float16)
+        scales: int8 벡터별 스케일 (float16이면 None)
+        rescore: 정확한 점수로 다시 계산할 후보 수 (0이면 재점수 없이 근사 거리 반환)
+    """
+
+    def __init__(self, base: NumpyIndex, codes: np.ndarray, scales: Optional[np.ndarray] = None, rescore: int = 20):
+        if codes.shape[0] != base.count():
+            raise ValueError(f"압축 행렬 크기가 문서 수와 맞지 않습니다: {codes.shape[0]} vs {base.count()}")
+
+        self.base = base
+        self.metric = base.metric
+        self.codes = codes
+        self.scales = scales
+        self.mode = "int8" if codes.dtype == np.int8 else "float16"
+        self.rescore = max(0, rescore)
+
+    @classmethod
+    def build(cls, base: NumpyIndex, mode: str = "int8", rescore: int = 20) -> "QuantizedIndex":
+        """base 인덱스의 벡터를 양자화하여 생성"""
+        codes, scales = quantize(base.matrix, mode)
+        return cls(base, codes, scales, rescore=rescore)
+
+    def save(self, path: str) -> Dict:
+        """압축 행렬 저장 (문서/원본 벡터는 base 인덱스 파일에 있음)"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        arrays = {"version": np.int32(QUANTIZED_FORMAT_VERSION), "codes": self.codes, **index_fingerprint(self.base)}
+        if self.scales is not None:
+            arrays["scales"] = self.scales
+        tmp_path = path + ".tmp.npz"
+        np.savez(tmp_path, **arrays)
+        os.replace(tmp_path, path)
+        return {"mode": self.mode, "count": self.count(), "size_bytes": os.path.getsize(path)}
+
+    @classmethod
+    def load(cls, path: str, base: NumpyIndex, rescore: int = 20) -> "QuantizedIndex":
+        """저장된 압축 행렬 로드 (base 인덱스와 크기/지문이 다르면 ValueError)"""
+        with np.load(path) as data:
+            version = int(data["version"])
+            if version != QUANTIZED_FORMAT_VERSION:
+                raise ValueError(f"지원하지 않는 양자화 인덱스 버전: {version} (지원: {QUANTIZED_FORMAT_VERSION})")
+            codes = data["codes"]
+            scales = data["scales"] if "scales" in data.files else None
+
+            if codes.shape != base.matrix.shape:
+                raise ValueError(
+                    f"양자화 인덱스가 현재 벡터 인덱스와 맞지 않습니다 ({codes.shape} vs {base.matrix.shape}) - 다시 구축하세요"
+                )
+            if not matches_fingerprint(base, data):
+                raise ValueError("양자화 인덱스가 다른 벡터 인덱스로 구축되었습니다 (base 인덱스 재구축 이후) - 다시 구축하세요")
+        return cls(base, codes, scales, rescore=rescore)
+
+    def code_bytes(self) -> int:
+        """압축 행렬(+ int8 스케일) 크기 (바이트)"""
+        return self.codes.nbytes + (self.scales.nbytes if self.scales is not None else 0)
+
+    def memory_bytes(self) -> int:
+        """
+        검색에 상주하는 메모리 (바이트)
+        - 압축 행렬 + 인메모리 base의 float32 행렬 (mmap base는 재점수 행만 파일에서 읽으므로 제외)
+        """
+        resident_base = 0 if isinstance(self.base, MmapIndex) else self.base.matrix.nbytes
+        return self.code_bytes() + resident_base
+
+    def _approximate(self, rows: Optional[np.ndarray], query: np.ndarray) -> np.ndarray:
+        """압축 행렬로 근사 유사도 계산 (청크 단위)"""
+        count = self.count() if rows is None else rows.size
+        similarities = np.empty(count, dtype=np.float32)
+        for start in range(0, count, _SCORE_CHUNK):
+            selected = slice(start, start + _SCORE_CHUNK) if rows is None else rows[start:start + _SCORE_CHUNK]
+            chunk = self.codes[selected].astype(np.float32) @ query
+            if self.scales is not None:
+                chunk *= self.scales[selected]
+            similarities[start:start + len(chunk)] = chunk
+        return similarities
+
+    def search_by_vector(
+        self,
+        query_vector: Sequence[float],
+        k: int = 5,
+        filter: Optional[Dict] = None
+    ) -> List[Tuple[Document, float]]:
+        rows, distances = self._search_rows(query_vector, k, filter)
+        return [(self.base._document(int(row)), float(d)) for row, d in zip(rows, distances)]
+
+    def search_ids_by_vector(
+        self,
+        query_vector: Sequence[float],
+        k: int = 5,
+        filter: Optional[Dict] = None
+    ) -> List[Tuple[str, float]]:
+        rows, distances = self._search_rows(query_vector, k, filter)
+        return [(self.base._doc_id(int(row)), float(d)) for row, d in zip(rows, distances)]
+
+    def _search_rows(
+        self,
+        query_vector: Sequence[float],
+        k: int,
+        filter: Optional[Dict]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """(행 번호, 거리) 배열 - 거리 오름차순"""
+        empty = (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32))
+        if self.count() == 0 or k <= 0:
+            return empty
+
+        query = self.base._normalize_query(query_vector)
+        rows = self.metadata_index.rows(filter) if filter else None
+        if rows is not None and rows.size == 0:
+            return empty
+
+        similarities = self._approximate(rows, query)
+        candidates = NumpyIndex._top_k(similarities, max(k, self.rescore))
+        candidate_rows = candidates if rows is None else rows[candidates]
+
+        if self.rescore > 0:
+            # 후보만 원본 float32 벡터로 정확히 재점수 (행 순서로 읽어 mmap 페이지 접근을 순차화)
+            candidate_rows = np.sort(candidate_rows)
+            exact = self.base.matrix[candidate_rows] @ query
+            top = NumpyIndex._top_k(exact, k)
+            top_rows, top_similarities = candidate_rows[top], exact[top]
+        else:
+            top_rows, top_similarities = candidate_rows[:k], similarities[candidates[:k]]
+
+        return top_rows, similarity_to_distance(top_similarities, self.metric)
+
+    def count(self) -> int:
+        return self.base.count()
+
+    def get_documents(self, faq_ids: Sequence[str]) -> Dict[str, Document]:
+        return self.base.get_documents(faq_ids)
+
+    def get_metadatas(self, faq_ids: Sequence[str]) -> Dict[str, Dict]:
+        return self.base.get_metadatas(faq_ids)
+
+    def _metadatas(self) -> Tuple[List[Dict], List[str]]:
+        return self.base._metadatas()
+
+    @property
+    def metadata_index(self):
+        return self.base.metadata_index
+
+
+def compare_quantization(
+    base: NumpyIndex,
+    queries: np.ndarray,
+    k: int = 5,
+    modes: Sequence[str] = QUANTIZATION_MODES,
+    rescore: int = 20
+) -> List[Dict]:
+    """
+    float32 대비 양자화 방식별 메모리 / recall@k / 지연시간 비교
+
+    Args:
+        base: float32 기준 인덱스
+        queries: 쿼리 벡터들 (n x dim)
+        k: recall@k의 k
+        modes: 비교할 양자화 방식
+        rescore: 재점수 후보 수
+
+    Returns:
+        방식별 결과 리스트 (mode, bytes_per_doc, resident_bytes_per_doc, recall, recall_no_rescore, latency_p50_ms)
+        - bytes_per_doc: 검색 행렬 크기, resident_bytes_per_doc: 상주 메모리 (memory_bytes)
+        mode="float32" 항목이 기준
+    """
+    def measure(index) -> Tuple[List[set], List[float]]:
+        found, latencies = [], []
+        for query in queries:
+            started = time.perf_counter()
+            results = index.search_by_vector(query, k=k)
+            latencies.append(time.perf_counter() - started)
+            found.append({doc.metadata.get("id", "") for doc, _ in results})
+        return found, latencies
+
+    def recall(found: List[set], expected: List[set]) -> float:
+        total = sum(len(e) for e in expected)
+        return sum(len(f & e) for f, e in zip(found, expected)) / total if total else 1.0
+
+    count = max(base.count(), 1)
+    exact, exact_latencies = measure(base)
+    report = [{
+        "mode": "float32",
+        "bytes_per_doc": base.matrix.nbytes / count,
+        "resident_bytes_per_doc": base.matrix.nbytes / count,
+        "recall": 1.0,
+        "recall_no_rescore": 1.0,
+        "latency_p50_ms": float(np.median(exact_latencies)) * 1000,
+    }]
+
+    for mode in modes:
+        quantized = QuantizedIndex.build(base, mode=mode, rescore=rescore)
+        found, latencies = measure(quantized)
+        quantized.rescore = 0
+        found_approx, _ = measure(quantized)
+        report.append({
+            "mode": mode,
+            "bytes_per_doc": quantized.code_bytes() / count,
+            "resident_bytes_per_doc": quantized.memory_bytes() / count,
+            "recall": recall(found, exact),
+            "recall_no_rescore": recall(found_approx, exact),
+            "latency_p50_ms": float(np.median(latencies)) * 1000,
+        })
+    return report
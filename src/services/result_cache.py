@@ -0,0 +1,177 @@
+"""Result Cache - 시맨틱 검색 결과 캐시
+
+표현만 다른 질의("비번 까먹었어요" / "비밀번호를 잊어버렸어요")는 대부분 같은 FAQ로 이어집니다.
+쿼리 임베딩이 캐시된 쿼리와 코사인 반경 안에 있으면 인덱스 검색 없이
+이전 검색 결과(retrieved_docs, relevance_score)를 그대로 재사용합니다.
+- 결과가 없던 질의도 캐시 (negative caching → 바로 티켓 확인으로 진행)
+- 최대 개수(LRU) + 유효 시간(TTL)
+- 인덱스 버전이 바뀌면 전체 무효화
+"""
+
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import copy
+import time
+import threading
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+
+class SemanticResultCache:
+    """쿼리 임베딩 기반 검색 결과 캐시
+
+    - 캐시된 쿼리 벡터를 정규화된 float32 행렬 하나에 보관 (조회 = 행렬-벡터 곱 한 번)
+    - scope가 다른 항목(예: 메타데이터 필터가 다른 검색)은 서로 재사용하지 않음
+
+    Args:
+        max_size: 최대 항목 수 (0이면 비활성화)
+        radius: 코사인 거리 반경 (1 - cos, 이 값 이하면 같은 질의로 간주)
+        ttl_seconds: 유효 시간 (초, 0 이하면 만료 없음)
+    """
+
+    def __init__(self, max_size: int = 512, radius: float = 0.05, ttl_seconds: float = 3600.0):
+        self.max_size = max_size
+        self.radius = radius
+        self.ttl_seconds = ttl_seconds
+        self.version: Optional[str] = None
+
+        self._lock = threading.Lock()
+        self._matrix: Optional[np.ndarray] = None  # max_size x dim
+        self._valid = np.zeros(max(max_size, 0), dtype=bool)
+        self._scopes = np.zeros(max(max_size, 0), dtype=np.int32)
+        self._stored_at = np.zeros(max(max_size, 0), dtype=np.float64)
+        self._last_used = np.zeros(max(max_size, 0), dtype=np.int64)
+        self._values: list = [None] * max(max_size, 0)
+        self._scope_codes: Dict[str, int] = {}
+        self._tick = 0
+
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def _normalize(self, vector: Sequence[float]) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def set_version(self, version: Optional[str]) -> None:
+        """인덱스 버전 갱신 - 이전 버전과 다르면 전체 무효화"""
+        with self._lock:
+            if version == self.version:
+                return
+            if self._valid.any():
+                self.invalidations += 1
+            self._valid[:] = False
+            self._values = [None] * len(self._values)
+            self.version = version
+
+    def lookup(self, vector: Sequence[float], scope: str = "") -> Optional[Dict]:
+        """
+        반경 안의 가장 가까운 캐시 항목 조회
+
+        Args:
+            vector: 쿼리 임베딩
+            scope: 검색 범위 키 (필터 등)
+
+        Returns:
+            캐시된 값의 복사본, 없으면 None
+        """
+        if self.max_size <= 0:
+            return None
+
+        query = self._normalize(vector)
+        with self._lock:
+            code = self._scope_codes.get(scope)
+            if code is None or self._matrix is None or self._matrix.shape[1] != query.shape[0]:
+                self.misses += 1
+                return None
+
+            candidates = np.flatnonzero(self._valid & (self._scopes == code))
+            if self.ttl_seconds > 0 and candidates.size:
+                expired = candidates[time.monotonic() - self._stored_at[candidates] > self.ttl_seconds]
+                if expired.size:
+                    self._valid[expired] = False
+                    for slot in expired:
+                        self._values[slot] = None
+                    self.expirations += int(expired.size)
+                    candidates = np.setdiff1d(candidates, expired, assume_unique=True)
+
+            if candidates.size == 0:
+                self.misses += 1
+                return None
+
+            similarities = self._matrix[candidates] @ query
+            best = int(np.argmax(similarities))
+            if 1.0 - float(similarities[best]) > self.radius:
+                self.misses += 1
+                return None
+
+            slot = int(candidates[best])
+            self._tick += 1
+            self._last_used[slot] = self._tick
+            value = self._values[slot]
+            self.hits += 1
+            if not value.get("retrieved_docs"):
+                self.negative_hits += 1
+            return copy.deepcopy(value)
+
+    def store(self, vector: Sequence[float], value: Dict, scope: str = "") -> None:
+        """캐시 저장 (가득 차면 가장 오래 사용되지 않은 항목 교체)"""
+        if self.max_size <= 0:
+            return
+
+        query = self._normalize(vector)
+        with self._lock:
+            if self._matrix is None or self._matrix.shape[1] != query.shape[0]:
+                # 첫 저장 시(또는 임베딩 차원이 바뀌면) 행렬 할당
+                self._matrix = np.zeros((self.max_size, query.shape[0]), dtype=np.float32)
+                self._valid[:] = False
+
+            free = np.flatnonzero(~self._valid)
+            if free.size:
+                slot = int(free[0])
+            else:
+                slot = int(np.argmin(self._last_used))
+                self.evictions += 1
+
+            code = self._scope_codes.setdefault(scope, len(self._scope_codes))
+            self._tick += 1
+            self._matrix[slot] = query
+            self._scopes[slot] = code
+            self._stored_at[slot] = time.monotonic()
+            self._last_used[slot] = self._tick
+            self._values[slot] = copy.deepcopy(value)
+            self._valid[slot] = True
+
+    def clear(self) -> None:
+        """전체 항목 삭제 (통계는 유지)"""
+        with self._lock:
+            self._valid[:] = False
+            self._values = [None] * len(self._values)
+
+    def __len__(self) -> int:
+        return int(self._valid.sum())
+
+    def stats(self) -> Dict[str, float]:
+        """캐시 통계 (hit/miss 카운터, 적중률)"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": int(self._valid.sum()),
+                "max_size": self.max_size,
+                "version": self.version,
+                "hits": self.hits,
+                "negative_hits": self.negative_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
@@ -0,0 +1,1174 @@
+"""Retrieval Service - 공유 검색 서비스
+
+프로세스당 한 번만 생성되는 검색 서비스를 제공합니다.
+임베딩 클라이언트와 Chroma 컬렉션을 재사용하여
+매 턴마다 발생하던 HTTP 클라이언트 생성 / SQLite 컬렉션 오픈 비용을 제거합니다.
+"""
+
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import os
+import json
+import time
+import threading
+import weakref
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Set, Tuple
+
+from langchain_chroma import Chroma
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_ollama import OllamaEmbeddings
+from dotenv import load_dotenv
+
+from src.services.embedding_cache import EmbeddingCache, CachedEmbeddings
+from src.services.vector_index import (
+    VectorIndex,
+    ChromaIndex,
+    NumpyIndex,
+    similarity_to_distance,
+    distance_to_similarity,
+)
+from src.services.lexical_index import LexicalIndex, reciprocal_rank_fusion
+from src.services.index_file import MmapIndex, INDEX_FILE
+from src.services.ivf_index import IVFIndex, IVF_FILE
+from src.services.quantized_index import QuantizedIndex, QUANTIZATION_MODES, quantized_file_name
+from src.services.index_manifest import MANIFEST_FILE
+from src.services.result_cache import SemanticResultCache
+from src.services.solution_index import (
+    SOLUTION_INDEX_FILE,
+    solution_from_document,
+    split_solutions,
+    fallback_solutions,
+    rank_solutions_lexically,
+)
+from src.services.document_store import DocumentStore, DocumentStoreFile, DOC_STORE_FILE, document_to_dict
+from src.services.index_reload import IndexReloader, resolve_index_directory
+from src.services.tenant_shards import ShardRegistry, normalize_tenant
+from src.services.ticket_index import TICKET_INDEX_DIR, is_ticket_id
+
+# 환경 변수 로드
+load_dotenv()
+
+CHROMA_SQLITE_FILE = "chroma.sqlite3"  # Chroma 영속 저장 파일 (매니페스트가 없을 때 인덱스 버전 기준)
+
+
+class RetrievalService:
+    """FAQ 검색 서비스
+
+    - 임베딩 클라이언트와 벡터 스토어를 최초 사용 시 한 번만 생성
+    - 여러 스레드(Streamlit 세션)에서 동시에 사용해도 안전
+    - warmup()으로 앱 시작 시 미리 로드 가능
+    - 쿼리 임베딩은 EmbeddingCache로 캐시 (EMBEDDING_CACHE_SIZE=0이면 비활성화)
+    - 벡터 인덱스 백엔드는 VECTORSTORE_BACKEND로 선택 (chroma | numpy | mmap | ivf)
+      mmap은 build_vectorstore.py가 내보낸 단일 파일 인덱스를 열며 Chroma를 로드하지 않음
+      ivf는 build_ann_index.py가 만든 클러스터 파일로 근사 검색 (IVF_NPROBE로 재현율/지연시간 조절)
+    - VECTORSTORE_QUANTIZATION(int8 | float16)이면 mmap 백엔드를 압축 행렬로 검색 후 상위 후보만 재점수
+      (numpy 백엔드는 float32 행렬이 메모리에 남아 압축 효과가 없으므로 적용하지 않음)
+    - hybrid_search(): 문자 n-gram 어휘 색인 + 벡터 검색을 RRF로 결합 (어휘 전용 문서도 실제 벡터 거리)
+      어휘 점수만으로 확실한 질의는 decisive_lexical_ids()가 임베딩 없이 어휘 점수로 응답
+    - cached_results() / cache_results(): 쿼리 임베딩 반경 기반 검색 결과 캐시
+      (SEMANTIC_CACHE_SIZE=0이면 비활성화, 인덱스 버전이 바뀌면 무효화)
+    - best_solutions(): 검색된 FAQ들의 해결 방법 하위 문서 중 질의와 가장 가까운 것만 선택
+    - *_ids 검색은 (FAQ ID, 거리)만 반환하고, 본문은 hydrate()로 문서 저장소(+LRU)에서 조회
+    - batch_search_ids(): 여러 쿼리를 배치 임베딩 + 다중 쿼리 검색 한 번으로 처리 (오프라인 작업용)
+      batch_search_collections()는 티켓 컬렉션까지 같은 방식으로 검색하여 search_collections와 같은 규칙으로 병합
+    - persist_directory에 버전 포인터(current.json)가 있으면 게시된 버전 디렉토리를 열고,
+      공유 서비스는 포인터가 바뀌면 새 버전으로 무중단 교체 (INDEX_RELOAD_INTERVAL)
+    - get_retrieval_service(tenant)는 테넌트별 샤드(tenants/<테넌트>)를 같은 클래스의 인스턴스로 반환
+    - search_collections(): FAQ + 답변 완료 티켓 컬렉션(<루트>/tickets)을 스레드 풀에서 동시 검색하고
+      정규화 점수 × 출처 가중치로 병합 (질의당 전체 마감 시간 SEARCH_DEADLINE_MS)
+    """
+
+    BACKENDS = ("chroma", "numpy", "mmap", "ivf")
+
+    def __init__(
+        self,
+        persist_directory: Optional[str] = None,
+        embedding_model: Optional[str] = None,
+        base_url: Optional[str] = None,
+        collection_name: str = "faq_collection",
+        backend: Optional[str] = None,
+        embeddings: Optional[Embeddings] = None
+    ):
+        self.root_directory = persist_directory or os.getenv("VECTORSTORE_PATH", "data/vectorstore")
+        # 버전 포인터가 있으면 게시된 버전 디렉토리, 없으면 루트 디렉토리 그대로
+        self.persist_directory, self.published_version = resolve_index_directory(self.root_directory)
+        self.embedding_model = embedding_model or os.getenv("OLLAMA_EMBEDDING_MODEL", "bge-m3-korean")
+        self.base_url = base_url or os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+        self.collection_name = collection_name
+        self.index_file = os.getenv("VECTORSTORE_INDEX_FILE") or os.path.join(self.persist_directory, INDEX_FILE)
+        self.ivf_file = os.getenv("IVF_INDEX_FILE") or os.path.join(self.persist_directory, IVF_FILE)
+        self.ivf_nprobe = int(os.getenv("IVF_NPROBE", "8"))
+        self.backend = (backend or os.getenv("VECTORSTORE_BACKEND", "chroma")).lower()
+        if self.backend not in self.BACKENDS:
+            raise ValueError(
+                f"지원하지 않는 VECTORSTORE_BACKEND: {self.backend} (지원: {', '.join(self.BACKENDS)})"
+            )
+        quantization = os.getenv("VECTORSTORE_QUANTIZATION", "none").lower()
+        if quantization not in ("none", "") + QUANTIZATION_MODES:
+            raise ValueError(
+                f"지원하지 않는 VECTORSTORE_QUANTIZATION: {quantization} (지원: none, {', '.join(QUANTIZATION_MODES)})"
+            )
+        self.quantization = quantization if quantization in QUANTIZATION_MODES else None
+        self.quantized_rescore = int(os.getenv("QUANTIZED_RESCORE", "20"))
+
+        self.embedding_cache = EmbeddingCache(
+            max_size=int(os.getenv("EMBEDDING_CACHE_SIZE", "1024")),
+            ttl_seconds=float(os.getenv("EMBEDDING_CACHE_TTL", "3600"))
+        )
+
+        self.result_cache = SemanticResultCache(
+            max_size=int(os.getenv("SEMANTIC_CACHE_SIZE", "512")),
+            radius=float(os.getenv("SEMANTIC_CACHE_RADIUS", "0.05")),
+            ttl_seconds=float(os.getenv("SEMANTIC_CACHE_TTL", "3600"))
+        )
+
+        self.solution_index_file = os.path.join(self.persist_directory, SOLUTION_INDEX_FILE)
+        self.doc_store_file = os.path.join(self.persist_directory, DOC_STORE_FILE)
+        self.doc_cache_size = int(os.getenv("DOC_STORE_CACHE_SIZE", "256"))
+        self.solutions_top_k = int(os.getenv("SOLUTIONS_TOP_K", "3"))
+
+        # 하이브리드 검색 설정
+        self.hybrid_enabled = os.getenv("HYBRID_SEARCH", "true").lower() == "true"
+        self.lexical_min_score = float(os.getenv("LEXICAL_DECISIVE_SCORE", "0.6"))
+        self.lexical_min_margin = float(os.getenv("LEXICAL_DECISIVE_MARGIN", "0.25"))
+        self.rrf_k = int(os.getenv("RRF_K", "60"))
+        self.path_counts: Counter = Counter()  # 검색 경로별 처리 횟수 (lexical / hybrid / vector)
+
+        # 다중 컬렉션 검색 설정 (티켓 인덱스가 구축된 경우에만 사용)
+        self.ticket_directory: Optional[str] = os.path.join(self.root_directory, TICKET_INDEX_DIR)
+        self.source_weights = {
+            "faq": float(os.getenv("FAQ_SOURCE_WEIGHT", "1.0")),
+            "tickets": float(os.getenv("TICKET_SOURCE_WEIGHT", "0.9")),
+        }
+        self.search_deadline = float(os.getenv("SEARCH_DEADLINE_MS", "5000")) / 1000
+        self.collection_counts: Counter = Counter()  # 컬렉션별 검색 / 마감 초과 / 실패 횟수
+
+        self._lock = threading.Lock()
+        self._base_embeddings = embeddings  # 지정 시 Ollama 대신 사용 (오프라인 벤치마크/테스트)
+        self._embeddings: Optional[Embeddings] = None
+        self._vectorstore: Optional[Chroma] = None
+        self._index: Optional[VectorIndex] = None
+        self._lexical_index: Optional[LexicalIndex] = None
+        self._lexical_loaded = False
+        self._solution_index: Optional[VectorIndex] = None
+        self._doc_store: Optional[DocumentStore] = None
+        self._solution_loaded = False
+        self._warmed = False
+        self._version_warned = False
+        self._closeables: list = []  # 버전 교체 후 해제할 mmap 파일 / Chroma 클라이언트
+        self._ticket_service: Optional["RetrievalService"] = None
+        self._ticket_reloader: Optional[IndexReloader] = None
+        self._ticket_lock = threading.Lock()
+
+    @property
+    def embeddings(self) -> Embeddings:
+        """임베딩 클라이언트 (지연 생성, 쿼리 캐시 적용)"""
+        if self._embeddings is None:
+            with self._lock:
+                if self._embeddings is None:
+                    embeddings = self._base_embeddings or OllamaEmbeddings(
+                        model=self.embedding_model,
+                        base_url=self.base_url
+                    )
+                    if self.embedding_cache.max_size > 0:
+                        embeddings = CachedEmbeddings(embeddings, self.embedding_cache)
+                    self._embeddings = embeddings
+        return self._embeddings
+
+    @property
+    def vectorstore(self) -> Chroma:
+        """Chroma 벡터 스토어 (지연 생성)"""
+        if self._vectorstore is None:
+            embeddings = self.embeddings
+            with self._lock:
+                if self._vectorstore is None:
+                    self._vectorstore = Chroma(
+                        persist_directory=self.persist_directory,
+                        embedding_function=embeddings,
+                        collection_name=self.collection_name
+                    )
+                    self._closeables.append(self._vectorstore._client)
+        return self._vectorstore
+
+    @property
+    def index(self) -> VectorIndex:
+        """선택된 벡터 인덱스 백엔드 (지연 생성)"""
+        if self._index is None:
+            if self.backend == "mmap":
+                with self._lock:
+                    if self._index is None:
+                        # 단일 파일 인덱스를 mmap으로 열기 (Chroma/SQLite 로드 없음)
+                        self._index = self._quantized(self._open_mmap(self.index_file))
+                return self._index
+
+            if self.backend == "ivf" and os.path.exists(self.index_file):
+                with self._lock:
+                    if self._index is None:
+                        # 단일 파일 인덱스 위에 클러스터 정보만 얹음 (Chroma 로드 없음)
+                        self._index = self._ivf(self._open_mmap(self.index_file))
+                return self._index
+
+            vectorstore = self.vectorstore
+            with self._lock:
+                if self._index is None:
+                    if self.backend == "ivf":
+                        self._index = self._ivf(NumpyIndex.from_chroma(vectorstore))
+                    elif self.backend == "numpy":
+                        # Chroma에 저장된 임베딩을 한 번 읽어 행렬로 적재 (재임베딩 없음)
+                        if self.quantization is not None:
+                            print(f"[WARNING] VECTORSTORE_QUANTIZATION={self.quantization}은 mmap 백엔드에서만 적용됩니다 "
+                                  "(numpy 백엔드는 float32 행렬을 그대로 사용)")
+                        self._index = NumpyIndex.from_chroma(vectorstore)
+                    else:
+                        self._index = ChromaIndex(vectorstore)
+        return self._index
+
+    def _open_mmap(self, path: str) -> MmapIndex:
+        index = MmapIndex.open(path)
+        self._closeables.append(index)
+        return index
+
+    def spawn(self, persist_directory: str, version: str = "") -> "RetrievalService":
+        """
+        같은 설정으로 다른 인덱스 디렉토리를 여는 서비스 (버전 교체용)
+
+        임베딩 클라이언트와 쿼리 임베딩 캐시는 공유하고 (같은 임베딩 모델),
+        결과 캐시 / 문서 LRU / 인덱스는 새로 만듭니다.
+        """
+        service = RetrievalService(
+            persist_directory=persist_directory,
+            embedding_model=self.embedding_model,
+            base_url=self.base_url,
+            collection_name=self.collection_name,
+            backend=self.backend,
+            embeddings=self._base_embeddings
+        )
+        if version:
+            # 같은 루트의 새 버전 - 티켓 컬렉션 위치는 루트 기준으로 유지
+            service.published_version = version
+            service.root_directory = self.root_directory
+            service.ticket_directory = self.ticket_directory
+        service.embedding_cache = self.embedding_cache
+        service._embeddings = self._embeddings
+        return service
+
+    def release_when_unreferenced(self) -> None:
+        """더 이상 참조되지 않으면(진행 중인 검색이 모두 끝나면) 파일 매핑과 Chroma 클라이언트 해제"""
+        weakref.finalize(self, _close_all, self._closeables)
+        if self._ticket_service is not None:
+            self._ticket_service.release_when_unreferenced()
+
+    def _ivf(self, base: NumpyIndex) -> VectorIndex:
+        """IVF 클러스터 파일 로드 - 파일이 없거나 base 인덱스와 맞지 않으면(재구축 이후) 경고 후 exact 검색"""
+        try:
+            return IVFIndex.load(self.ivf_file, base, nprobe=self.ivf_nprobe)
+        except (OSError, KeyError, ValueError) as e:
+            print(f"[WARNING] IVF 인덱스를 사용할 수 없어 exact 검색으로 대체합니다 ({self.ivf_file}): {e}")
+            return base
+
+    def _quantized(self, base: MmapIndex) -> VectorIndex:
+        """
+        양자화 설정 시 mmap base 인덱스를 압축 행렬 백엔드로 감쌈
+        - 구축된 파일이 없으면 메모리에서 양자화
+        - 파일이 base 인덱스와 맞지 않으면(재구축 이후) 경고 후 exact 검색
+        """
+        if self.quantization is None:
+            return base
+        path = os.path.join(self.persist_directory, quantized_file_name(self.quantization))
+        if not os.path.exists(path):
+            return QuantizedIndex.build(base, mode=self.quantization, rescore=self.quantized_rescore)
+        try:
+            return QuantizedIndex.load(path, base, rescore=self.quantized_rescore)
+        except (OSError, KeyError, ValueError) as e:
+            print(f"[WARNING] 양자화 인덱스를 사용할 수 없어 exact 검색으로 대체합니다 ({path}): {e}")
+            return base
+
+    @property
+    def lexical_index(self) -> Optional[LexicalIndex]:
+        """문자 n-gram 어휘 색인 (build_vectorstore.py가 만든 파일이 없으면 None)"""
+        if not self._lexical_loaded:
+            with self._lock:
+                if not self._lexical_loaded:
+                    path = os.path.join(self.persist_directory, LexicalIndex.FILE_NAME)
+                    if os.path.exists(path):
+                        self._lexical_index = LexicalIndex.load(path)
+                    self._lexical_loaded = True
+        return self._lexical_index
+
+    @property
+    def solution_index(self) -> Optional[VectorIndex]:
+        """해결 방법 하위 문서 색인 (build_vectorstore.py가 만든 파일이 없으면 None)"""
+        if not self._solution_loaded:
+            with self._lock:
+                if not self._solution_loaded:
+                    if os.path.exists(self.solution_index_file):
+                        self._solution_index = self._open_mmap(self.solution_index_file)
+                    self._solution_loaded = True
+        return self._solution_index
+
+    @property
+    def doc_store(self) -> DocumentStore:
+        """문서 저장소 (doc_store.bin이 있으면 mmap 파일, 없으면 벡터 인덱스에서 조회) + LRU"""
+        if self._doc_store is None:
+            source = None
+            if not os.path.exists(self.doc_store_file):
+                source = self.index
+            with self._lock:
+                if self._doc_store is None:
+                    if source is None:
+                        source = DocumentStoreFile(self.doc_store_file)
+                        self._closeables.append(source)
+                    self._doc_store = DocumentStore(source, max_size=self.doc_cache_size)
+        return self._doc_store
+
+    @property
+    def ticket_service(self) -> Optional["RetrievalService"]:
+        """
+        답변 완료 티켓 컬렉션 검색 서비스 (지연 생성)
+
+        - 티켓 인덱스(build_vectorstore.py --tickets)가 없으면 None
+        - 티켓 디렉토리에 버전 포인터가 있으면 접근할 때마다 확인하여 새 버전으로 교체
+        """
+        if self._ticket_service is None:
+            if not self.ticket_directory or not os.path.isdir(self.ticket_directory):
+                return None
+            with self._ticket_lock:
+                if self._ticket_service is None:
+                    service = self._load_tickets(self.ticket_directory)
+                    self._ticket_reloader = IndexReloader(
+                        self.ticket_directory,
+                        service.published_version,
+                        load=self._load_tickets,
+                        on_swap=self._swap_tickets
+                    )
+                    self._ticket_service = service
+        elif self._ticket_reloader is not None:
+            self._ticket_reloader.check()
+        return self._ticket_service
+
+    def _load_tickets(self, directory: str, version: str = "") -> "RetrievalService":
+        """티켓 컬렉션 서비스 생성 + 예열 (임베딩 클라이언트 / 쿼리 임베딩 캐시 공유)"""
+        service = self.spawn(directory)
+        if version:
+            service.published_version = version
+        service.ticket_directory = None
+        service.warmup(query=None)
+        return service
+
+    def _swap_tickets(self, service: "RetrievalService") -> None:
+        previous, self._ticket_service = self._ticket_service, service
+        if previous is not None:
+            previous.release_when_unreferenced()
+
+    @property
+    def collection(self):
+        """내부 Chroma 컬렉션 (통계/조회용)"""
+        return self.vectorstore._collection
+
+    def warmup(self, query: Optional[str] = "비밀번호를 잊어버렸어요") -> float:
+        """
+        서비스 예열
+        - 임베딩 클라이언트와 컬렉션을 미리 생성
+        - query가 주어지면 검색을 한 번 수행하여 HTTP 연결과 인덱스를 로드
+        - 이미 예열된 경우 바로 반환
+
+        Args:
+            query: 예열용 검색어 (None이면 로드만 수행)
+
+        Returns:
+            예열에 걸린 시간 (초)
+        """
+        if self._warmed:
+            return 0.0
+
+        started = time.perf_counter()
+        self.index
+        self.lexical_index
+        self.doc_store
+        self.ticket_service
+        if query:
+            self.similarity_search_with_score(query, k=1)
+            self._warmed = True
+        return time.perf_counter() - started
+
+    def similarity_search_with_score(
+        self,
+        query: str,
+        k: int = 5,
+        filter: Optional[Dict] = None
+    ) -> List[Tuple[Document, float]]:
+        """유사 문서 검색 (점수 포함, 낮을수록 유사)"""
+        query_vector = self.embeddings.embed_query(query)
+        return self.index.search_by_vector(query_vector, k=k, filter=filter)
+
+    def similarity_search_ids(
+        self,
+        query: str,
+        k: int = 5,
+        filter: Optional[Dict] = None
+    ) -> List[Tuple[str, float]]:
+        """유사 문서 검색 - (FAQ ID, 거리)만 반환 (본문은 hydrate()로 조회)"""
+        query_vector = self.embeddings.embed_query(query)
+        return self.index.search_ids_by_vector(query_vector, k=k, filter=filter)
+
+    def hybrid_search_ids(
+        self,
+        query: str,
+        k: int = 5,
+        filter: Optional[Dict] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        어휘 + 벡터 하이브리드 검색 - (FAQ ID, 거리)만 반환
+
+        1. 문자 n-gram 색인으로 어휘 검색
+        2. 벡터 검색 결과와 RRF로 결합
+
+        점수 계약은 벡터 검색과 동일합니다 (낮을수록 유사).
+        벡터 결과에 없는 어휘 전용 문서도 같은 질의 벡터로 거리를 계산하므로 모든 거리는 실제 벡터 거리입니다.
+        (어휘 점수만으로 확실한 질의를 임베딩 없이 처리하는 경로는 decisive_lexical_ids)
+
+        Args:
+            query: 사용자 질의
+            k: 반환할 문서 수
+            filter: 메타데이터 필터 표현식 (예: {"category": "메신저"}) - 어휘/벡터 양쪽에 적용
+
+        Returns:
+            (FAQ ID, 거리) 리스트 - RRF 순서
+        """
+        lexical = self._lexical_search(query, k, filter)
+        query_vector = self.embeddings.embed_query(query)
+        vector = self.index.search_ids_by_vector(query_vector, k=k, filter=filter)
+        return self._fuse(query_vector, vector, lexical, k)
+
+    def decisive_lexical_ids(
+        self,
+        query: str,
+        k: int = 5,
+        filter: Optional[Dict] = None
+    ) -> Optional[List[Tuple[str, float]]]:
+        """
+        어휘 점수만으로 확실한 질의의 검색 결과 - 임베딩을 한 번도 호출하지 않음
+
+        search_knowledge_node가 시맨틱 결과 캐시(질의 임베딩 필요)보다 먼저 확인합니다.
+        FAQ 어휘 검색이 확실하면(is_decisive) 티켓 컬렉션도 어휘 색인으로만 검색하여
+        search_collections와 같은 출처 가중치로 병합합니다.
+
+        벡터 거리가 없으므로 점수는 거리로 바꾸지 않은 어휘 점수입니다 (0~1, 높을수록 유사).
+        거리 임계값이 아닌 어휘 점수(LEXICAL_MIN_SCORE)로 걸러야 합니다.
+
+        Args:
+            query: 사용자 질의
+            k: 반환할 문서 수
+            filter: 메타데이터 필터 표현식 - 두 컬렉션 모두에 적용
+
+        Returns:
+            (문서 ID, 가중 어휘 점수) 리스트 - 점수 내림차순,
+            또는 None (어휘 색인이 없거나 확실하지 않음 → 하이브리드 검색)
+        """
+        lexical = self._lexical_search(query, k, filter)
+        if not LexicalIndex.is_decisive(lexical or [], self.lexical_min_score, self.lexical_min_margin):
+            return None
+        return self._lexical_collections(query, lexical, k, filter)
+
+    def search_collections(
+        self,
+        query: str,
+        k: int = 5,
+        filter: Optional[Dict] = None,
+        deadline: Optional[float] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        FAQ + 답변 완료 티켓 컬렉션 동시 하이브리드 검색 - (문서 ID, 거리)만 반환
+
+        1. 두 컬렉션의 hybrid_search_ids를 공유 스레드 풀에서 동시에 실행
+        2. 마감 시간까지 끝난 컬렉션 결과만 사용 (초과한 컬렉션은 건너뛰고 경고)
+        3. 거리를 코사인 유사도로 정규화한 뒤 출처 가중치(FAQ_SOURCE_WEIGHT / TICKET_SOURCE_WEIGHT)를 곱해
+           다시 거리로 변환한 뒤 가중 거리 순으로 정렬하여 병합
+
+        티켓 인덱스가 없으면 hybrid_search_ids와 같습니다 (스레드 풀을 거치지 않음).
+
+        Args:
+            query: 사용자 질의
+            k: 반환할 문서 수
+            filter: 메타데이터 필터 표현식 - 두 컬렉션 모두에 적용
+            deadline: 질의당 전체 마감 시간 (초, None이면 SEARCH_DEADLINE_MS)
+
+        Returns:
+            (문서 ID, 거리) 리스트 - 티켓 문서 ID는 "TICKET-" 접두사
+        """
+        if not self.ticket_directory or not os.path.isdir(self.ticket_directory):
+            return self.hybrid_search_ids(query, k=k, filter=filter)
+
+        deadline = self.search_deadline if deadline is None else deadline
+
+        def search_tickets():
+            tickets = self.ticket_service
+            return tickets.hybrid_search_ids(query, k=k, filter=filter) if tickets is not None else []
+
+        pool = _search_pool()
+        futures = {
+            pool.submit(self.hybrid_search_ids, query, k, filter): "faq",
+            pool.submit(search_tickets): "tickets",
+        }
+        done, _ = wait(futures, timeout=deadline)
+
+        results: Dict[str, List[Tuple[str, float]]] = {}
+        for future, source in futures.items():
+            if future not in done:
+                # 마감 초과 - 결과를 기다리지 않음 (실행 중인 검색은 백그라운드에서 끝남)
+                future.cancel()
+                self._count_collection(source, "timeouts")
+                print(f"[WARNING] {source} 컬렉션 검색이 마감 시간({deadline * 1000:.0f}ms)을 넘어 제외합니다")
+                continue
+            try:
+                results[source] = future.result()
+            except Exception as e:
+                # FAQ 검색 오류는 단일 컬렉션 검색과 같이 호출자에게 전달, 티켓 검색 오류는 FAQ 결과만 사용
+                if source == "faq":
+                    raise
+                self._count_collection(source, "errors")
+                print(f"[WARNING] {source} 컬렉션 검색 실패: {e}")
+                continue
+            self._count_collection(source, "searches")
+
+        return self._merge_collections(results, k)
+
+    def embed_queries(self, queries: List[str], batch_size: Optional[int] = None) -> List[List[float]]:
+        """
+        여러 쿼리 임베딩 (batch_size개씩 모델 배치 호출, 쿼리 캐시 적용)
+
+        Args:
+            queries: 쿼리 리스트
+            batch_size: 모델 호출 한 번에 보낼 쿼리 수 (None이면 EMBED_BATCH_SIZE)
+
+        Returns:
+            쿼리 순서대로 임베딩 리스트
+        """
+        batch_size = batch_size or int(os.getenv("EMBED_BATCH_SIZE", "32"))
+        embeddings = self.embeddings
+        embed = embeddings.embed_queries if isinstance(embeddings, CachedEmbeddings) else embeddings.embed_documents
+
+        vectors = []
+        for start in range(0, len(queries), batch_size):
+            vectors.extend(embed(list(queries[start:start + batch_size])))
+        return vectors
+
+    def batch_search_ids(
+        self,
+        queries: List[str],
+        k: int = 5,
+        filter: Optional[Dict] = None,
+        batch_size: Optional[int] = None
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        여러 쿼리 하이브리드 검색 (캐시 예열 / 검색 평가 / 티켓 중복 탐지 등 오프라인 작업용)
+
+        hybrid_search_ids와 같은 결과를 반환하되
+        쿼리를 배치로 임베딩하고 인덱스의 다중 쿼리 검색 한 번으로 점수 계산
+
+        Args:
+            queries: 쿼리 리스트
+            k: 쿼리당 반환할 문서 수
+            filter: 모든 쿼리에 적용할 메타데이터 필터
+            batch_size: 임베딩 배치 크기 (None이면 EMBED_BATCH_SIZE)
+
+        Returns:
+            쿼리 순서대로 (FAQ ID, 거리) 리스트
+        """
+        lexical_results = [self._lexical_search(query, k, filter) for query in queries]
+        return self._batch_search_ids(queries, k, filter, batch_size, lexical_results)
+
+    def batch_search_collections(
+        self,
+        queries: List[str],
+        k: int = 5,
+        filter: Optional[Dict] = None,
+        batch_size: Optional[int] = None,
+        decisive: bool = True
+    ) -> Tuple[List[List[Tuple[str, float]]], Set[int]]:
+        """
+        여러 쿼리 FAQ + 답변 완료 티켓 컬렉션 검색 (search_knowledge_batch용)
+
+        쿼리별로 search_knowledge_node와 같은 병합 규칙을 적용합니다.
+        - FAQ 어휘 점수만으로 확실한 쿼리(decisive_lexical_ids): 임베딩 없이 두 컬렉션 어휘 결과 사용
+        - 나머지 쿼리(search_collections): FAQ / 티켓 컬렉션 모두 batch_search_ids로 일괄 검색
+        오프라인 작업용이므로 마감 시간은 적용하지 않으며, 티켓 검색 오류는 FAQ 결과만 사용합니다.
+
+        Args:
+            queries: 쿼리 리스트
+            k: 쿼리당 반환할 문서 수
+            filter: 메타데이터 필터 - 두 컬렉션 모두에 적용
+            batch_size: 임베딩 배치 크기 (None이면 EMBED_BATCH_SIZE)
+            decisive: False면 어휘 점수가 확실한 쿼리도 벡터 검색 (노드의 필터 대체 재검색과 같은 경로)
+
+        Returns:
+            (쿼리 순서대로 결과 리스트, 어휘 결과로 답한 쿼리 번호)
+            - 어휘 결과 쿼리는 (문서 ID, 가중 어휘 점수), 나머지는 (문서 ID, 거리)
+            - 티켓 문서 ID는 "TICKET-" 접두사
+        """
+        results: List[Optional[List[Tuple[str, float]]]] = [None] * len(queries)
+        lexical_results = [self._lexical_search(query, k, filter) for query in queries]
+
+        lexical_queries = set()
+        if decisive:
+            for i, lexical in enumerate(lexical_results):
+                if LexicalIndex.is_decisive(lexical or [], self.lexical_min_score, self.lexical_min_margin):
+                    results[i] = self._lexical_collections(queries[i], lexical, k, filter)
+                    lexical_queries.add(i)
+
+        pending = [i for i, result in enumerate(results) if result is None]
+        if not pending:
+            return results, lexical_queries
+
+        pending_queries = [queries[i] for i in pending]
+        faq_results = self._batch_search_ids(
+            pending_queries, k, filter, batch_size, [lexical_results[i] for i in pending]
+        )
+        if not self.ticket_directory or not os.path.isdir(self.ticket_directory):
+            for i, docs in zip(pending, faq_results):
+                results[i] = docs
+            return results, lexical_queries
+
+        try:
+            tickets = self.ticket_service
+            ticket_results = (
+                tickets.batch_search_ids(pending_queries, k, filter, batch_size) if tickets is not None else None
+            )
+        except Exception as e:
+            self._count_collection("tickets", "errors")
+            print(f"[WARNING] tickets 컬렉션 일괄 검색 실패: {e}")
+            ticket_results = None
+
+        for j, (i, docs) in enumerate(zip(pending, faq_results)):
+            merged = {"faq": docs}
+            if ticket_results is not None:
+                merged["tickets"] = ticket_results[j]
+                self._count_collection("tickets", "searches")
+            results[i] = self._merge_collections(merged, k)
+        return results, lexical_queries
+
+    def _batch_search_ids(
+        self,
+        queries: List[str],
+        k: int,
+        filter: Optional[Dict],
+        batch_size: Optional[int],
+        lexical_results: List[Optional[List[Tuple[str, float]]]]
+    ) -> List[List[Tuple[str, float]]]:
+        """batch_search_ids 본체 - 쿼리별 어휘 결과(_lexical_search)를 받아 벡터 결과와 RRF 결합"""
+        if not queries:
+            return []
+        vectors = self.embed_queries(queries, batch_size=batch_size)
+        vector_results = self.index.search_ids_by_vectors(vectors, k=k, filter=filter)
+        return [
+            self._fuse(query_vector, vector, lexical, k)
+            for query_vector, vector, lexical in zip(vectors, vector_results, lexical_results)
+        ]
+
+    def hybrid_search(
+        self,
+        query: str,
+        k: int = 5,
+        filter: Optional[Dict] = None
+    ) -> List[Tuple[Document, float]]:
+        """어휘 + 벡터 하이브리드 검색 (hybrid_search_ids 결과를 문서 저장소에서 조회)"""
+        return self._with_documents(self.hybrid_search_ids(query, k=k, filter=filter))
+
+    def hydrate(self, refs: List[Dict]) -> List[Dict]:
+        """
+        검색 결과 참조 → 본문 포함 dict (문서 저장소 + LRU, 티켓 참조는 티켓 컬렉션에서 조회)
+
+        Args:
+            refs: state["retrieved_docs"] 형식의 참조들 ({"id", "score", ...})
+
+        Returns:
+            id, category, title, content, tags, score, source, helpful_count dict 리스트
+        """
+        documents = self.get_documents([ref["id"] for ref in refs])
+        return [
+            document_to_dict(documents[ref["id"]], ref.get("score"), ref.get("lexical_score"))
+            for ref in refs
+            if ref["id"] in documents
+        ]
+
+    def get_documents(self, doc_ids: List[str]) -> Dict[str, Document]:
+        """문서 ID → Document (FAQ는 문서 저장소, "TICKET-" ID는 티켓 컬렉션 문서 저장소)"""
+        ticket_ids = [doc_id for doc_id in doc_ids if is_ticket_id(doc_id)]
+        documents = self.doc_store.get_documents([doc_id for doc_id in doc_ids if not is_ticket_id(doc_id)])
+        tickets = self.ticket_service if ticket_ids else None
+        if tickets is not None:
+            documents.update(tickets.doc_store.get_documents(ticket_ids))
+        return documents
+
+    def get_metadatas(self, doc_ids: List[str]) -> Dict[str, Dict]:
+        """문서 ID → 메타데이터만 (검색 결과 참조 생성용 - 본문을 읽지 않음, 티켓 ID는 티켓 컬렉션에서)"""
+        ticket_ids = [doc_id for doc_id in doc_ids if is_ticket_id(doc_id)]
+        metadatas = self.doc_store.get_metadatas([doc_id for doc_id in doc_ids if not is_ticket_id(doc_id)])
+        tickets = self.ticket_service if ticket_ids else None
+        if tickets is not None:
+            metadatas.update(tickets.doc_store.get_metadatas(ticket_ids))
+        return metadatas
+
+    def hydrate_solutions(self, refs: List[Dict]) -> List[Dict]:
+        """
+        해결 방법 참조 → 본문 포함 dict
+
+        하위 문서 색인에 있으면 그 문서를, 없으면(대체 선택된 경우) 상위 FAQ 본문에서 해당 방법 블록을 사용합니다.
+        """
+        if not refs:
+            return []
+
+        documents = self.solution_index.get_documents([ref["id"] for ref in refs]) if self.solution_index else {}
+        missing_parents = [ref["parent_id"] for ref in refs if ref["id"] not in documents]
+        parents = self.get_documents(missing_parents) if missing_parents else {}
+
+        solutions = []
+        for ref in refs:
+            if ref["id"] in documents:
+                solution = solution_from_document(documents[ref["id"]], ref.get("score"))
+                if ref.get("lexical_score") is not None:
+                    solution["lexical_score"] = ref["lexical_score"]
+            elif ref["parent_id"] in parents:
+                blocks = split_solutions(parents[ref["parent_id"]].page_content)
+                block = next((b for b in blocks if b["method"] == ref["method"]), None)
+                if block is None:
+                    continue
+                solution = dict(ref, content=block["content"])
+            else:
+                continue
+            solutions.append(solution)
+        return solutions
+
+    def infer_category_filter(self, text: str) -> Optional[Dict]:
+        """
+        텍스트에 색인된 카테고리명이 언급되면 카테고리 필터 생성
+        (예: "메신저가 이상해" → {"category": "메신저"})
+
+        Args:
+            text: 사용자 메시지
+
+        Returns:
+            필터 표현식, 언급된 카테고리가 없으면 None
+        """
+        mentioned = [
+            category for category in self.index.metadata_index.values("category")
+            if category and category in text
+        ]
+        return {"category": mentioned} if mentioned else None
+
+    def best_solutions(
+        self,
+        query: str,
+        retrieved_docs: List[Dict],
+        limit: Optional[int] = None,
+        lexical: bool = False
+    ) -> List[Dict]:
+        """
+        검색된 FAQ들의 해결 방법 중 질의와 가장 가까운 것 선택
+
+        Args:
+            query: 사용자 질의
+            retrieved_docs: 검색된 FAQ 참조 리스트 (search_knowledge_node 결과, id 필수)
+            limit: 선택할 해결 방법 수 (None이면 SOLUTIONS_TOP_K)
+            lexical: 어휘 검색 경로 결과 - 임베딩 없이 문자 n-gram 겹침으로 방법 선택
+
+        Returns:
+            해결 방법 dict 리스트 (id, parent_id, method, title, content, score) - 거리 오름차순
+            어휘 경로는 거리 없이(score None) n-gram 겹침 비율(lexical_score) 내림차순
+            하위 문서 색인이 없으면 상위 FAQ 순서대로 본문에서 추출
+            티켓 문서는 담당자 답변(방법 하나)을 그대로 사용하여 FAQ 해결 방법 뒤에 추가
+        """
+        limit = limit or self.solutions_top_k
+        ticket_docs = [doc for doc in retrieved_docs if is_ticket_id(doc.get("id", ""))]
+        if ticket_docs:
+            answers = fallback_solutions(self._with_content(ticket_docs), limit)
+            faq_docs = [doc for doc in retrieved_docs if not is_ticket_id(doc.get("id", ""))]
+            if not faq_docs or len(answers) >= limit:
+                return answers[:limit]
+            return self.best_solutions(query, faq_docs, limit - len(answers), lexical=lexical) + answers
+
+        parent_ids = [doc["id"] for doc in retrieved_docs if doc.get("id")]
+        if not parent_ids:
+            return []
+
+        if lexical:
+            # 어휘 경로는 질의 임베딩을 만들지 않음 - 검색된 FAQ 본문의 방법들을 n-gram 겹침으로 정렬
+            docs = self._with_content(retrieved_docs)
+            candidates = fallback_solutions(docs, sum(len(split_solutions(doc.get("content", ""))) for doc in docs))
+            return [
+                dict(solution, lexical_score=float(coverage))
+                for solution, coverage in rank_solutions_lexically(query, candidates, limit)
+            ]
+
+        solution_index = self.solution_index
+        if solution_index is None:
+            return fallback_solutions(self._with_content(retrieved_docs), limit)
+
+        query_vector = self.embeddings.embed_query(query)
+        results = solution_index.search_by_vector(query_vector, k=limit, filter={"parent_id": parent_ids})
+        if not results:
+            return fallback_solutions(self._with_content(retrieved_docs), limit)
+        return [solution_from_document(doc, float(score)) for doc, score in results]
+
+    def index_version(self) -> str:
+        """
+        현재 인덱스 버전
+        - 게시된 버전 디렉토리: 버전 이름
+        - mmap/ivf: 인덱스 파일의 수정 시각 + 크기
+        - chroma/numpy: 매니페스트(build_vectorstore.py가 구축 시마다 갱신)의 수정 시각 + 크기
+          (매니페스트 없이 구축된 저장소는 Chroma SQLite 파일의 수정 시각 + 크기)
+        - 어느 파일도 없으면 "" (결과 캐시를 사용하지 않음)
+        - 티켓 컬렉션이 로드되어 있으면 티켓 인덱스 버전을 덧붙임 (티켓 재구축 시 결과 캐시 무효화)
+        """
+        version = self._own_index_version()
+        if self._ticket_service is not None:
+            version += f"+{self._ticket_service.index_version()}"
+        return version
+
+    def _own_index_version(self) -> str:
+        if self.published_version:
+            return self.published_version
+        if self.backend in ("mmap", "ivf") and os.path.exists(self.index_file):
+            paths = [self.index_file]
+        else:
+            paths = [os.path.join(self.persist_directory, name) for name in (MANIFEST_FILE, CHROMA_SQLITE_FILE)]
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            return f"{stat.st_mtime_ns}:{stat.st_size}"
+        return ""
+
+    def _result_cache_enabled(self) -> bool:
+        """결과 캐시 사용 여부 - 인덱스 버전을 알 수 없으면 재구축 후에도 이전 결과가 남으므로 사용하지 않음"""
+        if self.result_cache.max_size <= 0:
+            return False
+        if self._own_index_version():
+            return True
+        if not self._version_warned:
+            self._version_warned = True
+            print(f"[WARNING] 인덱스 버전을 확인할 수 없어 검색 결과 캐시를 사용하지 않습니다: {self.persist_directory}")
+        return False
+
+    @staticmethod
+    def _cache_scope(filter: Optional[Dict]) -> str:
+        return json.dumps(filter, ensure_ascii=False, sort_keys=True) if filter else ""
+
+    def cached_results(self, query: str, filter: Optional[Dict] = None) -> Optional[Dict]:
+        """
+        시맨틱 결과 캐시 조회
+
+        Args:
+            query: 사용자 질의
+            filter: 메타데이터 필터 (필터가 다른 검색 결과는 재사용하지 않음)
+
+        Returns:
+            {"retrieved_docs": [...], "retrieved_solutions": [...], "relevance_score": float} 또는 None (미스)
+        """
+        if not self._result_cache_enabled():
+            return None
+        self.result_cache.set_version(self.index_version())
+        query_vector = self.embeddings.embed_query(query)
+        return self.result_cache.lookup(query_vector, scope=self._cache_scope(filter))
+
+    def cache_results(
+        self,
+        query: str,
+        retrieved_docs: List[Dict],
+        relevance_score: float,
+        filter: Optional[Dict] = None,
+        retrieved_solutions: Optional[List[Dict]] = None
+    ) -> None:
+        """시맨틱 결과 캐시 저장 (결과가 없는 경우도 저장 - negative caching)"""
+        if not self._result_cache_enabled():
+            return
+        query_vector = self.embeddings.embed_query(query)
+        self.result_cache.store(
+            query_vector,
+            {
+                "retrieved_docs": retrieved_docs,
+                "retrieved_solutions": retrieved_solutions or [],
+                "relevance_score": relevance_score,
+            },
+            scope=self._cache_scope(filter)
+        )
+
+    def metrics(self) -> Dict:
+        """캐시 적중률 / 검색 경로 통계"""
+        with self._lock:
+            path_counts = dict(self.path_counts)
+        return {
+            "embedding_cache": self.embedding_cache.stats(),
+            "result_cache": self.result_cache.stats(),
+            "doc_store": self.doc_store.stats() if self._doc_store is not None else None,
+            "search_paths": path_counts,
+            "index_version": self.published_version or None,
+            "reloader": _reloader.stats() if _reloader is not None else None,
+            "tenant_shards": _shards.stats() if _shards is not None else None,
+            "collections": self.collection_stats(),
+        }
+
+    def collection_stats(self) -> Optional[Dict]:
+        """다중 컬렉션 검색 통계 (티켓 컬렉션이 로드되지 않았으면 None)"""
+        tickets = self._ticket_service
+        if tickets is None:
+            return None
+        with self._lock:
+            counts = dict(self.collection_counts)
+        return {
+            "ticket_version": tickets.index_version() or None,
+            "weights": dict(self.source_weights),
+            "deadline_ms": self.search_deadline * 1000,
+            "counts": {f"{source}.{event}": count for (source, event), count in counts.items()},
+            "reloader": self._ticket_reloader.stats() if self._ticket_reloader is not None else None,
+        }
+
+    def _merge_collections(
+        self,
+        results: Dict[str, List[Tuple[str, float]]],
+        k: int,
+        lexical: bool = False
+    ) -> List[Tuple[str, float]]:
+        """
+        컬렉션별 (문서 ID, 거리) → 가중 거리로 병합
+
+        거리를 코사인 유사도로 정규화하고 출처 가중치를 곱해 다시 거리로 변환합니다
+        (가중치 < 1이면 같은 유사도라도 거리가 멀어져 임계값 필터에서 불리).
+        컬렉션별 RRF 순서는 가중 거리 순이 아니므로 전체를 가중 거리로 정렬한 뒤 상위 k개를 반환합니다
+        (거리가 같으면 컬렉션 순서 → 컬렉션 내 순서 유지).
+
+        lexical=True면 (문서 ID, 어휘 점수)에 출처 가중치를 바로 곱해 점수 내림차순으로 병합합니다
+        (어휘 점수는 거리로 변환하지 않음).
+        """
+        if lexical:
+            weighted = [
+                (doc_id, float(score * self.source_weights.get(source, 1.0)))
+                for source, docs in results.items()
+                for doc_id, score in docs
+            ]
+            return sorted(weighted, key=lambda item: item[1], reverse=True)[:k]
+
+        metric = self.index.metric
+        weighted = []
+        for source, docs in results.items():
+            weight = self.source_weights.get(source, 1.0)
+            weighted.extend(
+                (doc_id, float(similarity_to_distance(distance_to_similarity(distance, metric) * weight, metric)))
+                for doc_id, distance in docs
+            )
+        return sorted(weighted, key=lambda item: item[1])[:k]
+
+    def _count_collection(self, source: str, event: str) -> None:
+        with self._lock:
+            self.collection_counts[(source, event)] += 1
+
+    def _lexical_search(self, query: str, k: int, filter: Optional[Dict]) -> Optional[List[Tuple[str, float]]]:
+        """어휘 검색 (FAQ ID, 정규화 점수) - 어휘 색인이 없거나 하이브리드 검색이 꺼져 있으면 None"""
+        lexical_index = self.lexical_index if self.hybrid_enabled else None
+        if lexical_index is None:
+            return None
+        allowed_ids = self.index.metadata_index.ids(filter) if filter else None
+        return lexical_index.search(query, k=k, allowed_ids=allowed_ids)
+
+    def _lexical_collections(
+        self,
+        query: str,
+        lexical: List[Tuple[str, float]],
+        k: int,
+        filter: Optional[Dict]
+    ) -> List[Tuple[str, float]]:
+        """확실한 FAQ 어휘 결과 + 티켓 컬렉션 어휘 결과 → (문서 ID, 가중 어휘 점수) (임베딩 없음)"""
+        self._count_path("lexical")
+        results = {"faq": lexical}
+        if self.ticket_directory and os.path.isdir(self.ticket_directory):
+            try:
+                tickets = self.ticket_service
+                ticket_lexical = tickets._lexical_search(query, k, filter) if tickets is not None else None
+            except Exception as e:
+                self._count_collection("tickets", "errors")
+                print(f"[WARNING] tickets 컬렉션 어휘 검색 실패: {e}")
+                ticket_lexical = None
+            if ticket_lexical:
+                results["tickets"] = ticket_lexical
+                self._count_collection("tickets", "searches")
+        return self._merge_collections(results, k, lexical=True)
+
+    def _fuse(
+        self,
+        query_vector: List[float],
+        vector: List[Tuple[str, float]],
+        lexical: Optional[List[Tuple[str, float]]],
+        k: int
+    ) -> List[Tuple[str, float]]:
+        """
+        벡터 결과 + 어휘 결과 RRF 결합 (어휘 결과가 없으면 벡터 결과 그대로)
+
+        벡터 결과에 없는 어휘 전용 문서는 같은 질의 벡터로 해당 문서만 거리를 계산합니다
+        (어휘 점수를 거리로 바꾸지 않음 - 임계값 필터와 출처 가중치는 실제 벡터 거리에만 적용).
+        """
+        if not lexical:
+            self._count_path("vector")
+            return vector
+
+        distances = dict(vector)
+        fused = reciprocal_rank_fusion(
+            [list(distances.keys()), [faq_id for faq_id, _ in lexical]],
+            k=self.rrf_k
+        )[:k]
+        lexical_only = [faq_id for faq_id, _ in fused if faq_id not in distances]
+        if lexical_only:
+            distances.update(
+                self.index.search_ids_by_vector(query_vector, k=len(lexical_only), filter={"id": lexical_only})
+            )
+
+        self._count_path("hybrid")
+        return [(faq_id, distances[faq_id]) for faq_id, _ in fused if faq_id in distances]
+
+    def _with_documents(self, results: List[Tuple[str, float]]) -> List[Tuple[Document, float]]:
+        """(FAQ ID, 거리) → (Document, 거리) - 저장소에 없는 ID는 제외"""
+        documents = self.get_documents([faq_id for faq_id, _ in results])
+        return [(documents[faq_id], score) for faq_id, score in results if faq_id in documents]
+
+    def _with_content(self, retrieved_docs: List[Dict]) -> List[Dict]:
+        """본문이 없는 참조만 문서 저장소에서 조회"""
+        if all("content" in doc for doc in retrieved_docs):
+            return retrieved_docs
+        return self.hydrate(retrieved_docs)
+
+    def _count_path(self, path: str) -> None:
+        with self._lock:
+            self.path_counts[path] += 1
+
+    def similarity_search(self, query: str, k: int = 5) -> List[Document]:
+        """유사 문서 검색"""
+        return [doc for doc, _ in self.similarity_search_with_score(query, k=k)]
+
+
+def _close_all(closeables: list) -> None:
+    """교체된 버전의 mmap 파일 / Chroma 클라이언트 닫기"""
+    for resource in closeables:
+        try:
+            resource.close()
+        except Exception as e:
+            print(f"[WARNING] 이전 인덱스 버전 해제 실패: {e}")
+    closeables.clear()
+
+
+def _search_pool() -> ThreadPoolExecutor:
+    """컬렉션 동시 검색용 공유 스레드 풀 (SEARCH_WORKERS, 처음 사용될 때 생성)"""
+    global _executor
+    if _executor is None:
+        with _service_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=int(os.getenv("SEARCH_WORKERS", "8")),
+                    thread_name_prefix="collection-search"
+                )
+    return _executor
+
+
+_service: Optional[RetrievalService] = None
+_service_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+_reloader: Optional[IndexReloader] = None
+_shards: Optional[ShardRegistry] = None
+_missing_tenants: set = set()
+
+
+def _load_version(directory: str, version: str) -> RetrievalService:
+    """새 인덱스 버전 로드 + 예열 (감시 스레드에서 실행 - 검색 요청은 기존 버전으로 계속 처리)"""
+    service = _service.spawn(directory, version)
+    service.warmup(query=None)
+    return service
+
+
+def _swap_service(service: RetrievalService) -> None:
+    """공유 서비스 교체 - 이후 get_retrieval_service()는 새 버전을 반환"""
+    global _service
+    with _service_lock:
+        previous, _service = _service, service
+    if previous is not None:
+        previous.release_when_unreferenced()
+
+
+def _load_shard(directory: str) -> RetrievalService:
+    """테넌트 샤드 서비스 생성 (기본 서비스의 임베딩 클라이언트 / 쿼리 임베딩 캐시 공유)"""
+    return get_retrieval_service().spawn(directory)
+
+
+def _tenant_service(tenant: str) -> Optional[RetrievalService]:
+    """테넌트 샤드 조회 (샤드 레지스트리는 처음 사용될 때 생성)"""
+    global _shards
+    if _shards is None:
+        root = get_retrieval_service().root_directory
+        with _service_lock:
+            if _shards is None:
+                _shards = ShardRegistry(
+                    root,
+                    factory=_load_shard,
+                    max_bytes=int(float(os.getenv("TENANT_SHARD_MEMORY_MB", "1024")) * 1024 * 1024),
+                    max_shards=int(os.getenv("TENANT_SHARD_MAX", "8"))
+                )
+    return _shards.get(tenant)
+
+
+def get_retrieval_service(tenant: Optional[str] = None) -> RetrievalService:
+    """
+    프로세스 공유 검색 서비스 반환
+
+    버전 포인터(current.json)를 사용하는 구성이면 INDEX_RELOAD_INTERVAL초마다 포인터를 확인하여
+    새 버전을 백그라운드에서 로드한 뒤 교체합니다 (0이면 감시하지 않음).
+    호출자가 받은 서비스 객체는 교체 후에도 그대로 유효합니다.
+
+    Args:
+        tenant: 테넌트 키 (state["tenant_id"]) - 지정되면 해당 테넌트 샤드,
+                샤드가 구축되지 않은 테넌트는 기본 인덱스 사용
+
+    Returns:
+        RetrievalService 인스턴스 (기본 인덱스 싱글톤 또는 테넌트 샤드)
+    """
+    tenant = normalize_tenant(tenant)
+    if tenant is not None:
+        service = _tenant_service(tenant)
+        if service is not None:
+            return service
+        with _service_lock:
+            first_miss = tenant not in _missing_tenants
+            _missing_tenants.add(tenant)
+        if first_miss:
+            print(f"[WARNING] 테넌트 '{tenant}' 샤드가 없어 기본 인덱스를 사용합니다")
+
+    global _service, _reloader
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = RetrievalService()
+                interval = float(os.getenv("INDEX_RELOAD_INTERVAL", "5"))
+                if interval > 0:
+                    _reloader = IndexReloader(
+                        _service.root_directory,
+                        _service.published_version,
+                        load=_load_version,
+                        on_swap=_swap_service,
+                        interval=interval
+                    ).start()
+    return _service
+
+
+def reset_retrieval_service() -> None:
+    """공유 검색 서비스 초기화 (벡터 스토어 재구축 후 / 테스트용)"""
+    global _service, _reloader, _shards
+    with _service_lock:
+        reloader, _reloader = _reloader, None
+        _service = None
+        _shards = None
+        _missing_tenants.clear()
+    if reloader is not None:
+        reloader.stop()
@@ -0,0 +1,152 @@
+"""Solution Index - 해결 방법 단위 하위 문서
+
+FAQ 하나에 들어 있는 여러 해결 방법([방법 N])을 각각 독립된 하위 문서로 색인합니다.
+- 하위 문서 ID: "<FAQ ID>#<방법 번호>" (metadata["parent_id"]로 상위 FAQ 연결)
+- 검색된 FAQ들의 해결 방법 중 질의와 가장 가까운 것만 골라 plan_response 프롬프트에 전달
+  (FAQ 본문을 500자로 자르던 방식 대신 필요한 방법의 전체 단계를 유지하면서 프롬프트 축소)
+
+FAQ 본문 렌더링(render_solution)과 파싱(split_solutions)을 한곳에서 정의하여
+build_vectorstore.py가 만드는 FAQ 문서와 하위 문서의 형식이 항상 같도록 합니다.
+"""
+
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.documents import Document
+
+from src.services.lexical_index import char_ngrams
+
+SOLUTION_INDEX_FILE = "solution_index.bin"
+
+_SOLUTION_HEADER = re.compile(r"^\[방법 (\d+)\] (.*)$", re.MULTILINE)
+
+
+def solution_id(faq_id: str, method) -> str:
+    """하위 문서 ID (FAQ ID + 방법 번호)"""
+    return f"{faq_id}#{method}"
+
+
+def render_solution(solution: Dict) -> str:
+    """해결 방법 하나를 FAQ 본문과 같은 형식의 텍스트로 렌더링"""
+    text = f"[방법 {solution['method']}] {solution['title']}\n"
+    for i, step in enumerate(solution["steps"], 1):
+        text += f"  {i}. {step}\n"
+    text += f"  ▶ 기대 결과: {solution['expected_result']}\n"
+    return text
+
+
+def split_solutions(content: str) -> List[Dict]:
+    """
+    렌더링된 FAQ 본문에서 해결 방법 블록 추출
+
+    Args:
+        content: FAQ page_content
+
+    Returns:
+        [{"method": int, "title": str, "content": str}] - 본문 순서
+    """
+    matches = list(_SOLUTION_HEADER.finditer(content))
+    solutions = []
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(content)
+        solutions.append({
+            "method": int(match.group(1)),
+            "title": match.group(2).strip(),
+            "content": content[match.start():end].strip(),
+        })
+    return solutions
+
+
+def create_solution_documents(faq_data: List[Dict]) -> List[Document]:
+    """
+    FAQ 데이터 → 해결 방법 하위 문서
+
+    임베딩 품질을 위해 상위 FAQ 제목과 증상을 앞에 붙이고,
+    metadata에는 상위 FAQ 연결 정보(parent_id, method)를 담습니다.
+    """
+    documents = []
+    for faq in faq_data:
+        for solution in faq["content"]["solutions"]:
+            content = (
+                f"제목: {faq['title']}\n"
+                f"증상: {faq['content']['symptom']}\n\n"
+                f"{render_solution(solution)}"
+            )
+            documents.append(Document(
+                page_content=content,
+                metadata={
+                    "id": solution_id(faq["id"], solution["method"]),
+                    "parent_id": faq["id"],
+                    "method": solution["method"],
+                    "title": solution["title"],
+                    "category": faq["category"],
+                    "source": faq["source"],
+                }
+            ))
+    return documents
+
+
+def solution_from_document(doc: Document, score: Optional[float] = None) -> Dict:
+    """하위 문서 → state에 담을 해결 방법 dict (본문은 [방법 N] 블록만)"""
+    blocks = split_solutions(doc.page_content)
+    return {
+        "id": doc.metadata.get("id", ""),
+        "parent_id": doc.metadata.get("parent_id", ""),
+        "method": doc.metadata.get("method", 0),
+        "title": doc.metadata.get("title", ""),
+        "content": blocks[0]["content"] if blocks else doc.page_content,
+        "score": score,
+    }
+
+
+def solution_ref(solution: Dict) -> Dict:
+    """해결 방법 dict → 대화 상태에 담는 참조 (본문 제외, 어휘 경로 선택은 lexical_score 포함)"""
+    ref = {key: solution.get(key) for key in ("id", "parent_id", "method", "title", "score")}
+    if solution.get("lexical_score") is not None:
+        ref["lexical_score"] = solution["lexical_score"]
+    return ref
+
+
+def fallback_solutions(retrieved_docs: Sequence[Dict], limit: int) -> List[Dict]:
+    """
+    하위 문서 색인이 없을 때의 대체 선택
+    - 검색 순위가 높은 FAQ부터 본문 순서대로 limit개 (각 방법은 잘리지 않음)
+    """
+    selected = []
+    for doc in retrieved_docs:
+        for block in split_solutions(doc.get("content", "")):
+            if len(selected) >= limit:
+                return selected
+            selected.append({
+                "id": solution_id(doc.get("id", ""), block["method"]),
+                "parent_id": doc.get("id", ""),
+                "method": block["method"],
+                "title": block["title"],
+                "content": block["content"],
+                "score": None,
+            })
+    return selected
+
+
+def rank_solutions_lexically(query: str, solutions: Sequence[Dict], limit: int) -> List[Tuple[Dict, float]]:
+    """
+    해결 방법 후보를 질의와의 문자 n-gram 겹침으로 정렬 (임베딩 없이 선택할 때 - 어휘 검색 경로)
+    - 점수: 질의 n-gram 중 방법 본문(제목 포함)에 있는 비율 (0~1, 높을수록 유사)
+    - 점수가 같으면 원래 순서(검색 순위 → 본문 순서) 유지
+
+    Returns:
+        (해결 방법 dict, 겹침 비율) 리스트 - 최대 limit개
+    """
+    query_grams = char_ngrams(query)
+    if not query_grams:
+        return [(solution, 0.0) for solution in solutions[:limit]]
+    scored = [
+        (solution, len(query_grams & char_ngrams(solution.get("content", ""))) / len(query_grams))
+        for solution in solutions
+    ]
+    return sorted(scored, key=lambda item: item[1], reverse=True)[:limit]
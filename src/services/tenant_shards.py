@@ -0,0 +1,183 @@
+"""Tenant Shards - 테넌트별 검색 샤드
+
+사업부(테넌트) 또는 카테고리 그룹마다 별도 인덱스 디렉토리(VECTORSTORE_PATH/tenants/<테넌트>)를 두고
+대화 상태의 tenant_id로 샤드를 선택합니다.
+- 샤드는 처음 사용될 때 로드 (사용하지 않는 테넌트는 메모리를 차지하지 않음)
+- 로드된 샤드는 인덱스 파일 크기 기준 메모리 예산(TENANT_SHARD_MEMORY_MB) / 개수(TENANT_SHARD_MAX) LRU
+- 축출된 샤드는 진행 중인 검색이 끝나 참조가 없어지면 해제
+- 각 샤드 디렉토리도 버전 포인터(current.json)로 게시 가능 (build_vectorstore.py --tenant ... --publish)
+"""
+
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import os
+import re
+import time
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+TENANTS_DIR = "tenants"
+DEFAULT_TENANT = "default"
+_TENANT_KEY = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]{0,63}$")
+
+
+def normalize_tenant(tenant: Optional[str]) -> Optional[str]:
+    """
+    테넌트 키 정규화 - 기본 테넌트(None / "" / "default")는 None
+
+    Raises:
+        ValueError: 영문/숫자/-/_ 이외의 문자가 포함된 경우 (디렉토리 경로로 사용되므로)
+    """
+    if tenant is None:
+        return None
+    tenant = str(tenant).strip()
+    if not tenant or tenant == DEFAULT_TENANT:
+        return None
+    if not _TENANT_KEY.match(tenant):
+        raise ValueError(f"잘못된 테넌트 키: {tenant!r} (영문/숫자/-/_ 64자 이내)")
+    return tenant
+
+
+def resolve_tenant(tenant: Optional[str]) -> Optional[str]:
+    """
+    외부 입력(URL ?tenant= / 요청 상태)의 테넌트 키 검증 - 잘못된 키는 경고 후 기본 테넌트(None)
+
+    normalize_tenant와 같지만 예외 대신 기본 인덱스로 대체하므로 대화 노드가 실패하지 않습니다.
+    """
+    try:
+        return normalize_tenant(tenant)
+    except ValueError as e:
+        print(f"[WARNING] {e} - 기본 인덱스를 사용합니다")
+        return None
+
+
+def tenant_directory(root: str, tenant: Optional[str]) -> str:
+    """테넌트 샤드 디렉토리 (VECTORSTORE_PATH/tenants/<테넌트>, 기본 테넌트는 루트 디렉토리)"""
+    tenant = normalize_tenant(tenant)
+    return os.path.join(root, TENANTS_DIR, tenant) if tenant else root
+
+
+def list_tenants(root: str) -> List[str]:
+    """구축된 테넌트 샤드 목록"""
+    directory = os.path.join(root, TENANTS_DIR)
+    if not os.path.isdir(directory):
+        return []
+    return sorted(name for name in os.listdir(directory) if os.path.isdir(os.path.join(directory, name)))
+
+
+def estimate_shard_bytes(directory: str) -> int:
+    """샤드 메모리 추정치 - 인덱스 디렉토리(하위 디렉토리 포함)의 파일 크기 합
+    (행렬 / 색인 / 문서 저장소 / Chroma HNSW 세그먼트 디렉토리)"""
+    total = 0
+    for current, _, files in os.walk(directory):
+        for name in files:
+            path = os.path.join(current, name)
+            try:
+                if not os.path.islink(path):
+                    total += os.path.getsize(path)
+            except OSError:
+                pass
+    return total
+
+
+class ShardRegistry:
+    """테넌트별 검색 서비스 (최초 사용 시 로드, 메모리 예산 LRU)
+
+    Args:
+        root: 벡터 스토어 루트 디렉토리 (tenants/ 상위)
+        factory: 샤드 디렉토리 → 검색 서비스 (warmup / release_when_unreferenced / persist_directory 필요)
+        max_bytes: 로드된 샤드 크기 합 상한 (초과 시 가장 오래 사용하지 않은 샤드부터 축출)
+        max_shards: 로드된 샤드 수 상한
+    """
+
+    def __init__(self, root: str, factory: Callable[[str], object], max_bytes: int, max_shards: int = 8):
+        self.root = root
+        self.factory = factory
+        self.max_bytes = max_bytes
+        self.max_shards = max(1, max_shards)
+
+        self._shards: "OrderedDict[str, Dict]" = OrderedDict()
+        self._loading: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.loads = 0
+        self.evictions = 0
+        self.load_seconds = 0.0
+
+    def get(self, tenant: str) -> Optional[object]:
+        """
+        테넌트 샤드 반환 (처음이면 로드/예열)
+
+        Returns:
+            검색 서비스, 샤드 디렉토리가 없으면 None
+        """
+        with self._lock:
+            entry = self._shards.get(tenant)
+            if entry is not None:
+                self._shards.move_to_end(tenant)
+                self.hits += 1
+                return entry["service"]
+            load_lock = self._loading.setdefault(tenant, threading.Lock())
+
+        # 같은 테넌트의 동시 첫 요청은 한 번만 로드 (다른 테넌트 검색은 막지 않음)
+        with load_lock:
+            with self._lock:
+                entry = self._shards.get(tenant)
+                if entry is not None:
+                    self._shards.move_to_end(tenant)
+                    self.hits += 1
+                    return entry["service"]
+
+            directory = tenant_directory(self.root, tenant)
+            if not os.path.isdir(directory):
+                return None
+
+            started = time.perf_counter()
+            service = self.factory(directory)
+            service.warmup(query=None)
+            size = estimate_shard_bytes(service.persist_directory)
+
+            with self._lock:
+                self._shards[tenant] = {"service": service, "bytes": size}
+                self.loads += 1
+                self.load_seconds += time.perf_counter() - started
+                self._evict_over_budget()
+            return service
+
+    def _evict_over_budget(self) -> None:
+        """예산을 넘으면 가장 오래 사용하지 않은 샤드부터 축출 (방금 로드한 샤드는 유지)"""
+        while len(self._shards) > 1 and (
+            len(self._shards) > self.max_shards or self.loaded_bytes() > self.max_bytes
+        ):
+            # 방금 로드한 샤드는 맨 뒤에 있으므로 맨 앞(가장 오래 사용하지 않은 샤드)부터 축출
+            entry = self._shards.pop(next(iter(self._shards)))
+            entry["service"].release_when_unreferenced()
+            self.evictions += 1
+
+    def loaded_bytes(self) -> int:
+        return sum(entry["bytes"] for entry in self._shards.values())
+
+    def evict(self, tenant: str) -> bool:
+        """샤드 명시적 축출 (재구축 후 다시 로드하도록)"""
+        with self._lock:
+            entry = self._shards.pop(tenant, None)
+        if entry is None:
+            return False
+        entry["service"].release_when_unreferenced()
+        return True
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "loaded": {tenant: entry["bytes"] for tenant, entry in self._shards.items()},
+                "loaded_bytes": self.loaded_bytes(),
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "loads": self.loads,
+                "evictions": self.evictions,
+                "avg_load_seconds": round(self.load_seconds / self.loads, 3) if self.loads else 0.0,
+            }
@@ -0,0 +1,81 @@
+"""Ticket Index - 답변 완료 티켓 컬렉션
+
+담당자가 답변한 티켓(TICKETS_PATH/*.json, status "answered")을 FAQ와 같은 레코드 형식으로 변환하여
+별도 인덱스 디렉토리(VECTORSTORE_PATH/tickets)에 구축합니다.
+- 구축: python scripts/build_vectorstore.py --tickets (FAQ 구축과 같은 파일 구성, --publish / --incremental 지원)
+- 검색: search_knowledge_node가 FAQ / 티켓 컬렉션을 동시에 검색한 뒤 점수를 정규화하여 병합
+- 티켓 문서 ID는 "TICKET-<티켓 번호>" (FAQ ID와 겹치지 않으므로 ID만으로 컬렉션 구분)
+"""
+
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import os
+import json
+import glob
+from typing import Dict, List
+
+TICKET_INDEX_DIR = "tickets"
+TICKET_ID_PREFIX = "TICKET-"
+TICKET_SOURCE = "ticket"
+
+
+def is_ticket_id(doc_id: str) -> bool:
+    """티켓 컬렉션 문서 ID인지"""
+    return str(doc_id).startswith(TICKET_ID_PREFIX)
+
+
+def ticket_to_record(ticket: Dict) -> Dict:
+    """
+    답변 완료 티켓 → FAQ 레코드 형식
+
+    - 증상: 티켓 요약 + 추가 정보
+    - 원인: 없음 (티켓에는 원인 분석이 없음)
+    - 해결 방법: 담당자 답변 한 가지 ([방법 1] 블록 - 해결 방법 선택 / 본문 대체 추출과 호환)
+    """
+    symptom = ticket.get("summary") or ""
+    if ticket.get("additional_info"):
+        symptom += f"\n추가 정보: {ticket['additional_info']}"
+
+    answer_lines = [line.strip() for line in str(ticket.get("answer") or "").splitlines() if line.strip()]
+    return {
+        "id": f"{TICKET_ID_PREFIX}{ticket['ticket_id']}",
+        "category": ticket.get("category") or "기타",
+        "title": ticket.get("title") or "고객 문의",
+        "content": {
+            "symptom": symptom,
+            "cause": "",
+            "solutions": [{
+                "method": 1,
+                "title": "담당자 답변",
+                "steps": answer_lines,
+                "expected_result": "",
+            }],
+        },
+        "tags": [],
+        "source": TICKET_SOURCE,
+        "helpful_count": 0,
+        "created_at": ticket.get("answered_at") or ticket.get("created_at") or "",
+    }
+
+
+def load_answered_tickets(tickets_path: str) -> List[Dict]:
+    """
+    답변 완료 티켓 로드 → FAQ 레코드 리스트 (티켓 번호 순)
+
+    status가 "answered"이고 답변이 있는 티켓만 사용하며, 읽을 수 없는 파일은 경고 후 건너뜁니다.
+    """
+    records = []
+    for path in sorted(glob.glob(os.path.join(tickets_path, "*.json"))):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                ticket = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"[WARNING] 티켓 파일을 읽을 수 없습니다: {path} ({e})")
+            continue
+        if ticket.get("status") != "answered" or not ticket.get("answer") or not ticket.get("ticket_id"):
+            continue
+        records.append(ticket_to_record(ticket))
+    return records
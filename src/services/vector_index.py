@@ -0,0 +1,496 @@
+"""Vector Index - 벡터 인덱스 백엔드
+
+검색 서비스가 사용하는 교체 가능한 벡터 인덱스 백엔드를 정의합니다.
+- chroma: 기존 Chroma 컬렉션 (기본값)
+- numpy: 정규화된 임베딩을 float32 행렬 하나에 올려두고 brute-force 검색
+
+모든 백엔드는 Chroma와 같은 (Document, 거리) 계약을 따릅니다 (낮을수록 유사).
+메타데이터 필터(category / source / tags)는 MetadataIndex로 후보 행을 먼저 좁힌 뒤
+후보 행만 점수를 계산합니다.
+"""
+
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import hashlib
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_chroma import Chroma
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from src.services.metadata_index import MetadataIndex
+
+
+def similarity_to_distance(similarities, metric: str = "l2"):
+    """
+    코사인 유사도 → 백엔드 거리 변환
+    - l2: 단위 벡터 간 제곱 L2 거리 = 2 - 2·cos (Chroma 기본 공간)
+    - cosine: 1 - cos
+    """
+    if metric == "l2":
+        return np.maximum(2.0 - 2.0 * np.asarray(similarities), 0.0)
+    return 1.0 - np.asarray(similarities)
+
+
+def distance_to_similarity(distances, metric: str = "l2"):
+    """백엔드 거리 → 코사인 유사도 (similarity_to_distance의 역변환, 백엔드가 다른 결과 병합용)"""
+    if metric == "l2":
+        return 1.0 - np.asarray(distances) / 2.0
+    return 1.0 - np.asarray(distances)
+
+
+FINGERPRINT_SAMPLE_ROWS = 64  # 지문에 포함하는 임베딩 표본 행 수 (균등 간격)
+FINGERPRINT_TOLERANCE = 1e-5  # 표본 임베딩 비교 허용 오차 (파일 저장 시 재정규화 오차 허용)
+
+
+def index_fingerprint(index: "NumpyIndex") -> Dict[str, np.ndarray]:
+    """
+    base 인덱스 지문 - 파생 파일(IVF 클러스터 / 양자화 코드)에 함께 저장하여 같은 인덱스인지 확인
+
+    Returns:
+        {"fingerprint_ids": 문서 수/차원/거리 함수 + 행 순서대로의 문서 ID 해시,
+         "fingerprint_sample": 균등 간격 표본 행의 임베딩 (전체 행렬을 읽지 않음)}
+    """
+    count = index.count()
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{count}:{index.matrix.shape[1]}:{index.metric}".encode("utf-8"))
+    for row in range(count):
+        digest.update(index._doc_id(row).encode("utf-8") + b"\0")
+    rows = np.unique(np.linspace(0, count - 1, min(count, FINGERPRINT_SAMPLE_ROWS)).astype(np.int64))
+    return {
+        "fingerprint_ids": np.str_(digest.hexdigest()),
+        "fingerprint_sample": np.asarray(index.matrix[rows], dtype=np.float32),
+    }
+
+
+def matches_fingerprint(index: "NumpyIndex", stored) -> bool:
+    """저장된 지문(npz 데이터)이 index와 같은지 - 지문이 없는 이전 형식 파일은 False"""
+    if "fingerprint_ids" not in stored or "fingerprint_sample" not in stored:
+        return False
+    current = index_fingerprint(index)
+    sample = stored["fingerprint_sample"]
+    return (
+        str(stored["fingerprint_ids"]) == str(current["fingerprint_ids"])
+        and sample.shape == current["fingerprint_sample"].shape
+        and bool(np.allclose(sample, current["fingerprint_sample"], atol=FINGERPRINT_TOLERANCE))
+    )
+
+
+class VectorIndex:
+    """벡터 인덱스 백엔드 인터페이스"""
+
+    metric = "l2"
+    _metadata_index: Optional[MetadataIndex] = None
+
+    def search_by_vector(
+        self,
+        query_vector: Sequence[float],
+        k: int = 5,
+        filter: Optional[Dict] = None
+    ) -> List[Tuple[Document, float]]:
+        """
+        쿼리 벡터로 유사 문서 검색
+
+        Args:
+            query_vector: 쿼리 임베딩
+            k: 반환할 문서 수
+            filter: 메타데이터 필터 표현식 (예: {"category": "메신저"})
+
+        Returns:
+            (Document, 거리) 리스트 - 거리 오름차순
+        """
+        raise NotImplementedError
+
+    def search_ids_by_vector(
+        self,
+        query_vector: Sequence[float],
+        k: int = 5,
+        filter: Optional[Dict] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        문서 본문 없이 (FAQ ID, 거리)만 검색 - 본문은 문서 저장소에서 필요할 때 조회
+
+        기본 구현은 search_by_vector 결과에서 ID만 추출합니다.
+        """
+        return [(doc.metadata.get("id", ""), score) for doc, score in self.search_by_vector(query_vector, k, filter)]
+
+    def search_ids_by_vectors(
+        self,
+        query_vectors: Sequence[Sequence[float]],
+        k: int = 5,
+        filter: Optional[Dict] = None
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        여러 쿼리 벡터를 한 번에 검색 (배치 작업용)
+
+        기본 구현은 쿼리마다 search_ids_by_vector를 호출합니다.
+
+        Returns:
+            쿼리 순서대로 (FAQ ID, 거리) 리스트
+        """
+        return [self.search_ids_by_vector(query_vector, k, filter) for query_vector in query_vectors]
+
+    def count(self) -> int:
+        """색인된 문서 수"""
+        raise NotImplementedError
+
+    def get_documents(self, faq_ids: Sequence[str]) -> Dict[str, Document]:
+        """
+        FAQ ID(metadata["id"])로 문서 조회 (임베딩 없이)
+
+        Args:
+            faq_ids: FAQ ID 리스트
+
+        Returns:
+            {FAQ ID: Document} - 존재하는 문서만 포함
+        """
+        raise NotImplementedError
+
+    def get_metadatas(self, faq_ids: Sequence[str]) -> Dict[str, Dict]:
+        """
+        FAQ ID로 메타데이터만 조회 (검색 결과 참조용 - 본문 제외)
+
+        기본 구현은 get_documents 결과에서 메타데이터만 추출합니다.
+        """
+        return {faq_id: doc.metadata for faq_id, doc in self.get_documents(faq_ids).items()}
+
+    def _metadatas(self) -> Tuple[List[Dict], List[str]]:
+        """전체 문서의 (메타데이터 리스트, FAQ ID 리스트) - 행 순서"""
+        raise NotImplementedError
+
+    @property
+    def metadata_index(self) -> MetadataIndex:
+        """메타데이터 사전 필터 색인 (첫 필터 검색 시 생성)"""
+        if self._metadata_index is None:
+            metadatas, doc_ids = self._metadatas()
+            self._metadata_index = MetadataIndex(metadatas, doc_ids)
+        return self._metadata_index
+
+
+class ChromaIndex(VectorIndex):
+    """Chroma 컬렉션 백엔드"""
+
+    def __init__(self, vectorstore: Chroma):
+        self.vectorstore = vectorstore
+        collection_metadata = vectorstore._collection.metadata or {}
+        self.metric = collection_metadata.get("hnsw:space", "l2")
+
+    def search_by_vector(
+        self,
+        query_vector: Sequence[float],
+        k: int = 5,
+        filter: Optional[Dict] = None
+    ) -> List[Tuple[Document, float]]:
+        where = self._where(filter)
+        if where == {}:
+            return []
+
+        # langchain_chroma의 relevance_scores는 실제로는 거리 값 (낮을수록 유사)
+        return self.vectorstore.similarity_search_by_vector_with_relevance_scores(
+            list(query_vector),
+            k=k,
+            filter=where
+        )
+
+    def search_ids_by_vector(
+        self,
+        query_vector: Sequence[float],
+        k: int = 5,
+        filter: Optional[Dict] = None
+    ) -> List[Tuple[str, float]]:
+        where = self._where(filter)
+        if where == {} or k <= 0:
+            return []
+
+        # 본문(documents)은 요청하지 않음
+        results = self.vectorstore._collection.query(
+            query_embeddings=[list(query_vector)],
+            n_results=k,
+            where=where,
+            include=["metadatas", "distances"]
+        )
+        return [
+            ((metadata or {}).get("id", doc_id), float(distance))
+            for doc_id, metadata, distance in zip(
+                results["ids"][0], results["metadatas"][0], results["distances"][0]
+            )
+        ]
+
+    def search_ids_by_vectors(
+        self,
+        query_vectors: Sequence[Sequence[float]],
+        k: int = 5,
+        filter: Optional[Dict] = None
+    ) -> List[List[Tuple[str, float]]]:
+        where = self._where(filter)
+        if where == {} or k <= 0 or len(query_vectors) == 0:
+            return [[] for _ in query_vectors]
+
+        # 여러 쿼리를 컬렉션 query 한 번으로 검색
+        results = self.vectorstore._collection.query(
+            query_embeddings=[list(query_vector) for query_vector in query_vectors],
+            n_results=k,
+            where=where,
+            include=["metadatas", "distances"]
+        )
+        return [
+            [
+                ((metadata or {}).get("id", doc_id), float(distance))
+                for doc_id, metadata, distance in zip(ids, metadatas, distances)
+            ]
+            for ids, metadatas, distances in zip(results["ids"], results["metadatas"], results["distances"])
+        ]
+
+    def _where(self, filter: Optional[Dict]) -> Optional[Dict]:
+        """메타데이터 필터 → Chroma where 절 (None: 필터 없음, {}: 후보 없음)"""
+        if not filter:
+            return None
+        candidate_ids = self.metadata_index.ids(filter)
+        if not candidate_ids:
+            return {}
+        # 후보 ID로 좁혀서 Chroma가 후보만 검색하도록 (tags는 Chroma where로 표현 불가)
+        return {"id": {"$in": sorted(candidate_ids)}}
+
+    def count(self) -> int:
+        return self.vectorstore._collection.count()
+
+    def get_documents(self, faq_ids: Sequence[str]) -> Dict[str, Document]:
+        if not faq_ids:
+            return {}
+        results = self.vectorstore.get(
+            where={"id": {"$in": list(faq_ids)}},
+            include=["documents", "metadatas"]
+        )
+        return {
+            metadata.get("id", ""): Document(id=doc_id, page_content=content, metadata=metadata)
+            for doc_id, content, metadata in zip(
+                results["ids"], results["documents"], results["metadatas"]
+            )
+        }
+
+    def get_metadatas(self, faq_ids: Sequence[str]) -> Dict[str, Dict]:
+        if not faq_ids:
+            return {}
+        # 본문(documents)은 요청하지 않음
+        results = self.vectorstore.get(where={"id": {"$in": list(faq_ids)}}, include=["metadatas"])
+        return {
+            (metadata or {}).get("id", doc_id): metadata or {}
+            for doc_id, metadata in zip(results["ids"], results["metadatas"])
+        }
+
+    def _metadatas(self) -> Tuple[List[Dict], List[str]]:
+        metadatas = self.vectorstore.get(include=["metadatas"])["metadatas"]
+        metadatas = [metadata or {} for metadata in metadatas]
+        return metadatas, [metadata.get("id", "") for metadata in metadatas]
+
+
+class NumpyIndex(VectorIndex):
+    """인메모리 NumPy brute-force 백엔드
+
+    - 임베딩을 L2 정규화하여 연속된 float32 행렬 하나에 보관
+    - 쿼리당 행렬-벡터 곱 한 번 + argpartition으로 top-k 선택
+      (search_ids_by_vectors는 여러 쿼리를 행렬-행렬 곱 한 번으로 처리)
+    - metric="l2": Chroma 기본 공간(hnsw:space=l2)과 같은 제곱 L2 거리 = 2 - 2·cos
+      (faq_collection은 기본 l2 공간이므로 기존 0.9 임계값이 그대로 유지됨)
+    - metric="cosine": 코사인 거리 = 1 - cos
+    """
+
+    METRICS = ("l2", "cosine")
+    BATCH_SCORE_ELEMENTS = 1 << 24  # 배치 검색 시 한 번에 만드는 유사도 행렬 원소 수 상한 (float32 64MB)
+
+    def __init__(self, documents: List[Document], embeddings, metric: str = "l2"):
+        if metric not in self.METRICS:
+            raise ValueError(f"지원하지 않는 거리 함수: {metric} (지원: {', '.join(self.METRICS)})")
+
+        matrix = np.ascontiguousarray(np.asarray(embeddings, dtype=np.float32))
+        if matrix.ndim != 2 or matrix.shape[0] != len(documents):
+            raise ValueError(
+                f"임베딩 행렬 크기가 문서 수와 맞지 않습니다: {matrix.shape} vs {len(documents)}개"
+            )
+
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        matrix /= norms
+
+        self.documents = documents
+        self.matrix = matrix
+        self.metric = metric
+        self._rows_by_id = {doc.metadata.get("id", ""): row for row, doc in enumerate(documents)}
+
+    @classmethod
+    def from_documents(cls, documents: List[Document], embeddings: Embeddings, metric: str = "l2") -> "NumpyIndex":
+        """Document 리스트를 임베딩하여 인덱스 생성"""
+        vectors = embeddings.embed_documents([doc.page_content for doc in documents])
+        return cls(documents, vectors, metric=metric)
+
+    @classmethod
+    def from_chroma(cls, vectorstore: Chroma) -> "NumpyIndex":
+        """기존 Chroma 컬렉션의 임베딩/문서를 그대로 가져와 인덱스 생성 (재임베딩 없음)"""
+        results = vectorstore.get(include=["embeddings", "documents", "metadatas"])
+        documents = [
+            Document(id=doc_id, page_content=content, metadata=metadata or {})
+            for doc_id, content, metadata in zip(
+                results["ids"], results["documents"], results["metadatas"]
+            )
+        ]
+
+        embeddings = results["embeddings"]
+        if len(documents) == 0:
+            embeddings = np.zeros((0, 1), dtype=np.float32)
+        return cls(documents, embeddings, metric=cls.chroma_metric(vectorstore))
+
+    @classmethod
+    def chroma_metric(cls, vectorstore: Chroma) -> str:
+        """Chroma 컬렉션의 거리 함수 (hnsw:space, 지원하지 않는 값이면 l2)"""
+        collection_metadata = vectorstore._collection.metadata or {}
+        metric = collection_metadata.get("hnsw:space", "l2")
+        return metric if metric in cls.METRICS else "l2"
+
+    def _normalize_query(self, query_vector: Sequence[float]) -> np.ndarray:
+        query = np.asarray(query_vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm > 0:
+            query = query / norm
+        return query
+
+    @staticmethod
+    def _top_k(similarities: np.ndarray, k: int) -> np.ndarray:
+        """유사도 상위 k개 행 번호 (내림차순)"""
+        n = similarities.shape[0]
+        k = min(k, n)
+        if k < n:
+            top = np.argpartition(-similarities, k - 1)[:k]
+        else:
+            top = np.arange(n)
+        return top[np.argsort(-similarities[top])]
+
+    @staticmethod
+    def _top_k_rows(similarities: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """유사도 행렬(쿼리 x 문서)의 행별 상위 k개 (열 번호, 유사도) - 내림차순"""
+        n = similarities.shape[1]
+        k = min(k, n)
+        if k < n:
+            top = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+        else:
+            top = np.broadcast_to(np.arange(n), similarities.shape).copy()
+        top_similarities = np.take_along_axis(similarities, top, axis=1)
+        order = np.argsort(-top_similarities, axis=1)
+        return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_similarities, order, axis=1)
+
+    def _document(self, row: int) -> Document:
+        """행 번호 → Document"""
+        return self.documents[row]
+
+    def _metadata(self, row: int) -> Dict:
+        """행 번호 → 메타데이터"""
+        return self.documents[row].metadata
+
+    def _doc_id(self, row: int) -> str:
+        """행 번호 → FAQ ID"""
+        return self.documents[row].metadata.get("id", "")
+
+    def search_by_vector(
+        self,
+        query_vector: Sequence[float],
+        k: int = 5,
+        filter: Optional[Dict] = None
+    ) -> List[Tuple[Document, float]]:
+        top, distances = self._search_rows(query_vector, k, filter)
+        return [(self._document(int(i)), float(d)) for i, d in zip(top, distances)]
+
+    def search_ids_by_vector(
+        self,
+        query_vector: Sequence[float],
+        k: int = 5,
+        filter: Optional[Dict] = None
+    ) -> List[Tuple[str, float]]:
+        top, distances = self._search_rows(query_vector, k, filter)
+        return [(self._doc_id(int(i)), float(d)) for i, d in zip(top, distances)]
+
+    def _search_rows(
+        self,
+        query_vector: Sequence[float],
+        k: int,
+        filter: Optional[Dict]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """(행 번호, 거리) 배열 - 거리 오름차순"""
+        empty = (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32))
+        n = self.matrix.shape[0]
+        if n == 0 or k <= 0:
+            return empty
+
+        query = self._normalize_query(query_vector)
+        rows = self.metadata_index.rows(filter) if filter else None
+        if rows is None:
+            similarities = self.matrix @ query
+            top = self._top_k(similarities, k)
+            top_similarities = similarities[top]
+        else:
+            # 후보 행만 점수 계산
+            if rows.size == 0:
+                return empty
+            similarities = self.matrix[rows] @ query
+            local_top = self._top_k(similarities, k)
+            top, top_similarities = rows[local_top], similarities[local_top]
+
+        return top, similarity_to_distance(top_similarities, self.metric)
+
+    def search_ids_by_vectors(
+        self,
+        query_vectors: Sequence[Sequence[float]],
+        k: int = 5,
+        filter: Optional[Dict] = None
+    ) -> List[List[Tuple[str, float]]]:
+        n = self.matrix.shape[0]
+        if n == 0 or k <= 0 or len(query_vectors) == 0:
+            return [[] for _ in query_vectors]
+
+        queries = np.asarray(query_vectors, dtype=np.float32)
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        queries = queries / norms
+
+        rows = self.metadata_index.rows(filter) if filter else None
+        if rows is not None and rows.size == 0:
+            return [[] for _ in query_vectors]
+        matrix = self.matrix if rows is None else self.matrix[rows]
+
+        # 유사도 행렬이 너무 커지지 않도록 쿼리를 나누어 행렬-행렬 곱
+        chunk = max(1, self.BATCH_SCORE_ELEMENTS // matrix.shape[0])
+        results = []
+        for start in range(0, queries.shape[0], chunk):
+            similarities = queries[start:start + chunk] @ matrix.T
+            top, top_similarities = self._top_k_rows(similarities, k)
+            if rows is not None:
+                top = rows[top]
+            distances = similarity_to_distance(top_similarities, self.metric)
+            results.extend(
+                [(self._doc_id(int(i)), float(d)) for i, d in zip(row_top, row_distances)]
+                for row_top, row_distances in zip(top, distances)
+            )
+        return results
+
+    def count(self) -> int:
+        return self.matrix.shape[0]
+
+    def get_documents(self, faq_ids: Sequence[str]) -> Dict[str, Document]:
+        return {
+            faq_id: self._document(self._rows_by_id[faq_id])
+            for faq_id in faq_ids
+            if faq_id in self._rows_by_id
+        }
+
+    def get_metadatas(self, faq_ids: Sequence[str]) -> Dict[str, Dict]:
+        return {
+            faq_id: self._metadata(self._rows_by_id[faq_id])
+            for faq_id in faq_ids
+            if faq_id in self._rows_by_id
+        }
+
+    def _metadatas(self) -> Tuple[List[Dict], List[str]]:
+        metadatas = [self._document(row).metadata for row in range(self.count())]
+        return metadatas, [metadata.get("id", "") for metadata in metadatas]
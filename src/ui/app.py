@@ -10,11 +10,15 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+import os
 import streamlit as st
 from langchain_core.messages import HumanMessage, AIMessage
 import uuid
 
 from src.graph.workflow import create_workflow
+from src.services.retrieval import get_retrieval_service
+from src.services.intent_knn import get_intent_classifier
+from src.services.tenant_shards import resolve_tenant
 
 
 # 페이지 설정
@@ -28,12 +32,28 @@ st.set_page_config(
 if "app" not in st.session_state:
     st.session_state.app = create_workflow()
 
+    # 검색 서비스 예열 (프로세스당 한 번, 이후 세션은 재사용)
+    try:
+        get_retrieval_service().warmup()
+    except Exception as e:
+        print(f"[App] Warning: 검색 서비스 예열 실패: {e}")
+
+    # 의도 분류 예시 임베딩 (프로세스당 한 번)
+    try:
+        get_intent_classifier().warmup()
+    except Exception as e:
+        print(f"[App] Warning: 의도 분류 예시 임베딩 실패: {e}")
+
 if "session_id" not in st.session_state:
     st.session_state.session_id = str(uuid.uuid4())
 
 if "messages" not in st.session_state:
     st.session_state.messages = []
 
+# 테넌트(사업부) - URL ?tenant=<키> 또는 TENANT_ID, 없거나 잘못된 키면 기본 인덱스
+if "tenant_id" not in st.session_state:
+    st.session_state.tenant_id = resolve_tenant(st.query_params.get("tenant") or os.getenv("TENANT_ID"))
+
 if "config" not in st.session_state:
     st.session_state.config = {
         "configurable": {
@@ -67,7 +87,8 @@ with st.sidebar:
 
     ### 세션 정보
     - 세션 ID: `{}`
-    """.format(st.session_state.session_id[:8]))
+    - 테넌트: `{}`
+    """.format(st.session_state.session_id[:8], st.session_state.tenant_id or "default"))
 
     if st.button("🔄 새 대화 시작"):
         st.session_state.session_id = str(uuid.uuid4())
@@ -92,10 +113,15 @@ with st.sidebar:
             with st.expander("📚 검색 결과", expanded=False):
                 st.write(f"**검색된 문서 수**: {len(debug['retrieved_docs'])}개")
                 for i, doc in enumerate(debug["retrieved_docs"][:3], 1):
+                    # 어휘 결과 경로 문서는 벡터 거리 없이 어휘 점수만 있음
+                    if doc.get("score") is not None:
+                        score = f"{doc['score']:.4f}"
+                    else:
+                        score = f"어휘 점수 {doc.get('lexical_score', 0.0):.4f}"
                     st.markdown(f"""
                     **[{i}] {doc['title']}**
                     - 카테고리: {doc['category']}
-                    - 유사도: {doc['score']:.4f}
+                    - 유사도: {score}
                     - ID: {doc['id']}
                     """)
 
@@ -134,7 +160,8 @@ if prompt := st.chat_input("무엇을 도와드릴까요?"):
                     else AIMessage(content=msg["content"])
                     for msg in st.session_state.messages
                 ],
-                "user_id": "user_001"
+                "user_id": "user_001",
+                "tenant_id": st.session_state.tenant_id
             }
 
             # 워크플로우 실행
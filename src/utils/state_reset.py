@@ -30,7 +30,9 @@ def reset_conversation_state(state: SupportState) -> Dict[str, Any]:
     state["solution_steps"] = []
     state["current_step"] = 0
     state["retrieved_docs"] = []
+    state["retrieved_solutions"] = []
     state["relevance_score"] = 0.0
+    state["search_filter"] = None
     state["unresolved_reason"] = None
     state["ticket_id"] = None
     state["is_continuing"] = False
@@ -0,0 +1,124 @@
+"""일괄 검색 테스트
+
+배치 임베딩 + 다중 쿼리 검색 결과가 질의별 검색(search_knowledge_node 경로)과 같은지 검증합니다.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+from langchain_chroma import Chroma
+
+import src.services.retrieval as retrieval
+from src.services.retrieval import RetrievalService, reset_retrieval_service
+from src.services.vector_index import ChromaIndex, NumpyIndex
+from src.services.hashed_embeddings import HashedNgramEmbeddings
+from src.nodes.search_knowledge import search_knowledge_batch, search_knowledge_node
+from scripts.evaluate_retrieval import DEFAULT_QUERIES, load_labeled_queries, build_offline_store
+from test_vector_index import UnitEmbeddings, make_documents
+
+
+class CountingEmbeddings(HashedNgramEmbeddings):
+    """모델 호출 횟수를 세는 임베딩"""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def embed_documents(self, texts):
+        self.calls += 1
+        return super().embed_documents(texts)
+
+
+def assert_same_results(actual, expected):
+    """FAQ ID 순서 일치 + 거리 일치 (행렬-행렬 곱과 행렬-벡터 곱의 부동소수 오차 허용)"""
+    assert [faq_id for faq_id, _ in actual] == [faq_id for faq_id, _ in expected]
+    assert np.allclose([d for _, d in actual], [d for _, d in expected], atol=1e-5)
+
+
+def test_multi_query_index_search():
+    """다중 쿼리 검색 = 쿼리별 검색 (Chroma / NumPy, 필터 포함)"""
+
+    embeddings = UnitEmbeddings()
+    documents = make_documents(40)
+    for i, doc in enumerate(documents):
+        doc.metadata["category"] = "메신저" if i % 3 == 0 else "메일"
+
+    queries = [embeddings.embed_query(f"FAQ 문서 {i}") for i in (1, 9, 22, 35)] + [np.ones(32).tolist()]
+    with tempfile.TemporaryDirectory() as tmp:
+        vectorstore = Chroma.from_documents(documents, embeddings, persist_directory=tmp, collection_name="faq_collection")
+        for index in (ChromaIndex(vectorstore), NumpyIndex.from_chroma(vectorstore)):
+            for filter in (None, {"category": "메신저"}):
+                batch = index.search_ids_by_vectors(queries, k=5, filter=filter)
+                assert len(batch) == len(queries)
+                for query, results in zip(queries, batch):
+                    assert_same_results(results, index.search_ids_by_vector(query, k=5, filter=filter))
+
+    # 유사도 행렬을 쿼리 단위로 나누어 계산해도 결과 동일
+    index = NumpyIndex(documents, embeddings.embed_documents([doc.page_content for doc in documents]))
+    index.BATCH_SCORE_ELEMENTS = 40 * 2
+    for query, results in zip(queries, index.search_ids_by_vectors(queries, k=3)):
+        assert_same_results(results, index.search_ids_by_vector(query, k=3))
+
+
+def test_batch_search_matches_node():
+    """search_knowledge_batch 결과 = 질의별 search_knowledge_node 결과, 임베딩은 배치 호출"""
+
+    queries = [item["query"] for item in load_labeled_queries(str(project_root / DEFAULT_QUERIES))]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        build_offline_store(str(project_root / "data" / "faq_sample.json"), tmp, HashedNgramEmbeddings())
+        embeddings = CountingEmbeddings()
+        service = RetrievalService(persist_directory=tmp, backend="numpy", embeddings=embeddings)
+        service.result_cache.max_size = 0
+        retrieval._service = service
+        try:
+            batch = search_knowledge_batch(queries, batch_size=16)
+            batch_calls = embeddings.calls
+            vector_queries = service.path_counts["vector"] + service.path_counts["hybrid"]
+
+            service.embedding_cache.clear()
+            for query, result in zip(queries, batch):
+                state = search_knowledge_node({"current_query": query, "search_filter": None})
+                assert result["query"] == query
+                if state["relevance_score"] is None:
+                    # 어휘 결과 경로 - 거리 없이 어휘 점수만 (임계값은 어휘 점수로 적용)
+                    assert result["relevance_score"] is None
+                    assert all(doc["score"] is None for doc in result["retrieved_docs"])
+                    assert result["retrieved_docs"] == state["retrieved_docs"]
+                    continue
+                assert_same_results(
+                    [(doc["id"], doc["score"]) for doc in result["retrieved_docs"]],
+                    [(doc["id"], doc["score"]) for doc in state["retrieved_docs"]]
+                )
+                assert abs(result["relevance_score"] - state["relevance_score"]) < 1e-5
+
+            # 필터 범위에 문서가 없으면 노드와 같이 전체 범위 하이브리드 검색으로 다시 검색
+            found = [r for r in batch if r["retrieved_docs"]]
+            no_match = {"category": "존재하지 않음"}
+            filtered = search_knowledge_batch([r["query"] for r in found], filter=no_match)
+            for result in filtered:
+                state = search_knowledge_node({"current_query": result["query"], "search_filter": no_match})
+                assert result["relevance_score"] is not None and state["relevance_score"] is not None
+                assert abs(result["relevance_score"] - state["relevance_score"]) < 1e-5
+                assert_same_results(
+                    [(doc["id"], doc["score"]) for doc in result["retrieved_docs"]],
+                    [(doc["id"], doc["score"]) for doc in state["retrieved_docs"]]
+                )
+        finally:
+            reset_retrieval_service()
+
+    print(f"\n  질의 {len(queries)}개 (임베딩 필요 {vector_queries}개) → 임베딩 호출 {batch_calls}회")
+    assert batch_calls == -(-vector_queries // 16)
+    ref_fields = {"id", "title", "category", "score", "source"}
+    assert found and all(
+        set(doc) in (ref_fields, ref_fields | {"lexical_score"}) for r in found for doc in r["retrieved_docs"]
+    )
+
+
+if __name__ == "__main__":
+    test_multi_query_index_search()
+    test_batch_search_matches_node()
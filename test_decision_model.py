@@ -0,0 +1,206 @@
+"""평가 노드 판단 모델 테스트
+
+LLM 판단 로그 → 문자 n-gram 로지스틱 회귀 학습 → 버전 아티팩트 저장/게시 → 로드 후
+확실한 입력은 모델이, 애매한 입력은 LLM이 판단하고 섀도 비교 일치율이 집계되는지 검증합니다.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+
+import src.services.decision_model as decision_model
+import src.services.llm_provider as llm_provider
+from src.services.decision_model import (
+    DecisionModel,
+    DecisionRouter,
+    evaluate_against_llm,
+    load_decision_log,
+    load_decision_model,
+    publish_decision_model,
+    reset_decision_router,
+)
+from src.services.llm_provider import LLMProvider, reset_llm_provider
+from src.nodes.evaluate_ticket_confirmation import evaluate_ticket_confirmation_node
+
+NODE = "evaluate_ticket_confirmation"
+REPLIES = {
+    "yes": ["네", "넵", "응", "ㅇㅇ", "좋아요", "그래요", "등록해줘", "부탁해요", "해주세요", "ok", "네네",
+            "예", "좋습니다", "네 해주세요", "등록 부탁드려요", "그렇게 해주세요", "네 등록해주세요", "yes"],
+    "no": ["아니요", "아니", "no", "안해요", "취소", "싫어요", "ㄴㄴ", "괜찮아요", "됐어요", "필요없어요",
+           "그만", "아뇨", "취소해주세요", "안 할래요", "아니요 괜찮습니다", "등록하지 마세요"],
+    "unclear": ["음", "글쎄요", "잘 모르겠어요", "뭐라고요?", "흠", "생각해볼게요", "그게 뭔데요",
+                "잘 모르겠네요", "음 글쎄", "어떻게 하죠"],
+}
+
+
+def log_llm_decisions(router: DecisionRouter) -> None:
+    """모델이 없는 상태의 라우터로 LLM 판단을 로그 (두 번씩 - 응답 캐시 적중 반복 기록 흉내)"""
+    for _ in range(2):
+        for decision, replies in REPLIES.items():
+            for reply in replies:
+                result = router.decide(NODE, reply, "", lambda: {"decision": decision, "reason": "LLM"})
+                assert result["path"] == "llm"
+
+
+def train_and_publish(model_dir: str, log_dir: str) -> DecisionModel:
+    records = load_decision_log(NODE, log_dir)
+    model = DecisionModel(NODE, threshold=0.8).fit(
+        [r["text"] for r in records], [r["decision"] for r in records], contexts=[r["context"] for r in records]
+    )
+    version = model.save(model_dir)
+    publish_decision_model(NODE, version, model_dir)
+    return model
+
+
+def test_log_train_and_artifact():
+    """로그 중복 제거, 학습 정확도, 저장 → 게시 → 로드 후 같은 예측"""
+    with tempfile.TemporaryDirectory() as tmp:
+        log_dir, model_dir = os.path.join(tmp, "logs"), os.path.join(tmp, "models")
+        log_llm_decisions(DecisionRouter(model_dir=model_dir, log_dir=log_dir))
+
+        records = load_decision_log(NODE, log_dir)
+        assert len(records) == sum(len(replies) for replies in REPLIES.values())
+
+        model = train_and_publish(model_dir, log_dir)
+        report = evaluate_against_llm(model, records)
+        print(f"\n  학습 데이터 일치율 {report['accuracy']:.1%}, {report['thresholds']}")
+        assert report["accuracy"] >= 0.95
+
+        loaded = load_decision_model(NODE, model_dir=model_dir)
+        assert loaded.version == model.version and loaded.labels == model.labels
+        texts = ["네 부탁해요", "아니요", "글쎄요"]
+        assert np.allclose(loaded.predict_proba(texts), model.predict_proba(texts))
+
+
+def test_router_paths_and_agreement_monitor():
+    """확실하면 모델 (LLM 호출 없음), 애매하면 LLM, 섀도 비교는 일치율 집계"""
+    with tempfile.TemporaryDirectory() as tmp:
+        log_dir, model_dir = os.path.join(tmp, "logs"), os.path.join(tmp, "models")
+        log_llm_decisions(DecisionRouter(model_dir=model_dir, log_dir=log_dir))
+        train_and_publish(model_dir, log_dir)
+
+        calls = []
+
+        def ask_llm(decision):
+            def ask():
+                calls.append(decision)
+                return {"decision": decision, "reason": "LLM"}
+            return ask
+
+        router = DecisionRouter(model_dir=model_dir, log_dir=log_dir, shadow_rate=0.0)
+        assert router.decide(NODE, "네", "", ask_llm("yes"))["path"] == "model"
+        assert router.decide(NODE, "아니요", "", ask_llm("no"))["decision"] == "no"
+        assert not calls
+
+        result = router.decide(NODE, "네", "", ask_llm("yes"), allow_model=False)
+        assert result["path"] == "llm" and calls == ["yes"]
+
+        shadow = DecisionRouter(model_dir=model_dir, log_dir=log_dir, shadow_rate=1.0)
+        shadow.decide(NODE, "네", "", ask_llm("yes"))
+        shadow.decide(NODE, "아니요", "", ask_llm("unclear"))  # 불일치
+        metrics = shadow.metrics()[NODE]
+        print(f"\n  {metrics}")
+        assert metrics["llm"] == 2 and metrics["shadow_checks"] == 2
+        assert metrics["agreement_rate"] == 0.5
+
+
+def test_context_dependent_replies_defer_to_llm():
+    """evaluate_status: 같은 메시지를 단계에 따라 LLM이 다르게 판단했으면 모델이 답하지 않음 (저장 후에도 유지)"""
+    node = "evaluate_status"
+    steps = {
+        "continue": str({"step": 1, "action": "캐시 삭제", "expected_result": "캐시가 비워짐"}),
+        "resolved": str({"step": 2, "action": "앱 재시작 후 로그인", "expected_result": "정상 로그인"}),
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        router = DecisionRouter(model_dir=tmp, log_dir=tmp)
+        logged = {
+            "continue": ["했어요", "삭제했어요", "해봤어요", "잠시만요", "확인해볼게요", "그래도 안돼요", "여전히 안 돼요"],
+            "resolved": ["이제 잘 돼요", "해결됐어요", "정상이에요", "다 고쳐졌어요", "잘 됩니다", "문제 없어요"],
+            "escalate": ["상담원 연결해주세요", "문의 등록할게요", "티켓 만들어 주세요", "담당자랑 얘기할래요"],
+        }
+        for decision, replies in logged.items():
+            context = steps.get(decision, steps["continue"])
+            for reply in replies:
+                router.decide(node, reply, context, lambda d=decision: {"decision": d, "reason": "LLM"})
+        # "네"는 캐시 삭제 단계에서는 continue, 로그인 확인 단계에서는 resolved
+        router.decide(node, "네", steps["continue"], lambda: {"decision": "continue", "reason": "LLM"})
+        router.decide(node, "네!", steps["resolved"], lambda: {"decision": "resolved", "reason": "LLM"})
+
+        records = load_decision_log(node, tmp)
+        model = DecisionModel(node, threshold=0.5).fit(
+            [r["text"] for r in records], [r["decision"] for r in records], contexts=[r["context"] for r in records]
+        )
+        assert model.conflicting == {"네"}
+        assert model.weights[model.dim:].any()  # 문맥 특징도 학습됨
+
+        version = model.save(tmp)
+        publish_decision_model(node, version, tmp)
+        loaded = load_decision_model(node, model_dir=tmp)
+        assert loaded.conflicting == {"네"}
+        assert not loaded.predict("네", steps["resolved"])["confident"]
+        assert loaded.predict("해결됐어요", steps["resolved"])["confident"]
+
+        calls = []
+        result = DecisionRouter(model_dir=tmp, log_dir=tmp, shadow_rate=0.0).decide(
+            node, "네", steps["resolved"], lambda: calls.append(1) or {"decision": "resolved", "reason": "LLM"}
+        )
+        assert result["path"] == "llm" and calls == [1]
+
+
+def test_node_uses_decision_model():
+    """evaluate_ticket_confirmation 노드: 짧은 확실한 응답은 LLM 없이 판단"""
+    with tempfile.TemporaryDirectory() as tmp:
+        log_dir, model_dir = os.path.join(tmp, "logs"), os.path.join(tmp, "models")
+        log_llm_decisions(DecisionRouter(model_dir=model_dir, log_dir=log_dir))
+        train_and_publish(model_dir, log_dir)
+
+        created = []
+
+        def factory(model, temperature, **options):
+            created.append(model)
+            return FakeListChatModel(responses=['{"decision": "yes", "reason": "긍정", "additional_info": "에러 코드 500"}'])
+
+        os.environ["LLM_CACHE"] = "false"
+        llm_provider._provider = LLMProvider(model="test-model", factory=factory)
+        decision_model._router = DecisionRouter(model_dir=model_dir, log_dir=log_dir, shadow_rate=0.0)
+        try:
+            state = evaluate_ticket_confirmation_node({"messages": [HumanMessage(content="네")]})
+            assert state["ticket_confirmed"] is True and state["ticket_additional_info"] is None
+            assert decision_model._router.metrics()[NODE]["model"] == 1
+
+            # 긴 응답은 추가 정보 추출을 위해 LLM - 확인 요청 중인 문의 요약이 판단 문맥으로 기록
+            confirmation = (
+                "📋 **등록될 문의 내용:**\n\n"
+                "**제목**: 로그인 오류\n"
+                "**핵심 문제**: 비밀번호 재설정 후에도 로그인 실패\n\n"
+                "💬 **이 내용으로 문의를 등록하시겠습니까?**"
+            )
+            state = evaluate_ticket_confirmation_node({
+                "messages": [
+                    AIMessage(content=confirmation),
+                    HumanMessage(content="네 그리고 로그인 화면에서 에러 코드 500이 떠요"),
+                ]
+            })
+            assert state["ticket_additional_info"] == "에러 코드 500"
+            assert decision_model._router.metrics()[NODE]["llm"] == 1
+            assert load_decision_log(NODE, log_dir)[-1]["context"] == (
+                "제목: 로그인 오류 / 핵심 문제: 비밀번호 재설정 후에도 로그인 실패"
+            )
+        finally:
+            os.environ.pop("LLM_CACHE", None)
+            reset_llm_provider()
+            reset_decision_router()
+
+
+if __name__ == "__main__":
+    test_log_train_and_artifact()
+    test_router_paths_and_agreement_monitor()
+    test_context_dependent_replies_defer_to_llm()
+    test_node_uses_decision_model()
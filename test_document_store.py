@@ -0,0 +1,128 @@
+"""문서 저장소 테스트
+
+검색은 (FAQ ID, 거리)만 반환하고 본문은 ID 기반 문서 저장소에서
+지연 조회(hydration)하는 구조를 검증합니다.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from langchain_chroma import Chroma
+
+from src.services.document_store import DocumentStore, DocumentStoreFile, write_document_store
+from src.services.index_file import MmapIndex, write_index_file
+from src.services.vector_index import ChromaIndex, NumpyIndex
+from src.nodes.search_knowledge import select_documents
+from test_vector_index import UnitEmbeddings, make_documents
+
+
+def test_document_store_file_roundtrip():
+    """파일 저장/이진 탐색 조회 - 없는 ID는 제외"""
+
+    documents = make_documents(50)
+    documents[7].metadata["tags"] = "알림, 로그인"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "doc_store.bin")
+        info = write_document_store(path, list(reversed(documents)))
+        assert info["count"] == 50
+
+        store = DocumentStoreFile(path)
+        found = store.get_documents(["FAQ-007", "FAQ-049", "FAQ-000", "FAQ-999"])
+        assert set(found) == {"FAQ-007", "FAQ-049", "FAQ-000"}
+        assert found["FAQ-007"].page_content == "FAQ 문서 7"
+        assert found["FAQ-007"].metadata["tags"] == "알림, 로그인"
+        store.close()
+
+
+def test_lru_and_hydrate():
+    """LRU 적중/축출 + 참조 순서 유지 hydration"""
+
+    index = NumpyIndex.from_documents(make_documents(10), UnitEmbeddings())
+    store = DocumentStore(index, max_size=3)
+
+    refs = [{"id": "FAQ-005", "score": 0.2}, {"id": "없음", "score": 0.3}, {"id": "FAQ-001", "score": 0.4}]
+    hydrated = store.hydrate(refs)
+    assert [doc["id"] for doc in hydrated] == ["FAQ-005", "FAQ-001"]
+    assert hydrated[0]["content"] == "FAQ 문서 5" and hydrated[0]["score"] == 0.2
+
+    store.hydrate(refs[:1])
+    store.get_documents(["FAQ-002", "FAQ-003"])
+    stats = store.stats()
+    print(f"\n  {stats}")
+    assert stats["hits"] == 1
+    assert stats["size"] == 3 and stats["evictions"] == 1
+
+
+def no_content(*args, **kwargs):
+    raise AssertionError("참조 생성에서 본문을 읽음")
+
+
+class MetadataOnlyService:
+    """get_documents를 호출하면 실패하는 검색 서비스 (select_documents가 메타데이터만 읽는지 확인)"""
+
+    lexical_min_score = 0.6
+
+    def __init__(self, store: DocumentStore):
+        self.get_metadatas = store.get_metadatas
+        self.get_documents = no_content
+
+
+def test_metadata_refs_without_content():
+    """검색 결과 참조는 메타데이터만 읽어 생성 (문서 저장소 파일 / mmap / Chroma 모두 본문 디코딩 없음)"""
+
+    documents = make_documents(10)
+    for i, doc in enumerate(documents):
+        doc.metadata["title"] = f"제목 {i}"
+    embeddings = UnitEmbeddings()
+    vectors = embeddings.embed_documents([doc.page_content for doc in documents])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        write_document_store(str(Path(tmp) / "doc_store.bin"), documents)
+        write_index_file(str(Path(tmp) / "index.bin"), documents, vectors)
+        store_file = DocumentStoreFile(str(Path(tmp) / "doc_store.bin"))
+        mmap_index = MmapIndex(str(Path(tmp) / "index.bin"))
+        vectorstore = Chroma.from_documents(documents, embeddings, persist_directory=tmp, collection_name="faq_collection")
+
+        for source in (store_file, mmap_index, ChromaIndex(vectorstore)):
+            source._document = no_content
+            metadatas = source.get_metadatas(["FAQ-003", "FAQ-999"])
+            assert set(metadatas) == {"FAQ-003"} and metadatas["FAQ-003"]["title"] == "제목 3"
+
+        store = DocumentStore(store_file)
+        refs = select_documents(MetadataOnlyService(store), [("FAQ-003", 0.2), ("FAQ-999", 0.3), ("FAQ-001", 0.95)])
+        assert refs == [{"id": "FAQ-003", "title": "제목 3", "category": "테스트", "score": 0.2, "source": "faq"}]
+        assert store.stats()["size"] == 0  # 본문이 없는 메타데이터는 LRU에 넣지 않음
+
+        store_file.close()
+        mmap_index.close()
+
+
+def test_search_ids_match_documents():
+    """ID 검색 결과가 Document 검색 결과와 일치 (Chroma / NumPy)"""
+
+    embeddings = UnitEmbeddings()
+    with tempfile.TemporaryDirectory() as tmp:
+        vectorstore = Chroma.from_documents(
+            make_documents(),
+            embeddings,
+            persist_directory=tmp,
+            collection_name="faq_collection"
+        )
+        for index in (ChromaIndex(vectorstore), NumpyIndex.from_chroma(vectorstore)):
+            query_vector = embeddings.embed_query("FAQ 문서 3")
+            expected = index.search_by_vector(query_vector, k=5)
+            actual = index.search_ids_by_vector(query_vector, k=5)
+            assert [doc.metadata["id"] for doc, _ in expected] == [faq_id for faq_id, _ in actual]
+            for (_, exp_score), (_, act_score) in zip(expected, actual):
+                assert abs(exp_score - act_score) < 1e-6
+
+
+if __name__ == "__main__":
+    test_document_store_file_roundtrip()
+    test_lru_and_hydrate()
+    test_metadata_refs_without_content()
+    test_search_ids_match_documents()
@@ -0,0 +1,87 @@
+"""쿼리 임베딩 캐시 테스트
+
+Ollama 없이 호출 횟수를 세는 가짜 임베딩으로 캐시 동작을 검증합니다.
+"""
+
+import sys
+import time
+from pathlib import Path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from langchain_core.embeddings import Embeddings
+from src.services.embedding_cache import EmbeddingCache, CachedEmbeddings, normalize_query
+
+
+class CountingEmbeddings(Embeddings):
+    """호출 횟수를 기록하는 가짜 임베딩"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def embed_query(self, text):
+        self.calls += 1
+        return [float(len(text)), 1.0]
+
+    def embed_documents(self, texts):
+        return [self.embed_query(t) for t in texts]
+
+
+def test_normalize_query():
+    """공백/문장부호/이모지 정규화 테스트"""
+
+    print("=" * 60)
+    print("  쿼리 정규화 테스트")
+    print("=" * 60)
+
+    variants = [
+        "알림이 안 떠요",
+        "알림이 안떠요!!",
+        "  알림이   안 떠요 😭😭 ",
+        "알림이 안 떠요...?",
+        "알림이 안 떠요 ❤️",
+    ]
+    keys = {normalize_query(v) for v in variants}
+    print(f"  {variants} → {keys}")
+    assert keys == {"알림이안떠요"}
+    assert normalize_query("Login ERROR") == normalize_query("login error")
+
+
+def test_warm_query_skips_embedding_call():
+    """캐시 적중 시 임베딩 호출 생략 테스트"""
+
+    base = CountingEmbeddings()
+    embeddings = CachedEmbeddings(base, EmbeddingCache(max_size=10, ttl_seconds=60))
+
+    embeddings.embed_query("비밀번호를 잊어버렸어요")
+    embeddings.embed_query("비밀번호를 잊어버렸어요!")
+    embeddings.embed_query("비밀번호를  잊어버렸어요 🙏")
+
+    stats = embeddings.cache.stats()
+    print(f"\n  임베딩 호출: {base.calls}회, 캐시 통계: {stats}")
+    assert base.calls == 1
+    assert stats["hits"] == 2 and stats["misses"] == 1
+
+
+def test_size_and_ttl_eviction():
+    """최대 개수(LRU) 및 TTL 만료 테스트"""
+
+    cache = EmbeddingCache(max_size=2, ttl_seconds=0.05)
+    cache.put("a", [1.0])
+    cache.put("b", [2.0])
+    cache.get("a")                # a를 최근 사용으로
+    cache.put("c", [3.0])         # b 제거
+    assert cache.get("b") is None
+    assert cache.get("a") == [1.0]
+    assert cache.stats()["evictions"] == 1
+
+    time.sleep(0.1)
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+    print("\n  ✅ LRU/TTL 제거 정상 동작")
+
+
+if __name__ == "__main__":
+    test_normalize_query()
+    test_warm_query_skips_embedding_call()
+    test_size_and_ttl_eviction()
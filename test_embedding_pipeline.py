@@ -0,0 +1,162 @@
+"""임베딩 파이프라인 테스트
+
+실패하는 임베딩 백엔드로 배치 재시도 / 실패 배치 보고를 검증하고,
+배치 완료 순서가 바뀌어도 완료된 배치만 메인 스레드에서 기록되고,
+커밋 지점(CommitWatermark)은 입력 순서대로만 전진하는지 확인합니다.
+(재시도 대기는 retry_backoff=0, 완료 순서는 이벤트로 조절 - 실제 대기 없음)
+"""
+
+import sys
+import threading
+from pathlib import Path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from langchain_core.documents import Document
+
+from src.services.embedding_pipeline import EmbeddingPipeline
+from src.services.faq_stream import CommitWatermark
+
+
+def make_documents(count: int) -> list:
+    return [Document(page_content=f"FAQ 문서 {i}", metadata={"id": f"FAQ-{i:03d}"}) for i in range(count)]
+
+
+class FailingBackend:
+    """배치별로 처음 fail_times번 실패하는 임베딩 백엔드 (always_fail 문서가 든 배치는 항상 실패)
+
+    - 실패 방식은 번갈아 ConnectionError / 임베딩 수 불일치
+    - before_final(배치 키, 실패 여부)을 주면 배치의 마지막 응답(성공 또는 마지막 시도 실패) 직전에 호출
+    """
+
+    def __init__(self, fail_times: int = 1, always_fail: str = None, max_attempts: int = None, before_final=None):
+        self.fail_times = fail_times
+        self.always_fail = always_fail
+        self.max_attempts = max_attempts
+        self.before_final = before_final
+        self.attempts = {}
+        self.lock = threading.Lock()
+
+    def __call__(self, batch):
+        key = batch[0].metadata["id"]
+        with self.lock:
+            self.attempts[key] = self.attempts.get(key, 0) + 1
+            attempt = self.attempts[key]
+
+        failing = any(doc.metadata["id"] == self.always_fail for doc in batch) or attempt <= self.fail_times
+        if self.before_final is not None and (not failing or attempt == self.max_attempts):
+            self.before_final(key, failing)
+        if failing:
+            if attempt % 2:
+                raise ConnectionError("임베딩 서버 응답 없음")
+            return [[0.0]]
+        return [[float(doc.metadata["id"][4:])] for doc in batch]
+
+
+class ReverseOrder:
+    """뒤 배치부터 완료되도록 조절 - 각 배치는 바로 뒤 배치가 처리(기록 또는 최종 실패)된 뒤에 응답"""
+
+    def __init__(self, keys: list):
+        self.keys = keys
+        self.done = {key: threading.Event() for key in keys}
+
+    def before_final(self, key: str, failing: bool) -> None:
+        index = self.keys.index(key)
+        if index + 1 < len(self.keys):
+            assert self.done[self.keys[index + 1]].wait(timeout=10), "뒤 배치가 끝나지 않음"
+        if failing:
+            self.release(key)
+
+    def release(self, key: str) -> None:
+        self.done[key].set()
+
+
+def test_retry_then_succeed():
+    """일시적 실패는 재시도로 복구, 배치와 벡터가 짝이 맞게 전달"""
+    backend = FailingBackend(fail_times=2)
+    pipeline = EmbeddingPipeline(backend, batch_size=4, max_workers=3, max_retries=2, retry_backoff=0, verbose=False)
+
+    written = {}
+
+    def on_batch(batch, vectors):
+        for doc, vector in zip(batch, vectors):
+            written[doc.metadata["id"]] = vector
+
+    stats = pipeline.run(make_documents(18), on_batch=on_batch)
+    assert stats["documents"] == 18 and stats["batches"] == 5
+    assert stats["failed_batches"] == 0 and stats["failed_documents"] == []
+    assert stats["retries"] == 5 * 2
+    assert all(attempts == 3 for attempts in backend.attempts.values())
+    assert written == {f"FAQ-{i:03d}": [float(i)] for i in range(18)}
+
+
+def test_retries_exhausted():
+    """재시도를 모두 소진한 배치는 실패로 보고하고 on_batch에 전달하지 않음"""
+    backend = FailingBackend(fail_times=0, always_fail="FAQ-005")
+    pipeline = EmbeddingPipeline(backend, batch_size=4, max_workers=2, max_retries=3, retry_backoff=0, verbose=False)
+
+    written = []
+    stats = pipeline.run(make_documents(12), on_batch=lambda batch, vectors: written.extend(batch))
+    assert stats["failed_batches"] == 1 and stats["retries"] == 3
+    assert [doc.metadata["id"] for doc in stats["failed_documents"]] == ["FAQ-004", "FAQ-005", "FAQ-006", "FAQ-007"]
+    assert backend.attempts["FAQ-004"] == 4
+    assert stats["documents"] == len(written) == 8
+
+
+def test_out_of_order_completion():
+    """뒤 배치가 먼저 끝나도 완료된 배치만 메인 스레드에서 순차 기록 (실패한 배치는 기록되지 않음)"""
+    documents = make_documents(24)
+    keys = [documents[start].metadata["id"] for start in range(0, 24, 4)]
+    order = ReverseOrder(keys)
+    backend = FailingBackend(fail_times=1, always_fail="FAQ-016", max_attempts=2, before_final=order.before_final)
+    pipeline = EmbeddingPipeline(backend, batch_size=4, max_workers=6, max_retries=1, retry_backoff=0, verbose=False)
+
+    main_thread = threading.get_ident()
+    completed, committed = [], {}
+
+    def on_batch(batch, vectors):
+        assert threading.get_ident() == main_thread  # 컬렉션 쓰기는 메인 스레드에서 순차 호출
+        completed.append(batch[0].metadata["id"])
+        committed.update((doc.metadata["id"], vector) for doc, vector in zip(batch, vectors))
+        order.release(batch[0].metadata["id"])
+
+    stats = pipeline.run(iter(documents), on_batch=on_batch)
+
+    assert completed == ["FAQ-020", "FAQ-012", "FAQ-008", "FAQ-004", "FAQ-000"]
+    assert stats["failed_batches"] == 1 and stats["retries"] == 6
+    assert set(committed) == {doc.metadata["id"] for doc in documents} - {f"FAQ-{i:03d}" for i in range(16, 20)}
+
+
+def test_ordered_commit():
+    """뒤 배치가 먼저 끝나도 커밋 지점은 입력 순서대로만 전진, 실패한 배치 앞에서 멈춤"""
+    documents = make_documents(24)
+    keys = [documents[start].metadata["id"] for start in range(0, 24, 4)]
+    order = ReverseOrder(keys)
+    backend = FailingBackend(fail_times=0, always_fail="FAQ-016", max_attempts=1, before_final=order.before_final)
+    pipeline = EmbeddingPipeline(backend, batch_size=4, max_workers=6, max_retries=0, retry_backoff=0, verbose=False)
+
+    watermark = CommitWatermark()
+    for row, doc in enumerate(documents, 1):
+        watermark.track(doc, row * 100)
+
+    offsets = []
+
+    def on_batch(batch, vectors):
+        watermark.commit(batch)
+        offsets.append(watermark.offset)
+        order.release(batch[0].metadata["id"])
+
+    stats = pipeline.run(iter(documents), on_batch=on_batch)
+
+    # 첫 배치가 마지막으로 끝나기 전까지 커밋 지점은 그대로
+    assert offsets == [0, 0, 0, 0, 1600]
+    assert stats["failed_batches"] == 1
+    # FAQ-016 배치(17~20번째 문서)가 실패 → 16번째 문서까지만 커밋, 뒤 배치는 보류
+    assert (watermark.offset, watermark.records, watermark.pending) == (1600, 16, 8)
+
+
+if __name__ == "__main__":
+    test_retry_then_succeed()
+    test_retries_exhausted()
+    test_out_of_order_completion()
+    test_ordered_commit()
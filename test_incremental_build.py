@@ -0,0 +1,99 @@
+"""증분 구축 테스트
+
+매니페스트의 FAQ별 콘텐츠 해시와 비교하여 변경된 FAQ만 다시 임베딩하고,
+삭제된 FAQ는 컬렉션에서 제거하며, 변경이 없으면 아무것도 임베딩하지 않는지 검증합니다.
+"""
+
+import os
+import sys
+import json
+import hashlib
+import tempfile
+from pathlib import Path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from langchain_core.embeddings import Embeddings
+
+from scripts.build_vectorstore import build_vectorstore, create_documents_from_faq
+from src.services.index_manifest import content_hash, load_manifest
+
+
+class CountingEmbeddings(Embeddings):
+    """결정적 해시 임베딩 (Ollama 불필요) - 임베딩한 문서 본문 기록"""
+
+    def __init__(self, dim: int = 32):
+        self.dim = dim
+        self.embedded = []
+
+    def _embed(self, text: str) -> list:
+        digest = hashlib.sha256(text.encode("utf-8")).digest()
+        return [byte / 255.0 for byte in digest[:self.dim]]
+
+    def embed_documents(self, texts):
+        self.embedded.extend(texts)
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text):
+        return self._embed(text)
+
+
+def build(faq_data: list, persist_directory: str, cache_path: str):
+    """새 디스크 임베딩 캐시로 증분 구축 - 캐시 적중 없이 매니페스트가 건너뛴 문서만 임베딩되지 않음"""
+    os.environ["EMBEDDING_CACHE_PATH"] = cache_path
+    embeddings = CountingEmbeddings()
+    documents = create_documents_from_faq(faq_data)
+    vectorstore = build_vectorstore(documents, persist_directory, incremental=True, embeddings=embeddings)
+    return vectorstore, documents, embeddings
+
+
+def test_incremental_manifest():
+    """변경 / 삭제 / 변경 없음 FAQ 반영 + 재실행 시 임베딩 없음"""
+
+    with open(project_root / "data" / "faq_sample.json", "r", encoding="utf-8") as f:
+        faq_data = json.load(f)
+
+    previous_cache = os.environ.get("EMBEDDING_CACHE_PATH")
+    with tempfile.TemporaryDirectory() as tmp:
+        persist_directory = os.path.join(tmp, "vectorstore")
+        try:
+            # 1차: 매니페스트가 없어 전체 구축
+            vectorstore, documents, embeddings = build(faq_data, persist_directory, os.path.join(tmp, "cache1.sqlite"))
+            assert len(embeddings.embedded) == len(faq_data)
+            manifest = load_manifest(persist_directory)
+            assert manifest["documents"] == {doc.metadata["id"]: content_hash(doc) for doc in documents}
+
+            # 2차: FAQ 하나 변경, 하나 삭제, 나머지는 그대로
+            changed, removed = faq_data[0]["id"], faq_data[1]["id"]
+            updated = json.loads(json.dumps(faq_data))
+            updated[0]["content"]["symptom"] += " (재부팅 후에도 동일)"
+            del updated[1]
+
+            vectorstore, documents, embeddings = build(updated, persist_directory, os.path.join(tmp, "cache2.sqlite"))
+            assert len(embeddings.embedded) == 1 and "재부팅 후에도 동일" in embeddings.embedded[0]
+
+            stored = vectorstore._collection.get(include=["documents"])
+            contents = dict(zip(stored["ids"], stored["documents"]))
+            assert set(contents) == {faq["id"] for faq in updated} and removed not in contents
+            assert "재부팅 후에도 동일" in contents[changed]
+
+            manifest = load_manifest(persist_directory)
+            assert manifest["documents"] == {doc.metadata["id"]: content_hash(doc) for doc in documents}
+            assert removed not in manifest["documents"]
+
+            # 3차: 변경 없음 → 임베딩 / 컬렉션 / 매니페스트 모두 그대로
+            vectorstore, _, embeddings = build(updated, persist_directory, os.path.join(tmp, "cache3.sqlite"))
+            assert embeddings.embedded == []
+            assert vectorstore._collection.count() == len(updated)
+            assert load_manifest(persist_directory) == manifest
+        finally:
+            if previous_cache is None:
+                os.environ.pop("EMBEDDING_CACHE_PATH", None)
+            else:
+                os.environ["EMBEDDING_CACHE_PATH"] = previous_cache
+
+    print(f"\n  FAQ {len(faq_data)}개 → 변경 1개 / 삭제 1개만 반영, 재실행 시 임베딩 0개")
+
+
+if __name__ == "__main__":
+    test_incremental_manifest()
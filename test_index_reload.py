@@ -0,0 +1,109 @@
+"""인덱스 무중단 교체 테스트
+
+버전 포인터(current.json)가 바뀌면 새 버전을 로드한 뒤 공유 검색 서비스를 교체하고,
+교체 전에 받은 서비스는 계속 동작하다가 참조가 없어지면 해제되는지 검증합니다.
+"""
+
+import gc
+import os
+import sys
+import json
+import tempfile
+import threading
+from pathlib import Path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+import src.services.retrieval as retrieval
+from src.services.retrieval import RetrievalService, get_retrieval_service, reset_retrieval_service
+from src.services.index_reload import (
+    IndexReloader,
+    VERSIONS_DIR,
+    publish_index_version,
+    prune_index_versions,
+    read_index_pointer,
+)
+from src.services.hashed_embeddings import HashedNgramEmbeddings
+from scripts.evaluate_retrieval import build_offline_store
+
+
+def build_version(root: str, version: str, faq_data: list) -> None:
+    """FAQ 목록으로 versions/<version>에 색인 구축"""
+    directory = os.path.join(root, VERSIONS_DIR, version)
+    os.makedirs(directory)
+    faq_file = os.path.join(root, f"{version}.json")
+    with open(faq_file, "w", encoding="utf-8") as f:
+        json.dump(faq_data, f, ensure_ascii=False)
+    build_offline_store(faq_file, directory, HashedNgramEmbeddings())
+
+
+def test_hot_reload_swap():
+    """포인터 교체 → 새 버전으로 교체, 진행 중인 검색은 이전 버전으로 완료 후 해제"""
+
+    with open(project_root / "data" / "faq_sample.json", "r", encoding="utf-8") as f:
+        faq_data = json.load(f)
+    removed_id = faq_data[0]["id"]
+    query = faq_data[0]["title"]
+
+    with tempfile.TemporaryDirectory() as root:
+        build_version(root, "v1", faq_data)
+        build_version(root, "v2", faq_data[1:])
+        os.makedirs(os.path.join(root, VERSIONS_DIR, "v3-broken"))
+        publish_index_version(root, "v1")
+
+        retrieval._service = RetrievalService(persist_directory=root, backend="mmap", embeddings=HashedNgramEmbeddings())
+        reloader = IndexReloader(root, "v1", load=retrieval._load_version, on_swap=retrieval._swap_service)
+        try:
+            old = get_retrieval_service()
+            assert old.published_version == "v1" and old.index_version() == "v1"
+            assert removed_id in [faq_id for faq_id, _ in old.hybrid_search_ids(query, k=3)]
+            assert not reloader.check()  # 포인터 변경 없음
+
+            # 교체 중에도 검색 요청이 실패하지 않음
+            errors, stop = [], threading.Event()
+
+            def search_loop():
+                while not stop.is_set():
+                    try:
+                        get_retrieval_service().hybrid_search_ids(query, k=3)
+                    except Exception as e:  # pragma: no cover - 실패 시 기록
+                        errors.append(e)
+
+            threads = [threading.Thread(target=search_loop) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            publish_index_version(root, "v2")
+            swapped = reloader.check()
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+            assert swapped and not errors
+            new = get_retrieval_service()
+            assert new is not old and new.published_version == "v2"
+            assert new.embedding_cache is old.embedding_cache
+            assert removed_id not in [faq_id for faq_id, _ in new.hybrid_search_ids(query, k=3)]
+
+            # 교체 전에 받은 서비스는 참조가 남아 있는 동안 이전 버전으로 계속 검색
+            assert removed_id in [faq_id for faq_id, _ in old.hybrid_search_ids(query, k=3)]
+            closeables = old._closeables
+            assert closeables
+            del old
+            gc.collect()
+            assert closeables == []  # 참조가 없어지자 mmap 파일 해제
+
+            # 로드에 실패한 버전은 교체하지 않고 기존 버전 유지
+            publish_index_version(root, "v3-broken")
+            assert not reloader.check()
+            assert get_retrieval_service() is new and reloader.failures == 1
+            print(f"\n  {reloader.stats()}")
+
+            publish_index_version(root, "v2")
+            assert prune_index_versions(root, keep=2) == ["v1"]
+            assert read_index_pointer(root)["version"] == "v2"
+        finally:
+            reset_retrieval_service()
+
+
+if __name__ == "__main__":
+    test_hot_reload_swap()
@@ -0,0 +1,113 @@
+"""임베딩 k-NN 의도 분류 테스트
+
+라벨된 예시 문장을 한 번만 임베딩하여 k-NN 투표로 분류하고, 마진이 부족하면 LLM으로 넘기며,
+분류에 쓴 질의 임베딩을 search_knowledge 단계에서 캐시로 재사용하는지 검증합니다.
+(Ollama 없이 HashedNgramEmbeddings 사용 - 표면 문자 겹침 기준이므로 유사도 하한을 낮춤)
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import HumanMessage
+
+import src.services.retrieval as retrieval
+import src.services.intent_knn as intent_knn
+import src.services.llm_provider as llm_provider
+from src.services.hashed_embeddings import HashedNgramEmbeddings
+from src.services.intent_knn import IntentKNNClassifier, reset_intent_classifier
+from src.services.llm_provider import LLMProvider, reset_llm_provider
+from src.services.retrieval import RetrievalService, reset_retrieval_service
+from src.nodes.classify_intent import classify_intent_node
+
+MIN_SIMILARITY = 0.3
+
+
+class CountingEmbeddings(HashedNgramEmbeddings):
+    """원본 모델 호출 횟수를 세는 임베딩"""
+
+    def __init__(self):
+        super().__init__()
+        self.query_calls = 0
+        self.document_calls = 0
+
+    def embed_query(self, text):
+        self.query_calls += 1
+        return super().embed_query(text)
+
+    def embed_documents(self, texts):
+        self.document_calls += 1
+        return super().embed_documents(texts)
+
+
+def test_knn_vote_and_handoff():
+    """가까운 예시가 한쪽으로 모이면 확정, 투표가 갈리면 None (LLM으로)"""
+    embeddings = CountingEmbeddings()
+    classifier = IntentKNNClassifier(embeddings, min_similarity=MIN_SIMILARITY)
+
+    cases = [
+        ("안녕하세요 반가워요", "small_talk"),
+        ("파일 업로드 실패", "technical_support"),
+        ("메신저가 좀 이상해요", "vague_problem"),
+    ]
+    for text, expected in cases:
+        result = classifier.classify(text)
+        print(f"\n  {text} → {result}")
+        assert result is not None and result["intent"] == expected, (text, result)
+
+    vote = classifier.vote(embeddings.embed_query("회사 메신저 관련해서 여쭤볼 게 있어요"))
+    assert not vote["accepted"] and vote["margin"] < classifier.margin
+    assert embeddings.document_calls == 1  # 예시는 한 번만 (배치) 임베딩
+
+
+def test_node_embedding_path_reuses_query_embedding():
+    """k-NN으로 확정되면 LLM 호출 없음, 같은 질의의 검색 임베딩은 캐시 적중"""
+    created = []
+
+    def factory(model, temperature, **options):
+        created.append(model)
+        return FakeListChatModel(responses=['{"intent": "technical_support", "reason": "문의", "confidence": 0.7}'])
+
+    os.environ["INTENT_RULES"] = "false"  # 규칙 경로를 건너뛰고 임베딩 경로 확인
+    os.environ["LLM_CACHE"] = "false"
+    base = CountingEmbeddings()
+    with tempfile.TemporaryDirectory() as tmp:
+        service = RetrievalService(persist_directory=tmp, backend="numpy", embeddings=base)
+        retrieval._service = service
+        intent_knn._classifier = IntentKNNClassifier(service.embeddings, min_similarity=MIN_SIMILARITY)
+        llm_provider._provider = LLMProvider(model="test-model", factory=factory)
+        try:
+            query = "파일 업로드 실패"
+            state = classify_intent_node({"messages": [HumanMessage(content=query)], "status": "new"})
+            info = state["debug_info"]["intent_classification"]
+            assert state["intent"] == "technical_support" and state["status"] == "searching"
+            assert info["path"] == "embedding" and not created
+            assert base.document_calls == 1  # 예시 배치 임베딩
+            calls = base.query_calls
+
+            # search_knowledge의 결과 캐시 조회 / 검색과 같은 경로 - 원본 모델을 다시 호출하지 않음
+            service.embeddings.embed_query(query)
+            assert base.query_calls == calls
+            assert service.embedding_cache.stats()["hits"] == 1
+
+            state = classify_intent_node({
+                "messages": [HumanMessage(content="회사 메신저 관련해서 여쭤볼 게 있어요")],
+                "status": "new",
+            })
+            assert state["debug_info"]["intent_classification"]["path"] == "llm"
+            assert len(created) == 1
+        finally:
+            os.environ.pop("INTENT_RULES", None)
+            os.environ.pop("LLM_CACHE", None)
+            reset_llm_provider()
+            reset_intent_classifier()
+            reset_retrieval_service()
+
+
+if __name__ == "__main__":
+    test_knn_vote_and_handoff()
+    test_node_embedding_path_reuses_query_embedding()
@@ -0,0 +1,112 @@
+"""의도 분류 규칙 빠른 경로 테스트
+
+인사 / 감사 / 명확한 기술 문의 / 모호한 문제 표현은 LLM 없이 규칙으로 분류되고,
+애매한 입력만 LLM으로 넘어가는지 검증합니다.
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import HumanMessage
+
+import src.services.llm_provider as llm_provider
+from src.services.llm_provider import LLMProvider, reset_llm_provider
+from src.services.intent_rules import match_intent
+from src.nodes.classify_intent import classify_intent_node
+
+RULE_CASES = [
+    ("안녕하세요", "small_talk"),
+    ("Hello", "small_talk"),
+    ("좋은 아침이에요", "small_talk"),
+    ("고마워요 ㅎㅎ", "small_talk"),
+    ("안녕하세요^^", "small_talk"),
+    ("넌 누구니?", "small_talk"),
+    ("로그인이 안돼요", "technical_support"),
+    ("파일 업로드가 실패합니다", "technical_support"),
+    ("비밀번호를 잊어버렸어요", "technical_support"),
+    ("메시지가 안 보내져요", "technical_support"),
+    ("계정을 삭제하고 싶어요", "technical_support"),
+    ("안녕하세요, 로그인이 안되는데 도와주세요", "technical_support"),
+    ("Hello, I can't upload files", "technical_support"),
+    ("메신저가 이상해", "vague_problem"),
+    ("뭔가 안 돼", "vague_problem"),
+    ("답답해요", "vague_problem"),
+    ("안녕하세요 메신저가 이상해요", "vague_problem"),
+    ("이게 자꾸 안돼요", "vague_problem"),
+]
+
+AMBIGUOUS = ["회사 메신저 관련해서 여쭤볼 게 있어요", "오늘 점심 뭐 먹지", "로그인"]
+
+# 일반 단어 / 사용법 표현 / 감사·챗봇 언급 때문에 기술 문의로 잘못 확정되면 안 되는 입력
+NOT_TECHNICAL = [
+    "설정 방법 알려줘서 고마워요",
+    "이 챗봇 어떻게 사용해요?",
+    "비밀번호 찾는 방법 알려주셔서 감사합니다",
+    "이 기능은 어떻게 사용하나요?",
+]
+
+# 대상이 있는 구체적인 실패 보고 - 검색 전에 모호한 문제로 확정되면 안 됨
+NOT_VAGUE = [
+    "검색 기능이 안 돼요",
+    "그룹방 기능이 안 돼요",
+    "결재가 안돼요",
+    "안녕하세요 결재가 안되네요",
+]
+
+
+def test_rule_matches():
+    """확실한 입력은 규칙으로, 애매한 입력은 None"""
+    for text, expected in RULE_CASES:
+        match = match_intent(text)
+        assert match is not None and match["intent"] == expected, (text, match)
+    for text in AMBIGUOUS:
+        assert match_intent(text) is None, text
+    for text in NOT_TECHNICAL:
+        match = match_intent(text)
+        assert match is None or match["intent"] != "technical_support", (text, match)
+    for text in NOT_VAGUE:
+        match = match_intent(text)
+        assert match is None or match["intent"] != "vague_problem", (text, match)
+
+    started = time.perf_counter()
+    for _ in range(1000):
+        match_intent("안녕하세요, 로그인이 안되는데 도와주세요")
+    per_call_us = (time.perf_counter() - started) * 1000
+    print(f"\n  규칙 매칭: {per_call_us:.1f}µs/건")
+    assert per_call_us < 1000
+
+
+def test_node_paths():
+    """규칙으로 확정되면 LLM을 호출하지 않고, 애매하면 LLM 경로 - debug_info에 경로 기록"""
+    created = []
+
+    def factory(model, temperature, **options):
+        created.append(model)
+        return FakeListChatModel(responses=['{"intent": "small_talk", "reason": "잡담", "confidence": 0.7}'])
+
+    os.environ["INTENT_KNN"] = "false"  # 임베딩 분류는 test_intent_knn.py
+    os.environ["LLM_CACHE"] = "false"
+    llm_provider._provider = LLMProvider(model="test-model", factory=factory)
+    try:
+        state = classify_intent_node({"messages": [HumanMessage(content="로그인이 안돼요")], "status": "new"})
+        info = state["debug_info"]["intent_classification"]
+        assert state["intent"] == "technical_support" and state["status"] == "searching"
+        assert info["path"] == "rule" and not created
+
+        state = classify_intent_node({"messages": [HumanMessage(content=AMBIGUOUS[1])], "status": "new"})
+        assert state["intent"] == "small_talk" and state["debug_info"]["intent_classification"]["path"] == "llm"
+        assert len(created) == 1
+    finally:
+        os.environ.pop("INTENT_KNN", None)
+        os.environ.pop("LLM_CACHE", None)
+        reset_llm_provider()
+
+
+if __name__ == "__main__":
+    test_rule_matches()
+    test_node_paths()
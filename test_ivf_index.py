@@ -0,0 +1,131 @@
+"""IVF 근사 검색 인덱스 테스트
+
+군집 구조가 있는 합성 임베딩으로 IVF 인덱스의 재현율과
+exact 검색(NumpyIndex)과의 거리 계약 일치를 검증합니다.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+from langchain_core.documents import Document
+
+from src.services.vector_index import NumpyIndex
+from src.services.ivf_index import IVFIndex, IVF_FILE, evaluate_recall
+from src.services.index_file import INDEX_FILE, export_index_file
+from src.services.retrieval import RetrievalService
+from scripts.build_vectorstore import refresh_derived_indexes
+
+
+def make_clustered_index(n: int = 2000, dim: int = 32, clusters: int = 20, seed: int = 0) -> NumpyIndex:
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    labels = rng.integers(0, clusters, size=n)
+    vectors = centers[labels] + rng.normal(scale=0.3, size=(n, dim))
+    documents = [
+        Document(
+            page_content=f"문서 {i}",
+            metadata={"id": f"QA-{i:05d}", "category": f"분류{labels[i] % 4}", "source": "qna"}
+        )
+        for i in range(n)
+    ]
+    return NumpyIndex(documents, vectors)
+
+
+def test_ivf_full_probe_matches_exact():
+    """nprobe = nlist면 exact 검색과 동일한 결과"""
+
+    base = make_clustered_index()
+    ivf = IVFIndex.build(base, nlist=16, nprobe=16)
+    assert ivf.list_offsets[-1] == base.count()
+
+    query = base.matrix[7] + 0.01
+    expected = base.search_by_vector(query, k=10)
+    actual = ivf.search_by_vector(query, k=10)
+    assert [doc.metadata["id"] for doc, _ in expected] == [doc.metadata["id"] for doc, _ in actual]
+    for (_, exp_score), (_, act_score) in zip(expected, actual):
+        assert abs(exp_score - act_score) < 1e-6
+
+
+def test_ivf_recall_report():
+    """적은 nprobe에서도 군집 데이터의 recall@5가 충분히 높음"""
+
+    base = make_clustered_index()
+    ivf = IVFIndex.build(base, nlist=32, nprobe=4)
+
+    rng = np.random.default_rng(1)
+    queries = base.matrix[rng.choice(base.count(), size=50, replace=False)]
+    report = evaluate_recall(ivf, queries, k=5, nprobes=(1, 4, 32))
+
+    print("\n  nprobe | recall | 탐색 비율")
+    for row in report:
+        print(f"  {row['nprobe']:6d} | {row['recall']:.3f} | {row['scanned_ratio']:.1%}")
+
+    by_nprobe = {row["nprobe"]: row for row in report}
+    assert by_nprobe[4]["recall"] >= 0.9
+    assert by_nprobe[4]["scanned_ratio"] < 0.5
+    assert by_nprobe[32]["recall"] == 1.0
+    assert by_nprobe[1]["recall"] <= by_nprobe[4]["recall"]
+
+
+def test_ivf_save_load_and_filter():
+    """저장/로드 후 동일 결과 + 메타데이터 필터 적용"""
+
+    base = make_clustered_index(n=500)
+    ivf = IVFIndex.build(base, nlist=8, nprobe=2)
+    query = base.matrix[3]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "ivf_index.npz")
+        ivf.save(path)
+        loaded = IVFIndex.load(path, base, nprobe=2)
+
+        assert [d.metadata["id"] for d, _ in loaded.search_by_vector(query, k=5)] == \
+            [d.metadata["id"] for d, _ in ivf.search_by_vector(query, k=5)]
+
+        try:
+            IVFIndex.load(path, make_clustered_index(n=100))
+            assert False, "문서 수가 다른 base 인덱스는 ValueError"
+        except ValueError:
+            pass
+
+    results = ivf.search_by_vector(query, k=5, filter={"category": "분류1"})
+    assert results
+    assert all(doc.metadata["category"] == "분류1" for doc, _ in results)
+
+
+def test_stale_ivf_after_rebuild():
+    """base 인덱스 재구축(같은 문서 수) 후 오래된 IVF 파일 - 로드 거부, 검색은 exact로 대체, 구축 스크립트가 갱신"""
+
+    old_base = make_clustered_index(n=500, seed=0)
+    new_base = make_clustered_index(n=500, seed=1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        IVFIndex.build(old_base, nlist=8).save(str(Path(tmp) / IVF_FILE))
+        export_index_file(str(Path(tmp) / INDEX_FILE), new_base)
+
+        try:
+            IVFIndex.load(str(Path(tmp) / IVF_FILE), new_base)
+            assert False, "다른 base 인덱스로 만든 IVF 파일은 ValueError"
+        except ValueError:
+            pass
+
+        service = RetrievalService(persist_directory=tmp, backend="ivf")
+        assert not isinstance(service.index, IVFIndex)
+        query = new_base.matrix[3]
+        assert service.index.search_ids_by_vector(query, k=1)[0][0] == new_base.documents[3].metadata["id"]
+
+        refresh_derived_indexes(tmp)
+        refreshed = IVFIndex.load(str(Path(tmp) / IVF_FILE), new_base)
+        assert refreshed.nlist == 8
+        service.index.close()
+
+
+if __name__ == "__main__":
+    test_ivf_full_probe_matches_exact()
+    test_ivf_recall_report()
+    test_ivf_save_load_and_filter()
+    test_stale_ivf_after_rebuild()
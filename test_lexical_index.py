@@ -0,0 +1,138 @@
+"""어휘(n-gram) 색인 및 RRF 결합 테스트
+
+샘플 FAQ로 문자 n-gram 역색인을 구축하여 정확한 용어 질의를 검증합니다 (Ollama 불필요).
+"""
+
+import sys
+import json
+import tempfile
+import os
+from pathlib import Path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+import src.services.retrieval as retrieval
+from src.services.lexical_index import LexicalIndex, char_ngrams, reciprocal_rank_fusion
+from src.services.retrieval import RetrievalService, reset_retrieval_service
+from src.services.hashed_embeddings import HashedNgramEmbeddings
+from src.nodes.search_knowledge import search_knowledge_node
+from scripts.evaluate_retrieval import build_offline_store
+
+
+def load_sample_faq() -> list:
+    with open(project_root / "data" / "faq_sample.json", "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_exact_terms():
+    """제목/태그의 정확한 용어 질의 테스트"""
+
+    print("=" * 60)
+    print("  어휘 색인 검색 테스트")
+    print("=" * 60)
+
+    index = LexicalIndex.from_faq(load_sample_faq())
+
+    test_cases = [
+        ("VPN 연결이 안돼요", "FAQ-015", True),
+        ("계정잠금", "FAQ-005", True),
+        ("이중 인증 설정", "FAQ-014", True),
+        ("메신저가 이상해", None, False),   # 모호한 질의는 벡터 검색으로
+    ]
+
+    for query, expected_id, decisive in test_cases:
+        results = index.search(query, k=3)
+        is_decisive = LexicalIndex.is_decisive(results, min_score=0.6, min_margin=0.25)
+        print(f"\n  쿼리: {query} → {[(faq_id, round(score, 2)) for faq_id, score in results]} (확실: {is_decisive})")
+
+        assert is_decisive == decisive
+        if expected_id:
+            assert results[0][0] == expected_id
+
+
+class CountingEmbeddings(HashedNgramEmbeddings):
+    """질의/문서 임베딩 호출 횟수를 세는 임베딩"""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def embed_query(self, text):
+        self.calls += 1
+        return super().embed_query(text)
+
+    def embed_documents(self, texts):
+        self.calls += 1
+        return [super(CountingEmbeddings, self).embed_query(text) for text in texts]
+
+
+def test_node_lexical_path_without_embedding():
+    """어휘 점수가 확실한 질의 - search_knowledge_node가 임베딩을 한 번도 호출하지 않음 (결과 캐시 포함)"""
+
+    with tempfile.TemporaryDirectory() as tmp:
+        build_offline_store(str(project_root / "data" / "faq_sample.json"), tmp, HashedNgramEmbeddings())
+        embeddings = CountingEmbeddings()
+        service = RetrievalService(persist_directory=tmp, backend="mmap", embeddings=embeddings)
+        retrieval._service = service
+        try:
+            for _ in range(2):
+                state = search_knowledge_node({"current_query": "계정잠금", "search_filter": None})
+                assert state["retrieved_docs"][0]["id"] == "FAQ-005"
+                assert state["retrieved_solutions"]
+                assert all(s["parent_id"] == "FAQ-005" for s in state["retrieved_solutions"][:1])
+            path_counts = dict(service.path_counts)
+            cache_stats = service.result_cache.stats()
+        finally:
+            reset_retrieval_service()
+
+    print(f"\n  계정잠금 → 검색 경로 {path_counts}, 임베딩 호출 {embeddings.calls}회")
+    assert embeddings.calls == 0
+    assert path_counts == {"lexical": 2}
+    assert cache_stats["size"] == 0 and cache_stats["misses"] == 0
+
+
+def test_lexical_only_hits_use_vector_distance():
+    """하이브리드 결과의 어휘 전용 문서도 실제 벡터 거리 (어휘 점수를 거리로 바꾸지 않음)"""
+
+    with tempfile.TemporaryDirectory() as tmp:
+        build_offline_store(str(project_root / "data" / "faq_sample.json"), tmp, HashedNgramEmbeddings())
+        service = RetrievalService(persist_directory=tmp, backend="numpy", embeddings=HashedNgramEmbeddings())
+        query_vector = service.embeddings.embed_query("메신저가 이상해")
+        all_distances = dict(service.index.search_ids_by_vector(query_vector, k=service.index.count()))
+
+        # 벡터 결과에 없는 어휘 전용 문서 2개 (어휘 점수 0.99는 거리에 반영되지 않아야 함)
+        vector = [("FAQ-001", all_distances["FAQ-001"])]
+        fused = service._fuse(query_vector, vector, [("FAQ-005", 0.99), ("FAQ-015", 0.5)], k=3)
+
+    assert [faq_id for faq_id, _ in fused] == ["FAQ-001", "FAQ-005", "FAQ-015"]
+    for faq_id, distance in fused:
+        assert abs(distance - all_distances[faq_id]) < 1e-5
+
+
+def test_save_and_load():
+    """저장/로드 후 동일 결과 테스트"""
+
+    index = LexicalIndex.from_faq(load_sample_faq())
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, LexicalIndex.FILE_NAME)
+        index.save(path)
+        loaded = LexicalIndex.load(path)
+
+    assert loaded.search("파일 업로드 실패", k=3) == index.search("파일 업로드 실패", k=3)
+
+
+def test_ngrams_and_rrf():
+    """n-gram 생성 및 RRF 순위 테스트"""
+
+    assert char_ngrams("VPN 연결") == {"vp", "pn", "vpn", "연결"}
+
+    fused = reciprocal_rank_fusion([["A", "B", "C"], ["B", "D"]], k=60)
+    assert [doc_id for doc_id, _ in fused][:2] == ["B", "A"]
+
+
+if __name__ == "__main__":
+    test_exact_terms()
+    test_node_lexical_path_without_embedding()
+    test_lexical_only_hits_use_vector_distance()
+    test_save_and_load()
+    test_ngrams_and_rrf()
@@ -0,0 +1,132 @@
+"""LLM 응답 캐시 테스트
+
+temperature 0 노드의 같은 프롬프트는 메모리 → SQLite 캐시로 응답하고,
+유효 시간 / 행 수 상한 / 프롬프트 버전 변경 시 무효화가 동작하는지 검증합니다.
+"""
+
+import os
+import sys
+import time
+import tempfile
+from pathlib import Path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import HumanMessage
+
+import src.services.llm_provider as llm_provider
+import src.services.decision_model as decision_model
+from src.services.decision_model import DecisionRouter, reset_decision_router
+from src.services.llm_provider import LLMProvider, get_llm_provider, reset_llm_provider
+from src.services.llm_cache import LLMResponseCache, response_key
+from src.nodes.evaluate_ticket_confirmation import evaluate_ticket_confirmation_node
+
+YES = '{"decision": "yes", "reason": "긍정", "additional_info": null}'
+
+
+def counting_factory(calls: list):
+    def factory(model, temperature, **options):
+        model = FakeListChatModel(responses=[YES])
+        original = model._call
+
+        def call(*args, **kwargs):
+            calls.append(temperature)
+            return original(*args, **kwargs)
+
+        object.__setattr__(model, "_call", call)
+        return model
+    return factory
+
+
+def make_provider(path: str, calls: list) -> LLMProvider:
+    return LLMProvider(model="test-model", factory=counting_factory(calls), response_cache=LLMResponseCache(path))
+
+
+def test_two_level_cache():
+    """같은 입력은 메모리 적중, 새 프로세스(새 제공자)는 SQLite 적중, temperature > 0은 캐시하지 않음"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "llm_cache.sqlite")
+        calls = []
+        provider = make_provider(path, calls)
+
+        llm = provider.get("evaluate_status", temperature=0, cache=True, prompt_version="1")
+        for _ in range(3):
+            assert llm.invoke([HumanMessage(content="네")]).content == YES
+        llm.invoke([HumanMessage(content="아니요")])
+        assert len(calls) == 2
+
+        creative = provider.get("handle_small_talk", temperature=0.7, cache=True)
+        creative.invoke("안녕")
+        creative.invoke("안녕")
+        assert len(calls) == 4
+
+        stats = provider.metrics()["response_cache"]
+        print(f"\n  {stats}")
+        assert stats["nodes"]["evaluate_status"]["memory_hits"] == 2
+        assert stats["nodes"]["evaluate_status"]["misses"] == 2
+        assert "handle_small_talk" not in stats["nodes"]
+        assert provider.metrics()["nodes"]["evaluate_status"]["calls"] == 2  # 적중은 LLM 호출 없음
+        provider.close()
+
+        restarted = make_provider(path, calls)
+        response = restarted.get("evaluate_status", temperature=0, cache=True, prompt_version="1").invoke(
+            [HumanMessage(content="네")]
+        )
+        assert response.content == YES and response.response_metadata["cache"] == "hit"
+        assert len(calls) == 4
+        assert restarted.metrics()["response_cache"]["nodes"]["evaluate_status"]["disk_hits"] == 1
+
+        # 프롬프트 버전 변경 → 해당 노드 항목만 무효화
+        changed = make_provider(path, calls)
+        changed.get("evaluate_status", temperature=0, cache=True, prompt_version="2").invoke(
+            [HumanMessage(content="네")]
+        )
+        assert len(calls) == 5
+        restarted.close()
+        changed.close()
+
+
+def test_ttl_and_size_limits():
+    """만료된 항목은 미스, 행 수 상한을 넘으면 오래된 항목부터 삭제"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = LLMResponseCache(os.path.join(tmp, "cache.sqlite"), memory_size=2, max_rows=3, ttl_seconds=0.2)
+        keys = [response_key(("m", 0.0, ()), [HumanMessage(content=str(i))]) for i in range(5)]
+        for i, key in enumerate(keys):
+            cache.put("node", key, f"응답 {i}")
+
+        assert len(cache._entries) == 2  # 메모리 LRU 상한
+        assert cache.get("node", keys[0]) == "응답 0"  # SQLite 적중
+        assert cache.prune() == 2 and cache.stats()["disk_rows"] == 3
+        assert cache.get("node", keys[1]) is None  # 메모리에도 SQLite에도 없음
+        assert cache.get("node", keys[4]) == "응답 4"
+
+        time.sleep(0.3)
+        assert cache.get("node", keys[4]) is None
+        assert cache.invalidate("node") == 3 and cache.stats()["disk_rows"] == 0
+        cache.close()
+
+
+def test_node_reuses_cached_decision():
+    """evaluate_ticket_confirmation 노드의 반복 입력("네")은 LLM을 다시 호출하지 않음"""
+    with tempfile.TemporaryDirectory() as tmp:
+        calls = []
+        llm_provider._provider = make_provider(os.path.join(tmp, "llm_cache.sqlite"), calls)
+        # 판단 모델 없이 매번 LLM 경로 (판단 로그는 임시 디렉토리에)
+        decision_model._router = DecisionRouter(model_dir=os.path.join(tmp, "models"), log_dir=tmp)
+        try:
+            for _ in range(3):
+                state = evaluate_ticket_confirmation_node({"messages": [HumanMessage(content="네")]})
+                assert state["ticket_confirmed"] is True
+            assert len(calls) == 1
+            hit_rate = get_llm_provider().metrics()["response_cache"]["nodes"]["evaluate_ticket_confirmation"]["hit_rate"]
+            assert abs(hit_rate - 2 / 3) < 1e-9
+        finally:
+            reset_llm_provider()
+            reset_decision_router()
+
+
+if __name__ == "__main__":
+    test_two_level_cache()
+    test_ttl_and_size_limits()
+    test_node_reuses_cached_decision()
@@ -0,0 +1,115 @@
+"""공유 LLM 제공자 테스트
+
+(모델, temperature, 옵션)별 클라이언트가 한 번만 생성되어 노드 간에 재사용되고,
+모든 Ollama 클라이언트가 하나의 연결 풀을 공유하며, 노드별 호출 통계가 집계되는지 검증합니다.
+"""
+
+import os
+import sys
+import threading
+from pathlib import Path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import HumanMessage
+from langchain_core.prompts import ChatPromptTemplate
+
+import src.services.llm_provider as llm_provider
+from src.services.llm_provider import LLMProvider, get_llm_provider, reset_llm_provider
+from src.nodes.classify_intent import classify_intent_node
+
+
+def fake_factory(created: list):
+    def factory(model, temperature, **options):
+        created.append((model, temperature, options))
+        return FakeListChatModel(responses=['{"intent": "technical_support", "confidence": 0.9}'])
+    return factory
+
+
+def test_client_reuse_and_node_stats():
+    """같은 키는 같은 클라이언트, 노드별 통계는 따로 집계"""
+    created = []
+    provider = LLMProvider(model="test-model", factory=fake_factory(created))
+
+    a = provider.get("classify_intent", temperature=0)
+    b = provider.get("evaluate_status", temperature=0)
+    c = provider.get("handle_small_talk", temperature=0.7)
+    assert provider.get("classify_intent", temperature=0) is a
+    assert provider.client(temperature=0) is provider.client(temperature=0.0)
+    assert provider.client(temperature=0, num_ctx=4096) is not provider.client(temperature=0)
+    assert len(created) == 3  # (0), (0.7), (0, num_ctx)
+
+    # invoke / prompt | llm 두 사용 방식 모두 집계
+    a.invoke([HumanMessage(content="로그인이 안돼요")])
+    (ChatPromptTemplate.from_messages([("user", "안녕")]) | c).invoke({})
+
+    threads = [threading.Thread(target=lambda: b.invoke("네")) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    metrics = provider.metrics()
+    print(f"\n  {metrics}")
+    assert metrics["clients"] == 3
+    assert metrics["nodes"]["classify_intent"]["calls"] == 1
+    assert metrics["nodes"]["evaluate_status"]["calls"] == 8
+    assert metrics["nodes"]["handle_small_talk"]["calls"] == 1
+    assert all(stats["errors"] == 0 for stats in metrics["nodes"].values())
+
+
+def test_shared_connection_pool():
+    """Ollama 클라이언트들은 같은 httpx 전송 계층(연결 풀)을 사용 (연결은 호출 시에만 맺음)"""
+    provider = LLMProvider(base_url="http://localhost:11434", model="test-model")
+    try:
+        low = provider.client(temperature=0)
+        high = provider.client(temperature=0.7)
+        assert low is not high
+        assert low._client._client._transport is high._client._client._transport is provider._transport
+    finally:
+        provider.close()
+
+
+def test_shared_connection_pool_without_sync_client_kwargs():
+    """sync_client_kwargs가 없는 langchain-ollama(0.2.x)에서도 동기 클라이언트가 공유 연결 풀 사용"""
+    original = llm_provider._HAS_SYNC_CLIENT_KWARGS
+    llm_provider._HAS_SYNC_CLIENT_KWARGS = False
+    provider = LLMProvider(base_url="http://localhost:11434", model="test-model")
+    try:
+        low = provider.client(temperature=0)
+        high = provider.client(temperature=0.7)
+        assert low._client._client._transport is high._client._client._transport is provider._transport
+        assert str(low._client._client.base_url).startswith("http://localhost:11434")
+    finally:
+        llm_provider._HAS_SYNC_CLIENT_KWARGS = original
+        provider.close()
+
+
+def test_node_uses_shared_provider():
+    """노드는 공유 제공자의 클라이언트를 사용"""
+    created = []
+    os.environ["INTENT_KNN"] = "false"  # 임베딩 분류는 test_intent_knn.py
+    os.environ["LLM_CACHE"] = "false"  # 매 호출이 LLM까지 가는지 확인 (응답 캐시는 test_llm_cache.py)
+    llm_provider._provider = LLMProvider(model="test-model", factory=fake_factory(created))
+    try:
+        for _ in range(3):
+            state = classify_intent_node({
+                "messages": [HumanMessage(content="회사 메신저 관련해서 여쭤볼 게 있어요")],  # 규칙으로 확정되지 않는 입력
+                "solution_steps": [],
+                "status": "new",
+            })
+            assert state["intent"] == "technical_support"
+        assert len(created) == 1
+        assert get_llm_provider().metrics()["nodes"]["classify_intent"]["calls"] == 3
+    finally:
+        os.environ.pop("INTENT_KNN", None)
+        os.environ.pop("LLM_CACHE", None)
+        reset_llm_provider()
+
+
+if __name__ == "__main__":
+    test_client_reuse_and_node_stats()
+    test_shared_connection_pool()
+    test_shared_connection_pool_without_sync_client_kwargs()
+    test_node_uses_shared_provider()
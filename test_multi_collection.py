@@ -0,0 +1,219 @@
+"""FAQ + 티켓 다중 컬렉션 검색 테스트
+
+답변 완료 티켓만 티켓 컬렉션에 구축되고, search_knowledge_node가 FAQ / 티켓 컬렉션을
+동시에 검색하여 출처 가중치로 병합하며, 마감 시간을 넘긴 컬렉션은 제외하는지 검증합니다.
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import threading
+from pathlib import Path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+import src.services.retrieval as retrieval
+import src.nodes.search_knowledge as search_knowledge
+from src.services.retrieval import RetrievalService, reset_retrieval_service
+from src.services.ticket_index import TICKET_INDEX_DIR, load_answered_tickets, is_ticket_id
+from src.services.embedding_cache import EmbeddingCache, CachedEmbeddings
+from src.services.hashed_embeddings import HashedNgramEmbeddings
+from src.nodes.search_knowledge import search_knowledge_node, search_knowledge_batch
+from scripts.evaluate_retrieval import build_offline_store
+
+# 해시 n-gram 임베딩은 실제 임베딩 모델보다 거리가 멀어(티켓 제목 질의 ≈ 1.0) 노드의 거리 임계값을 넘음
+# - 병합 / 조회 검증에서는 임계값을 완화 (어휘 점수는 거리로 바꾸지 않으므로 실제 벡터 거리로 통과해야 함)
+HASHED_DISTANCE_THRESHOLD = 1.5
+NODE_DISTANCE_THRESHOLD = search_knowledge.DISTANCE_THRESHOLD
+
+TICKETS = [
+    {
+        "ticket_id": "a1b2c3d4",
+        "title": "사내 VPN 연결 후 네트워크 프린터가 목록에서 사라져요",
+        "summary": "VPN에 접속하면 사무실 네트워크 프린터가 인쇄 대상 목록에 나타나지 않음",
+        "additional_info": "Windows 11, 3층 복합기",
+        "category": "네트워크",
+        "status": "answered",
+        "created_at": "2026-10-01T09:00:00",
+        "answered_at": "2026-10-01T11:00:00",
+        "answer": "VPN 클라이언트 설정에서 '로컬 네트워크 접근 허용'을 켜 주세요.\n프린터를 다시 추가하면 목록에 표시됩니다.",
+    },
+    {
+        "ticket_id": "e5f6a7b8",
+        "title": "사내 VPN 연결 후 화상회의 화면이 멈춰요",
+        "summary": "VPN 접속 중 화상회의 화면 공유가 멈춤",
+        "additional_info": None,
+        "category": "네트워크",
+        "status": "open",
+        "created_at": "2026-10-02T09:00:00",
+        "answered_at": None,
+        "answer": None,
+    },
+]
+
+
+def build_collections(root: str) -> None:
+    """FAQ 인덱스(루트) + 답변 완료 티켓 인덱스(<루트>/tickets) 구축"""
+    build_offline_store(str(project_root / "data" / "faq_sample.json"), root, HashedNgramEmbeddings())
+
+    tickets_path = os.path.join(root, "raw_tickets")
+    os.makedirs(tickets_path)
+    for ticket in TICKETS:
+        with open(os.path.join(tickets_path, f"ticket_{ticket['ticket_id']}.json"), "w", encoding="utf-8") as f:
+            json.dump(ticket, f, ensure_ascii=False)
+
+    records = load_answered_tickets(tickets_path)
+    ticket_file = os.path.join(root, "tickets.json")
+    with open(ticket_file, "w", encoding="utf-8") as f:
+        json.dump(records, f, ensure_ascii=False)
+    directory = os.path.join(root, TICKET_INDEX_DIR)
+    os.makedirs(directory)
+    build_offline_store(ticket_file, directory, HashedNgramEmbeddings())
+
+
+def test_answered_tickets_only():
+    """status가 answered이고 답변이 있는 티켓만 FAQ 레코드로 변환"""
+    with tempfile.TemporaryDirectory() as root:
+        build_collections(root)
+        records = load_answered_tickets(os.path.join(root, "raw_tickets"))
+        assert [record["id"] for record in records] == ["TICKET-a1b2c3d4"]
+        assert records[0]["content"]["solutions"][0]["steps"][0].startswith("VPN 클라이언트")
+        assert is_ticket_id("TICKET-a1b2c3d4") and not is_ticket_id("FAQ-001")
+
+
+def test_merged_search():
+    """노드 검색 결과에 FAQ와 티켓 문서가 함께 병합되고, 본문/답변은 해당 컬렉션에서 조회"""
+    with tempfile.TemporaryDirectory() as root:
+        build_collections(root)
+        service = RetrievalService(persist_directory=root, backend="mmap", embeddings=HashedNgramEmbeddings())
+        retrieval._service = service
+        search_knowledge.DISTANCE_THRESHOLD = HASHED_DISTANCE_THRESHOLD
+        try:
+            state = search_knowledge_node({"current_query": TICKETS[0]["title"], "search_filter": None})
+            ids = [doc["id"] for doc in state["retrieved_docs"]]
+            print(f"\n  {ids} {service.metrics()['collections']}")
+            assert ids[0] == "TICKET-a1b2c3d4" and state["retrieved_docs"][0]["source"] == "ticket"
+
+            hydrated = service.hydrate(state["retrieved_docs"])
+            assert [doc["id"] for doc in hydrated] == ids
+            assert "로컬 네트워크 접근 허용" in hydrated[0]["content"]
+
+            solutions = service.hydrate_solutions(state["retrieved_solutions"])
+            assert any(solution["parent_id"] == "TICKET-a1b2c3d4" for solution in solutions)
+
+            # FAQ 질의는 FAQ 문서가 먼저
+            faq_query = json.load(open(project_root / "data" / "faq_sample.json", encoding="utf-8"))[0]["title"]
+            assert not is_ticket_id(service.search_collections(faq_query, k=3)[0][0])
+            assert service.collection_counts[("tickets", "searches")] >= 2
+            assert "+" in service.index_version()  # 티켓 인덱스 버전 포함
+        finally:
+            reset_retrieval_service()
+            search_knowledge.DISTANCE_THRESHOLD = NODE_DISTANCE_THRESHOLD
+
+
+def test_batch_merged_search():
+    """search_knowledge_batch도 티켓 컬렉션을 함께 검색하여 노드와 같은 병합 결과"""
+    with tempfile.TemporaryDirectory() as root:
+        build_collections(root)
+        service = RetrievalService(persist_directory=root, backend="mmap", embeddings=HashedNgramEmbeddings())
+        service.result_cache.max_size = 0
+        retrieval._service = service
+        search_knowledge.DISTANCE_THRESHOLD = HASHED_DISTANCE_THRESHOLD
+        try:
+            faq_titles = [faq["title"] for faq in
+                          json.load(open(project_root / "data" / "faq_sample.json", encoding="utf-8"))[:3]]
+            queries = [TICKETS[0]["title"], "VPN 켜면 프린터가 안 보여요"] + faq_titles
+            batch = search_knowledge_batch(queries, batch_size=4)
+            assert batch[0]["retrieved_docs"][0]["id"] == "TICKET-a1b2c3d4"
+            for query, result in zip(queries, batch):
+                state = search_knowledge_node({"current_query": query, "search_filter": None})
+                assert [doc["id"] for doc in result["retrieved_docs"]] == [doc["id"] for doc in state["retrieved_docs"]]
+                if state["relevance_score"] is None:  # 어휘 결과 경로 - 벡터 거리 없음
+                    assert result["relevance_score"] is None
+                else:
+                    assert abs(result["relevance_score"] - state["relevance_score"]) < 1e-5
+
+            # 티켓 검색 오류 → FAQ 결과만 사용
+            service.ticket_service.batch_search_ids = lambda *args, **kwargs: 1 / 0
+            results, _ = service.batch_search_collections(["VPN 켜면 프린터가 안 보여요"], k=3)
+            assert not any(is_ticket_id(doc_id) for doc_id, _ in results[0])
+            assert service.collection_counts[("tickets", "errors")] == 1
+        finally:
+            reset_retrieval_service()
+            search_knowledge.DISTANCE_THRESHOLD = NODE_DISTANCE_THRESHOLD
+
+
+def test_source_weighting():
+    """같은 유사도라면 가중치가 낮은 티켓 문서가 뒤로, 병합 결과는 가중 거리 순"""
+    with tempfile.TemporaryDirectory() as root:
+        build_collections(root)
+        service = RetrievalService(persist_directory=root, backend="mmap", embeddings=HashedNgramEmbeddings())
+        merged = service._merge_collections({
+            "faq": [("FAQ-002", 0.4), ("FAQ-001", 0.3)],
+            "tickets": [("TICKET-x", 0.4)],
+        }, k=3)
+        assert [doc_id for doc_id, _ in merged] == ["FAQ-001", "FAQ-002", "TICKET-x"]
+        assert merged[2][1] > 0.4  # 가중치 0.9 → 유사도 0.8 × 0.9 = 0.72 → 거리 0.56
+        assert abs(merged[2][1] - 0.56) < 1e-6
+
+        # RRF 순서의 FAQ 목록은 거리 순이 아님 - 뒤쪽의 가까운 FAQ 문서가 앞쪽 먼 문서에 밀려 잘리지 않아야 함
+        merged = service._merge_collections({
+            "faq": [("FAQ-A", 0.7), ("FAQ-B", 0.5), ("FAQ-C", 0.4)],
+            "tickets": [("TICKET-y", 0.1)],
+        }, k=3)
+        assert [doc_id for doc_id, _ in merged] == ["TICKET-y", "FAQ-C", "FAQ-B"]
+        assert [distance for _, distance in merged] == sorted(distance for _, distance in merged)
+
+
+def test_deadline():
+    """마감 시간을 넘긴 컬렉션은 제외하고 완료된 결과만 반환"""
+    with tempfile.TemporaryDirectory() as root:
+        build_collections(root)
+        service = RetrievalService(persist_directory=root, backend="mmap", embeddings=HashedNgramEmbeddings())
+        tickets = service.ticket_service
+        search = tickets.hybrid_search_ids
+
+        def slow_search(*args, **kwargs):
+            time.sleep(1.0)
+            return search(*args, **kwargs)
+
+        tickets.hybrid_search_ids = slow_search
+        started = time.perf_counter()
+        results = service.search_collections(TICKETS[0]["title"], k=3, deadline=0.2)
+        elapsed = time.perf_counter() - started
+
+        assert elapsed < 0.8, elapsed
+        assert results and not any(is_ticket_id(doc_id) for doc_id, _ in results)
+        assert service.collection_counts[("tickets", "timeouts")] == 1
+
+
+def test_single_flight_query_embedding():
+    """같은 질의를 동시에 임베딩하면 원본 모델은 한 번만 호출"""
+    calls = []
+
+    class SlowEmbeddings(HashedNgramEmbeddings):
+        def embed_query(self, text):
+            calls.append(text)
+            time.sleep(0.1)
+            return super().embed_query(text)
+
+    embeddings = CachedEmbeddings(SlowEmbeddings(), EmbeddingCache(max_size=16))
+    vectors = []
+    threads = [threading.Thread(target=lambda: vectors.append(embeddings.embed_query("VPN 연결이 끊겨요")))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1 and len(vectors) == 4 and all(v == vectors[0] for v in vectors)
+
+
+if __name__ == "__main__":
+    test_answered_tickets_only()
+    test_merged_search()
+    test_batch_merged_search()
+    test_source_weighting()
+    test_deadline()
+    test_single_flight_query_embedding()
@@ -0,0 +1,107 @@
+"""양자화 인덱스 테스트
+
+int8 / float16 압축 행렬 검색 + float32 재점수가
+exact 검색(NumpyIndex)과 같은 순위/거리를 반환하는지 검증합니다.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+
+from src.services.quantized_index import QuantizedIndex, quantize, compare_quantization, quantized_file_name
+from src.services.index_file import INDEX_FILE, MmapIndex, export_index_file
+from src.services.retrieval import RetrievalService
+from scripts.build_vectorstore import refresh_derived_indexes
+from test_ivf_index import make_clustered_index
+
+
+def test_int8_quantization_error():
+    """int8 벡터별 스케일 양자화 오차가 스케일의 절반 이내"""
+
+    matrix = np.random.default_rng(0).normal(size=(50, 64)).astype(np.float32)
+    codes, scales = quantize(matrix, "int8")
+    assert codes.dtype == np.int8 and scales.shape == (50,)
+    restored = codes.astype(np.float32) * scales[:, None]
+    assert np.all(np.abs(restored - matrix) <= scales[:, None] / 2 + 1e-6)
+
+
+def test_rescored_results_match_exact():
+    """재점수 후 상위 k가 float32 exact 검색과 동일 (거리 포함)"""
+
+    base = make_clustered_index(n=1000, dim=64)
+    for mode in ("int8", "float16"):
+        index = QuantizedIndex.build(base, mode=mode, rescore=20)
+        for row in (3, 250, 999):
+            query = base.matrix[row] + 0.05
+            expected = base.search_by_vector(query, k=5)
+            actual = index.search_by_vector(query, k=5)
+            assert [d.metadata["id"] for d, _ in expected] == [d.metadata["id"] for d, _ in actual]
+            for (_, exp_score), (_, act_score) in zip(expected, actual):
+                assert abs(exp_score - act_score) < 1e-5
+
+        filtered = index.search_by_vector(base.matrix[3], k=5, filter={"category": "분류2"})
+        assert filtered and all(d.metadata["category"] == "분류2" for d, _ in filtered)
+
+
+def test_save_load_and_report():
+    """저장/로드 + 메모리/재현율 보고서"""
+
+    base = make_clustered_index(n=500, dim=64)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "quantized_int8.npz")
+        QuantizedIndex.build(base, mode="int8").save(path)
+        loaded = QuantizedIndex.load(path, base)
+        assert loaded.mode == "int8"
+        assert loaded.search_by_vector(base.matrix[0], k=1)[0][0].metadata["id"] == "QA-00000"
+
+    report = compare_quantization(base, base.matrix[:30], k=5)
+    by_mode = {row["mode"]: row for row in report}
+    print(f"\n  {by_mode}")
+    assert by_mode["float32"]["bytes_per_doc"] == 64 * 4
+    assert by_mode["int8"]["bytes_per_doc"] == 64 + 4
+    assert by_mode["float16"]["bytes_per_doc"] == 64 * 2
+    assert by_mode["int8"]["recall"] == 1.0
+    # 인메모리 base 위의 양자화는 float32 행렬도 상주
+    assert by_mode["int8"]["resident_bytes_per_doc"] == 64 * 4 + 64 + 4
+
+
+def test_stale_quantized_after_rebuild():
+    """base 인덱스 재구축 후 오래된 압축 행렬 - 로드 거부, mmap 검색은 exact로 대체, 구축 스크립트가 갱신"""
+
+    old_base = make_clustered_index(n=300, dim=64, seed=0)
+    new_base = make_clustered_index(n=300, dim=64, seed=1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / quantized_file_name("int8"))
+        QuantizedIndex.build(old_base, mode="int8").save(path)
+        export_index_file(str(Path(tmp) / INDEX_FILE), new_base)
+
+        try:
+            QuantizedIndex.load(path, new_base)
+            assert False, "다른 base 인덱스로 만든 압축 행렬은 ValueError"
+        except ValueError:
+            pass
+
+        service = RetrievalService(persist_directory=tmp, backend="mmap")
+        service.quantization = "int8"
+        assert isinstance(service.index, MmapIndex)
+        service.index.close()
+
+        refresh_derived_indexes(tmp)
+        mmap_base = MmapIndex.open(str(Path(tmp) / INDEX_FILE))
+        refreshed = QuantizedIndex.load(path, mmap_base)
+        # mmap base는 재점수 행만 읽으므로 상주 메모리 = 압축 행렬
+        assert refreshed.memory_bytes() == refreshed.code_bytes() == 300 * (64 + 4)
+        assert refreshed.search_ids_by_vector(new_base.matrix[5], k=1)[0][0] == "QA-00005"
+        mmap_base.close()
+
+
+if __name__ == "__main__":
+    test_int8_quantization_error()
+    test_rescored_results_match_exact()
+    test_save_load_and_report()
+    test_stale_quantized_after_rebuild()
@@ -0,0 +1,109 @@
+"""시맨틱 검색 결과 캐시 테스트
+
+반경 안/밖 조회, negative caching, 범위(scope) 분리,
+인덱스 버전 변경 시 무효화, LRU 제거를 검증합니다.
+매니페스트 없이 구축된 저장소의 인덱스 버전과 버전을 알 수 없을 때 캐시를 끄는지도 확인합니다.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+
+from src.services.result_cache import SemanticResultCache
+from src.services.retrieval import RetrievalService, CHROMA_SQLITE_FILE
+from src.services.hashed_embeddings import HashedNgramEmbeddings
+
+
+def unit(vector):
+    vector = np.asarray(vector, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def test_radius_lookup_and_negative_cache():
+    """반경 안의 질의는 재사용, 밖은 미스, 빈 결과도 캐시"""
+
+    cache = SemanticResultCache(max_size=8, radius=0.05)
+    base = unit([1.0, 0.0, 0.0, 0.0])
+    near = unit([1.0, 0.1, 0.0, 0.0])   # 1 - cos ≈ 0.005
+    far = unit([1.0, 1.0, 0.0, 0.0])    # 1 - cos ≈ 0.29
+
+    docs = [{"id": "FAQ-001", "title": "비밀번호 재설정", "score": 0.42}]
+    cache.store(base, {"retrieved_docs": docs, "relevance_score": 0.42})
+
+    hit = cache.lookup(near)
+    assert hit == {"retrieved_docs": docs, "relevance_score": 0.42}
+    hit["retrieved_docs"].append({"id": "오염"})
+    assert len(cache.lookup(base)["retrieved_docs"]) == 1, "반환값 수정이 캐시에 영향을 주면 안 됨"
+    assert cache.lookup(far) is None
+
+    empty = unit([0.0, 0.0, 1.0, 0.0])
+    cache.store(empty, {"retrieved_docs": [], "relevance_score": 1.0})
+    assert cache.lookup(empty)["retrieved_docs"] == []
+
+    stats = cache.stats()
+    print(f"\n  통계: {stats}")
+    assert stats["hits"] == 3
+    assert stats["negative_hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_scope_version_and_eviction():
+    """필터 범위 분리 / 버전 변경 무효화 / LRU 제거"""
+
+    cache = SemanticResultCache(max_size=2, radius=0.05)
+    a, b, c = unit([1, 0, 0]), unit([0, 1, 0]), unit([0, 0, 1])
+
+    cache.set_version("v1")
+    cache.store(a, {"retrieved_docs": [], "relevance_score": 1.0}, scope='{"category": "메신저"}')
+    assert cache.lookup(a) is None
+    assert cache.lookup(a, scope='{"category": "메신저"}') is not None
+
+    cache.store(b, {"retrieved_docs": [], "relevance_score": 1.0})
+    cache.store(c, {"retrieved_docs": [], "relevance_score": 1.0})  # a가 가장 오래 사용되지 않음 → 제거
+    assert cache.lookup(a, scope='{"category": "메신저"}') is None
+    assert cache.lookup(b) is not None and cache.lookup(c) is not None
+    assert cache.stats()["evictions"] == 1
+
+    cache.set_version("v1")
+    assert len(cache) == 2
+    cache.set_version("v2")
+    assert len(cache) == 0
+    assert cache.lookup(b) is None
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_version_without_manifest():
+    """매니페스트가 없으면 Chroma SQLite 파일로 버전 결정, 어떤 파일도 없으면 결과 캐시 비활성화"""
+
+    with tempfile.TemporaryDirectory() as tmp:
+        service = RetrievalService(persist_directory=tmp, backend="chroma", embeddings=HashedNgramEmbeddings())
+        assert service.index_version() == ""
+        service.cache_results("VPN 연결이 안돼요", [], 1.0)
+        assert service.cached_results("VPN 연결이 안돼요") is None
+        assert len(service.result_cache) == 0
+
+        sqlite_path = os.path.join(tmp, CHROMA_SQLITE_FILE)
+        with open(sqlite_path, "wb") as f:
+            f.write(b"v1")
+        version = service.index_version()
+        assert version
+        assert service.cached_results("VPN 연결이 안돼요") is None  # 노드와 같이 조회 → 저장 순서
+        service.cache_results("VPN 연결이 안돼요", [], 1.0)
+        assert service.cached_results("VPN 연결이 안돼요") is not None
+
+        # 재구축 (SQLite 파일 변경) → 이전 결과 무효화
+        with open(sqlite_path, "wb") as f:
+            f.write(b"version 2")
+        assert service.index_version() != version
+        assert service.cached_results("VPN 연결이 안돼요") is None
+
+
+if __name__ == "__main__":
+    test_radius_lookup_and_negative_cache()
+    test_scope_version_and_eviction()
+    test_version_without_manifest()
@@ -0,0 +1,70 @@
+"""오프라인 검색 벤치마크 테스트
+
+Ollama 없이 해싱 n-gram 임베딩으로 벡터 스토어를 구축하고
+recall@k / MRR / 지연시간 보고서가 백엔드와 무관하게 일관되는지 검증합니다.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+
+from scripts.evaluate_retrieval import (
+    DEFAULT_QUERIES,
+    load_labeled_queries,
+    build_offline_store,
+    run_benchmark,
+    compare_reports,
+)
+from src.services.retrieval import RetrievalService
+from src.services.hashed_embeddings import HashedNgramEmbeddings
+
+
+def test_hashed_embeddings_deterministic():
+    """같은 텍스트 → 같은 단위 벡터, 띄어쓰기 차이 무시"""
+
+    embeddings = HashedNgramEmbeddings(dim=128)
+    a = np.array(embeddings.embed_query("메신저 알림이 안 떠요"))
+    b = np.array(HashedNgramEmbeddings(dim=128).embed_query("메신저 알림이 안떠요"))
+    c = np.array(embeddings.embed_query("비밀번호를 잊어버렸어요"))
+
+    assert a.shape == (128,)
+    assert abs(np.linalg.norm(a) - 1.0) < 1e-5
+    assert np.allclose(a, b)
+    assert float(a @ c) < 0.5
+
+
+def test_offline_benchmark_report():
+    """백엔드별 보고서 - 품질 지표는 exact 백엔드끼리 동일"""
+
+    queries = load_labeled_queries(str(project_root / DEFAULT_QUERIES))
+    embeddings = HashedNgramEmbeddings()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        build_offline_store(str(project_root / "data" / "faq_sample.json"), tmp, embeddings)
+        runs = [
+            run_benchmark(RetrievalService(persist_directory=tmp, backend=backend, embeddings=embeddings), queries)
+            for backend in ("chroma", "numpy", "mmap")
+        ]
+
+    for run in runs:
+        print(f"\n  {run['config']['backend']}: {run['metrics']} {run['latency_ms']}")
+        metrics = run["metrics"]
+        assert run["config"]["queries"] == len(queries)
+        assert metrics["recall@1"] <= metrics["recall@3"] <= metrics["recall@5"]
+        assert metrics["recall@1"] <= metrics["mrr"] <= metrics["recall@5"]
+        assert metrics["recall@5"] >= 0.8
+        assert run["latency_ms"]["p50"] <= run["latency_ms"]["p95"] <= run["latency_ms"]["p99"]
+        assert sum(run["search_paths"].values()) == len(queries)
+    assert runs[0]["metrics"] == runs[1]["metrics"] == runs[2]["metrics"]
+
+    changes = compare_reports({"runs": runs[:1]}, {"runs": runs})
+    assert {name for _, name, _, _ in changes} >= {"recall@1", "mrr", "p95"}
+
+
+if __name__ == "__main__":
+    test_hashed_embeddings_deterministic()
+    test_offline_benchmark_report()
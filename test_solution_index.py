@@ -0,0 +1,148 @@
+"""해결 방법 하위 문서 테스트
+
+[방법 N] 단위 하위 문서 생성/파싱, 검색된 FAQ 범위의 해결 방법 선택,
+plan_response 프롬프트 컨텍스트 축소를 검증합니다.
+"""
+
+import sys
+import json
+import tempfile
+from pathlib import Path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from scripts.build_vectorstore import create_documents_from_faq
+from src.services.index_file import write_index_file
+from src.services.retrieval import RetrievalService
+from src.services.solution_index import (
+    SOLUTION_INDEX_FILE,
+    create_solution_documents,
+    split_solutions,
+    fallback_solutions,
+)
+from src.nodes.plan_response import format_docs_context
+from test_vector_index import UnitEmbeddings
+
+
+def load_faq() -> list:
+    with open(project_root / "data" / "faq_sample.json", "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def to_retrieved(doc, score: float = 0.5) -> dict:
+    return {
+        "id": doc.metadata["id"],
+        "category": doc.metadata["category"],
+        "title": doc.metadata["title"],
+        "content": doc.page_content,
+        "score": score,
+    }
+
+
+def test_solution_documents_roundtrip():
+    """하위 문서 ID/상위 연결 + FAQ 본문 파싱 결과 일치"""
+
+    faq_data = load_faq()
+    solution_docs = create_solution_documents(faq_data)
+    assert len(solution_docs) == sum(len(faq["content"]["solutions"]) for faq in faq_data)
+
+    first = solution_docs[0]
+    assert first.metadata["id"] == f"{faq_data[0]['id']}#1"
+    assert first.metadata["parent_id"] == faq_data[0]["id"]
+
+    faq_doc = create_documents_from_faq(faq_data[:1])[0]
+    blocks = split_solutions(faq_doc.page_content)
+    assert [b["method"] for b in blocks] == [s["method"] for s in faq_data[0]["content"]["solutions"]]
+    assert blocks[-1]["content"].endswith(faq_data[0]["content"]["solutions"][-1]["expected_result"])
+
+
+def test_best_solutions_and_prompt_context():
+    """검색된 FAQ의 해결 방법 중 질의와 가까운 것만 선택 → 프롬프트 축소"""
+
+    faq_data = load_faq()
+    faq_docs = create_documents_from_faq(faq_data)
+    solution_docs = create_solution_documents(faq_data)
+    embeddings = UnitEmbeddings()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        write_index_file(
+            str(Path(tmp) / SOLUTION_INDEX_FILE),
+            solution_docs,
+            embeddings.embed_documents([doc.page_content for doc in solution_docs])
+        )
+        service = RetrievalService(persist_directory=tmp, backend="numpy")
+        service._embeddings = embeddings
+
+        retrieved_docs = [to_retrieved(doc) for doc in faq_docs[:3]]
+        target = solution_docs[4]
+        solutions = service.best_solutions(target.page_content, retrieved_docs, limit=2)
+        service.solution_index.close()
+
+    parent_ids = {doc["id"] for doc in retrieved_docs}
+    assert len(solutions) == 2
+    assert all(s["parent_id"] in parent_ids for s in solutions)
+    assert solutions[0]["id"] == target.metadata["id"]
+    assert solutions[0]["content"].startswith("[방법 ")
+
+    old_context = format_docs_context(retrieved_docs, [])
+    new_context = format_docs_context(retrieved_docs, solutions)
+    print(f"\n  프롬프트 컨텍스트: {len(old_context)}자 → {len(new_context)}자")
+    assert solutions[0]["content"] in new_context
+    assert len(new_context) < len(old_context)
+
+
+class NoEmbeddings(UnitEmbeddings):
+    """임베딩 호출 시 실패 (어휘 경로에서 임베딩을 만들지 않는지 확인)"""
+
+    def embed_query(self, text):
+        raise AssertionError(f"어휘 경로에서 임베딩 호출: {text}")
+
+
+def test_lexical_best_solutions_without_embedding():
+    """어휘 검색 경로 - 질의 임베딩 없이 n-gram 겹침으로 해결 방법 선택"""
+
+    faq_data = load_faq()
+    faq_docs = create_documents_from_faq(faq_data)
+    solution_docs = create_solution_documents(faq_data)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        write_index_file(
+            str(Path(tmp) / SOLUTION_INDEX_FILE),
+            solution_docs,
+            UnitEmbeddings().embed_documents([doc.page_content for doc in solution_docs])
+        )
+        service = RetrievalService(persist_directory=tmp, backend="numpy")
+        service._embeddings = NoEmbeddings()
+
+        retrieved_docs = [to_retrieved(doc) for doc in faq_docs[:3]]
+        target = next(s for s in solution_docs[1:] if s.metadata["parent_id"] in {d["id"] for d in retrieved_docs})
+        solutions = service.best_solutions(target.metadata["title"], retrieved_docs, limit=2, lexical=True)
+        service.solution_index.close()
+
+    assert len(solutions) == 2
+    assert solutions[0]["id"] == target.metadata["id"]
+    # 겹침 비율은 거리로 바꾸지 않고 lexical_score로 (score는 None)
+    assert all(solution["score"] is None for solution in solutions)
+    assert solutions[0]["lexical_score"] >= solutions[1]["lexical_score"]
+    assert solutions[0]["content"].startswith("[방법 ")
+
+
+def test_fallback_without_solution_index():
+    """하위 문서 색인이 없으면 상위 FAQ 순서대로 잘리지 않은 방법 선택"""
+
+    faq_docs = create_documents_from_faq(load_faq()[:2])
+    retrieved_docs = [to_retrieved(doc) for doc in faq_docs]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        service = RetrievalService(persist_directory=tmp, backend="numpy")
+        solutions = service.best_solutions("아무 질의", retrieved_docs, limit=2)
+
+    assert solutions == fallback_solutions(retrieved_docs, 2)
+    assert [s["parent_id"] for s in solutions] == [retrieved_docs[0]["id"]] * 2
+
+
+if __name__ == "__main__":
+    test_solution_documents_roundtrip()
+    test_best_solutions_and_prompt_context()
+    test_lexical_best_solutions_without_embedding()
+    test_fallback_without_solution_index()
@@ -0,0 +1,198 @@
+"""JSONL 스트리밍 적재 테스트
+
+대용량 FAQ를 한 줄씩 읽어 구축하고, 중단되면 마지막 커밋 지점부터 재개하는지 검증합니다.
+"""
+
+import os
+import sys
+import json
+import tempfile
+from pathlib import Path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from scripts.generate_faq_corpus import load_seed_faqs, generate_faq_records, write_jsonl
+import numpy as np
+
+import scripts.build_vectorstore as build_vectorstore
+from scripts.build_vectorstore import (
+    render_document,
+    stream_build_vectorstore,
+    export_single_file_index,
+    export_record_indexes,
+)
+from src.services.faq_stream import CommitWatermark, iter_faq_jsonl, iter_faq_records, load_checkpoint
+from src.services.document_store import DocumentStoreFile, write_document_store
+from src.services.index_file import INDEX_FILE, MmapIndex
+from src.services.lexical_index import LexicalIndex
+from src.services.solution_index import SOLUTION_INDEX_FILE
+from src.services.vector_index import NumpyIndex
+from src.services.hashed_embeddings import HashedNgramEmbeddings
+from src.services.index_manifest import load_manifest
+
+
+class FlakyEmbeddings(HashedNgramEmbeddings):
+    """fail_from번째 호출부터 실패하는 임베딩 (구축 중단 재현), 임베딩한 문서 수 기록"""
+
+    def __init__(self, fail_from: int = None):
+        super().__init__(dim=64)
+        self.fail_from = fail_from
+        self.calls = 0
+        self.embedded = 0
+
+    def embed_documents(self, texts):
+        self.calls += 1
+        if self.fail_from is not None and self.calls >= self.fail_from:
+            raise ConnectionError("임베딩 서버 중단")
+        self.embedded += len(texts)
+        return super().embed_documents(texts)
+
+
+def restore_env(name: str, value) -> None:
+    """환경 변수 복원 (conftest의 임시 경로 설정이 다음 테스트에도 남도록)"""
+    if value is None:
+        os.environ.pop(name, None)
+    else:
+        os.environ[name] = value
+
+
+def write_corpus(path: str, count: int) -> None:
+    """합성 FAQ JSONL + 잘못된 줄 2개"""
+    write_jsonl(generate_faq_records(load_seed_faqs(str(project_root / "data" / "faq_sample.json")), count), path)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("{잘못된 JSON\n")
+        f.write(json.dumps({"id": "FAQ-BAD", "title": "필드 누락"}, ensure_ascii=False) + "\n")
+
+
+def test_iter_and_watermark():
+    """잘못된 줄 건너뛰기 / 오프셋 재개 / 순서가 바뀐 커밋"""
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "faq.jsonl")
+        write_corpus(path, 20)
+
+        records = list(iter_faq_jsonl(path))
+        assert len(records) == 20
+        resumed = list(iter_faq_jsonl(path, start_offset=records[9][0]))
+        assert [r["id"] for _, r in resumed] == [r["id"] for _, r in records[10:]]
+
+        # 문서 저장소도 제너레이터 입력으로 기록
+        store_path = os.path.join(tmp, "doc_store.bin")
+        info = write_document_store(store_path, (render_document(r) for r in iter_faq_records(path)))
+        assert info["count"] == 20
+        store = DocumentStoreFile(store_path)
+        assert set(store.get_documents(["FAQ-0000003", "FAQ-BAD"])) == {"FAQ-0000003"}
+        store.close()
+
+    items = [object() for _ in range(5)]
+    watermark = CommitWatermark()
+    for offset, item in enumerate(items, 1):
+        watermark.track(item, offset * 10)
+
+    assert not watermark.commit(items[2:4])      # 앞 배치가 아직 기록되지 않음
+    assert watermark.offset == 0 and watermark.pending == 5
+    assert watermark.commit(items[:2])
+    assert (watermark.offset, watermark.records, watermark.pending) == (40, 4, 1)
+
+
+def test_stream_build_resume():
+    """중단된 스트리밍 구축이 체크포인트부터 재개되어 전체 문서를 기록"""
+
+    previous_cache = os.environ.get("EMBEDDING_CACHE_PATH")
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["EMBEDDING_CACHE_PATH"] = os.path.join(tmp, "embedding_cache.sqlite")
+        faq_file = os.path.join(tmp, "faq.jsonl")
+        persist_directory = os.path.join(tmp, "vectorstore")
+        write_corpus(faq_file, 300)
+
+        try:
+            # 1차: 6번째 배치부터 임베딩 실패 → 종료, 체크포인트 유지
+            try:
+                stream_build_vectorstore(faq_file, persist_directory, batch_size=16, max_workers=2,
+                                         max_retries=0, embeddings=FlakyEmbeddings(fail_from=6))
+                assert False, "임베딩 실패 시 종료해야 합니다"
+            except SystemExit as e:
+                assert e.code == 1
+
+            checkpoint = load_checkpoint(persist_directory)
+            assert checkpoint is not None and 0 < checkpoint["records"] < 300
+            committed = checkpoint["records"]
+
+            # 2차: 체크포인트 다음 레코드부터 재개
+            embeddings = FlakyEmbeddings()
+            vectorstore = stream_build_vectorstore(faq_file, persist_directory, batch_size=16, max_workers=2,
+                                                   embeddings=embeddings)
+            ids = set(vectorstore._collection.get(include=[])["ids"])
+        finally:
+            restore_env("EMBEDDING_CACHE_PATH", previous_cache)
+
+        print(f"\n  1차 커밋 {committed}개 → 재개 후 임베딩 {embeddings.embedded}개")
+        assert len(ids) == 300 and "FAQ-BAD" not in ids
+        assert embeddings.embedded <= 300 - committed
+        assert load_checkpoint(persist_directory) is None
+        assert load_manifest(persist_directory)["streamed"] is True
+
+
+def test_streamed_exports():
+    """단일 파일 인덱스는 페이지 단위로, 어휘 색인 / 문서 저장소 / 해결 방법 색인은 한 번의 순회로 기록"""
+
+    previous_cache = os.environ.get("EMBEDDING_CACHE_PATH")
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["EMBEDDING_CACHE_PATH"] = os.path.join(tmp, "embedding_cache.sqlite")
+        faq_file = os.path.join(tmp, "faq.jsonl")
+        persist_directory = os.path.join(tmp, "vectorstore")
+        write_corpus(faq_file, 40)
+        page_size = build_vectorstore.EXPORT_PAGE_SIZE
+
+        try:
+            vectorstore = stream_build_vectorstore(faq_file, persist_directory, batch_size=16, max_workers=2,
+                                                   embeddings=FlakyEmbeddings())
+
+            # 페이지 크기보다 많은 문서 → 여러 페이지로 나눠 기록해도 전체 로드와 같은 인덱스
+            build_vectorstore.EXPORT_PAGE_SIZE = 7
+            export_single_file_index(vectorstore, persist_directory)
+            exported = MmapIndex(os.path.join(persist_directory, INDEX_FILE))
+            expected = NumpyIndex.from_chroma(vectorstore)
+            assert exported.count() == expected.count() == 40
+            assert [exported._doc_id(row) for row in range(40)] == [doc.metadata["id"] for doc in expected.documents]
+            assert np.allclose(exported.matrix, expected.matrix, atol=1e-6)
+            exported.close()
+
+            # 한 번의 순회: 제너레이터 입력이어도 세 파일 모두 기록
+            records = list(iter_faq_records(faq_file))
+            export_record_indexes(iter_faq_records(faq_file), persist_directory, batch_size=8, max_workers=2,
+                                  embeddings=FlakyEmbeddings())
+            lexical = LexicalIndex.load(os.path.join(persist_directory, LexicalIndex.FILE_NAME))
+            assert len(lexical.doc_ids) == 40
+            assert lexical.search(records[5]["title"], k=1)[0][0] == records[5]["id"]
+            store = DocumentStoreFile(os.path.join(persist_directory, build_vectorstore.DOC_STORE_FILE))
+            assert store.count() == 40
+            store.close()
+            solution_path = os.path.join(persist_directory, SOLUTION_INDEX_FILE)
+            solutions = MmapIndex(solution_path)
+            assert solutions.count() == sum(len(r["content"]["solutions"]) for r in records)
+            solutions.close()
+
+            # 하위 문서 임베딩 실패 (캐시 없음) → 이전 해결 방법 색인 유지, 나머지 색인은 끝까지 기록
+            os.environ["EMBEDDING_CACHE_PATH"] = os.path.join(tmp, "empty_cache.sqlite")
+            before = os.path.getsize(solution_path)
+            export_record_indexes(records[:10], persist_directory, max_retries=0,
+                                  embeddings=FlakyEmbeddings(fail_from=1))
+            assert os.path.getsize(solution_path) == before
+            assert not [name for name in os.listdir(persist_directory) if name.endswith(".tmp")]
+            store = DocumentStoreFile(os.path.join(persist_directory, build_vectorstore.DOC_STORE_FILE))
+            assert store.count() == 10
+            store.close()
+
+            # 스트리밍 구축(solutions=False)은 해결 방법 색인 삭제
+            export_record_indexes(records, persist_directory, solutions=False)
+            assert not os.path.exists(solution_path)
+        finally:
+            build_vectorstore.EXPORT_PAGE_SIZE = page_size
+            restore_env("EMBEDDING_CACHE_PATH", previous_cache)
+
+
+if __name__ == "__main__":
+    test_iter_and_watermark()
+    test_stream_build_resume()
+    test_streamed_exports()
@@ -0,0 +1,69 @@
+"""합성 FAQ 코퍼스 테스트
+
+생성된 레코드가 FAQDocument 스키마를 만족하고 같은 seed에서 재현되는지,
+규모별 벤치마크가 구축/검색/메모리 지표를 모두 기록하는지 검증합니다.
+"""
+
+import os
+import sys
+import json
+import tempfile
+from pathlib import Path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from src.models.faq import validate_faq_document
+from scripts.generate_faq_corpus import load_seed_faqs, generate_faq_records, write_jsonl
+from scripts.benchmark_scale import run_size
+
+SEED_FILE = str(project_root / "data" / "faq_sample.json")
+
+
+def test_generated_records_valid_and_reproducible():
+    """스키마 유효 + 같은 seed면 같은 코퍼스 + 고유 ID"""
+
+    seed_faqs = load_seed_faqs(SEED_FILE)
+    records = list(generate_faq_records(seed_faqs, 500, seed=3))
+    assert records == list(generate_faq_records(seed_faqs, 500, seed=3))
+    assert records != list(generate_faq_records(seed_faqs, 500, seed=4))
+
+    assert all(not validate_faq_document(record) for record in records)
+    assert len({record["id"] for record in records}) == 500
+    assert {record["category"] for record in records} <= {faq["category"] for faq in seed_faqs}
+    for record in records:
+        methods = [solution["method"] for solution in record["content"]["solutions"]]
+        assert methods == list(range(1, len(methods) + 1))
+        assert record["updated_at"] >= record["created_at"]
+        assert record["helpful_count"] <= record["view_count"]
+
+    assert validate_faq_document({"id": "FAQ-1"})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "faq.jsonl")
+        assert write_jsonl(iter(records), path) == 500
+        with open(path, "r", encoding="utf-8") as f:
+            assert [json.loads(line) for line in f] == records
+
+
+def test_scale_benchmark_report():
+    """규모 벤치마크 보고서에 구축 시간 / 지연시간 / RSS 포함"""
+
+    cache_path = os.environ.get("EMBEDDING_CACHE_PATH")
+    report = run_size(300, dim=64, queries=20, seed=1, seed_file=SEED_FILE)
+    print(f"\n  {report['build_seconds']}\n  {report['rss_mb']}")
+    assert report["documents"] == 300 and report["queries"] == 20
+    assert {"embed", "numpy_index", "ivf_build", "int8_build", "lexical_build"} <= set(report["build_seconds"])
+    assert {"chroma_build", "chroma_export", "record_indexes"} <= set(report["build_seconds"])
+    assert {"numpy", "mmap", "ivf", "int8", "chroma", "lexical", "category_filter"} <= set(report["latency_ms"])
+    assert os.environ.get("EMBEDDING_CACHE_PATH") == cache_path  # 임시 임베딩 캐시 설정은 측정 후 복원
+
+    # 전체 구축 경로도 같은 보고서
+    full = run_size(100, dim=64, queries=5, seed=1, seed_file=SEED_FILE, chroma="full")
+    assert full["chroma"] == "full" and "chroma_build" in full["build_seconds"]
+    assert report["rss_mb"]["peak"] > 0
+    assert report["sizes_bytes"]["int8_codes"] < report["sizes_bytes"]["float32_matrix"]
+
+
+if __name__ == "__main__":
+    test_generated_records_valid_and_reproducible()
+    test_scale_benchmark_report()
@@ -0,0 +1,152 @@
+"""테넌트 샤드 테스트
+
+tenant_id별 샤드가 처음 사용될 때 로드되고, 메모리/개수 예산을 넘으면
+가장 오래 사용하지 않은 샤드부터 축출되는지 검증합니다.
+"""
+
+import gc
+import os
+import sys
+import json
+import tempfile
+from pathlib import Path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+import src.services.retrieval as retrieval
+from src.services.retrieval import RetrievalService, get_retrieval_service, reset_retrieval_service
+from src.services.tenant_shards import (
+    ShardRegistry,
+    tenant_directory,
+    list_tenants,
+    normalize_tenant,
+    estimate_shard_bytes,
+)
+from src.nodes.initialize import initialize_node
+from src.services.hashed_embeddings import HashedNgramEmbeddings
+from src.nodes.search_knowledge import search_knowledge_node, search_knowledge_batch
+from scripts.evaluate_retrieval import build_offline_store
+
+TENANT_CATEGORIES = {
+    "messenger": ["메신저", "알림"],
+    "files": ["파일", "네트워크"],
+    "account": ["로그인", "계정", "보안", "설정"],
+}
+
+
+def build_shards(root: str) -> dict:
+    """기본 인덱스(전체 FAQ) + 카테고리 그룹별 테넌트 샤드 구축"""
+    faq_file = str(project_root / "data" / "faq_sample.json")
+    with open(faq_file, "r", encoding="utf-8") as f:
+        faq_data = json.load(f)
+
+    build_offline_store(faq_file, root, HashedNgramEmbeddings())
+    for tenant, categories in TENANT_CATEGORIES.items():
+        directory = tenant_directory(root, tenant)
+        os.makedirs(directory)
+        tenant_file = os.path.join(root, f"{tenant}.json")
+        with open(tenant_file, "w", encoding="utf-8") as f:
+            json.dump([faq for faq in faq_data if faq["category"] in categories], f, ensure_ascii=False)
+        build_offline_store(tenant_file, directory, HashedNgramEmbeddings())
+    return {faq["id"]: faq for faq in faq_data}
+
+
+def test_tenant_routing_and_lru():
+    """tenant_id → 샤드 검색, 개수 상한 초과 시 LRU 축출 후 참조가 없어지면 해제"""
+
+    os.environ["TENANT_SHARD_MAX"] = "2"
+    with tempfile.TemporaryDirectory() as root:
+        faqs = build_shards(root)
+        assert list_tenants(root) == sorted(TENANT_CATEGORIES)
+
+        retrieval._service = RetrievalService(persist_directory=root, backend="mmap", embeddings=HashedNgramEmbeddings())
+        try:
+            query = next(faq["title"] for faq in faqs.values() if faq["category"] == "알림")
+            state = search_knowledge_node({"current_query": query, "search_filter": None, "tenant_id": "messenger"})
+            assert state["retrieved_docs"]
+            assert all(faqs[doc["id"]]["category"] in TENANT_CATEGORIES["messenger"] for doc in state["retrieved_docs"])
+
+            messenger = get_retrieval_service("messenger")
+            assert messenger is not get_retrieval_service() and messenger.embedding_cache is get_retrieval_service().embedding_cache
+
+            batch = search_knowledge_batch(["파일 업로드가 안돼요", "비밀번호를 잊어버렸어요"], tenant="files")
+            assert all(faqs[doc["id"]]["category"] in TENANT_CATEGORIES["files"]
+                       for result in batch for doc in result["retrieved_docs"])
+
+            # 세 번째 테넌트 로드 → 가장 오래 사용하지 않은 messenger 축출
+            get_retrieval_service("account")
+            stats = get_retrieval_service().metrics()["tenant_shards"]
+            print(f"\n  {stats}")
+            assert set(stats["loaded"]) == {"files", "account"} and stats["evictions"] == 1
+            assert stats["loads"] == 3 and stats["hits"] >= 1
+
+            # 축출된 샤드도 참조가 남아 있는 동안은 검색 가능, 참조가 없어지면 해제
+            assert messenger.hybrid_search_ids(query, k=3)
+            closeables = messenger._closeables
+            del messenger
+            gc.collect()
+            assert closeables == []
+
+            # 샤드가 없는 테넌트는 기본 인덱스, 기본 테넌트 키는 None
+            assert get_retrieval_service("unknown-unit") is get_retrieval_service()
+            assert normalize_tenant("default") is None and tenant_directory(root, None) == root
+            try:
+                get_retrieval_service("../etc")
+                assert False, "잘못된 테넌트 키는 거부해야 합니다"
+            except ValueError:
+                pass
+        finally:
+            os.environ.pop("TENANT_SHARD_MAX", None)
+            reset_retrieval_service()
+
+
+def test_memory_budget_eviction():
+    """샤드 크기 합이 메모리 예산을 넘으면 축출"""
+
+    with tempfile.TemporaryDirectory() as root:
+        build_shards(root)
+        base = RetrievalService(persist_directory=root, backend="mmap", embeddings=HashedNgramEmbeddings())
+        registry = ShardRegistry(root, factory=base.spawn, max_bytes=1)
+
+        registry.get("messenger")
+        assert registry.stats()["evictions"] == 0  # 하나는 예산과 무관하게 유지
+        registry.get("files")
+        stats = registry.stats()
+        assert list(stats["loaded"]) == ["files"] and stats["evictions"] == 1
+        assert registry.get("nobody") is None
+
+
+def test_invalid_tenant_falls_back_to_default():
+    """URL로 들어온 잘못된 테넌트 키(한글 / 64자 초과) - 초기화 노드가 기본 인덱스로 대체, 검색 노드는 실패하지 않음"""
+
+    with tempfile.TemporaryDirectory() as root:
+        build_offline_store(str(project_root / "data" / "faq_sample.json"), root, HashedNgramEmbeddings())
+        retrieval._service = RetrievalService(persist_directory=root, backend="mmap", embeddings=HashedNgramEmbeddings())
+        try:
+            for tenant in ("메신저팀", "a" * 65, "../etc"):
+                state = initialize_node({"tenant_id": tenant, "messages": []})
+                assert state["tenant_id"] is None
+                state = search_knowledge_node(dict(state, current_query="비밀번호를 잊어버렸어요", search_filter=None))
+                assert state["retrieved_docs"]
+            assert initialize_node({"tenant_id": "messenger", "messages": []})["tenant_id"] == "messenger"
+        finally:
+            reset_retrieval_service()
+
+
+def test_shard_size_includes_subdirectories():
+    """샤드 크기 추정에 Chroma HNSW 세그먼트 같은 하위 디렉토리 파일 포함"""
+
+    with tempfile.TemporaryDirectory() as root:
+        os.makedirs(os.path.join(root, "segment"))
+        with open(os.path.join(root, "faq_index.bin"), "wb") as f:
+            f.write(b"x" * 100)
+        with open(os.path.join(root, "segment", "data_level0.bin"), "wb") as f:
+            f.write(b"x" * 1000)
+        assert estimate_shard_bytes(root) == 1100
+
+
+if __name__ == "__main__":
+    test_tenant_routing_and_lru()
+    test_memory_budget_eviction()
+    test_invalid_tenant_falls_back_to_default()
+    test_shard_size_includes_subdirectories()
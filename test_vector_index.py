@@ -0,0 +1,161 @@
+"""벡터 인덱스 백엔드 테스트
+
+Ollama 없이 결정적 임베딩으로 NumPy 백엔드가 Chroma와 같은
+(Document, 거리) 결과를 반환하는지 검증합니다.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+from langchain_chroma import Chroma
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding, Embeddings
+
+from src.services.vector_index import ChromaIndex, NumpyIndex
+from src.services.index_file import MmapIndex, export_index_file
+
+
+class UnitEmbeddings(Embeddings):
+    """L2 정규화된 결정적 임베딩 (BGE-M3처럼 단위 벡터 반환)"""
+
+    def __init__(self, size: int = 32):
+        self.base = DeterministicFakeEmbedding(size=size)
+
+    def embed_query(self, text):
+        vector = np.array(self.base.embed_query(text))
+        return (vector / np.linalg.norm(vector)).tolist()
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+
+def make_documents(n: int = 30) -> list:
+    return [
+        Document(page_content=f"FAQ 문서 {i}", metadata={"id": f"FAQ-{i:03d}", "category": "테스트"})
+        for i in range(n)
+    ]
+
+
+def test_numpy_matches_chroma():
+    """NumPy 백엔드와 Chroma 백엔드의 순위/거리 일치 테스트"""
+
+    print("=" * 60)
+    print("  NumPy vs Chroma 백엔드 비교")
+    print("=" * 60)
+
+    embeddings = UnitEmbeddings()
+    with tempfile.TemporaryDirectory() as tmp:
+        vectorstore = Chroma.from_documents(
+            make_documents(),
+            embeddings,
+            persist_directory=tmp,
+            collection_name="faq_collection"
+        )
+        chroma_index = ChromaIndex(vectorstore)
+        numpy_index = NumpyIndex.from_chroma(vectorstore)
+        assert numpy_index.count() == chroma_index.count() == 30
+
+        for query in ["FAQ 문서 3", "FAQ 문서 17", "전혀 다른 질의"]:
+            query_vector = embeddings.embed_query(query)
+            expected = chroma_index.search_by_vector(query_vector, k=5)
+            actual = numpy_index.search_by_vector(query_vector, k=5)
+
+            print(f"\n  쿼리: {query}")
+            for (exp_doc, exp_score), (act_doc, act_score) in zip(expected, actual):
+                print(f"    {exp_doc.metadata['id']} {exp_score:.4f} | {act_doc.metadata['id']} {act_score:.4f}")
+                assert exp_doc.metadata["id"] == act_doc.metadata["id"]
+                assert abs(exp_score - act_score) < 1e-3
+
+
+def test_numpy_cosine_metric():
+    """코사인 거리 및 top-k 경계 테스트"""
+
+    embeddings = UnitEmbeddings()
+    index = NumpyIndex.from_documents(make_documents(5), embeddings, metric="cosine")
+
+    results = index.search_by_vector(embeddings.embed_query("FAQ 문서 2"), k=10)
+    assert len(results) == 5
+    assert results[0][0].metadata["id"] == "FAQ-002"
+    assert abs(results[0][1]) < 1e-5
+    assert [score for _, score in results] == sorted(score for _, score in results)
+
+
+def test_metadata_filter():
+    """메타데이터 사전 필터 - NumPy/Chroma 백엔드 결과 일치 테스트"""
+
+    embeddings = UnitEmbeddings()
+    documents = make_documents()
+    for i, doc in enumerate(documents):
+        doc.metadata["category"] = "메신저" if i % 3 == 0 else "메일"
+        doc.metadata["tags"] = "알림, 로그인" if i % 2 == 0 else "로그인"
+
+    query_vector = embeddings.embed_query("FAQ 문서 5")
+    filter = {"category": "메신저", "tags": ["알림"]}
+    expected_ids = {f"FAQ-{i:03d}" for i in range(30) if i % 6 == 0}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        vectorstore = Chroma.from_documents(
+            documents,
+            embeddings,
+            persist_directory=tmp,
+            collection_name="faq_collection"
+        )
+        chroma_index = ChromaIndex(vectorstore)
+        numpy_index = NumpyIndex.from_chroma(vectorstore)
+
+        assert numpy_index.metadata_index.ids(filter) == expected_ids
+        assert numpy_index.metadata_index.values("category") == ["메신저", "메일"]
+
+        expected = chroma_index.search_by_vector(query_vector, k=10, filter=filter)
+        actual = numpy_index.search_by_vector(query_vector, k=10, filter=filter)
+        assert {doc.metadata["id"] for doc, _ in actual} == expected_ids
+        for (exp_doc, exp_score), (act_doc, act_score) in zip(expected, actual):
+            assert exp_doc.metadata["id"] == act_doc.metadata["id"]
+            assert abs(exp_score - act_score) < 1e-3
+
+        assert numpy_index.search_by_vector(query_vector, k=5, filter={"category": "없음"}) == []
+        assert chroma_index.search_by_vector(query_vector, k=5, filter={"category": "없음"}) == []
+
+    try:
+        numpy_index.search_by_vector(query_vector, k=5, filter={"title": "x"})
+        assert False, "지원하지 않는 필드는 ValueError"
+    except ValueError:
+        pass
+
+
+def test_mmap_index_file_roundtrip():
+    """단일 파일 인덱스 내보내기 → mmap 로드 결과 일치 테스트"""
+
+    embeddings = UnitEmbeddings()
+    numpy_index = NumpyIndex.from_documents(make_documents(), embeddings)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "faq_index.bin")
+        info = export_index_file(path, numpy_index)
+        print(f"\n  인덱스 파일: {info}")
+
+        mmap_index = MmapIndex.open(path)
+        try:
+            assert mmap_index.count() == 30
+            query_vector = embeddings.embed_query("FAQ 문서 7")
+            expected = numpy_index.search_by_vector(query_vector, k=5)
+            actual = mmap_index.search_by_vector(query_vector, k=5)
+            for (exp_doc, exp_score), (act_doc, act_score) in zip(expected, actual):
+                assert exp_doc.page_content == act_doc.page_content
+                assert exp_doc.metadata == act_doc.metadata
+                assert abs(exp_score - act_score) < 1e-6
+
+            assert set(mmap_index.get_documents(["FAQ-003", "없는-ID"])) == {"FAQ-003"}
+        finally:
+            mmap_index.close()
+
+
+if __name__ == "__main__":
+    test_numpy_matches_chroma()
+    test_numpy_cosine_metric()
+    test_metadata_filter()
+    test_mmap_index_file_roundtrip()